@@ -11,6 +11,8 @@ LAB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if LAB_DIR not in sys.path:
     sys.path.append(LAB_DIR)
 from infra.pager_relay import trigger_pager
+from infra.rag_generation import bump_rag_generation
+from infra.rag_sync import RagSync
 
 # Paths
 FIELD_NOTES_DATA = os.path.expanduser("~/Dev_Lab/Portfolio_Dev/field_notes/data")
@@ -36,11 +38,13 @@ def main():
     except ValueError:
         wisdom = chroma_client.get_collection(name=COLLECTION_WISDOM)
 
+    # [FEAT-486] Stage everything, then push only new/changed documents in batched upserts
+    sync = RagSync(wisdom, "bridge_burn_to_rag")
+
     # 2. Sync Technical Artifacts (Logs)
     json_files = glob.glob(os.path.join(FIELD_NOTES_DATA, "*.json"))
     ignore_files = ["themes.json", "status.json", "queue.json", "state.json", "search_index.json", "pager_activity.json", "file_manifest.json"]
 
-    total_added = 0
     for fpath in json_files:
         fname = os.path.basename(fpath)
         if fname in ignore_files: continue
@@ -76,13 +80,7 @@ def main():
 
                 event_id = f"artifact_{hashlib.md5(content.encode()).hexdigest()}"
 
-                if not wisdom.get(ids=[event_id])['ids']:
-                    wisdom.add(
-                        documents=[content],
-                        metadatas=[{"source": fname, "date": date, "type": "artifact", "domain": domain}],
-                        ids=[event_id]
-                    )
-                    total_added += 1
+                sync.add(event_id, content, {"source": fname, "date": date, "type": "artifact", "domain": domain})
         except Exception as e:
             print(f"Error processing {fname}: {e}")
 
@@ -97,13 +95,7 @@ def main():
                 if theme_text:
                     content = f"[{year} STRATEGIC THEME]: {theme_text}"
                     theme_id = f"theme_{year}"
-                    if not wisdom.get(ids=[theme_id])['ids']:
-                        wisdom.add(
-                            documents=[content],
-                            metadatas=[{"source": "themes.json", "year": year, "type": "strategy"}],
-                            ids=[theme_id]
-                        )
-                        total_added += 1
+                    sync.add(theme_id, content, {"source": "themes.json", "year": year, "type": "strategy"})
         except Exception as e:
             print(f"Error processing themes: {e}")
 
@@ -126,13 +118,7 @@ def main():
                     if not section.strip(): continue
                     chunk_content = f"[STRATEGY DOC: {doc}] {section.strip()}"
                     chunk_id = f"strat_{doc}_{i}"
-                    if not wisdom.get(ids=[chunk_id])['ids']:
-                        wisdom.add(
-                            documents=[chunk_content],
-                            metadatas=[{"source": doc, "type": "strategy_doc"}],
-                            ids=[chunk_id]
-                        )
-                        total_added += 1
+                    sync.add(chunk_id, chunk_content, {"source": doc, "type": "strategy_doc"})
             except Exception as e:
                 print(f"Error processing strat doc {doc}: {e}")
 
@@ -160,16 +146,14 @@ def main():
 
                 asset_id = f"asset_{hashlib.md5(content.encode()).hexdigest()}"
 
-                if not wisdom.get(ids=[asset_id])['ids']:
-                    wisdom.add(
-                        documents=[content],
-                        metadatas=[{"source": fname, "filename": filename, "type": "asset_catalog"}],
-                        ids=[asset_id]
-                    )
-                    total_added += 1
+                sync.add(asset_id, content, {"source": fname, "filename": filename, "type": "asset_catalog"})
         except Exception as e:
             print(f"Error processing artifact catalog {fname}: {e}")
 
+    total_added = sync.sync()["upserted"]
+    if total_added:
+        # [FEAT-478] Invalidate cached Hub RAG context
+        bump_rag_generation("bridge_burn_to_rag", total_added)
     print(f"Success: Synced {total_added} new items (Artifacts + Strategy + Assets) into Wisdom collection.")
     trigger_pager(f"RAG Sync Complete: Synced {total_added} new items to long_term_wisdom.", source="RAG", severity="INFO")
 
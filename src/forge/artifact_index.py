@@ -0,0 +1,86 @@
+"""Slug -> artifact resolution for index_artifacts_to_rag."""
+
+import os
+import re
+from collections import defaultdict
+
+# [FEAT-487] Hash-Indexed Artifact Matching
+# Objective: resolving a search-index slug used to scan every artifact entry
+# (O(slugs x artifacts)). ArtifactIndex is built once per run and resolves a
+# slug in three dictionary tiers, first hit wins:
+#   1. exact:      filename or keyword, as the old linear scan matched
+#   2. normalized: case/extension/separator-insensitive stem or keyword
+#   3. fuzzy:      trigram overlap (Jaccard) on normalized keys, via an
+#                  inverted trigram index so only candidates sharing a trigram
+#                  are scored
+# Within a tier the earliest artifact wins, matching the old first-match scan.
+
+FUZZY_THRESHOLD = 0.6
+_SEP_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name):
+    """'Power_Telemetry-Report.PDF' -> 'power telemetry report'."""
+    stem, ext = os.path.splitext(str(name).strip().lower())
+    if ext and not re.fullmatch(r"\.[a-z0-9]{1,5}", ext):
+        stem += ext  # not an extension, e.g. 'v1.2 notes'
+    return " ".join(_SEP_RE.sub(" ", stem).split())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ArtifactIndex:
+    """[FEAT-487] Precomputed exact / normalized / trigram lookup over artifact entries."""
+
+    def __init__(self, artifacts, fuzzy_threshold=FUZZY_THRESHOLD):
+        self.artifacts = list(artifacts)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.exact = {}
+        self.normalized = {}
+        self._grams = {}                   # normalized key -> its trigram set
+        self._postings = defaultdict(set)  # trigram -> normalized keys
+        self.stats = {"exact": 0, "normalized": 0, "fuzzy": 0, "miss": 0}
+        for pos, entry in enumerate(self.artifacts):
+            names = [entry.get("filename", ""), *entry.get("keywords", [])]
+            for name in names:
+                if not isinstance(name, str) or not name:
+                    continue
+                self.exact.setdefault(name, pos)
+                key = normalize(name)
+                if key and key not in self.normalized:
+                    self.normalized[key] = pos
+                    grams = trigrams(key)
+                    self._grams[key] = grams
+                    for g in grams:
+                        self._postings[g].add(key)
+
+    def _fuzzy(self, key):
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for g in grams:
+            for candidate in self._postings.get(g, ()):
+                shared[candidate] += 1
+        best = None  # (score, -position): highest overlap, then earliest artifact
+        for candidate, overlap in shared.items():
+            score = overlap / (len(grams) + len(self._grams[candidate]) - overlap)
+            if score >= self.fuzzy_threshold:
+                rank = (score, -self.normalized[candidate])
+                if best is None or rank > best:
+                    best = rank
+        return -best[1] if best else None
+
+    def resolve(self, slug):
+        """Returns (entry, tier) where tier is exact/normalized/fuzzy, or (None, 'miss')."""
+        pos, tier = self.exact.get(slug), "exact"
+        if pos is None:
+            key = normalize(slug)
+            pos, tier = self.normalized.get(key), "normalized"
+            if pos is None and key:
+                pos, tier = self._fuzzy(key), "fuzzy"
+        if pos is None:
+            tier = "miss"
+        self.stats[tier] += 1
+        return (self.artifacts[pos] if pos is not None else None), tier
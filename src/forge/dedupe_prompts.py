@@ -8,14 +8,30 @@ Gemini Prompt De-duplicator
 # [FEAT-208] Manifest Authority
 Prunes the refined prompt manifest using:
 1. Exact Hashing (Fast removal of identical prompts).
-2. Fuzzy Similarity (Levenshtein distance via 'thefuzz').
+2. Near-Duplicate Detection (MinHash + LSH over word shingles).
    Consolidates near-duplicates to ensure a diverse training curriculum.
+
+# [FEAT-488] Global MinHash/LSH
+Phase 2 used to compare each prompt against the last 100 accepted ones with
+thefuzz's ratio: pure-Python edit distance per pair, and blind to duplicates
+further apart than the window. Each prompt now gets a MinHash signature over
+its word shingles; the signature is cut into LSH bands, and only prompts that
+collide in some band are verified with the exact shingle Jaccard. Recall is
+tuned with NUM_PERM / LSH_BANDS (rows per band = NUM_PERM // LSH_BANDS):
+P(candidate) = 1 - (1 - J^rows)^bands.
 """
 
 import json
 import logging
+import random
+import re
+import zlib
 from pathlib import Path
-from thefuzz import fuzz
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python signatures (identical values, just slower)
+    np = None
 
 # --- Configuration ---
 REFINED_PROMPTS = (
@@ -24,13 +40,113 @@ REFINED_PROMPTS = (
 DEDUPED_PROMPT_FILE = (
     Path.home() / "Dev_Lab/HomeLabAI/src/forge/expertise/deduped_prompts.jsonl"
 )
-SIMILARITY_THRESHOLD = 85  # Percent similarity to trigger de-duplication
+SIMILARITY_THRESHOLD = 0.7  # Shingle Jaccard similarity to trigger de-duplication
+SHINGLE_SIZE = 2            # words per shingle
+NUM_PERM = 128
+# 32 bands x 4 rows: P(candidate) = 1-(1-J^4)^32 -> ~99.98% recall at J=0.7, but ~23% of J=0.3 pairs
+# (87% at J=0.5) still become candidates; those only cost an exact jaccard() check, never a false merge.
+LSH_BANDS = 32
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
 
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE = (1 << 61) - 1
+_MASK64 = (1 << 64) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Set of k-word shingles (hashed to 32 bits); short prompts become one shingle."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= k:
+        grams = [" ".join(words)]
+    else:
+        grams = (" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Universal-hash MinHash: h_i(x) = ((a_i * x + b_i) mod 2^61-1) & 0xffffffff."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.a = [rng.randint(1, _MERSENNE - 1) for _ in range(num_perm)]
+        self.b = [rng.randint(0, _MERSENNE - 1) for _ in range(num_perm)]
+        self.num_perm = num_perm
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)
+            self._b = np.array(self.b, dtype=np.uint64)
+
+    def signature(self, shingle_hashes):
+        if not shingle_hashes:
+            return (_MAX_HASH,) * self.num_perm
+        if np is not None:
+            hv = np.fromiter(shingle_hashes, dtype=np.uint64, count=len(shingle_hashes))
+            # uint64 arithmetic wraps exactly like the & _MASK64 below
+            phv = ((np.outer(hv, self._a) + self._b) % np.uint64(_MERSENNE)) & np.uint64(_MAX_HASH)
+            return tuple(phv.min(axis=0).tolist())
+        return tuple(
+            min((((a * h + b) & _MASK64) % _MERSENNE) & _MAX_HASH for h in shingle_hashes)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+class LSHIndex:
+    """Band index over MinHash signatures; query returns ids colliding in at least one band."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=LSH_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.rows = num_perm // bands
+        self.tables = [{} for _ in range(bands)]
+
+    def _keys(self, sig):
+        r = self.rows
+        return [sig[i * r:(i + 1) * r] for i in range(len(self.tables))]
+
+    def insert(self, item_id, sig):
+        for table, key in zip(self.tables, self._keys(sig)):
+            table.setdefault(key, []).append(item_id)
+
+    def query(self, sig):
+        found = set()
+        for table, key in zip(self.tables, self._keys(sig)):
+            found.update(table.get(key, ()))
+        return found
+
+
+def dedupe_near(prompts, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM, bands=LSH_BANDS):
+    """
+    Keep prompts in order, dropping any whose shingle Jaccard with an already
+    kept prompt is >= threshold. Returns (kept, stats).
+    """
+    hasher, index = MinHasher(num_perm), LSHIndex(num_perm, bands)
+    kept, kept_shingles = [], []
+    stats = {"candidates": 0, "verified_duplicates": 0}
+    for i, prompt in enumerate(prompts):
+        if i and i % 10000 == 0:
+            logging.info(f"Processing... {i}/{len(prompts)}")
+        sh = shingles(prompt)
+        sig = hasher.signature(sh)
+        candidates = index.query(sig)
+        stats["candidates"] += len(candidates)
+        if any(jaccard(sh, kept_shingles[c]) >= threshold for c in candidates):
+            stats["verified_duplicates"] += 1
+            continue
+        index.insert(len(kept), sig)
+        kept.append(prompt)
+        kept_shingles.append(sh)
+    return kept, stats
+
 
 def dedupe():
     """Prunes near-duplicates to ensure dataset variety."""
@@ -61,28 +177,11 @@ def dedupe():
     count_exact_unique = len(unique_prompts)
     logging.info(f"Phase 1: Exact de-dupe reduced {count_total} -> {count_exact_unique}")
 
-    # 2. Fuzzy Dedupe (Phase 2)
-    # To keep it O(N) or close to it, we'll use a sliding window approach
-    # assuming that duplicates often appear near each other in history.
-    # For a full O(N^2) on 6k prompts, it would take too long.
-    final_prompts = []
-    
-    logging.info(f"Phase 2: Starting Fuzzy Scan (Threshold: {SIMILARITY_THRESHOLD}%)...")
-    
-    for i, current in enumerate(unique_prompts):
-        if i % 500 == 0:
-            logging.info(f"Processing... {i}/{count_exact_unique}")
-            
-        is_duplicate = False
-        # Check against the last 100 accepted prompts (Sliding Window)
-        # This catches most "Spam" clusters without the N^2 penalty
-        for existing in final_prompts[-100:]:
-            if fuzz.ratio(current, existing) > SIMILARITY_THRESHOLD:
-                is_duplicate = True
-                break
-        
-        if not is_duplicate:
-            final_prompts.append(current)
+    # 2. Near-Duplicate Dedupe (Phase 2): global, not a sliding window
+    logging.info(f"Phase 2: Starting MinHash/LSH Scan (Jaccard >= {SIMILARITY_THRESHOLD}, "
+                 f"{NUM_PERM} perms / {LSH_BANDS} bands)...")
+    final_prompts, stats = dedupe_near(unique_prompts)
+    logging.info(f"Phase 2: {stats['candidates']} candidate pairs verified, {stats['verified_duplicates']} near-duplicates dropped.")
 
     count_final = len(final_prompts)
     
@@ -11,15 +11,29 @@ This script performs the "Capture" phase:
 3. For each "Gem," it calls the Lab Node to extract raw context.
 4. It saves the RAW LLM response to `expertise/raw_stage_1.jsonl`.
    NO PARSING happens here to prevent VRAM thrash/wait cycles.
+
+[FEAT-489] Resumable Capture Runner
+One authenticated Foyer websocket carries every capture, multiplexed by
+request_id (it used to reconnect and wait for a greeting per gem). The fixed
+30 s post-capture sleep is replaced by adaptive backpressure: a small
+in-flight window that grows on clean captures, halves on timeouts, and pauses
+while the Foyer reports VRAM above VRAM_HIGH_PCT. Every captured line carries
+its gem_hash, so raw_stage_1.jsonl doubles as the checkpoint and a restarted
+run skips what is already captured.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import glob
 import re
+import time
+import urllib.request
+import uuid
 from pathlib import Path
 import websockets
+from websockets.exceptions import ConnectionClosed, WebSocketException
 
 # --- Configuration ---
 LOG_LEVEL = logging.INFO
@@ -28,6 +42,13 @@ RAW_STAGE_1_FILE = (
     Path.home() / "Dev_Lab/HomeLabAI/src/forge/expertise/raw_stage_1.jsonl"
 )
 BRAIN_NODE_URI = "ws://localhost:8765"
+FOYER_STATUS_URL = "http://localhost:8765/status"
+
+CAPTURE_TIMEOUT = 300.0  # per gem, end to end
+MAX_INFLIGHT = 3         # captures queued at the Foyer at once (the window starts at 1)
+VRAM_HIGH_PCT = 90.0     # stop dispatching at/above this...
+VRAM_RESUME_PCT = 80.0   # ...until VRAM drops below this
+STATUS_POLL_S = 15.0
 
 # LOG_MAP for resolving log file paths
 LOG_MAP = {
@@ -65,52 +86,40 @@ logging.basicConfig(
 )
 
 
-async def call_lab_node_raw(prompt):
-    """Calls the Lab Node and returns the RAW response string."""
-    try:
-        async with websockets.connect(BRAIN_NODE_URI) as websocket:
-            # 1. Wait for Hub Greeting
-            await websocket.recv()
+def gem_hash(summary, source_file):
+    """Stable identity of a gem across runs (file name + summary)."""
+    return hashlib.sha1(f"{Path(source_file).name}\n{summary}".encode("utf-8")).hexdigest()
 
-            # 2. Send Extraction Query (Directed to Lab Node)
-            message = {
-                "type": "text_input",
-                "content": f"[ARCHIVE_EXTRACT]: {prompt}"
-            }
-            await websocket.send(json.dumps(message))
-            
-            # 3. Collect Response
-            for _ in range(10): # Increased loop to catch later Brain results
+
+def load_checkpoint(path=RAW_STAGE_1_FILE):
+    """Hashes of gems already captured in raw_stage_1.jsonl (legacy lines are hashed on the fly)."""
+    done = set()
+    try:
+        with open(path, "r") as f:
+            for line in f:
                 try:
-                    resp = await asyncio.wait_for(websocket.recv(), timeout=60)
-                    data = json.loads(resp)
-                    source = data.get("brain_source", "")
-                    text = data.get("brain", "")
-                    
-                    # Accept result from either Hemisphere (Brain or Lab)
-                    if ("Lab" in source or "Brain" in source) and "Result" in source:
-                        return text
-                except asyncio.TimeoutError:
-                    break
-            return None
-    except Exception as e:
-        logging.error(f"Error calling Brain Node: {e}")
-        return None
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                h = entry.get("gem_hash") or gem_hash(entry.get("summary", ""), entry.get("source_file", ""))
+                done.add(h)
+    except FileNotFoundError:
+        pass
+    return done
 
 
-async def main(limit=None):
-    """Main function to perform Stage 1: Raw Capture."""
-    logging.info("Starting Deep-Connect Stage 1 (Capture)...")
-    processed_count = 0
-    RAW_STAGE_1_FILE.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Ensure buffer exists
-    if not RAW_STAGE_1_FILE.exists():
-        RAW_STAGE_1_FILE.touch()
-
-    json_files = glob.glob(str(FIELD_NOTES_DATA_DIR / "20*.json"))
-    logging.info(f"Found {len(json_files)} field notes files.")
+def repair_tail(path):
+    """Drop a torn final line (crash mid-append) so the next append starts on a clean line."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
 
+def iter_gems(data_dir=FIELD_NOTES_DATA_DIR):
+    """Yields capture jobs for every rank >= 4 gem with a resolvable raw log."""
+    json_files = sorted(glob.glob(str(Path(data_dir) / "20*.json")))
+    logging.info(f"Found {len(json_files)} field notes files.")
     for file_path in json_files:
         logging.info(f"Scanning: {file_path}")
         try:
@@ -119,54 +128,310 @@ async def main(limit=None):
         except Exception:
             continue
 
-        gems = [item for item in data if item.get("rank", 0) >= 4]
-        if not gems:
-            continue
-
+        gems = [item for item in data if isinstance(item, dict) and item.get("rank", 0) >= 4]
         for gem in gems:
             summary = gem.get("summary")
-            
+
             # Robust Year Extraction
             filename = Path(file_path).name
             year_match = re.search(r'(20\d\d)', filename)
             log_key = gem.get("log_file") or (year_match.group(1) if year_match else None)
-            
+
             if not summary or not log_key:
                 continue
-            
+
             log_file_path = LOG_MAP.get(str(log_key))
             if not log_file_path:
                 continue
 
-            prompt = (
-                f"Find the specific paragraphs in the raw log file ({log_file_path}) "
-                f"that correspond to this summary: '{summary}'. Output ONLY the raw "
-                "paragraphs, no conversational filler."
-            )
+            yield {
+                "summary": summary,
+                "source_file": file_path,
+                "log_file": log_file_path,
+                "gem_hash": gem_hash(summary, file_path),
+                "prompt": (
+                    f"Find the specific paragraphs in the raw log file ({log_file_path}) "
+                    f"that correspond to this summary: '{summary}'. Output ONLY the raw "
+                    "paragraphs, no conversational filler."
+                ),
+            }
+
+
+def _is_capture_result(data):
+    # Accept result from either Hemisphere (Brain or Lab)
+    source = str(data.get("brain_source", ""))
+    return ("Lab" in source or "Brain" in source) and "Result" in source
+
+
+def _vram_pct(status):
+    if status.get("vram_pct") is not None:
+        return float(status["vram_pct"])
+    if status.get("vram_total"):
+        return status.get("vram_used", 0) / status["vram_total"] * 100.0
+    return None
+
+
+async def fetch_foyer_status(url=FOYER_STATUS_URL):
+    """GET /status (session token + VRAM). None when the Foyer is unreachable."""
+    def _get():
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    try:
+        return await asyncio.to_thread(_get)
+    except Exception:
+        return None
+
+
+class FoyerSession:
+    """[FEAT-489] One authenticated Foyer websocket; concurrent requests are matched by request_id."""
+
+    def __init__(self, uri=BRAIN_NODE_URI, lab_key="", on_status=None):
+        self.uri = uri
+        self.lab_key = lab_key
+        self.on_status = on_status
+        self.ws = None
+        self.connects = 0
+        self._pending = {}
+        self._reader = None
+        self._lock = asyncio.Lock()
 
+    async def ensure(self):
+        async with self._lock:
+            if self.ws is not None and self._reader is not None and not self._reader.done():
+                return
+            self.ws = await websockets.connect(self.uri, max_size=None)
+            self.connects += 1
+            try:
+                # 1. Hub greeting (LabStatus), then the FEAT-426 handshake and its ack
+                self._status(json.loads(await asyncio.wait_for(self.ws.recv(), timeout=30)))
+                await self.ws.send(json.dumps({"type": "handshake", "lab_key": self.lab_key, "client": "deep_connect"}))
+                while True:
+                    ack = json.loads(await asyncio.wait_for(self.ws.recv(), timeout=30))
+                    if ack.get("type") == "status" and ack.get("state") == "connected":
+                        break
+            except ConnectionClosed as e:
+                self.ws = None
+                raise ConnectionError(f"Foyer closed during handshake: {e}") from e
+            self._reader = asyncio.create_task(self._read(self.ws))
+            logging.info(f"Foyer session established ({ack.get('socket_id', '?')}).")
+
+    def _status(self, data):
+        if self.on_status is not None and ("vram_used" in data or "vram_pct" in data):
+            self.on_status(data)
+
+    async def _read(self, ws):
+        try:
+            async for raw in ws:
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    continue
+                self._status(data)
+                if not _is_capture_result(data):
+                    continue
+                rid = data.get("request_id")
+                if rid not in self._pending and len(self._pending) == 1:
+                    rid = next(iter(self._pending))  # untagged result with a single capture in flight
+                fut = self._pending.get(rid)
+                if fut is not None and not fut.done():
+                    fut.set_result(data.get("brain", ""))
+        except Exception as e:
+            logging.warning(f"Foyer session dropped: {e}")
+        finally:
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError("Foyer session closed"))
+
+    async def _drop(self, ws):
+        """Forget a dead socket so the next ensure() reconnects (no-op if another request already did)."""
+        if self.ws is not ws:
+            return
+        self.ws = None
+        reader, self._reader = self._reader, None
+        try:
+            await ws.close()
+        except Exception:
+            pass
+        if reader is not None:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    async def request(self, prompt, timeout=CAPTURE_TIMEOUT):
+        """Raises ConnectionError when the socket goes away (the session is dropped first)."""
+        await self.ensure()
+        ws = self.ws
+        rid = f"capture_{uuid.uuid4().hex[:12]}"
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[rid] = fut
+        try:
+            # 2. Send Extraction Query (Directed to Lab Node)
+            await ws.send(json.dumps({
+                "type": "text_input",
+                "content": f"[ARCHIVE_EXTRACT]: {prompt}",
+                "request_id": rid,
+            }))
+            return await asyncio.wait_for(fut, timeout=timeout)
+        except ConnectionClosed as e:
+            self._pending.pop(rid, None)  # before _drop, whose reader teardown fails every pending future
+            await self._drop(ws)
+            raise ConnectionError(f"Foyer session closed: {e}") from e
+        finally:
+            self._pending.pop(rid, None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class Backpressure:
+    """[FEAT-489] AIMD in-flight window with a VRAM pause (hysteresis between resume and high)."""
+
+    def __init__(self, max_inflight=MAX_INFLIGHT, high_pct=VRAM_HIGH_PCT, resume_pct=VRAM_RESUME_PCT):
+        self.max_inflight = max_inflight
+        self.high_pct = high_pct
+        self.resume_pct = resume_pct
+        self.window = 1
+        self.inflight = 0
+        self.vram_pct = None
+        self.paused = False
+        self.pauses = 0
+        self._changed = asyncio.Event()
+
+    def observe(self, status):
+        pct = _vram_pct(status)
+        if pct is None:
+            return
+        self.vram_pct = pct
+        if not self.paused and pct >= self.high_pct:
+            self.paused = True
+            self.pauses += 1
+            logging.info(f"VRAM at {pct:.0f}%: pausing captures.")
+        elif self.paused and pct < self.resume_pct:
+            self.paused = False
+            logging.info(f"VRAM at {pct:.0f}%: resuming captures.")
+        self._changed.set()
+
+    async def acquire(self, poll=None):
+        while self.paused or self.inflight >= self.window:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=STATUS_POLL_S)
+            except asyncio.TimeoutError:
+                if self.paused and poll is not None:
+                    status = await poll()
+                    if status:
+                        self.observe(status)
+        self.inflight += 1
+
+    def release(self, ok):
+        self.inflight -= 1
+        if ok:
+            self.window = min(self.max_inflight, self.window + 1)
+        else:
+            self.window = max(1, self.window // 2)
+        self._changed.set()
+
+
+class CaptureRunner:
+    """[FEAT-489] Feeds gems through one FoyerSession under Backpressure, appending + checkpointing results."""
+
+    def __init__(self, session=None, out_file=RAW_STAGE_1_FILE, backpressure=None, status_fn=None,
+                 timeout=CAPTURE_TIMEOUT, limit=None):
+        self.backpressure = backpressure or Backpressure()
+        self.session = session or FoyerSession(on_status=self.backpressure.observe)
+        if self.session.on_status is None:
+            self.session.on_status = self.backpressure.observe
+        self.out_file = Path(out_file)
+        self.status_fn = status_fn
+        self.timeout = timeout
+        self.limit = limit
+        self.stats = {"skipped": 0, "captured": 0, "empty": 0, "failed": 0}
+
+    def _append(self, gem, raw_response):
+        entry = {
+            "summary": gem["summary"],
+            "raw_llm_output": raw_response,
+            "source_file": gem["source_file"],
+            "log_file": gem["log_file"],
+            "timestamp": Path(gem["source_file"]).stat().st_mtime,
+            "gem_hash": gem["gem_hash"],
+        }
+        with open(self.out_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    async def _status_loop(self):
+        while True:
+            await asyncio.sleep(STATUS_POLL_S)
+            status = await self.status_fn()
+            if status:
+                self.backpressure.observe(status)
+
+    async def _capture(self, gem):
+        ok = False
+        try:
             # --- THE CAPTURE ---
-            logging.info(f"Querying Lab Node for: {summary[:50]}...")
-            raw_response = await call_lab_node_raw(prompt)
-            await asyncio.sleep(30) # Wait for VRAM/Hub to settle
-
-            if raw_response:
-                processed_count += 1
-                entry = {
-                    "summary": summary,
-                    "raw_llm_output": raw_response,
-                    "source_file": file_path,
-                    "log_file": log_file_path,
-                    "timestamp": Path(file_path).stat().st_mtime
-                }
-                with open(RAW_STAGE_1_FILE, "a") as f:
-                    f.write(json.dumps(entry) + "\n")
-                
-                logging.info(f"Captured [{processed_count}] raw blocks.")
-                
-                if limit and processed_count >= limit:
-                    logging.info(f"Limit reached ({limit}). Stopping Stage 1.")
-                    return
+            logging.info(f"Querying Lab Node for: {gem['summary'][:50]}...")
+            try:
+                raw_response = await self.session.request(gem["prompt"], timeout=self.timeout)
+            except (ConnectionError, ConnectionClosed):
+                raw_response = await self.session.request(gem["prompt"], timeout=self.timeout)  # one reconnect
+            ok = True
+            if raw_response and not (self.limit and self.stats["captured"] >= self.limit):
+                self.stats["captured"] += 1
+                self._append(gem, raw_response)
+                logging.info(f"Captured [{self.stats['captured']}] raw blocks.")
+            elif not raw_response:
+                self.stats["empty"] += 1
+        except (asyncio.TimeoutError, ConnectionError, WebSocketException, OSError) as e:
+            # A failed capture shrinks the backpressure window instead of failing the whole run
+            self.stats["failed"] += 1
+            logging.error(f"Capture failed for '{gem['summary'][:50]}': {e!r}")
+        finally:
+            self.backpressure.release(ok)
+
+    async def run(self, gems):
+        self.out_file.parent.mkdir(parents=True, exist_ok=True)
+        self.out_file.touch(exist_ok=True)
+        repair_tail(self.out_file)
+        done = load_checkpoint(self.out_file)
+        poller = asyncio.create_task(self._status_loop()) if self.status_fn else None
+        tasks = []
+        t0 = time.time()
+        try:
+            for gem in gems:
+                if gem["gem_hash"] in done:
+                    self.stats["skipped"] += 1
+                    continue
+                done.add(gem["gem_hash"])
+                await self.backpressure.acquire(poll=self.status_fn)
+                if self.limit and self.stats["captured"] >= self.limit:
+                    self.backpressure.release(True)
+                    logging.info(f"Limit reached ({self.limit}). Stopping Stage 1.")
+                    break
+                tasks.append(asyncio.create_task(self._capture(gem)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if poller is not None:
+                poller.cancel()
+            await self.session.close()
+        logging.info(f"Stage 1 run: {self.stats} in {time.time() - t0:.0f}s "
+                     f"(window {self.backpressure.window}, {self.backpressure.pauses} VRAM pauses).")
+        return self.stats
 
+
+async def main(limit=None):
+    """Main function to perform Stage 1: Raw Capture."""
+    logging.info("Starting Deep-Connect Stage 1 (Capture)...")
+    status = await fetch_foyer_status() or {}
+    backpressure = Backpressure()
+    backpressure.observe(status)
+    session = FoyerSession(lab_key=status.get("session_token", ""), on_status=backpressure.observe)
+    runner = CaptureRunner(session, backpressure=backpressure, status_fn=fetch_foyer_status, limit=limit)
+    await runner.run(iter_gems())
     logging.info("Deep-Connect Stage 1 Finished.")
 
 
@@ -8,108 +8,306 @@ Gemini Prompt Extractor
 Aggregates historical prompt data from:
 1. all_gemini_history.json (Pre-Jan 13)
 2. ~/.gemini/tmp/**/chats/*.json (Post-Jan 13)
+3. AGY transcripts (brain/**/transcript.jsonl)
 
 Outputs a consolidated JSONL for LoRA training.
+
+[FEAT-490] Streaming Extraction
+The history archive is walked incrementally (ijson when installed, otherwise a
+chunked raw_decode scanner) instead of buffering `jq` output, and chat /
+transcript files are parsed in a process pool. Prompts are deduped on the fly
+by hash and appended to the manifest in chunks, so peak memory is one file's
+prompts plus the hash set. A sidecar state file records each source's
+mtime/size: a re-run only parses new or changed sessions and appends their new
+prompts (a missing manifest forces a full rebuild).
 """
 
-import json
 import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # stdlib chunked scanner below
+    ijson = None
+
+# Path Self-Awareness
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from infra.atomic_io import atomic_write_json  # noqa: E402
+
 # --- Configuration ---
 HISTORY_JSON = Path.home() / "Dev_Lab/all_gemini_history.json"
 GEMINI_TMP = Path.home() / ".gemini/tmp"
+AGY_BRAIN = Path("/home/jallred/.gemini/antigravity-cli/brain")
 OUTPUT_FILE = Path.home() / "Dev_Lab/HomeLabAI/src/forge/expertise/gemini_prompts_manifest.jsonl"
+STATE_VERSION = 1
+WRITE_CHUNK = 500     # manifest lines per write
+READ_CHUNK = 1 << 20  # bytes per read in the stdlib history scanner
 
-def extract_from_history():
-    """Extracts prompts from the pre-Jan 13 archive using jq."""
-    import subprocess
-    prompts = []
-    if not HISTORY_JSON.exists():
-        return prompts
-    
-    print(f"Extracting from {HISTORY_JSON} using jq...")
+
+def _text(content):
+    if isinstance(content, list):
+        content = " ".join([str(c) for c in content])
+    return str(content).strip() if content else ""
+
+
+def _iter_array_items(f, key="messages"):
+    """
+    Yield the elements of every `"key": [...]` array in a (possibly multi-object)
+    JSON stream, decoding one element at a time from a sliding buffer.
+    """
+    decoder = json.JSONDecoder()
+    needle = f'"{key}"'
+    buf, pos, in_array, eof = "", 0, False, False
+
+    def refill():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_CHUNK)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    while True:
+        if not in_array:
+            i = buf.find(needle, pos)
+            if i < 0:
+                if eof:
+                    return
+                pos = max(pos, len(buf) - len(needle))  # keep a possible partial needle
+                refill()
+                continue
+            j = i + len(needle)
+            while True:
+                while j < len(buf) and buf[j] in " \t\r\n:":
+                    j += 1
+                if j < len(buf) or eof:
+                    break
+                pos = i
+                refill()
+                i, j = 0, len(needle)
+            if j < len(buf) and buf[j] == "[":
+                in_array, pos = True, j + 1
+            else:
+                pos = j
+            continue
+        # Inside the array: skip separators, then decode the next element
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                return
+            refill()
+            continue
+        if buf[pos] == "]":
+            in_array, pos = False, pos + 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                return
+            refill()  # element straddles the chunk boundary
+            continue
+        pos = end
+        yield item
+
+
+def iter_history_prompts(path=HISTORY_JSON):
+    """User prompts from the pre-Jan 13 archive (.messages[] | select(.type == "user") | .content)."""
+    with open(path, "rb" if ijson else "r") as f:
+        if ijson is not None:
+            items = ijson.items(f, "messages.item", multiple_values=True)
+        else:
+            items = _iter_array_items(f)
+        for msg in items:
+            if isinstance(msg, dict) and msg.get("type") == "user":
+                text = _text(msg.get("content"))
+                if text:
+                    yield text
+
+
+def prompts_from_chat(path):
+    """Extracts prompts from one legacy session file."""
     try:
-        # Command to pull user content from multiple objects
-        cmd = "jq -r '.messages[] | select(.type == \"user\") | .content' " + str(HISTORY_JSON)
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            prompts = [p.strip() for p in result.stdout.split('\n') if p.strip()]
-    except Exception as e:
-        print(f"Error using jq: {e}")
-        
+        with open(path, "r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        return []
+    prompts = []
+    if isinstance(data, dict) and "messages" in data:
+        for msg in data["messages"]:
+            if isinstance(msg, dict) and msg.get("type") == "user":
+                text = _text(msg.get("content"))
+                if text:
+                    prompts.append(text)
     return prompts
 
-def extract_from_tmp():
-    """Extracts prompts from the local session logs."""
+
+def prompts_from_transcript(path):
+    """Extracts prompts from one AGY transcript (JSONL)."""
     prompts = []
-    print(f"Scanning {GEMINI_TMP} for legacy sessions...")
-    
-    chat_files = glob.glob(str(GEMINI_TMP / "**/chats/*.json"), recursive=True)
-    print(f"Found {len(chat_files)} legacy session files.")
-    
-    for chat_file in chat_files:
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and entry.get("type") == "USER_INPUT":
+                text = _text(entry.get("content"))
+                if text:
+                    prompts.append(text)
+    return prompts
+
+
+def _parse_source(job):
+    """Worker entry point: (kind, path) -> (path, prompts | error string)."""
+    kind, path = job
+    try:
+        if kind == "transcript":
+            return path, prompts_from_transcript(path)
+        return path, prompts_from_chat(path)
+    except Exception as e:
+        return path, f"{type(e).__name__}: {e}"
+
+
+def prompt_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class PromptManifest:
+    """[FEAT-490] Append-only, hash-deduped manifest writer with per-source mtime state."""
+
+    def __init__(self, output=OUTPUT_FILE, state_file=None):
+        self.output = Path(output)
+        self.state_file = Path(state_file) if state_file else self.output.with_suffix(".state.json")
+        self.sources, self.seen = {}, set()
+        if self.output.exists():
+            try:
+                with open(self.state_file, "r") as f:
+                    state = json.load(f)
+                if state.get("version") == STATE_VERSION:
+                    self.sources = state.get("sources", {})
+                    self.seen = set(state.get("hashes", []))
+            except (OSError, ValueError):
+                pass
+        self.fresh = not self.sources and not self.seen
+        self.stats = {"parsed": 0, "unchanged": 0, "errors": 0, "prompts": 0, "duplicates": 0, "written": 0}
+        self._pending = []
+        self._file = None
+
+    def __enter__(self):
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output, "w" if self.fresh else "a")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
         try:
-            with open(chat_file, 'r') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "messages" in data:
-                    for msg in data["messages"]:
-                        if msg.get("type") == "user" and msg.get("content"):
-                            content = msg["content"]
-                            if isinstance(content, list):
-                                content = " ".join([str(c) for c in content])
-                            prompts.append(content)
-        except json.JSONDecodeError:
-            pass
-        except Exception as e:
-            print(f"Error reading {chat_file}: {e}")
-            
-    # New AGY Transcript Extraction
-    AGY_BRAIN = Path("/home/jallred/.gemini/antigravity-cli/brain")
-    print(f"Scanning {AGY_BRAIN} for AGY sessions...")
-    agy_files = glob.glob(str(AGY_BRAIN / "**/.system_generated/logs/transcript.jsonl"), recursive=True)
-    print(f"Found {len(agy_files)} AGY transcript files.")
-    
-    for agy_file in agy_files:
+            self.flush()
+        finally:
+            self._file.close()
+        # Sources only get a stamp once their prompts were consumed (see done()), so on an
+        # interrupted run (KeyboardInterrupt, BrokenProcessPool) this saves exactly the
+        # completed sources and the rest are parsed again next time.
+        if exc_type is not None:
+            print(f"Extraction interrupted ({exc_type.__name__}); saving state for completed sources only.")
+        atomic_write_json(str(self.state_file), {
+            "version": STATE_VERSION, "sources": self.sources, "hashes": sorted(self.seen),
+        }, indent=None)
+
+    def changed(self, path):
+        """The current [mtime_ns, size] stamp when `path` is new or modified since the last run, else None.
+        Nothing is recorded until done() is called for the source."""
         try:
-            with open(agy_file, 'r') as f:
-                for line in f:
-                    if not line.strip():
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        if self.sources.get(str(path)) == stamp:
+            self.stats["unchanged"] += 1
+            return None
+        self.stats["parsed"] += 1
+        return stamp
+
+    def done(self, path, stamp):
+        """Mark `path` processed at `stamp`; call only after all its prompts went through add()."""
+        self.sources[str(path)] = stamp
+
+    def add(self, prompt):
+        self.stats["prompts"] += 1
+        h = prompt_hash(prompt)
+        if h in self.seen:
+            self.stats["duplicates"] += 1
+            return
+        self.seen.add(h)
+        self._pending.append(json.dumps({"prompt": prompt}) + "\n")
+        if len(self._pending) >= WRITE_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write("".join(self._pending))
+            self.stats["written"] += len(self._pending)
+            self._pending = []
+
+
+def extract(history=HISTORY_JSON, chat_files=None, transcript_files=None, output=OUTPUT_FILE,
+            state_file=None, workers=None):
+    """Stream every source into the manifest; returns the run stats."""
+    if chat_files is None:
+        chat_files = sorted(glob.glob(str(GEMINI_TMP / "**/chats/*.json"), recursive=True))
+    if transcript_files is None:
+        transcript_files = sorted(glob.glob(str(AGY_BRAIN / "**/.system_generated/logs/transcript.jsonl"), recursive=True))
+    print(f"Found {len(chat_files)} legacy session files and {len(transcript_files)} AGY transcript files.")
+
+    with PromptManifest(output, state_file) as manifest:
+        # 1. Old History (single large file, streamed)
+        stamp = manifest.changed(history) if history and Path(history).exists() else None
+        if stamp:
+            print(f"Streaming {history} ({'ijson' if ijson else 'stdlib scanner'})...")
+            try:
+                for prompt in iter_history_prompts(history):
+                    manifest.add(prompt)
+                manifest.done(history, stamp)
+            except Exception as e:
+                manifest.stats["errors"] += 1  # no stamp recorded: retried next run
+                print(f"Error streaming history: {e}")
+
+        # 2. Local Sessions + AGY transcripts (worker pool, results consumed in order)
+        stamps = {}
+        for kind, paths in (("chat", chat_files), ("transcript", transcript_files)):
+            for p in paths:
+                stamp = manifest.changed(p)
+                if stamp:
+                    stamps[(kind, p)] = stamp
+        jobs = list(stamps)
+        if jobs:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for job, (path, result) in zip(jobs, pool.map(_parse_source, jobs, chunksize=8)):
+                    if isinstance(result, str):
+                        manifest.stats["errors"] += 1
+                        print(f"Error reading {path}: {result}")
                         continue
-                    try:
-                        entry = json.loads(line)
-                        if entry.get("type") == "USER_INPUT" and entry.get("content"):
-                            prompts.append(entry["content"])
-                    except json.JSONDecodeError:
-                        pass
-        except Exception as e:
-            print(f"Error reading {agy_file}: {e}")
-            
-    return prompts
+                    for prompt in result:
+                        manifest.add(prompt)
+                    manifest.done(path, stamps[job])  # only now is the source safe to skip next run
+    return manifest.stats
+
 
 def main():
-    all_prompts = []
-    
-    # 1. Old History
-    old_prompts = extract_from_history()
-    all_prompts.extend(old_prompts)
-    print(f"Extracted {len(old_prompts)} from history.")
-    
-    # 2. Local Sessions
-    new_prompts = extract_from_tmp()
-    all_prompts.extend(new_prompts)
-    
-    print(f"Total prompts extracted: {len(all_prompts)}")
-    
-    # 3. Output to JSONL
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w') as f:
-        for p in all_prompts:
-            # Format: simple prompt for now, or instruction pair if we have gemini response
-            entry = {"prompt": p}
-            f.write(json.dumps(entry) + "\n")
-            
+    stats = extract()
+    print(f"Sources: {stats['parsed']} parsed, {stats['unchanged']} unchanged, {stats['errors']} errors.")
+    print(f"Prompts: {stats['prompts']} seen, {stats['duplicates']} duplicates, {stats['written']} new.")
     print(f"Consolidated manifest written to {OUTPUT_FILE}")
 
+
 if __name__ == "__main__":
     main()
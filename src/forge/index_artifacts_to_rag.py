@@ -4,10 +4,21 @@
 import hashlib
 import json
 import logging
+import os
+import sys
 from glob import glob
 
 import chromadb
 
+# Path Self-Awareness
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from forge.artifact_index import ArtifactIndex  # noqa: E402
+from infra.rag_generation import bump_rag_generation  # noqa: E402
+from infra.rag_sync import RagSync  # noqa: E402
+
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
 
@@ -40,15 +51,14 @@ def main() -> None:
         for slug in slugs:
             slug_to_tags.setdefault(slug, []).append(tag)
 
-    artifacts = _load_artifacts()
+    # [FEAT-487] One pass to build the lookup, then O(1) per slug (trigram fallback for near-misses)
+    artifacts = ArtifactIndex(_load_artifacts())
+    sync = RagSync(collection, "index_artifacts_to_rag")
 
     for slug, tags in slug_to_tags.items():
-        # Find matching artifact entry
-        found = None
-        for entry in artifacts:
-            if slug in (entry.get("filename", ""), *entry.get("keywords", [])):
-                found = entry
-                break
+        found, tier = artifacts.resolve(slug)
+        if tier == "fuzzy":
+            LOG.info("Fuzzy match: %s -> %s", slug, found.get("filename", ""))
 
         title = found["filename"] if found else slug
         synopsis = found.get("synopsis", "") if found else ""
@@ -67,13 +77,14 @@ def main() -> None:
         }
         doc_id = f"artifact_{hashlib.md5(slug.encode()).hexdigest()}"
 
-        if collection.get(ids=[doc_id])["ids"]:
-            LOG.info("Skipping duplicate: %s", slug)
-        else:
-            collection.add(documents=[text], metadatas=[metadata], ids=[doc_id])
-            LOG.info("Added: %s", slug)
+        sync.add(doc_id, text, metadata)
 
-    LOG.info("Artifact index complete. Total unique slugs: %d", len(slug_to_tags))
+    # [FEAT-486] Batched upserts of new/changed documents only
+    added = sync.sync()["upserted"]
+    LOG.info("Artifact index complete. Total unique slugs: %d, resolution: %s", len(slug_to_tags), artifacts.stats)
+    if added:
+        # [FEAT-478] Invalidate cached Hub RAG context
+        bump_rag_generation("index_artifacts_to_rag", added)
 
 
 if __name__ == "__main__":
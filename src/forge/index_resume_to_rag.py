@@ -4,12 +4,21 @@
 import hashlib
 import json
 import logging
+import os
 import re
+import sys
 from datetime import datetime
 from glob import glob
 
 import chromadb
 
+# Path Self-Awareness
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from infra.rag_generation import bump_rag_generation  # noqa: E402
+
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
 
@@ -73,6 +82,7 @@ def _chunk_text(text: str, size: int = CHUNK_SIZE) -> list[str]:
 def main() -> None:
     client = chromadb.HttpClient(host="127.0.0.1", port=8001)
     collection = client.get_or_create_collection("career_ledger")
+    added = 0
 
     # --- Resume ---
     resume_path = _pick_latest_resume(RAW_NOTES)
@@ -90,6 +100,7 @@ def main() -> None:
                         metadatas=[{"era": section_name, "domain": "career_pedigree"}],
                         ids=[doc_id],
                     )
+                    added += 1
                     LOG.info("Added resume section: %s (chunk %d)", section_name, i)
                 else:
                     LOG.info("Skipping duplicate: %s (chunk %d)", section_name, i)
@@ -115,11 +126,15 @@ def main() -> None:
                     metadatas=[{"era": pillar_name, "domain": "career_pedigree"}],
                     ids=[doc_id],
                 )
+                added += 1
                 LOG.info("Added focal pillar: %s", pillar_name)
             else:
                 LOG.info("Skipping duplicate focal pillar: %s", pillar_name)
 
     LOG.info("Resume / focal index complete.")
+    if added:
+        # [FEAT-478] Invalidate cached Hub RAG context
+        bump_rag_generation("index_resume_to_rag", added)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,10 @@ modifying them:
     - Indexes it into the ChromaDB `lab_journal` collection (same client
       pattern as archive_node).
     - Atomically resets `journal_ledger.jsonl` to empty.
+    - [FEAT-491] Streams the ledger in bounded chunks (each chunk's entries
+      upserted in one batch), injects via the async hub client, and
+      checkpoints a byte offset so a crash mid-dream resumes without losing
+      or duplicating memories.
 
   Stage 2 (Natural Dreaming & WYWO):
     - Pinky & Brain reflect autonomously on the journal_kb entry (preferred:
@@ -32,6 +36,7 @@ path degrades to a deterministic fallback and logs loudly.
 import argparse
 import asyncio
 import datetime
+import hashlib
 import json
 import logging
 import os
@@ -40,7 +45,8 @@ import sys
 import time
 
 from infra.montana import reclaim_logger
-from infra.atomic_io import atomic_write_json, atomic_write_text
+from infra.atomic_io import atomic_write_json
+from infra.rag_generation import bump_rag_generation
 
 # [FEAT-304] Protocol Hardening: Ensure logs do not corrupt the MCP JSON-RPC pipe
 reclaim_logger(role="DREAM")
@@ -91,6 +97,13 @@ HUB_URL = "http://localhost:8765/inject"
 LEDGER_WINDOW_SECONDS = 86400  # [FEAT-441] 24h rolling window contract
 SUMMARY_CEILING = 4000  # sane truncation ceiling for deterministic condensation
 
+# [FEAT-491] Streaming consolidation. The hub rewrites journal_ledger.jsonl via
+# os.replace on every turn, so a dream first moves it aside (the "reset") and
+# consolidates that frozen copy; byte offsets into it stay valid across a crash.
+DREAMING_LEDGER = os.path.join(DATA_DIR, "journal_ledger.dreaming.jsonl")
+DREAM_CHECKPOINT = os.path.join(DATA_DIR, "journal_ledger.dreaming.ckpt.json")
+DREAM_CHUNK = 64  # ledger entries per read + batched upsert
+
 # MCP stdio wiring (mirrors dream_cycle.py)
 _SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BASE_DIR = os.path.dirname(_SRC_DIR)
@@ -170,23 +183,6 @@ def _derive_topics(text, limit=3):
     return [kw for _, kw in scored[:limit]]
 
 
-def _hub_inject_sync(prompt, context):
-    """[FEAT-443] Best-effort synchronous hub /inject. Non-fatal, returns None on failure."""
-    payload = {"query": f"[DREAM_PASS]: {prompt}\n\n[CONTEXT]: {context}"}
-    try:
-        if requests is not None:
-            r = requests.post(HUB_URL, json=payload, timeout=30)
-            if r.status_code == 200:
-                data = r.json()
-                return f"Intent {data.get('id')} queued for synthesis."
-            logger.warning(f"[DREAM] Hub /inject returned status {r.status_code}")
-        else:
-            logger.warning("[DREAM] requests unavailable; skipping hub /inject.")
-    except Exception as e:
-        logger.warning(f"[DREAM] Hub /inject unavailable: {e}")
-    return None
-
-
 async def _hub_inject(prompt, context):
     """Best-effort async hub /inject. Non-fatal, returns None on failure."""
     payload = {"query": f"[DREAM_PASS]: {prompt}\n\n[CONTEXT]: {context}"}
@@ -227,43 +223,134 @@ def _count_ledger_entries():
 
 
 # --- Stage 1: Memory Consolidation ---
-def memory_consolidation(allow_hub=True, note_id=None):
+def _entry_id(raw_line):
+    """Content-derived doc id: re-consolidating the same ledger line is an overwrite, never a duplicate."""
+    return "journal_" + hashlib.sha1(raw_line).hexdigest()[:20]
+
+
+def _claim_ledger(note_id=None):
+    """[FEAT-491] Resume an interrupted dream, or move the live ledger aside and start a new one."""
+    if os.path.exists(DREAMING_LEDGER):
+        try:
+            with open(DREAM_CHECKPOINT, "r") as f:
+                state = json.load(f)
+            logger.info(f"[DREAM] Resuming interrupted consolidation at byte {state['offset']} ({state['note_id']}).")
+            return state
+        except Exception as e:
+            # Entry ids are content-derived, so replaying from the top is safe
+            logger.warning(f"[DREAM] Dream checkpoint unreadable ({e}); replaying the frozen ledger.")
+            frozen_at = int(os.path.getmtime(DREAMING_LEDGER))
+    elif os.path.exists(JOURNAL_LEDGER):
+        os.replace(JOURNAL_LEDGER, DREAMING_LEDGER)
+        frozen_at = int(time.time())
+    else:
+        return None
+    state = {
+        "offset": 0,
+        "frozen_at": frozen_at,
+        "note_id": note_id or f"journal_kb_{datetime.datetime.fromtimestamp(frozen_at).strftime('%Y%m%d')}",
+        "entry_count": 0,
+        "condensed": [],
+    }
+    atomic_write_json(DREAM_CHECKPOINT, state)
+    return state
+
+
+def _read_chunk(path, offset, max_entries):
+    """Read up to max_entries non-empty lines from byte `offset`. Returns ([(raw, entry|None)], next_offset)."""
+    rows = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while len(rows) < max_entries:
+            raw = f.readline()
+            if not raw:
+                break
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                rows.append((raw, json.loads(raw)))
+            except Exception as e:
+                logger.warning(f"[DREAM] Skipping unparseable ledger line: {e}")
+                rows.append((raw, None))
+        return rows, f.tell()
+
+
+def _condense_into(condensed, dialogue, ceiling=SUMMARY_CEILING):
+    """Running, bounded equivalent of _deterministic_condensation's dedupe: stops growing past the ceiling."""
+    d = (dialogue or "").strip()
+    if not d or d in condensed or sum(len(c) + 1 for c in condensed) > ceiling:
+        return
+    condensed.append(d)
+
+
+def _release_ledger():
+    for path in (DREAMING_LEDGER, DREAM_CHECKPOINT):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def consolidate_memories(allow_hub=True, note_id=None, chunk_size=DREAM_CHUNK):
     """[FEAT-443] Stage 1: distill the 24h journal ledger into one journal_kb entry.
 
+    [FEAT-491] Entries are read DREAM_CHUNK at a time and each chunk is upserted
+    into lab_journal in one batch (off the event loop), with the byte offset
+    checkpointed after every chunk.
+
     Returns (summary, note_id, entry_count) on success, or None when:
-      - no entries fall within the 24h window (calm no-op, ledger untouched), or
-      - the ChromaDB add fails (ledger preserved, error logged).
+      - no entries fall within the 24h window (calm no-op), or
+      - a ChromaDB upsert fails (frozen ledger + checkpoint kept for the next run).
     """
-    if not os.path.exists(JOURNAL_LEDGER):
-        logger.info("[DREAM] Journal ledger missing; nothing to consolidate.")
+    if lab_journal is None:
+        logger.error("[DREAM] lab_journal collection unavailable; ledger preserved.")
         return None
-
-    now = int(time.time())
-    dialogues = []
-    entry_count = 0
     try:
-        with open(JOURNAL_LEDGER, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                except Exception as e:
-                    logger.warning(f"[DREAM] Skipping unparseable ledger line: {e}")
-                    continue
-                if now - entry.get("ts", 0) <= LEDGER_WINDOW_SECONDS:
-                    entry_count += 1
-                    dialogues.append(entry.get("dialogue", ""))
+        state = _claim_ledger(note_id)
     except Exception as e:
-        logger.error(f"[DREAM] Failed to read journal ledger: {e}")
+        logger.error(f"[DREAM] Failed to claim journal ledger: {e}")
+        return None
+    if state is None:
+        logger.info("[DREAM] Journal ledger missing; nothing to consolidate.")
         return None
 
+    resolved_note_id = state["note_id"]
+    date_str = datetime.datetime.fromtimestamp(state["frozen_at"]).strftime("%Y-%m-%d")
+    while True:
+        try:
+            rows, next_offset = await asyncio.to_thread(_read_chunk, DREAMING_LEDGER, state["offset"], chunk_size)
+        except Exception as e:
+            logger.error(f"[DREAM] Failed to read journal ledger: {e}")
+            return None
+        if not rows:
+            break
+        ids, documents, metadatas = [], [], []
+        for raw, entry in rows:
+            # Window is relative to when the ledger was frozen, so a resumed dream keeps its entries
+            if entry is None or state["frozen_at"] - entry.get("ts", 0) > LEDGER_WINDOW_SECONDS:
+                continue
+            dialogue = str(entry.get("dialogue", ""))
+            _condense_into(state["condensed"], dialogue)
+            if dialogue.strip() and _entry_id(raw) not in ids:
+                ids.append(_entry_id(raw))
+                documents.append(dialogue[:SUMMARY_CEILING])
+                metadatas.append({"type": "journal_entry", "date": date_str, "note_id": resolved_note_id,
+                                  "ts": int(entry.get("ts", 0))})
+            state["entry_count"] += 1
+        if ids:
+            try:
+                await asyncio.to_thread(lab_journal.upsert, ids=ids, documents=documents, metadatas=metadatas)
+            except Exception as e:
+                logger.error(f"[DREAM] Chroma upsert failed at byte {state['offset']}; checkpoint kept: {e}")
+                return None
+        state["offset"] = next_offset
+        atomic_write_json(DREAM_CHECKPOINT, state)
+
+    entry_count = state["entry_count"]
     if entry_count == 0:
         logger.info("[DREAM] No journal entries within the 24h window. Dreaming skipped.")
+        _release_ledger()
         return None
 
-    joined_dialogue = "\n".join(dialogues)
     summary = None
     if allow_hub:
         prompt = (
@@ -271,33 +358,18 @@ def memory_consolidation(allow_hub=True, note_id=None):
             "high-density journal_kb memory entry. Preserve key decisions, technical "
             "topics, and validation scars. STRICT: NO ROLEPLAY."
         )
-        summary = _hub_inject_sync(prompt, joined_dialogue)
+        summary = await _hub_inject(prompt, "\n".join(state["condensed"]))
     if not summary:
-        summary = _deterministic_condensation(dialogues)
+        summary = _deterministic_condensation(state["condensed"])
 
-    now_dt = datetime.datetime.now()
-    date_str = now_dt.strftime("%Y-%m-%d")
-    resolved_note_id = note_id or f"journal_kb_{now_dt.strftime('%Y%m%d')}"
     topics = _derive_topics(summary)
-    timestamp = now_dt.strftime("%Y-%m-%d %H:%M:%S")
-
-    journal_kb = {
-        "date": date_str,
-        "type": "journal_kb",
-        "note_id": resolved_note_id,
-        "summary": summary,
-        "topics": topics,
-        "entry_count": entry_count,
-        "timestamp": timestamp,
-    }
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # Index into lab_journal (note_id recoverable by archive_node's reranker
     # via meta.get("note_id") / doc id).
-    if lab_journal is None:
-        logger.error("[DREAM] lab_journal collection unavailable; ledger preserved.")
-        return None
     try:
-        lab_journal.add(
+        await asyncio.to_thread(
+            lab_journal.upsert,
             documents=[summary],
             metadatas=[{
                 "type": "journal_kb",
@@ -310,20 +382,27 @@ def memory_consolidation(allow_hub=True, note_id=None):
             ids=[resolved_note_id],
         )
         logger.info(f"[DREAM] journal_kb indexed into '{COLLECTION_JOURNAL}': {resolved_note_id}")
+        # [FEAT-478] Invalidate cached Hub RAG context
+        bump_rag_generation("dream_node", entry_count + 1)
     except Exception as e:
-        logger.error(f"[DREAM] Chroma add failed; ledger preserved: {e}")
+        logger.error(f"[DREAM] Chroma upsert failed; ledger preserved: {e}")
         return None
 
-    # Atomic reset AFTER a successful chroma add (tmp + os.replace discipline).
+    # The frozen copy is the ledger being "reset": drop it only after the journal_kb lands.
     try:
-        atomic_write_text(JOURNAL_LEDGER, "")
-        logger.info(f"[DREAM] Journal ledger atomically reset ({entry_count} entries consolidated).")
+        _release_ledger()
+        logger.info(f"[DREAM] Journal ledger consolidated and released ({entry_count} entries).")
     except Exception as e:
-        logger.error(f"[DREAM] Ledger reset failed: {e}")
+        logger.error(f"[DREAM] Ledger release failed: {e}")
 
     return summary, resolved_note_id, entry_count
 
 
+def memory_consolidation(allow_hub=True, note_id=None):
+    """Synchronous entry point for callers outside an event loop (--test-dream)."""
+    return asyncio.run(consolidate_memories(allow_hub=allow_hub, note_id=note_id))
+
+
 # --- Stage 2: Natural Dreaming & WYWO ---
 async def _run_debate(topic):
     """Preferred Stage-2: real Pinky & Brain debate over MCP stdio sessions.
@@ -435,7 +514,7 @@ async def natural_dreaming(journal_kb_summary, allow_debate=True, allow_hub=True
 async def run_pipeline():
     """[FEAT-443] Full two-stage dream engine run."""
     logger.info("[DREAM] Stage 1: Memory Consolidation.")
-    result = memory_consolidation()
+    result = await consolidate_memories()
     if result is None:
         logger.info("[DREAM] Nothing to dream about. Pipeline complete (no-op).")
         return None
@@ -486,6 +565,10 @@ def run_test_dream():
 
     ledger_backup = _backup_file(JOURNAL_LEDGER)
     dialogue_backup = _backup_file(NIGHTLY_DIALOGUE)
+    # [FEAT-491] Park an interrupted real dream so the fixture is not mistaken for a resume
+    dreaming_backup = _backup_file(DREAMING_LEDGER)
+    checkpoint_backup = _backup_file(DREAM_CHECKPOINT)
+    _release_ledger()
     try:
         # 1. Synthetic fixture: valid JSONL entries staggered within 24h.
         os.makedirs(DATA_DIR, exist_ok=True)
@@ -517,7 +600,7 @@ def run_test_dream():
                 try:
                     got = lab_journal.get(ids=[note_id])
                     if got and got.get("ids"):
-                        lab_journal.delete(ids=[note_id])
+                        lab_journal.delete(where={"note_id": note_id})  # journal_kb + its entries
                         logger.info(f"[DREAM-TEST] Synthetic note {note_id} verified and deleted from chroma.")
                         result["stage1"] = "PASS"
                     else:
@@ -565,8 +648,12 @@ def run_test_dream():
         # 6. Restore both files so the test leaves no trace on real data.
         _restore_file(JOURNAL_LEDGER, ledger_backup)
         _restore_file(NIGHTLY_DIALOGUE, dialogue_backup)
+        _restore_file(DREAMING_LEDGER, dreaming_backup)
+        _restore_file(DREAM_CHECKPOINT, checkpoint_backup)
         _remove_backup(JOURNAL_LEDGER)
         _remove_backup(NIGHTLY_DIALOGUE)
+        _remove_backup(DREAMING_LEDGER)
+        _remove_backup(DREAM_CHECKPOINT)
         logger.info("[DREAM-TEST] Original files restored.")
 
     logger.info(f"[DREAM-TEST] Verdict: {json.dumps(result)}")
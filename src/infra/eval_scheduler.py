@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass
+
+# [FEAT-492] Concurrent Eval Scheduler
+# Objective: run_eval executed cases strictly one at a time with a fixed 2 s
+# cooldown and judged each response inline, so a sweep cost
+# sum(inference + judge + 2 s) and its latency numbers mixed the engine's cold
+# first request in with the rest. EvalScheduler:
+#   1. warmup:   runs `warmup` throwaway requests first. They are reported as
+#                cold-start latency and never enter the steady-state stats.
+#   2. infer:    fans the measured cases out over `concurrency` workers.
+#   3. judge:    finished cases are queued to a separate judge pool. By
+#                default the pool only starts once every inference call has
+#                returned: the judge usually shares the GPU (local Ollama),
+#                and scoring during a timed case would leak its load into that
+#                case's latency and power. pipeline_judge=True overlaps the
+#                two (remote judge, or when wall time matters more).
+#   4. report:   latency and TTFT as p50/p95/p99 with percentile-bootstrap
+#                confidence intervals.
+# MockEngine is a deterministic in-process engine + judge for CI-free runs.
+
+log = logging.getLogger("eval")
+
+QUANTILES = (50, 95, 99)
+BOOTSTRAP_RESAMPLES = 1000
+CONFIDENCE = 0.95
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile (q in 0-100), numpy's default method."""
+    if not values:
+        return 0.0
+    return _sorted_percentile(sorted(values), q)
+
+
+def _sorted_percentile(ordered, q):
+    k = (len(ordered) - 1) * q / 100.0
+    lo, hi = math.floor(k), math.ceil(k)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(values, quantiles=QUANTILES, resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    {"n", "mean", "p50": {"value", "ci": [lo, hi]}, ...} for one latency series.
+    CIs come from a seeded percentile bootstrap, so a re-run over the same
+    samples reports the same interval. Tail CIs on small runs are wide (p99 of
+    20 samples is essentially the max); that width is the honest answer.
+    """
+    out = {"n": len(values), "mean": round(statistics.fmean(values), 3) if values else 0.0}
+    boots = {q: [] for q in quantiles}
+    if len(values) > 1:
+        rng = random.Random(seed)
+        for _ in range(resamples):
+            sample = sorted(rng.choices(values, k=len(values)))
+            for q in quantiles:
+                boots[q].append(_sorted_percentile(sample, q))
+    tail = (1.0 - confidence) / 2 * 100
+    for q in quantiles:
+        value = percentile(values, q)
+        lo, hi = (percentile(boots[q], tail), percentile(boots[q], 100 - tail)) if boots[q] else (value, value)
+        out[f"p{q}"] = {"value": round(value, 3), "ci": [round(lo, 3), round(hi, 3)]}
+    return out
+
+
+@dataclass
+class CaseResult:
+    index: int            # position in the case list; warmup runs are negative
+    case: dict
+    response: str = ""
+    ttft_ms: float = 0.0
+    tokens: int = 0
+    duration_s: float = 0.0
+    started: float = 0.0  # time.monotonic() bounds of the inference call
+    finished: float = 0.0
+    inflight: int = 1     # cases in flight when this one started, itself included
+    error: str = ""
+    score: int = 0
+    reasoning: str = ""
+    judge_model: str = ""
+    judged_at: float = 0.0
+
+    @property
+    def latency_ms(self):
+        return self.duration_s * 1000.0
+
+
+class EvalScheduler:
+    """
+    [FEAT-492] Warmup -> concurrent inference -> judge (after inference,
+    or pipelined alongside it with pipeline_judge=True).
+
+    infer(case) is awaited for (response, ttft_ms, tokens, duration_s), the
+    tuple _run_vllm/_run_ollama already return; judge(case, response) for
+    (score, reasoning, judge_model). on_result(CaseResult) runs once per
+    measured case after judging, in completion order.
+    """
+
+    def __init__(self, infer, judge=None, concurrency=1, warmup=0, judge_concurrency=1,
+                 cooldown_s=0.0, on_result=None, pipeline_judge=False):
+        self.infer = infer
+        self.judge = judge
+        self.pipeline_judge = pipeline_judge
+        self.concurrency = max(1, int(concurrency))
+        self.warmup = max(0, int(warmup))
+        self.judge_concurrency = max(1, int(judge_concurrency))
+        self.cooldown_s = cooldown_s
+        self.on_result = on_result
+        self.cold = []
+        self.wall_s = 0.0
+        self._inflight = 0
+
+    async def _infer_case(self, index, case):
+        result = CaseResult(index=index, case=case)
+        self._inflight += 1
+        result.inflight = self._inflight
+        result.started = time.monotonic()
+        try:
+            result.response, result.ttft_ms, result.tokens, result.duration_s = await self.infer(case)
+            if str(result.response).startswith("[ERROR]"):
+                result.error = result.response
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            self._inflight -= 1
+            result.finished = time.monotonic()
+        if not result.duration_s:
+            result.duration_s = result.finished - result.started
+        return result
+
+    async def _judge_case(self, result):
+        if self.judge is not None and not result.error:
+            try:
+                result.score, result.reasoning, result.judge_model = await self.judge(result.case, result.response)
+            except Exception as e:
+                result.reasoning = f"Judge failed: {e}"
+        result.judged_at = time.monotonic()
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                log.error(f"[EVAL] on_result failed for case {result.index}: {e}")
+
+    async def run(self, cases):
+        """Returns one CaseResult per case, in case order."""
+        cases = list(cases)
+        self.cold = []
+        if not cases:
+            return []
+
+        # 1. Warmup: serial, so each cold request sees an otherwise idle engine
+        for i in range(self.warmup):
+            result = await self._infer_case(-1 - i, cases[i % len(cases)])
+            self.cold.append(result)
+            log.info(f"[EVAL] Warmup {i + 1}/{self.warmup}: {result.latency_ms:.0f}ms"
+                     f"{' (' + result.error[:80] + ')' if result.error else ''}")
+
+        todo = asyncio.Queue()
+        for item in enumerate(cases):
+            todo.put_nowait(item)
+        finished = asyncio.Queue()
+        results = [None] * len(cases)
+
+        async def infer_worker():
+            while True:
+                try:
+                    index, case = todo.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[index] = await self._infer_case(index, case)
+                finished.put_nowait(results[index])
+                if self.cooldown_s and not todo.empty():
+                    await asyncio.sleep(self.cooldown_s)
+
+        async def judge_worker():
+            while True:
+                result = await finished.get()
+                if result is None:
+                    return
+                await self._judge_case(result)
+
+        t0 = time.monotonic()
+        judges = []
+        if self.pipeline_judge:
+            judges = [asyncio.create_task(judge_worker()) for _ in range(self.judge_concurrency)]
+        try:
+            await asyncio.gather(*(infer_worker() for _ in range(min(self.concurrency, len(cases)))))
+        finally:
+            # Judge phase (or drain, when pipelined): cases that finished still get judged and reported
+            if not judges:
+                judges = [asyncio.create_task(judge_worker()) for _ in range(self.judge_concurrency)]
+            for _ in judges:
+                finished.put_nowait(None)
+            await asyncio.gather(*judges)
+        self.wall_s = time.monotonic() - t0
+        return results
+
+    def report(self, results):
+        """Cold-start vs steady-state latency, throughput and judge pipelining for one run()."""
+        done = [r for r in results if r is not None]
+        ok = [r for r in done if not r.error]
+        cold = [r for r in self.cold if not r.error]
+        scores = [r.score for r in ok if r.score > 0]
+        last_infer = max((r.finished for r in done), default=0.0)
+        return {
+            "cases": len(results),
+            "errors": len(done) - len(ok),
+            "concurrency": self.concurrency,
+            "warmup": len(self.cold),
+            "wall_s": round(self.wall_s, 3),
+            "throughput_cps": round(len(ok) / self.wall_s, 3) if self.wall_s > 0 else 0.0,
+            # Too few warmup samples for percentiles; report them as-is
+            "cold_start": {
+                "latency_ms": [round(r.latency_ms, 3) for r in cold],
+                "ttft_ms": [round(r.ttft_ms, 3) for r in cold],
+            },
+            "steady_state": {
+                "latency_ms": summarize([r.latency_ms for r in ok]),
+                "ttft_ms": summarize([r.ttft_ms for r in ok if r.ttft_ms > 0]),
+            },
+            "judge": {
+                "scored": len(scores),
+                "avg_score": round(statistics.fmean(scores), 3) if scores else 0.0,
+                # Cases scored while inference was still running elsewhere
+                "pipelined": sum(1 for r in done if r.judged_at and r.judged_at < last_infer),
+            },
+        }
+
+
+class MockEngine:
+    """
+    [FEAT-492] Deterministic local engine for CI-free eval runs: sleeps a
+    seeded TTFT + per-token time, pays `cold_start_ms` once on the first call,
+    and fails the case ids in `fail_ids` the way _run_vllm does ("[ERROR] ...").
+    `slots` caps server-side parallelism like a real batch limit.
+    """
+
+    def __init__(self, ttft_ms=40.0, token_ms=2.0, tokens=32, cold_start_ms=250.0, jitter=0.2,
+                 judge_ms=10.0, slots=None, fail_ids=(), seed=0):
+        self.ttft_ms = ttft_ms
+        self.token_ms = token_ms
+        self.tokens = tokens
+        self.cold_start_ms = cold_start_ms
+        self.jitter = jitter
+        self.judge_ms = judge_ms
+        self.slots = slots
+        self.fail_ids = set(fail_ids)
+        self.calls = 0
+        self.judged = 0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self._rng = random.Random(seed)
+        self._sem = None
+
+    async def infer(self, case):
+        if self.slots and self._sem is None:
+            self._sem = asyncio.Semaphore(self.slots)
+        t0 = time.monotonic()
+        if self._sem is not None:
+            await self._sem.acquire()
+        try:
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+            cold = self.cold_start_ms if self.calls == 0 else 0.0
+            self.calls += 1
+            scale = 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+            await asyncio.sleep((cold + self.ttft_ms * scale) / 1000.0)
+            ttft_ms = (time.monotonic() - t0) * 1000.0
+            if case.get("id") in self.fail_ids:
+                return "[ERROR] mock engine failure", 0.0, 0, time.monotonic() - t0
+            await asyncio.sleep(self.tokens * self.token_ms * scale / 1000.0)
+            words = " ".join(f"tok{i}" for i in range(self.tokens))
+            return f"[MOCK] {case.get('id', '')} {words}", ttft_ms, self.tokens, time.monotonic() - t0
+        finally:
+            self.inflight -= 1
+            if self._sem is not None:
+                self._sem.release()
+
+    async def judge(self, case, response):
+        await asyncio.sleep(self.judge_ms / 1000.0)
+        self.judged += 1
+        score = 1 + int(hashlib.sha1(str(case.get("id", "")).encode("utf-8")).hexdigest(), 16) % 5
+        return score, "Mock judge verdict.", "mock-judge"
@@ -302,6 +302,35 @@ class LiveTelemetryCollector:
         sample.enrich()
         return sample
 
+    async def snapshot_async(self) -> LiveMetrics:
+        """
+        [FEAT-474] Same struct as snapshot(), but the DCGM, Foyer and swap
+        scrapes run concurrently so the tick costs one timeout, not three.
+        """
+        import asyncio
+
+        gpu, foyer, swap = await asyncio.gather(
+            asyncio.to_thread(self._scrape_dcgm),
+            asyncio.to_thread(self._scrape_foyer),
+            asyncio.to_thread(self._scrape_swap),
+        )
+        active_lora = await asyncio.to_thread(self._resolve_active_lora, foyer.get("data", {}))
+        sample = LiveMetrics(
+            vram_used_mb=gpu["vram_used_mb"],
+            vram_total_mb=gpu["vram_total_mb"],
+            gpu_power_w=gpu["gpu_power_w"],
+            connected_clients=foyer["connected_clients"],
+            round_table_active=foyer["round_table_active"],
+            active_lora=active_lora,
+            swap_used_mb=swap["swap_used_mb"],
+            swap_total_mb=swap["swap_total_mb"],
+            swap_pct=swap["swap_pct"],
+            dcgm_online=bool(gpu["vram_used_mb"] or gpu["gpu_power_w"]),
+            foyer_online=bool(foyer.get("data")),
+        )
+        sample.enrich()
+        return sample
+
     def write_record(self, sample: LiveMetrics) -> None:
         """
         Merge a live snapshot into status.json under the ``live_telemetry``
@@ -0,0 +1,69 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+
+from infra.atomic_io import atomic_write_json
+
+# [FEAT-478] RAG Generation Counter
+# Any process that adds documents to ChromaDB (bridge_burn_to_rag, dream_node,
+# forge/index_*_to_rag) bumps this counter. The Hub's RAG cache tags entries
+# with the generation they were retrieved under and drops them once it moves.
+# Readers stat the file and only re-parse it when the mtime/size changes.
+
+GENERATION_FILE = os.environ.get(
+    "LAB_RAG_GENERATION_FILE",
+    os.path.expanduser("~/Dev_Lab/Portfolio_Dev/field_notes/data/rag_generation.json"),
+)
+
+_cache = {}  # path -> (mtime_ns, size, generation)
+_lock = threading.Lock()
+
+
+def read_rag_generation(path=None):
+    path = path or GENERATION_FILE
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[:2] == stamp:
+        return cached[2]
+    with _lock:
+        try:
+            with open(path, "r") as f:
+                generation = int(json.load(f).get("generation", 0))
+        except (OSError, ValueError, AttributeError):
+            return cached[2] if cached else 0
+        _cache[path] = (stamp[0], stamp[1], generation)
+        return generation
+
+
+def bump_rag_generation(source, added=None, path=None):
+    """Increment the generation after a successful Chroma write. Never raises."""
+    path = os.path.expanduser(path or GENERATION_FILE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Serialize concurrent indexers so no increment is lost.
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(path, "r") as f:
+                    generation = int(json.load(f).get("generation", 0))
+            except (OSError, ValueError, AttributeError):
+                generation = 0
+            generation += 1
+            atomic_write_json(path, {
+                "generation": generation,
+                "source": source,
+                "added": added,
+                "timestamp": time.time(),
+            })
+        logging.info(f"[RAG_GEN] Generation {generation} ({source}, added={added}).")
+        return generation
+    except Exception as e:
+        logging.warning(f"[RAG_GEN] Failed to bump generation for {source}: {e}")
+        return None
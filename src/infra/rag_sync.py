@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from infra.atomic_io import atomic_write_json
+
+# [FEAT-486] Incremental RAG Sync
+# Objective: indexers used to pay a `get` plus an `add` round trip per document
+# and re-embed anything whose id they could not find. RagSync stages the full
+# document set, diffs it against a local manifest (document id -> sha256 of the
+# normalized text plus canonical JSON metadata, so duplicate texts under two ids
+# and metadata-only edits are both tracked), and only sends new or changed
+# documents, in chunked `upsert` calls so the server embeds them in large
+# batches. A re-run with no changes makes no write (and so no embedding) at all.
+#
+# The manifest is a cache, never the source of truth: documents it does not
+# know are first checked against the collection with one batched `get` per
+# chunk, and a collection that shrank below the manifest's recorded count
+# (wiped/rebuilt DB) invalidates it.
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RAG_SYNC_DIR = os.environ.get("LAB_RAG_SYNC_DIR", os.path.join(LAB_DIR, ".cache", "rag_sync"))
+UPSERT_BATCH = int(os.environ.get("LAB_RAG_UPSERT_BATCH", "256"))
+MANIFEST_VERSION = 2  # v1 was keyed by content hash
+
+
+def content_hash(text, metadata=None):
+    """sha256 of whitespace-normalized content (reflowed text is not re-embedded) plus canonical metadata."""
+    h = hashlib.sha256(" ".join(str(text).split()).encode("utf-8"))
+    h.update(b"\0")
+    h.update(json.dumps(metadata or {}, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+class RagSync:
+    """[FEAT-486] Stage documents with add(), then push the delta with sync()."""
+
+    def __init__(self, collection, name, manifest_dir=None, batch_size=None):
+        self.collection = collection
+        self.name = name
+        self.manifest_path = os.path.join(manifest_dir or RAG_SYNC_DIR, f"{name}.json")
+        self.batch_size = batch_size or UPSERT_BATCH
+        self._staged = {}  # doc_id -> (hash, document, metadata)
+
+    def add(self, doc_id, document, metadata):
+        if doc_id not in self._staged:
+            self._staged[doc_id] = (content_hash(document, metadata), document, metadata)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"docs": {}, "count": 0}
+
+    def _chunks(self, items):
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def _recover(self, pending):
+        """Drop pending docs the collection already holds with identical content and metadata (cold or lost manifest)."""
+        still = []
+        for chunk in self._chunks(pending):
+            try:
+                existing = self.collection.get(ids=chunk, include=["documents", "metadatas"])
+                ids = existing.get("ids") or []
+                stored = dict(zip(ids, zip(existing.get("documents") or [], existing.get("metadatas") or [None] * len(ids))))
+            except Exception as e:
+                logging.warning(f"[RAG_SYNC] {self.name}: existence check failed ({e}); upserting chunk.")
+                stored = {}
+            for doc_id in chunk:
+                doc = stored.get(doc_id)
+                if doc is None or content_hash(*doc) != self._staged[doc_id][0]:
+                    still.append(doc_id)
+        return still
+
+    def sync(self):
+        """Returns stats: staged, unchanged, recovered, upserted, batches, failed."""
+        t0 = time.time()
+        manifest = self._load_manifest()
+        known = manifest["docs"]
+        try:
+            count = self.collection.count()
+            if count < manifest.get("count", 0):
+                logging.warning(f"[RAG_SYNC] {self.name}: collection has {count} docs, manifest expected "
+                                f">= {manifest['count']}; rebuilding manifest.")
+                known = {}
+        except Exception:
+            count = None
+
+        pending = [doc_id for doc_id, (h, _, _) in self._staged.items() if known.get(doc_id) != h]
+        stats = {"staged": len(self._staged), "unchanged": len(self._staged) - len(pending),
+                 "recovered": 0, "upserted": 0, "batches": 0, "failed": 0}
+        if pending:
+            before = len(pending)
+            pending = self._recover(pending)
+            stats["recovered"] = before - len(pending)
+
+        failed = set()
+        for chunk in self._chunks(pending):
+            try:
+                self.collection.upsert(
+                    ids=chunk,
+                    documents=[self._staged[i][1] for i in chunk],
+                    metadatas=[self._staged[i][2] for i in chunk],
+                )
+                stats["upserted"] += len(chunk)
+                stats["batches"] += 1
+            except Exception as e:
+                logging.error(f"[RAG_SYNC] {self.name}: upsert of {len(chunk)} docs failed: {e}")
+                failed.update(chunk)
+        stats["failed"] = len(failed)
+
+        # The manifest mirrors exactly what this run staged and the collection now holds
+        docs = {doc_id: h for doc_id, (h, _, _) in self._staged.items() if doc_id not in failed}
+        if docs != manifest["docs"] or stats["upserted"]:
+            try:
+                count = self.collection.count()
+            except Exception:
+                count = count or 0
+            atomic_write_json(self.manifest_path, {"version": MANIFEST_VERSION, "docs": docs, "count": count}, indent=None)
+        logging.info(f"[RAG_SYNC] {self.name}: {stats['staged']} staged, {stats['unchanged']} unchanged, "
+                     f"{stats['recovered']} already present, {stats['upserted']} upserted in {stats['batches']} "
+                     f"batches ({time.time() - t0:.1f}s).")
+        return stats
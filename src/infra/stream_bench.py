@@ -0,0 +1,389 @@
+"""
+[FEAT-493] Streaming-Path Benchmark
+===================================
+Measures the client side of token streaming against infra/stub_engine.py, so
+loader regressions show up on a CPU-only box without vLLM or Ollama.
+
+The stub runs in a child process: the CPU time sampled here is the client's
+alone. Four measurements:
+
+    overhead     CPU us/token for each stream target vs a raw read of the same
+                 bytes (fresh session per request, like the loader), with the
+                 stub unpaced so the client is the bottleneck
+    connections  per-request cost of a fresh ClientSession vs a shared one,
+                 plus the TCP connections the stub saw for each
+    retry        loader behavior on a 400 context overflow (FEAT-431 retry),
+                 a 503, and a stream dropped mid-generation: server requests,
+                 tokens delivered, outcome, pages raised
+    decode       [FEAT-494] CPU us/token of StreamDecoder vs the legacy
+                 per-line str + json.loads decode, over the same captured
+                 stub bytes (no network in the timed loop)
+
+The legacy.* targets keep the pre-FEAT-494 loader decode as a fixed
+reference, so the loader's numbers always have something to regress against.
+
+Usage:
+    python -m infra.stream_bench                  # all four, JSON report to stdout
+    python -m infra.stream_bench --tokens 1024 --requests 50 --only overhead
+    python -m infra.stream_bench --only decode
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import time
+import types
+from dataclasses import asdict
+
+import aiohttp
+
+from infra.stream_decoder import NDJSON, SSE, StreamDecoder
+from infra.stub_engine import StubConfig, serve_child
+
+log = logging.getLogger("stream_bench")
+
+BENCH_PROMPT = "Summarize the RAPL power capping telemetry path."
+
+
+class StubProcess:
+    """[FEAT-493] StubEngine in a spawned child; `with StubProcess(cfg) as stub: stub.base_url`."""
+
+    def __init__(self, config=None, start_timeout=30):
+        self.config = config or StubConfig()
+        self.start_timeout = start_timeout
+        self.base_url = None
+        self._proc = None
+
+    def __enter__(self):
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Queue()
+        self._proc = ctx.Process(target=serve_child, args=(asdict(self.config), ready), daemon=True)
+        self._proc.start()
+        self.base_url = ready.get(timeout=self.start_timeout)
+        return self
+
+    def __exit__(self, *exc):
+        self._proc.terminate()
+        self._proc.join(5)
+
+    async def configure(self, session, **patch):
+        async with session.post(f"{self.base_url}/stub/config", json=patch) as r:
+            r.raise_for_status()
+            return await r.json()
+
+    async def stats(self, session, reset=False):
+        async with session.get(f"{self.base_url}/stub/stats") as r:
+            stats = await r.json()
+        if reset:
+            async with session.post(f"{self.base_url}/stub/reset") as r:
+                r.raise_for_status()
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# Stream targets: factory(base_url, payload) -> async iterator of token items
+# ---------------------------------------------------------------------------
+def vllm_payload(max_tokens, content=BENCH_PROMPT):
+    return {"model": "unified-base", "stream": True, "max_tokens": max_tokens,
+            "messages": [{"role": "system", "content": "You are a bench."}, {"role": "user", "content": content}]}
+
+
+def ollama_payload(max_tokens, content=BENCH_PROMPT):
+    return {"stream": True, "options": {"num_predict": max_tokens},
+            "messages": [{"role": "system", "content": "You are a bench."}, {"role": "user", "content": content}]}
+
+
+async def raw_vllm(base_url, payload):
+    """Transport floor: same bytes, same per-request session, no line splitting or decoding."""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base_url}/v1/chat/completions", json=payload) as r:
+            async for chunk in r.content.iter_any():
+                yield chunk
+
+
+async def raw_ollama(base_url, payload):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base_url}/api/chat", json=payload) as r:
+            async for chunk in r.content.iter_any():
+                yield chunk
+
+
+def _legacy_sse_line(line):
+    """Pre-FEAT-494 loader decode of one SSE line: (token | None, done)."""
+    decoded = line.decode("utf-8").strip()
+    if decoded.startswith("data: "):
+        if "[DONE]" in decoded:
+            return None, True
+        try:
+            return json.loads(decoded[6:])["choices"][0]["delta"].get("content", "") or None, False
+        except Exception:
+            pass
+    return None, False
+
+
+def _legacy_ndjson_line(line):
+    try:
+        data = json.loads(line.decode("utf-8"))
+    except Exception:
+        return None, False
+    return data.get("message", {}).get("content", "") or None, bool(data.get("done"))
+
+
+async def _legacy(base_url, path, payload, parse):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base_url}{path}", json=payload) as r:
+            async for line in r.content:
+                if not line:
+                    continue
+                token, done = parse(line)
+                if token:
+                    yield token
+                if done:
+                    break
+
+
+def legacy_vllm(base_url, payload):
+    return _legacy(base_url, "/v1/chat/completions", payload, _legacy_sse_line)
+
+
+def legacy_ollama(base_url, payload):
+    return _legacy(base_url, "/api/chat", payload, _legacy_ndjson_line)
+
+
+class _LoaderHost:
+    """Just the attributes BicameralNode's stream methods read, without booting MCP or the tokenizer."""
+
+    def __init__(self):
+        self.name = "bench"
+        self.tokens = types.SimpleNamespace(exact=False)
+        self._engine_cache = None
+
+
+def loader_targets():
+    """{name: factory} for the loader's stream generators; {} when nodes.loader cannot import here."""
+    try:
+        from nodes.loader import BicameralNode
+    except ImportError as e:
+        log.warning(f"[BENCH] nodes.loader unavailable ({e}); loader targets skipped.")
+        return {}
+    host = _LoaderHost()
+    vllm = types.MethodType(BicameralNode._stream_vllm, host)
+    ollama = types.MethodType(BicameralNode._stream_ollama, host)
+    host._decode_stream = types.MethodType(BicameralNode._decode_stream, host)
+    return {
+        "loader.vllm": lambda base_url, payload: vllm(f"{base_url}/v1/chat/completions", payload),
+        "loader.ollama": lambda base_url, payload: ollama(f"{base_url}/api/chat", payload),
+    }
+
+
+@contextlib.contextmanager
+def captured_pages():
+    """Route the loader's trigger_pager into a list so benchmarks never touch the real pager ledger."""
+    pages = []
+    try:
+        import nodes.loader as loader
+    except ImportError:
+        yield pages
+        return
+    original = loader.trigger_pager
+    loader.trigger_pager = lambda message, severity="INFO", source="System": pages.append((severity, message))
+    try:
+        yield pages
+    finally:
+        loader.trigger_pager = original
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+async def _drain(stream):
+    count = 0
+    async for _ in stream:
+        count += 1
+    return count
+
+
+async def bench_overhead(stub, targets, requests=20, tokens=256):
+    """CPU us/token per target; `overhead_us` is relative to the raw read of the same protocol."""
+    async with aiohttp.ClientSession() as control:
+        await stub.configure(control, token_rate=0, ttft_ms=0, tokens=tokens, fail_first=0, error_rate=0,
+                             abort_after=0, max_model_len=1 << 20)
+    all_targets = {"raw.vllm": raw_vllm, "raw.ollama": raw_ollama,
+                   "legacy.vllm": legacy_vllm, "legacy.ollama": legacy_ollama, **targets}
+    results = {}
+    for name, factory in all_targets.items():
+        make = ollama_payload if "ollama" in name else vllm_payload
+        await _drain(factory(stub.base_url, make(tokens)))  # warm imports, DNS, allocator
+        items, cpu0, wall0 = 0, time.process_time(), time.perf_counter()
+        for _ in range(requests):
+            n = await _drain(factory(stub.base_url, make(tokens)))
+            items += n
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        results[name] = {
+            "items": items,
+            "cpu_us_per_token": round(cpu / (requests * tokens) * 1e6, 3),
+            "wall_ms_per_request": round(wall / requests * 1000, 3),
+        }
+    for name, row in results.items():
+        floor = results["raw.ollama" if "ollama" in name else "raw.vllm"]["cpu_us_per_token"]
+        row["overhead_us"] = round(row["cpu_us_per_token"] - floor, 3)
+    return results
+
+
+async def bench_connections(stub, requests=20):
+    """Fresh ClientSession per request (the loader's pattern) vs one shared session."""
+    async with aiohttp.ClientSession() as control:
+        await stub.configure(control, token_rate=0, ttft_ms=0, tokens=1, fail_first=0, error_rate=0, abort_after=0)
+        await stub.stats(control, reset=True)
+        url, payload = f"{stub.base_url}/v1/chat/completions", vllm_payload(1)
+
+        async def one(session):
+            async with session.post(url, json=payload) as r:
+                await r.read()
+
+        t0 = time.perf_counter()
+        for _ in range(requests):
+            async with aiohttp.ClientSession() as session:
+                await one(session)
+        fresh_ms = (time.perf_counter() - t0) / requests * 1000
+        fresh_conns = (await stub.stats(control, reset=True))["connections"]
+
+        t0 = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            for _ in range(requests):
+                await one(session)
+        shared_ms = (time.perf_counter() - t0) / requests * 1000
+        shared_conns = (await stub.stats(control, reset=True))["connections"]
+    return {
+        "fresh": {"ms_per_request": round(fresh_ms, 3), "connections": fresh_conns},
+        "shared": {"ms_per_request": round(shared_ms, 3), "connections": shared_conns},
+        "setup_ms": round(fresh_ms - shared_ms, 3),
+    }
+
+
+async def bench_retry(stub, factory):
+    """Loader failure paths: overflow retry, hard 503, and a stream cut mid-generation."""
+    long_prompt = " ".join(["telemetry"] * 600)
+    scenarios = {
+        # 600 words + 400 > 900, the 25%-chopped retry (450 + 300) fits
+        "overflow": ({"max_model_len": 900}, vllm_payload(400, long_prompt)),
+        "unavailable": ({"fail_first": 1}, vllm_payload(64)),
+        "abort": ({"abort_after": 8}, vllm_payload(64)),
+    }
+    base = {"token_rate": 0, "ttft_ms": 0, "tokens": 64, "fail_first": 0, "error_rate": 0, "abort_after": 0,
+            "max_model_len": 16384}
+    results = {}
+    async with aiohttp.ClientSession() as control:
+        for name, (patch, payload) in scenarios.items():
+            await stub.configure(control, **{**base, **patch})
+            await stub.stats(control, reset=True)
+            tokens, errors = 0, []
+            with captured_pages() as pages:
+                t0 = time.perf_counter()
+                async for item in factory(stub.base_url, payload):
+                    # Loader streams yield (text, token_count) batches [FEAT-494]; plain targets yield tokens
+                    text, n = item if isinstance(item, tuple) else (item, 1)
+                    if text.startswith("Error") or "warming" in text:
+                        errors.append(text)
+                    else:
+                        tokens += n
+                ms = (time.perf_counter() - t0) * 1000
+            stats = await stub.stats(control)
+            results[name] = {
+                "requests": stats["requests"],
+                "tokens": tokens,
+                "outcome": errors[-1][:120] if errors else "ok",
+                "pages": len(pages),
+                "ms": round(ms, 3),
+            }
+        await stub.configure(control, **base)
+    return results
+
+
+async def _capture(url, payload):
+    """The raw body chunks exactly as iter_any() delivered them."""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=payload) as r:
+            return [chunk async for chunk in r.content.iter_any()]
+
+
+def _time_per_token(fn, rounds):
+    cpu0 = time.process_time()
+    for _ in range(rounds):
+        n = fn()
+    return (time.process_time() - cpu0) / (rounds * n) * 1e6, n
+
+
+async def bench_decode(stub, tokens=512, rounds=50):
+    """[FEAT-494] Decoder-only CPU cost on captured stub bytes: legacy per-line parse vs StreamDecoder."""
+    async with aiohttp.ClientSession() as control:
+        await stub.configure(control, token_rate=0, ttft_ms=0, tokens=tokens, fail_first=0, error_rate=0,
+                             abort_after=0, max_model_len=1 << 20)
+    captures = {
+        SSE: (await _capture(f"{stub.base_url}/v1/chat/completions", vllm_payload(tokens)), _legacy_sse_line),
+        NDJSON: (await _capture(f"{stub.base_url}/api/chat", ollama_payload(tokens)), _legacy_ndjson_line),
+    }
+    results = {}
+    for protocol, (chunks, legacy_parse) in captures.items():
+        lines = b"".join(chunks).splitlines(keepends=True)  # what the old readline loop handed over
+
+        def legacy():
+            out = []
+            for line in lines:
+                token, done = legacy_parse(line)
+                if token:
+                    out.append(token)
+                if done:
+                    break
+            return len(out)
+
+        def decoder():
+            dec, n = StreamDecoder(protocol), 0
+            for chunk in chunks:
+                n += len(dec.feed(chunk))
+            return n + len(dec.close())
+
+        legacy_us, legacy_n = _time_per_token(legacy, rounds)
+        fast_us, fast_n = _time_per_token(decoder, rounds)
+        results[protocol] = {
+            "tokens": fast_n,
+            "parity": fast_n == legacy_n,
+            "legacy_us_per_token": round(legacy_us, 3),
+            "decoder_us_per_token": round(fast_us, 3),
+            "speedup": round(legacy_us / fast_us, 2) if fast_us else 0.0,
+        }
+    return results
+
+
+async def run_bench(stub, targets=None, requests=20, tokens=256, only=None):
+    targets = loader_targets() if targets is None else targets
+    report = {}
+    if only in (None, "overhead"):
+        report["overhead"] = await bench_overhead(stub, targets, requests=requests, tokens=tokens)
+    if only in (None, "connections"):
+        report["connections"] = await bench_connections(stub, requests=requests)
+    if only in (None, "retry") and "loader.vllm" in targets:
+        report["retry"] = await bench_retry(stub, targets["loader.vllm"])
+    if only in (None, "decode"):
+        report["decode"] = await bench_decode(stub, tokens=tokens)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="[FEAT-493] Streaming-path benchmark against the stub engine")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=256)
+    parser.add_argument("--only", choices=["overhead", "connections", "retry", "decode"], default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [BENCH] %(message)s")
+    with StubProcess() as stub:
+        report = asyncio.run(run_bench(stub, requests=args.requests, tokens=args.tokens, only=args.only))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # stdlib json for the slow path
+    orjson = None
+
+# [FEAT-494] Incremental Stream Decoder
+# Objective: _stream_vllm/_stream_ollama read the body line by line, decoded
+# every line to str, stripped the "data: " prefix and json.loads'ed the whole
+# chunk object (id, model, choices, logprobs...) just to reach one small
+# string. StreamDecoder works on the raw byte chunks from iter_any():
+#   - event boundaries are found with bytes.find on the chunk itself; only a
+#     trailing partial line is carried over to the next chunk
+#   - the delta/message content is located by a targeted scan for its key;
+#     escape-free strings (the common case) are a single slice + utf-8 decode,
+#     escaped ones go through a JSON string decode of just that slice
+#   - anything the scan does not recognise (tool_calls ahead of content, odd
+#     key order, error objects) falls back to a full orjson/json parse with the
+#     old field semantics
+# The loader yields tokens in batches of at most STREAM_BATCH per read, so
+# per-token generator hops, concatenation and relay posts become per-batch.
+
+STREAM_BATCH = 16
+
+SSE = "sse"        # OpenAI/vLLM: data: {...}\n\n ... data: [DONE]
+NDJSON = "ndjson"  # Ollama: {...}\n per chunk, final object has "done": true
+
+_loads = orjson.loads if orjson is not None else json.loads
+_QUOTE, _BACKSLASH, _SPACE = 0x22, 0x5C, 0x20
+
+
+def _skip_spaces(buf, i, end):
+    while i < end and buf[i] == _SPACE:
+        i += 1
+    return i
+
+
+def _string_at(buf, i, end):
+    """
+    JSON string value starting at buf[i] == '"'. Returns the decoded str, or
+    None when the value is not a complete string (null, truncated, other).
+    """
+    if i >= end or buf[i] != _QUOTE:
+        return None
+    start = i + 1
+    q = buf.find(b'"', start, end)
+    if q < 0:
+        return None
+    if buf.find(b"\\", start, q) < 0:
+        return buf[start:q].decode("utf-8")  # fast path: no escapes
+    while True:
+        n, j = 0, q - 1
+        while j >= start and buf[j] == _BACKSLASH:
+            n, j = n + 1, j - 1
+        if n % 2 == 0:
+            return _loads(buf[i:q + 1])
+        q = buf.find(b'"', q + 1, end)
+        if q < 0:
+            return None
+
+
+def _content_in(buf, parent_key, start, end):
+    """
+    (found, text) for the "content" string of the object under `parent_key`.
+    found=False means the scan cannot vouch for the layout; parse the line.
+    """
+    k = buf.find(parent_key, start, end)
+    if k < 0:
+        return False, None
+    c = buf.find(b'"content":', k, end)
+    if c < 0 or buf.find(b"}", k, c) >= 0:
+        # No content key inside the object: an empty delta is normal, anything else is unknown
+        tail = _skip_spaces(buf, k + len(parent_key), end)
+        return (True, None) if buf.startswith(b"{}", tail) else (False, None)
+    v = _skip_spaces(buf, c + 10, end)
+    if buf.startswith(b"null", v):
+        return True, None
+    text = _string_at(buf, v, end)
+    return (text is not None), text
+
+
+class StreamDecoder:
+    """[FEAT-494] feed(raw_bytes) -> list of token strings; `done` once the stream's end marker is seen."""
+
+    def __init__(self, protocol=SSE):
+        if protocol not in (SSE, NDJSON):
+            raise ValueError(f"unknown stream protocol: {protocol}")
+        self.protocol = protocol
+        self.done = False
+        self.tokens = 0
+        self.slow_path = 0  # lines that needed a full parse
+        self._tail = b""
+
+    def feed(self, chunk):
+        if self.done or not chunk:
+            return []
+        buf = self._tail + chunk if self._tail else bytes(chunk)
+        out = []
+        line = self._sse_line if self.protocol == SSE else self._ndjson_line
+        pos = 0
+        while not self.done:
+            nl = buf.find(b"\n", pos)
+            if nl < 0:
+                break
+            if nl > pos:
+                line(buf, pos, nl, out)
+            pos = nl + 1
+        self._tail = b"" if self.done else buf[pos:]
+        self.tokens += len(out)
+        return out
+
+    def close(self):
+        """Flush a final line that arrived without its newline."""
+        out = []
+        if self._tail and not self.done:
+            buf, self._tail = self._tail, b""
+            (self._sse_line if self.protocol == SSE else self._ndjson_line)(buf, 0, len(buf), out)
+            self.tokens += len(out)
+        return out
+
+    def _sse_line(self, buf, start, end, out):
+        if not buf.startswith(b"data:", start):
+            return
+        p = _skip_spaces(buf, start + 5, end)
+        if buf.startswith(b"[DONE]", p):
+            self.done = True
+            return
+        found, text = _content_in(buf, b'"delta":', p, end)
+        if not found:
+            self.slow_path += 1
+            try:
+                text = _loads(buf[p:end])["choices"][0]["delta"].get("content", "")
+            except Exception:
+                return
+        if text:
+            out.append(text)
+
+    def _ndjson_line(self, buf, start, end, out):
+        found, text = _content_in(buf, b'"message":', start, end)
+        if found:
+            d = buf.find(b'"done":', start, end)
+            done = d >= 0 and buf.startswith(b"true", _skip_spaces(buf, d + 7, end))
+        else:
+            self.slow_path += 1
+            try:
+                data = _loads(buf[start:end])
+            except Exception:
+                return
+            text = data.get("message", {}).get("content", "")
+            done = bool(data.get("done"))
+        if text:
+            out.append(text)
+        if done:
+            self.done = True
+
+
+def iter_batches(tokens, size=STREAM_BATCH):
+    """(text, token_count) runs of at most `size` tokens."""
+    for i in range(0, len(tokens), size):
+        part = tokens[i:i + size]
+        yield "".join(part), len(part)
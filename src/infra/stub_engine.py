@@ -0,0 +1,423 @@
+"""
+[FEAT-493] Stub Inference Engine
+================================
+Deterministic local stand-in for vLLM and Ollama, so the streaming paths
+(BicameralNode._stream_vllm / _stream_ollama, run_evals, the hub relay) can be
+exercised and benchmarked on a CPU-only box.
+
+Endpoints:
+    GET  /v1/models             vLLM model list (base + LoRA adapters, max_model_len)
+    POST /v1/chat/completions   OpenAI-compatible; SSE when "stream": true
+    GET  /api/tags, /api/ps     Ollama model list / resident model
+    POST /api/chat              Ollama NDJSON stream (or one JSON object)
+    GET  /metrics               Prometheus text, vllm:* names (see infra/vllm_metrics.py)
+    GET  /stub/stats            request/connection counters as JSON
+    POST /stub/config           patch StubConfig fields at runtime ({"token_rate": 0, ...})
+    POST /stub/reset            zero the counters
+
+Output is a pure function of (seed, last message, token count): the same
+request always streams the same tokens, paced at `ttft_ms` then `token_rate`
+tokens/s on an absolute schedule (no drift from sleep granularity; tokens that
+fall due together are written in one chunk). `token_rate <= 0` streams as fast
+as the socket takes it, which isolates client-side cost.
+
+Error injection:
+    fail_first    first N completion requests answer `fail_status` (default 503)
+    error_rate    seeded fraction of requests answer `error_status` (default 500)
+    max_model_len vLLM 400 context overflow, same message text as vLLM
+    abort_after   drop the connection mid-stream after N tokens
+
+Usage:
+    python -m infra.stub_engine --port 8088 --token-rate 200 --ttft-ms 40 --lora lab_history_v1
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields
+
+from aiohttp import web
+
+log = logging.getLogger("stub_engine")
+
+# Mixed register on purpose: leading spaces, quotes, escapes and non-ASCII all
+# show up in real streams and exercise the client's JSON decoding.
+VOCAB = (
+    " the", " silicon", " RAPL", " telemetry", " PCIe", " link", " power", " MSR", " cap", " DCGM",
+    " vLLM", " LoRA", " adapter", " batch", " token", ",", ".", " and", " of", " to",
+    " \"quoted\"", "\n", " naïve", " 11GB", " 🧪", " a\\b", " {json}", " 2080", " Ti", " AWQ",
+)
+
+
+@dataclass
+class StubConfig:
+    base_model: str = "unified-base"
+    base_root: str = "/speedy/models/llama-3.2-3b-instruct-awq"
+    loras: tuple = ("lab_history_v1", "shadow_brain_v2", "cli_voice_v1")
+    ollama_models: tuple = ("llama3.2:3b",)
+    tokens: int = 64             # tokens per completion (capped by max_tokens / num_predict)
+    ttft_ms: float = 40.0
+    token_rate: float = 200.0    # tokens/s; <= 0 means unpaced
+    max_model_len: int = 16384
+    fail_first: int = 0
+    fail_status: int = 503
+    error_rate: float = 0.0
+    error_status: int = 500
+    abort_after: int = 0         # 0 = never
+    seed: int = 0
+
+    def update(self, patch):
+        known = {f.name for f in fields(self)}
+        for key, value in patch.items():
+            if key not in known:
+                raise KeyError(key)
+            setattr(self, key, tuple(value) if isinstance(getattr(self, key), tuple) else value)
+
+
+def prompt_tokens(messages):
+    """Whitespace token estimate, same spirit as the loader's heuristic counter."""
+    return sum(len(str(m.get("content", "")).split()) for m in messages if isinstance(m, dict))
+
+
+def stub_tokens(seed, messages, count):
+    """Deterministic token list for one request."""
+    last = str(messages[-1].get("content", "")) if messages and isinstance(messages[-1], dict) else ""
+    digest = hashlib.sha1(f"{seed}:{last}".encode("utf-8")).digest()
+    rng = random.Random(int.from_bytes(digest[:8], "big"))
+    return [rng.choice(VOCAB) for _ in range(count)]
+
+
+class StubEngine:
+    """[FEAT-493] aiohttp app serving the vLLM and Ollama streaming protocols from a StubConfig."""
+
+    def __init__(self, config=None):
+        self.config = config or StubConfig()
+        self.app = web.Application()
+        self.app.router.add_get("/v1/models", self.handle_models)
+        self.app.router.add_post("/v1/chat/completions", self.handle_completions)
+        self.app.router.add_get("/api/tags", self.handle_tags)
+        self.app.router.add_get("/api/ps", self.handle_ps)
+        self.app.router.add_post("/api/chat", self.handle_ollama_chat)
+        self.app.router.add_get("/metrics", self.handle_metrics)
+        self.app.router.add_get("/stub/stats", self.handle_stats)
+        self.app.router.add_post("/stub/config", self.handle_config)
+        self.app.router.add_post("/stub/reset", self.handle_reset)
+        self._runner = None
+        self.base_url = None
+        self.reset()
+
+    def reset(self):
+        self._rng = random.Random(self.config.seed)
+        self._peers = set()
+        self._seen_prefixes = set()
+        self.running = 0
+        self.stats = {
+            "requests": {}, "connections": 0, "completions": 0, "failed": 0, "aborted": 0,
+            "prompt_tokens": 0, "generation_tokens": 0, "prefix_queries": 0, "prefix_hits": 0,
+            "finished": {"stop": 0, "length": 0},
+        }
+
+    # --- lifecycle -------------------------------------------------------------
+    async def start(self, host="127.0.0.1", port=0):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        log.info(f"[STUB] Serving on {self.base_url}")
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # --- bookkeeping -----------------------------------------------------------
+    def _track(self, request, status):
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer is not None and peer not in self._peers:
+            self._peers.add(peer)
+            self.stats["connections"] += 1
+        key = f"{request.path} {status}"
+        self.stats["requests"][key] = self.stats["requests"].get(key, 0) + 1
+
+    def _injected_error(self):
+        """(status, message) when this completion should fail, else None."""
+        cfg = self.config
+        self.stats["completions"] += 1
+        if self.stats["completions"] <= cfg.fail_first:
+            return cfg.fail_status, "Stub engine is warming (fail_first)."
+        if cfg.error_rate and self._rng.random() < cfg.error_rate:
+            return cfg.error_status, "Stub engine injected failure (error_rate)."
+        return None
+
+    def _count_prompt(self, messages):
+        n = prompt_tokens(messages)
+        self.stats["prompt_tokens"] += n
+        self.stats["prefix_queries"] += n
+        # A repeated system prompt counts as cached blocks, like vLLM prefix caching
+        if messages and isinstance(messages[0], dict) and messages[0].get("role") == "system":
+            prefix = hashlib.sha1(str(messages[0].get("content", "")).encode("utf-8")).hexdigest()
+            if prefix in self._seen_prefixes:
+                self.stats["prefix_hits"] += len(str(messages[0].get("content", "")).split())
+            self._seen_prefixes.add(prefix)
+
+    async def _paced(self, request, resp, chunks, finish):
+        """Write pre-encoded per-token chunks on the TTFT + rate schedule; False if aborted."""
+        cfg = self.config
+        t_first = time.monotonic() + cfg.ttft_ms / 1000.0
+        interval = 1.0 / cfg.token_rate if cfg.token_rate > 0 else 0.0
+        sent = 0
+        while sent < len(chunks):
+            if cfg.abort_after and sent >= cfg.abort_after:
+                self.stats["aborted"] += 1
+                self.stats["generation_tokens"] += sent
+                request.transport.close()
+                return False
+            now = time.monotonic()
+            due = len(chunks) if not interval else int((now - t_first) / interval) + 1
+            if now < t_first or due <= sent:
+                wake = t_first + sent * interval
+                await asyncio.sleep(max(0.0, wake - now))
+                continue
+            upto = min(due, len(chunks), cfg.abort_after or len(chunks), sent + 256)
+            await resp.write(b"".join(chunks[sent:upto]))
+            sent = upto
+        self.stats["generation_tokens"] += sent
+        await resp.write(finish)
+        return True
+
+    # --- vLLM ------------------------------------------------------------------
+    async def handle_models(self, request):
+        cfg = self.config
+        base = {"id": cfg.base_model, "object": "model", "owned_by": "vllm", "root": cfg.base_root,
+                "parent": None, "max_model_len": cfg.max_model_len}
+        loras = [{"id": name, "object": "model", "owned_by": "vllm", "root": f"/speedy/adapters/{name}",
+                  "parent": cfg.base_model, "max_model_len": cfg.max_model_len} for name in cfg.loras]
+        self._track(request, 200)
+        return web.json_response({"object": "list", "data": [base, *loras]})
+
+    def _vllm_error(self, request, status, message, kind):
+        self._track(request, status)
+        self.stats["failed"] += 1
+        return web.json_response({"object": "error", "message": message, "type": kind, "param": None,
+                                  "code": status}, status=status)
+
+    async def handle_completions(self, request):
+        cfg = self.config
+        try:
+            payload = await request.json()
+        except ValueError:
+            return self._vllm_error(request, 400, "Invalid JSON body.", "BadRequestError")
+        model = payload.get("model", cfg.base_model)
+        if model not in (cfg.base_model, *cfg.loras, cfg.base_root):
+            return self._vllm_error(request, 404, f"The model `{model}` does not exist.", "NotFoundError")
+        injected = self._injected_error()
+        if injected:
+            return self._vllm_error(request, injected[0], injected[1], "InternalServerError")
+        messages = payload.get("messages") or []
+        max_tokens = int(payload.get("max_tokens") or cfg.tokens)
+        n_prompt = prompt_tokens(messages)
+        if n_prompt + max_tokens > cfg.max_model_len:
+            return self._vllm_error(
+                request, 400,
+                f"This model's maximum context length is {cfg.max_model_len} tokens. However, you requested "
+                f"{n_prompt + max_tokens} tokens ({n_prompt} in the messages, {max_tokens} in the completion). "
+                "Please reduce the length of the messages or completion.", "BadRequestError")
+        self._count_prompt(messages)
+        count = min(cfg.tokens, max_tokens)
+        finish_reason = "length" if max_tokens <= cfg.tokens else "stop"
+        tokens = stub_tokens(cfg.seed, messages, count)
+        rid, created = f"chatcmpl-{uuid.uuid4().hex[:16]}", int(time.time())
+
+        if not payload.get("stream"):
+            await asyncio.sleep(cfg.ttft_ms / 1000.0 + (count / cfg.token_rate if cfg.token_rate > 0 else 0.0))
+            self._track(request, 200)
+            self.stats["generation_tokens"] += count
+            self.stats["finished"][finish_reason] += 1
+            return web.json_response({
+                "id": rid, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": n_prompt, "completion_tokens": count, "total_tokens": n_prompt + count},
+            })
+
+        def event(delta, finish=None):
+            chunk = {"id": rid, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish}]}
+            body = json.dumps(chunk, ensure_ascii=False, separators=(",", ":"))
+            return b"data: " + body.encode("utf-8") + b"\n\n"
+
+        self._track(request, 200)
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        self.running += 1
+        try:
+            await resp.write(event({"role": "assistant", "content": ""}))
+            chunks = [event({"content": t}) for t in tokens]
+            if await self._paced(request, resp, chunks, event({}, finish_reason) + b"data: [DONE]\n\n"):
+                self.stats["finished"][finish_reason] += 1
+                await resp.write_eof()
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.running -= 1
+        return resp
+
+    # --- Ollama ----------------------------------------------------------------
+    async def handle_tags(self, request):
+        self._track(request, 200)
+        return web.json_response({"models": [{"name": m, "model": m, "size": 0} for m in self.config.ollama_models]})
+
+    async def handle_ps(self, request):
+        self._track(request, 200)
+        return web.json_response({"models": [{"name": m, "model": m} for m in self.config.ollama_models[:1]]})
+
+    async def handle_ollama_chat(self, request):
+        cfg = self.config
+        try:
+            payload = await request.json()
+        except ValueError:
+            self._track(request, 400)
+            return web.json_response({"error": "invalid JSON body"}, status=400)
+        model = payload.get("model") or cfg.ollama_models[0]
+        if model not in cfg.ollama_models:
+            self._track(request, 404)
+            self.stats["failed"] += 1
+            return web.json_response({"error": f"model '{model}' not found, try pulling it first"}, status=404)
+        injected = self._injected_error()
+        if injected:
+            self._track(request, injected[0])
+            self.stats["failed"] += 1
+            return web.json_response({"error": injected[1]}, status=injected[0])
+        messages = payload.get("messages") or []
+        self._count_prompt(messages)
+        num_predict = int((payload.get("options") or {}).get("num_predict") or cfg.tokens)
+        count = min(cfg.tokens, num_predict)
+        tokens = stub_tokens(cfg.seed, messages, count)
+        done_reason = "length" if num_predict <= cfg.tokens else "stop"
+        t0 = time.monotonic_ns()
+
+        def line(content, done=False):
+            obj = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                   "message": {"role": "assistant", "content": content}, "done": done}
+            if done:
+                obj.update({"done_reason": done_reason, "total_duration": time.monotonic_ns() - t0,
+                            "prompt_eval_count": prompt_tokens(messages), "eval_count": count})
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+        self._track(request, 200)
+        if payload.get("stream") is False:
+            await asyncio.sleep(cfg.ttft_ms / 1000.0 + (count / cfg.token_rate if cfg.token_rate > 0 else 0.0))
+            self.stats["generation_tokens"] += count
+            self.stats["finished"][done_reason] += 1
+            body = json.loads(line("".join(tokens), done=True))
+            return web.json_response(body)
+
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await resp.prepare(request)
+        self.running += 1
+        try:
+            if await self._paced(request, resp, [line(t) for t in tokens], line("", done=True)):
+                self.stats["finished"][done_reason] += 1
+                await resp.write_eof()
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.running -= 1
+        return resp
+
+    # --- observability / control -------------------------------------------------
+    async def handle_metrics(self, request):
+        s, model = self.stats, self.config.base_model
+        label = f'{{model_name="{model}"}}'
+        lines = [
+            "# TYPE vllm:num_requests_running gauge",
+            f"vllm:num_requests_running{label} {self.running}",
+            "# TYPE vllm:prompt_tokens_total counter",
+            f"vllm:prompt_tokens_total{label} {s['prompt_tokens']}",
+            "# TYPE vllm:generation_tokens_total counter",
+            f"vllm:generation_tokens_total{label} {s['generation_tokens']}",
+            "# TYPE vllm:prefix_cache_queries_total counter",
+            f"vllm:prefix_cache_queries_total{label} {s['prefix_queries']}",
+            "# TYPE vllm:prefix_cache_hits_total counter",
+            f"vllm:prefix_cache_hits_total{label} {s['prefix_hits']}",
+            "# TYPE vllm:request_success_total counter",
+            *(f'vllm:request_success_total{{finished_reason="{k}",model_name="{model}"}} {v}'
+              for k, v in s["finished"].items()),
+            "# TYPE stub_requests_total counter",
+            *(f'stub_requests_total{{path="{k.split(" ")[0]}",status="{k.split(" ")[1]}"}} {v}'
+              for k, v in sorted(s["requests"].items())),
+            "# TYPE stub_connections_total counter",
+            f"stub_connections_total {s['connections']}",
+        ]
+        return web.Response(text="\n".join(lines) + "\n", content_type="text/plain")
+
+    async def handle_stats(self, request):
+        return web.json_response({**self.stats, "running": self.running, "config": asdict(self.config)})
+
+    async def handle_config(self, request):
+        try:
+            self.config.update(await request.json())
+        except (KeyError, ValueError, TypeError) as e:
+            return web.json_response({"error": f"bad config field: {e}"}, status=400)
+        return web.json_response(asdict(self.config))
+
+    async def handle_reset(self, request):
+        self.reset()
+        return web.json_response({"status": "reset"})
+
+
+async def serve(config, host="127.0.0.1", port=8088, ready=None):
+    """Run until cancelled; `ready(base_url)` fires once the socket is bound."""
+    engine = StubEngine(config)
+    base_url = await engine.start(host, port)
+    if ready:
+        ready(base_url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await engine.stop()
+
+
+def serve_child(config, ready):
+    """multiprocessing target: `config` is asdict(StubConfig), the base URL goes to the `ready` queue."""
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(serve(StubConfig(**config), port=0, ready=ready.put))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="[FEAT-493] Deterministic vLLM/Ollama stub engine")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--tokens", type=int, default=StubConfig.tokens)
+    parser.add_argument("--ttft-ms", type=float, default=StubConfig.ttft_ms)
+    parser.add_argument("--token-rate", type=float, default=StubConfig.token_rate, help="tokens/s, <= 0 for unpaced")
+    parser.add_argument("--max-model-len", type=int, default=StubConfig.max_model_len)
+    parser.add_argument("--lora", action="append", default=None, help="LoRA adapter name (repeatable)")
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--abort-after", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    config = StubConfig(tokens=args.tokens, ttft_ms=args.ttft_ms, token_rate=args.token_rate,
+                        max_model_len=args.max_model_len, fail_first=args.fail_first, error_rate=args.error_rate,
+                        abort_after=args.abort_after, seed=args.seed)
+    if args.lora:
+        config.loras = tuple(args.lora)
+    try:
+        asyncio.run(serve(config, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import hashlib
+import threading
+
+# [FEAT-475] Shared Style Key Cache
+# The Lab key is the first 8 hex chars of md5(field_notes/style.css). It only
+# changes when the stylesheet is redeployed, so hash once per (mtime, size)
+# instead of on every /status poll, WebSocket connect and status write.
+
+STYLE_CSS = os.path.expanduser("~/Dev_Lab/Portfolio_Dev/field_notes/style.css")
+
+_cache = {}  # path -> (mtime_ns, size, key)
+_lock = threading.Lock()
+
+
+def get_style_key(path=STYLE_CSS, fallback="default_key"):
+    """[FEAT-267] Dynamic Key Discovery, memoized on the stylesheet's mtime/size."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return fallback
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[:2] == stamp:
+        return cached[2]
+    with _lock:
+        try:
+            with open(path, "rb") as f:
+                key = hashlib.md5(f.read()).hexdigest()[:8]
+        except OSError:
+            return fallback
+        _cache[path] = (stamp[0], stamp[1], key)
+        return key
+
+
+def clear_style_key_cache():
+    with _lock:
+        _cache.clear()
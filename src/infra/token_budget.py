@@ -0,0 +1,185 @@
+import json
+import logging
+import math
+import os
+
+# [FEAT-480] Exact Token Budgeting
+# Objective: Replace the len/3.8 and chars/4 estimates with real token counts
+# so prompts are packed to the engine's discovered max_model_len up front,
+# instead of learning about an overflow from a vLLM 400.
+#
+# The tokenizer is the local (CPU-only) `tokenizers` fast tokenizer shipped
+# with the served model, loaded once per node. When it is unavailable the
+# counter degrades to a conservative chars/3.5 estimate and says so (`exact`).
+
+HEURISTIC_CHARS_PER_TOKEN = 3.5
+# Chat-template framing (role headers, BOS, eot markers) per message and per request.
+TEMPLATE_TOKENS_PER_MESSAGE = 8
+TEMPLATE_TOKENS_BASE = 16
+MIN_OUTPUT_TOKENS = 150
+SAFETY_MARGIN_TOKENS = 32
+
+# Per-section packing policy: (priority, keep). Lower priority packs first;
+# `keep` decides which end survives truncation. Unlisted sections pack last, head-first.
+SECTION_POLICY = {
+    "CONTEXT_VALIDITY": (0, "head"),
+    "HUB_TOOLS": (1, "head"),
+    "GUIDANCE_FRAME": (2, "head"),
+    "SYSTEM_DESIGN_STANCE": (3, "head"),
+    "PREVIOUS_DEBATE": (4, "tail"),  # most recent exchanges matter most
+}
+
+
+def _model_dir(model_ref):
+    """Manifest key / alias / path -> local model directory, or None."""
+    if not model_ref:
+        return None
+    if os.path.isdir(model_ref):
+        return model_ref
+    infra_config = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                "config", "infrastructure.json")
+    try:
+        with open(infra_config, "r") as f:
+            manifest = json.load(f).get("model_manifest", {})
+        ref = manifest.get(model_ref, model_ref)
+        ref = manifest.get(ref, ref)  # 'unified-base' -> key -> path
+        return ref if os.path.isdir(ref) else None
+    except Exception:
+        return None
+
+
+def load_tokenizer(model_ref):
+    """Load the model's fast tokenizer from disk (no network, no GPU). Returns None if unavailable."""
+    path = _model_dir(model_ref)
+    if not path:
+        return None
+    tokenizer_json = os.path.join(path, "tokenizer.json")
+    try:
+        if os.path.exists(tokenizer_json):
+            from tokenizers import Tokenizer
+            return Tokenizer.from_file(tokenizer_json)
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(path, local_files_only=True)
+    except Exception as e:
+        logging.warning(f"[TOKENS] Tokenizer load failed for {path}: {e}")
+        return None
+
+
+class TokenCounter:
+    """[FEAT-480] Exact token counts when a tokenizer is present, conservative estimates otherwise."""
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    @property
+    def exact(self):
+        return self.tokenizer is not None
+
+    def encode(self, text):
+        if hasattr(self.tokenizer, "encode_batch"):  # tokenizers.Tokenizer
+            return self.tokenizer.encode(text, add_special_tokens=False).ids
+        return self.tokenizer.encode(text, add_special_tokens=False)
+
+    def count(self, text):
+        if not text:
+            return 0
+        if self.tokenizer is None:
+            return math.ceil(len(text) / HEURISTIC_CHARS_PER_TOKEN)
+        return len(self.encode(text))
+
+    def count_messages(self, messages):
+        return TEMPLATE_TOKENS_BASE + sum(
+            TEMPLATE_TOKENS_PER_MESSAGE + self.count(m.get("content", "")) for m in messages
+        )
+
+    def truncate(self, text, max_tokens, keep="head"):
+        """Cut `text` to at most `max_tokens`, keeping its head or tail."""
+        if max_tokens <= 0 or not text:
+            return ""
+        if self.tokenizer is None:
+            max_chars = int(max_tokens * HEURISTIC_CHARS_PER_TOKEN)
+            if len(text) <= max_chars:
+                return text
+            return text[-max_chars:] if keep == "tail" else text[:max_chars]
+        ids = self.encode(text)
+        if len(ids) <= max_tokens:
+            return text
+        ids = ids[-max_tokens:] if keep == "tail" else ids[:max_tokens]
+        return self.tokenizer.decode(ids)
+
+
+def section_cost(counter, name, text):
+    """Tokens a section adds to the prompt tail ('[NAME]:\\n<text>' plus separator)."""
+    return counter.count(f"[{name}]:\n{text}\n\n")
+
+
+def pack_sections(counter, sections, budget):
+    """
+    Fit `sections` ({name: text}) into `budget` tokens by SECTION_POLICY priority.
+    Whole sections are kept while they fit; the first one that does not is
+    truncated to the remainder and everything after it is dropped.
+    Returns (packed, report) where report maps name -> (kept_tokens, original_tokens).
+    """
+    def _policy(name):
+        return SECTION_POLICY.get(name, (len(SECTION_POLICY), "head"))
+
+    packed, report = {}, {}
+    remaining = max(0, budget)
+    for name in sorted((n for n, t in sections.items() if t), key=lambda n: (_policy(n)[0], n)):
+        text = sections[name]
+        cost = section_cost(counter, name, text)
+        if cost <= remaining:
+            packed[name] = text
+            report[name] = (cost, cost)
+            remaining -= cost
+            continue
+        room = remaining - section_cost(counter, name, "")
+        cut = counter.truncate(text, room, keep=_policy(name)[1]) if room >= 32 else ""
+        if cut:
+            packed[name] = cut
+        report[name] = (section_cost(counter, name, cut) if cut else 0, cost)
+        remaining = 0
+    return packed, report
+
+
+class ContextWindowExceeded(ValueError):
+    """The fixed system prefix leaves no room for the query and a minimal reply."""
+
+
+def fit_prompt(counter, layout, query, sections, system_override, max_model_len, max_tokens):
+    """
+    [FEAT-480] Pack a turn into the engine window.
+    The system prefix is never cut; an oversized query keeps its tail; sections
+    pack by priority into what is left after reserving room for the reply.
+    Returns (system_prompt, user_message, max_tokens, report). Raises
+    ContextWindowExceeded when the system prefix alone does not fit.
+    """
+    system, query, sections = layout.split(query, sections, system_override)
+    window = max_model_len - SAFETY_MARGIN_TOKENS
+    frame = "\n\n---\n[DYNAMIC_CONTEXT]:\n"
+
+    def _fixed(q):
+        return counter.count_messages([{"content": system}, {"content": q + frame}])
+
+    fixed = _fixed(query)
+    if fixed + MIN_OUTPUT_TOKENS > window:
+        allowed = window - MIN_OUTPUT_TOKENS - (fixed - counter.count(query))
+        if allowed < 1:
+            raise ContextWindowExceeded(
+                f"System prefix exceeds context window: {fixed - counter.count(query)} prefix tokens + "
+                f"{MIN_OUTPUT_TOKENS} reply tokens > {window} usable of {max_model_len}.")
+        query = counter.truncate(query, allowed, keep="tail")
+        fixed = _fixed(query)
+        logging.warning(f"[TOKENS] Query truncated to fit {max_model_len}-token window.")
+
+    reserve = min(max_tokens, max(MIN_OUTPUT_TOKENS, (window - fixed) // 2))
+    packed, report = pack_sections(counter, sections, window - fixed - reserve)
+    system, user = layout.render(system, query, packed)
+    prompt_tokens = counter.count_messages([{"content": system}, {"content": user}])
+    fitted_max = max(1, min(max_tokens, window - prompt_tokens))
+    return system, user, fitted_max, {
+        "prompt_tokens": prompt_tokens,
+        "max_tokens": fitted_max,
+        "exact": counter.exact,
+        "sections": report,
+    }
@@ -0,0 +1,237 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import zlib
+
+# [FEAT-495] Background Trace Sink
+# Objective: BicameralNode._mirror_trace opened logs/trace_{node}.json and wrote
+# an indent=2 JSON document on every send and every receive, on the event loop,
+# in the middle of token generation. The sink moves all of that off the hot path:
+#   - submit() snapshots the entry's containers and does a put_nowait on a
+#     bounded queue; a full queue drops the entry (counted) instead of blocking.
+#     The worker also holds the batch it is writing (at most
+#     min(queue_size, WRITE_BATCH) entries), so the effective in-memory bound
+#     is queue_size + min(queue_size, WRITE_BATCH) entries
+#   - one daemon worker per file drains the queue in batches, encodes compact
+#     NDJSON and appends each batch with a single O_APPEND write
+#   - the file rotates by size into .1 .. .N backups
+#   - flush() blocks until everything submitted before it is on disk; close()
+#     flushes and stops the worker (also run at interpreter exit)
+#   - sampled(request_id) is a per-request decision, so a turn's send and recv
+#     entries are kept or skipped together on high-volume sessions
+
+NODE_TRACE_ENABLED = os.environ.get("LAB_NODE_TRACE", "1") == "1"
+NODE_TRACE_SAMPLE = float(os.environ.get("LAB_NODE_TRACE_SAMPLE", "1.0"))
+NODE_TRACE_QUEUE = int(os.environ.get("LAB_NODE_TRACE_QUEUE", "1024"))
+NODE_TRACE_MAX_BYTES = int(float(os.environ.get("LAB_NODE_TRACE_MAX_MB", "32")) * 1024 * 1024)
+NODE_TRACE_BACKUPS = int(os.environ.get("LAB_NODE_TRACE_BACKUPS", "3"))
+
+WRITE_BATCH = 256
+
+
+def _snapshot(obj):
+    """Copy dict/list structure so later in-place edits (e.g. the FEAT-431 retry) never reach the file."""
+    if isinstance(obj, dict):
+        return {k: _snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_snapshot(v) for v in obj]
+    return obj
+
+
+class _Flush:
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+class TraceSink:
+    """[FEAT-495] Bounded-queue NDJSON writer with size rotation; one per file path."""
+
+    def __init__(self, path, max_bytes=NODE_TRACE_MAX_BYTES, backups=NODE_TRACE_BACKUPS,
+                 queue_size=NODE_TRACE_QUEUE, sample=NODE_TRACE_SAMPLE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.sample = sample
+        self.stats = {"submitted": 0, "written": 0, "dropped": 0, "sampled_out": 0, "rotations": 0, "errors": 0}
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._batch_max = min(WRITE_BATCH, self._queue.maxsize)  # in-hand batch counts toward the bound
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._fd = None
+        self._size = 0
+
+    def sampled(self, request_id=None):
+        """Keep this turn? Stable per request_id; untagged ("default") turns are drawn at random."""
+        if self.sample >= 1.0:
+            return True
+        if self.sample <= 0.0:
+            self.stats["sampled_out"] += 1
+            return False
+        if request_id and request_id != "default":
+            keep = zlib.crc32(str(request_id).encode("utf-8")) % 10000 < self.sample * 10000
+        else:
+            keep = random.random() < self.sample
+        if not keep:
+            self.stats["sampled_out"] += 1
+        return keep
+
+    def submit(self, entry):
+        """Queue one record without blocking. False when it was dropped (queue full or sink closed)."""
+        if self._closed:
+            self.stats["dropped"] += 1
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(_snapshot(entry))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] == 1:
+                logging.warning(f"[TRACE] Sink queue full for {self.path}; dropping entries until the writer catches up.")
+            return False
+        self.stats["submitted"] += 1
+        return True
+
+    def flush(self, timeout=5.0):
+        """Block until every entry submitted before this call has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.event.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush, stop the worker and release the file. Later submits are dropped."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self.flush(timeout)
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self._close_fd()
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name=f"trace-sink:{os.path.basename(self.path)}",
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, markers, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self._batch_max:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.event.set()
+            if stop:
+                return
+
+    def _encode(self, entry):
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+    def _write(self, batch):
+        lines = []
+        for entry in batch:
+            try:
+                lines.append(self._encode(entry))
+            except (TypeError, ValueError) as e:
+                self.stats["errors"] += 1
+                logging.debug(f"[TRACE] Unencodable trace entry skipped: {e}")
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            if self._fd is None:
+                self._open()
+            if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            os.write(self._fd, data)
+            self._size += len(data)
+            self.stats["written"] += len(lines)
+        except OSError as e:
+            self.stats["errors"] += 1
+            logging.debug(f"[TRACE] Trace write to {self.path} failed: {e}")
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = os.fstat(self._fd).st_size
+
+    def _close_fd(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def _rotate(self):
+        """trace.json -> trace.json.1 -> ... -> trace.json.N (oldest removed)."""
+        self._close_fd()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.stats["rotations"] += 1
+        self._open()
+
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(path, **kwargs):
+    """Shared sink for `path` (several nodes in one process reuse one writer per file)."""
+    path = os.path.abspath(path)
+    with _sinks_lock:
+        sink = _sinks.get(path)
+        if sink is None or sink._closed:
+            sink = _sinks[path] = TraceSink(path, **kwargs)
+        return sink
+
+
+def close_all(timeout=5.0):
+    """[FEAT-495] Flush-on-shutdown for every open sink."""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.close(timeout)
+
+
+atexit.register(close_all)
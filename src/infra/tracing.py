@@ -0,0 +1,336 @@
+import contextvars
+import datetime
+import glob
+import html
+import json
+import logging
+import os
+import threading
+import time
+
+# [FEAT-481] Request-Scoped Span Tracing
+# One trace per request_id, spanning the Foyer (queue wait, division of labor,
+# waterfall drain/broadcast), the Hub (triage, HyDE, RAG, node legs) and the
+# resident nodes (archive get_context phases, LLM TTFT/decode).
+#
+# Every process appends finished spans to the same per-day NDJSON file with a
+# single O_APPEND write, so no collector process is needed. The request_id
+# crosses process boundaries the way it already does: as an MCP tool argument
+# and in the HTTP relay payloads. Inside a process it rides a contextvar, so
+# tasks spawned from a traced coroutine inherit it.
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TRACE_DIR = os.environ.get("LAB_TRACE_DIR", os.path.join(LAB_DIR, "logs", "traces"))
+TRACING_ENABLED = os.environ.get("LAB_TRACING", "1") == "1"
+TRACE_RETENTION_DAYS = 7
+
+_current_span = contextvars.ContextVar("lab_trace_span", default=None)
+_current_request = contextvars.ContextVar("lab_trace_request", default=None)
+_service = os.environ.get("LAB_TRACE_SERVICE", "lab")
+
+
+def set_service(name):
+    """Label every span from this process (e.g. 'foyer', 'pinky', 'archive')."""
+    global _service
+    _service = str(name).lower()
+
+
+def current_request_id():
+    return _current_request.get()
+
+
+def bind_request(request_id):
+    """Make `request_id` the ambient trace key for this task and the tasks it spawns."""
+    return _current_request.set(request_id)
+
+
+class Span:
+    """A timed operation. Use as a (async) context manager, or call end() explicitly."""
+
+    __slots__ = ("name", "request_id", "span_id", "parent_id", "service", "attrs",
+                 "t_us", "d_us", "_p0", "_lap", "_token", "_req_token", "_store")
+
+    def __init__(self, name, request_id=None, parent=None, store=None, service=None, **attrs):
+        parent = parent if parent is not None else _current_span.get()
+        self.name = name
+        self.request_id = request_id or (parent.request_id if parent else None) or _current_request.get() or "default"
+        self.span_id = os.urandom(4).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.service = service or (parent.service if parent else _service)
+        self.attrs = attrs
+        self.t_us = time.time_ns() // 1000
+        self.d_us = None
+        self._p0 = time.perf_counter()
+        self._lap = None
+        self._token = None
+        self._req_token = None
+        self._store = store
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def lap(self, name, **attrs):
+        """Close the running phase (if any) and start `name` as the next child phase."""
+        if self._lap is not None:
+            self._lap.end()
+        self._lap = Span(name, parent=self, store=self._store, **attrs)
+        return self._lap
+
+    def end(self, **attrs):
+        if self.d_us is not None:
+            return self
+        if self._lap is not None:
+            self._lap.end()
+            self._lap = None
+        self.attrs.update(attrs)
+        self.d_us = int((time.perf_counter() - self._p0) * 1_000_000)
+        (self._store or get_store()).write(self.to_record())
+        return self
+
+    def to_record(self):
+        rec = {"r": self.request_id, "s": self.span_id, "n": self.name, "svc": self.service,
+               "t": self.t_us, "d": self.d_us}
+        if self.parent_id:
+            rec["p"] = self.parent_id
+        if self.attrs:
+            rec["a"] = self.attrs
+        return rec
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        self._req_token = _current_request.set(self.request_id)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.end()
+        _current_span.reset(self._token)
+        _current_request.reset(self._req_token)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class _NullSpan:
+    """Stand-in when tracing is disabled; same surface, no I/O."""
+
+    request_id = span_id = parent_id = None
+
+    def set(self, **attrs):
+        return self
+
+    def lap(self, name, **attrs):
+        return self
+
+    def end(self, **attrs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def span(name, request_id=None, service=None, **attrs):
+    """New span under the current one. Enter it to make it current; inside async
+    generators call end() in a finally instead, since they may be closed from another context."""
+    if not TRACING_ENABLED:
+        return NULL_SPAN
+    return Span(name, request_id=request_id, service=service, **attrs)
+
+
+def lap(name, **attrs):
+    """Start the next phase of the current span (no-op outside a span)."""
+    current = _current_span.get()
+    if current is not None:
+        current.lap(name, **attrs)
+
+
+def record_span(name, request_id, start_s, end_s=None, service=None, **attrs):
+    """Record an interval measured elsewhere (e.g. queue wait from an enqueue timestamp)."""
+    if not TRACING_ENABLED:
+        return None
+    end_s = time.time() if end_s is None else end_s
+    rec = {"r": request_id or "default", "s": os.urandom(4).hex(), "n": name, "svc": service or _service,
+           "t": int(start_s * 1_000_000), "d": max(0, int((end_s - start_s) * 1_000_000))}
+    parent = _current_span.get()
+    if parent is not None and parent.request_id == rec["r"]:
+        rec["p"] = parent.span_id
+    if attrs:
+        rec["a"] = attrs
+    get_store().write(rec)
+    return rec
+
+
+class TraceStore:
+    """[FEAT-481] Append-only per-day NDJSON span store shared by all Lab processes."""
+
+    def __init__(self, directory=TRACE_DIR, retention_days=TRACE_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._fd = None
+        self._day = None
+        self._lock = threading.Lock()
+
+    def _path(self, day):
+        return os.path.join(self.directory, f"spans_{day}.ndjson")
+
+    def write(self, rec):
+        line = (json.dumps(rec, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        day = datetime.date.today().strftime("%Y%m%d")
+        try:
+            with self._lock:
+                if day != self._day:
+                    if self._fd is not None:
+                        os.close(self._fd)
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._fd = os.open(self._path(day), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                    self._day = day
+                    self.prune()
+                os.write(self._fd, line)  # one write per span: lines from concurrent processes never interleave
+        except OSError as e:
+            logging.debug(f"[TRACE] Span write failed: {e}")
+
+    def prune(self):
+        cutoff = (datetime.date.today() - datetime.timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for path in glob.glob(os.path.join(self.directory, "spans_*.ndjson")):
+            if os.path.basename(path)[6:14] < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _files(self, days):
+        today = datetime.date.today()
+        return [self._path((today - datetime.timedelta(days=i)).strftime("%Y%m%d")) for i in range(days)]
+
+    def load(self, request_id, days=2):
+        """All spans for `request_id` from the last `days` files."""
+        needle = f'"r":{json.dumps(request_id)}'
+        spans = []
+        for path in self._files(days):
+            try:
+                with open(path, "r") as f:
+                    for line in f:
+                        if needle in line:
+                            try:
+                                spans.append(json.loads(line))
+                            except ValueError:
+                                continue
+            except OSError:
+                continue
+        return spans
+
+    def recent(self, limit=20, tail_bytes=512 * 1024):
+        """Most recent request_ids with their span count and wall-clock extent."""
+        path = self._files(1)[0]
+        summary = {}
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                offset = max(0, f.tell() - tail_bytes)
+                f.seek(offset)
+                chunk = f.read().decode("utf-8", errors="replace").splitlines()
+                if offset:
+                    chunk = chunk[1:]  # first line is likely partial
+        except OSError:
+            return []
+        for line in chunk:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            s = summary.setdefault(rec["r"], {"request_id": rec["r"], "spans": 0, "start": rec["t"], "end": 0})
+            s["spans"] += 1
+            s["start"] = min(s["start"], rec["t"])
+            s["end"] = max(s["end"], rec["t"] + rec["d"])
+        rows = sorted(summary.values(), key=lambda s: s["end"], reverse=True)[:limit]
+        return [{"request_id": s["request_id"], "spans": s["spans"], "total_ms": round((s["end"] - s["start"]) / 1000.0, 1),
+                 "ended": s["end"] / 1_000_000} for s in rows]
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = TraceStore()
+    return _store
+
+
+def set_store(store):
+    global _store
+    _store = store
+
+
+def waterfall(spans):
+    """Order spans for display: start offset, duration and nesting depth relative to the first span."""
+    if not spans:
+        return {"total_ms": 0.0, "rows": [], "by_service": {}}
+    by_id = {s["s"]: s for s in spans}
+
+    def _depth(s):
+        depth, seen = 0, set()
+        while s.get("p") in by_id and s["s"] not in seen:
+            seen.add(s["s"])
+            s = by_id[s["p"]]
+            depth += 1
+        return depth
+
+    t0 = min(s["t"] for s in spans)
+    t1 = max(s["t"] + s["d"] for s in spans)
+    rows, by_service = [], {}
+    for s in sorted(spans, key=lambda s: (s["t"], -s["d"])):
+        rows.append({
+            "name": s["n"], "service": s.get("svc", ""), "span_id": s["s"], "parent_id": s.get("p"),
+            "depth": _depth(s), "start_ms": round((s["t"] - t0) / 1000.0, 2), "dur_ms": round(s["d"] / 1000.0, 2),
+            "attrs": s.get("a", {}),
+        })
+        if s.get("p") not in by_id:  # root-level spans only, so nested phases are not double counted
+            by_service[s.get("svc", "")] = round(by_service.get(s.get("svc", ""), 0.0) + s["d"] / 1000.0, 2)
+    return {"total_ms": round((t1 - t0) / 1000.0, 2), "rows": rows, "by_service": by_service}
+
+
+def render_waterfall_html(request_id, view):
+    """Self-contained waterfall page (one bar per span, indented by depth)."""
+    total = view["total_ms"] or 1.0
+    bars = []
+    for row in view["rows"]:
+        left = 100.0 * row["start_ms"] / total
+        width = max(0.2, 100.0 * row["dur_ms"] / total)
+        label = html.escape(f"{row['service']} · {row['name']}")
+        title = html.escape(json.dumps(row["attrs"], default=str)) if row["attrs"] else ""
+        bars.append(
+            f'<div class="row"><div class="lbl" style="padding-left:{row["depth"] * 12}px">{label}</div>'
+            f'<div class="lane"><div class="bar svc-{html.escape(row["service"])}" title="{title}" '
+            f'style="left:{left:.3f}%;width:{width:.3f}%"></div></div>'
+            f'<div class="ms">{row["start_ms"]:.1f} +{row["dur_ms"]:.1f} ms</div></div>'
+        )
+    return (
+        "<!doctype html><html><head><meta charset='utf-8'>"
+        f"<title>trace {html.escape(request_id)}</title><style>"
+        "body{font:12px monospace;background:#111;color:#ddd;margin:16px}"
+        ".row{display:flex;align-items:center;height:18px}.lbl{width:320px;overflow:hidden;white-space:nowrap}"
+        ".lane{position:relative;flex:1;height:12px;background:#1c1c1c}.bar{position:absolute;height:12px;background:#4a9}"
+        ".svc-foyer{background:#c84}.svc-hub{background:#48c}.svc-archive{background:#a6c}.ms{width:160px;text-align:right}"
+        "</style></head><body>"
+        f"<h3>{html.escape(request_id)} — {view['total_ms']:.1f} ms</h3>"
+        + "".join(bars) + "</body></html>"
+    )
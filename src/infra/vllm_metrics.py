@@ -0,0 +1,91 @@
+import urllib.request
+
+# [FEAT-479] vLLM Prefix-Cache Meter
+# Scrapes the engine's Prometheus endpoint and reports how much of the prompt
+# stream was served from cached KV blocks. Counter names moved between vLLM
+# releases, so every known spelling is accepted; label sets are summed.
+
+VLLM_METRICS_URL = "http://localhost:8088/metrics"
+
+_QUERY_COUNTERS = (
+    "vllm:prefix_cache_queries_total", "vllm:prefix_cache_queries",
+    "vllm:gpu_prefix_cache_queries_total", "vllm:gpu_prefix_cache_queries",
+)
+_HIT_COUNTERS = (
+    "vllm:prefix_cache_hits_total", "vllm:prefix_cache_hits",
+    "vllm:gpu_prefix_cache_hits_total", "vllm:gpu_prefix_cache_hits",
+)
+# Pre-V1 engines only expose a lifetime hit-rate gauge.
+_HIT_RATE_GAUGES = ("vllm:gpu_prefix_cache_hit_rate",)
+
+
+def parse_prom_metrics(text, names):
+    """Sum sample values per metric name (labels ignored) for the requested names."""
+    wanted = set(names)
+    totals = {}
+    for line in text.splitlines():
+        if not line or line[0] == "#":
+            continue
+        name_end = len(line)
+        for sep in ("{", " "):
+            idx = line.find(sep)
+            if 0 < idx < name_end:
+                name_end = idx
+        name = line[:name_end]
+        if name not in wanted:
+            continue
+        try:
+            value = float(line.rsplit(" ", 1)[1])
+        except (IndexError, ValueError):
+            continue
+        totals[name] = totals.get(name, 0.0) + value
+    return totals
+
+
+def _first(totals, names):
+    for name in names:
+        if name in totals:
+            return totals[name]
+    return None
+
+
+def _fetch(url, timeout=2.0):
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.read().decode("utf-8", errors="replace")
+
+
+class PrefixCacheMeter:
+    """
+    [FEAT-479] Windowed prefix-cache hit rate.
+    `sample()` returns the lifetime rate plus the rate since the previous
+    sample, which is what shows whether the current prompt layout is reusing
+    its prefix. Returns None when the engine exposes no prefix-cache metrics.
+    """
+
+    def __init__(self, url=VLLM_METRICS_URL, fetch=_fetch):
+        self.url = url
+        self._fetch = fetch
+        self._last = None  # (queries, hits)
+
+    def read(self, text):
+        totals = parse_prom_metrics(text, _QUERY_COUNTERS + _HIT_COUNTERS + _HIT_RATE_GAUGES)
+        queries, hits = _first(totals, _QUERY_COUNTERS), _first(totals, _HIT_COUNTERS)
+        if queries is None or hits is None:
+            gauge = _first(totals, _HIT_RATE_GAUGES)
+            return None if gauge is None else {"hit_rate": round(gauge, 4), "window_hit_rate": None}
+
+        window = None
+        if self._last is not None:
+            d_queries, d_hits = queries - self._last[0], hits - self._last[1]
+            if d_queries > 0 and d_hits >= 0:  # counters reset on engine restart
+                window = round(d_hits / d_queries, 4)
+        self._last = (queries, hits)
+        return {
+            "hit_rate": round(hits / queries, 4) if queries else 0.0,
+            "window_hit_rate": window,
+            "queried_tokens": int(queries),
+            "hit_tokens": int(hits),
+        }
+
+    def sample(self):
+        return self.read(self._fetch(self.url))
@@ -7,6 +7,10 @@ import re
 import time
 import random
 from v5.common.types import LAB_VERSION
+from logic.triage_cache import TriageCache, file_signature, prompt_fingerprint
+from logic.rag_cache import RagCache
+from logic.leg_scheduler import BASELINE_GRACE_S, LegScheduler, LegStats
+from infra import tracing
 
 # [FEAT-442] QPR Pre-Retrieval Query De-Noising Patterns
 # Strips conversational framing, filler, and politeness while preserving
@@ -127,6 +131,56 @@ def _load_hyde_synthesis_prompt():
 
 HYDE_SYNTHESIS_PROMPT = _load_hyde_synthesis_prompt()
 
+# [FEAT-436] Unified Intent-HyDE Guided Decoding Schema & Context
+TRIAGE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "prereflection_triage_result",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "inferred_intent": {"type": "string"},
+                "addressed_to": {"type": "string", "enum": ["NONE", "BRAIN", "PINKY", "MICE"]},
+                "vibe": {"type": "string", "enum": ["TECHNICAL", "CASUAL", "HISTORICAL", "ANALYTICAL", "OPERATIONAL", "FORENSIC", "META", "WYWO", "DEEP_RESEARCH"]},
+                "domain": {"type": "string", "enum": ["exp_tlm", "exp_bkm", "exp_for", "standard", "lab_history"]},
+                "casual": {"type": "number"},
+                "intrigue": {"type": "number"},
+                "importance": {"type": "number"},
+                "situation": {"type": "string"},
+                "hints": {"type": "string"},
+                "hyde_vector_text": {
+                    "type": "string",
+                    "description": "3-part multi-voice Composite HyDE Vector Query. For technical, historical, or validation queries, synthesize EXACTLY this format: [VALIDATION]: <silicon_term_or_pcie_ras> | [STRATEGY]: <focal_goal_or_leadership_impact> | [SRE]: <bkm_scar_or_shell_command>. For casual quips or greetings, emit an empty string."
+                }
+            },
+            "required": ["inferred_intent", "addressed_to", "vibe", "domain", "casual", "intrigue", "importance", "hyde_vector_text"]
+        }
+    }
+}
+
+# [FEAT-451/452] Brain Persona grounding + 4-Domain HyDE Domain Map Contract
+TRIAGE_MODE_CONTEXT = (
+    '[MODE]: UNIFIED PRE-REFLECTION & TRIAGE\n'
+    + BRAIN_PERSONA_SPEC + '\n'
+    "Translate user intent (I think the user is trying to say...).\n"
+    'HyDE synthesis is gated by the 4-Domain HyDE Map Contract:\n'
+    '  1. exp_tlm (Silicon Telemetry): PCIe error bursts, RAPL power/thermal caps, NVIDIA GPU metrics, MSR registers, Redfish sensors.\n'
+    '  2. exp_bkm (SRE playbooks): Point-of-failure playbooks, diagnostic shell BKMs, test runner steps, systemd service topologies.\n'
+    '  3. exp_for (Forensic Logs): Kernel panic tracebacks, OOM crash logs, backpressure ledgers, memory pressure root cause analysis.\n'
+    '  4. lab_history (18-Year Archive): historical project notes (2005-2025), career milestones, past sprint retrospectives.\n'
+    'If the intent maps to a domain, synthesize in hyde_vector_text a 3-part Composite HyDE Vector Query:\n'
+    '[VALIDATION]: <silicon_term_or_pcie_ras> | [STRATEGY]: <focal_goal_or_leadership_impact> | [SRE]: <bkm_scar_or_shell_command>\n'
+    'If the intent does NOT map to the 4 domains (casual greetings, status checks, pleasantries, meta-talk), set hyde_vector_text: "" and vibe: CASUAL. No hardcoded string arrays (BKM-015).\n'
+    'For casual quips or greetings, set addressed_to: PINKY, vibe: CASUAL, importance: 0.1, hyde_vector_text: empty string.'
+)
+
+# [FEAT-476] Triage cache revision: any edit to the prompt or schema drops cached results
+TRIAGE_FINGERPRINT = prompt_fingerprint(TRIAGE_SCHEMA, TRIAGE_MODE_CONTEXT)
+
+# [FEAT-477] Speculative RAG: raw-query retrieval starts alongside triage
+SPECULATIVE_RAG = os.environ.get("LAB_SPECULATIVE_RAG", "1") == "1"
+SPECULATIVE_REFINE_BUDGET = 2.0  # seconds the HyDE retrieval gets before a finished prefetch is served
+
 # [FEAT-T20.2] Lazy import — avoids hard dep if DCGM is absent
 def _get_telemetry_collector():
     try:
@@ -180,8 +234,13 @@ class CognitiveHub:
         # [FEAT-356] Foil-Aware Memory (Unified Session Ledger)
         self.round_table_memory = []
         self.turn_thought_trace = {}
-        # [FEAT-441-Cache] Lightweight RAG response cache (max 128, LRU eviction)
-        self._rag_cache = {}
+        # [FEAT-441-Cache][FEAT-478] RAG response cache: LRU, byte budget, TTL, archive generation
+        self._rag_cache = RagCache()
+        # [FEAT-477] In-flight speculative retrievals, keyed by turn text
+        self._rag_prefetch = {}
+        self.rag_prefetch_stats = {"started": 0, "cancelled": 0, "served": 0, "refined": 0}
+        # [FEAT-482] Per-leg outcomes, latency percentiles and utility across turns
+        self.leg_stats = LegStats()
         
         # [Task 6.3] Hygiene: Process Tracking
         self.processed_ids = deque(maxlen=1000)
@@ -207,12 +266,15 @@ class CognitiveHub:
         self._config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config")
         self._role_tokens_path = os.path.join(self._config_dir, "role_tokens.json")
         self.role_tokens = {}
-        if os.path.exists(self._role_tokens_path):
-            try:
-                with open(self._role_tokens_path, "r") as f:
-                    self.role_tokens = json.load(f)
-            except Exception:
-                pass
+        self._role_tokens_sig = None
+        self._reload_role_tokens()
+
+        # [FEAT-476] Semantic triage cache (invalidated by prompt/schema or role_tokens.json edits)
+        self.triage_cache = TriageCache(
+            fingerprint=TRIAGE_FINGERPRINT,
+            watch_files=(self._role_tokens_path,),
+            refine=qpr_refine_query,
+        )
 
         # [BKM-015] Token → routing override map.
         # Tokens live in config/role_tokens.json (single source of truth);
@@ -238,12 +300,29 @@ class CognitiveHub:
             if underlying is not node and hasattr(underlying, '_on_telemetry'):
                 underlying._on_telemetry = self._collect_telemetry
 
+    def _reload_role_tokens(self):
+        """[BKM-015] (Re)load config/role_tokens.json when it changes on disk."""
+        sig = file_signature(self._role_tokens_path)
+        if sig == self._role_tokens_sig:
+            return
+        self._role_tokens_sig = sig
+        if os.path.exists(self._role_tokens_path):
+            try:
+                with open(self._role_tokens_path, "r") as f:
+                    self.role_tokens = json.load(f)
+            except Exception:
+                pass
+
     def get_status(self):
         """Return current system status including boot info."""
         return {
             "boot_commit": getattr(self, "boot_commit", "unknown"),
             "boot_timestamp": getattr(self, "boot_timestamp", 0),
-            "service": "lab-attendant"
+            "service": "lab-attendant",
+            "triage_cache": self.triage_cache.report(),
+            "rag_cache": self._rag_cache.report(),
+            "rag_prefetch": dict(self.rag_prefetch_stats),
+            "legs": self.leg_stats.report(),
         }
 
     async def evaluate_response_async(self, query: str, response: str, session_id: str = "default"):
@@ -502,6 +581,9 @@ class CognitiveHub:
                 "channel": channel
             })
 
+        # [FEAT-481] Leg span (ended in finally: this generator may be closed early)
+        leg, ttft_ms, full_text = tracing.NULL_SPAN, None, ""
+        call_task = None
         try:
             # [Task 2.3] Persona Interest: Adjust behavioral density based on scalar
             stance = ""
@@ -531,6 +613,8 @@ class CognitiveHub:
             buf_key = f"{request_id}_{src_key}"
             self.session_buffers[buf_key] = ""
             
+            leg = tracing.span(f"node.{node_id}", request_id=request_id, service="hub")
+            leg_t0 = time.perf_counter()
             # [Task 9.2] Hub relies on the Node's telemetry queue to populate the Foyer drainer.
             call_task = asyncio.create_task(node.call_tool("think", arguments={
                 "query": query, "context": context, "tools": tools or [], 
@@ -548,6 +632,8 @@ class CognitiveHub:
                 if len(curr_buffer) > last_len:
                     new_tokens = curr_buffer[last_len:]
                     full_text += new_tokens
+                    if ttft_ms is None:
+                        ttft_ms = round((time.perf_counter() - leg_t0) * 1000.0, 1)
                     
                     # Check for peer-vote interest boosting signals [FEAT-238]
                     if ("<boost_interest>" in full_text or "<upvote>" in full_text) and not self._boosted_interest:
@@ -629,6 +715,12 @@ class CognitiveHub:
             
         except Exception as e:
             logging.error(f"[HUB] Stream from {node_id} failed: {e}")
+            leg.set(error=str(e)[:120])
+        finally:
+            # [FEAT-482] A cancelled leg must not leave its think() call running
+            if call_task is not None and not call_task.done():
+                call_task.cancel()
+            leg.end(ttft_ms=ttft_ms, chars=len(full_text), starved="[ERROR: CONTEXT_STARVED]" in full_text)
 
     async def execute_dispatch(self, text, source_name, shutdown_event=None, retry_count=0, final=False):
         """Dispatches a finalized block to the UI."""
@@ -676,10 +768,22 @@ class CognitiveHub:
 # [FEAT-106] Async Coordination Engine
     async def process_query(self, turn, shutdown_event=None, request_id=None, trigger_briefing_callback=None):
         """[FEAT-145] Main Reasoning Waterfall."""
-        self.turn_thought_trace = {}
         if request_id is None:
             import uuid
             request_id = uuid.uuid4().hex[:8]
+        # [FEAT-481] Root hub span; triage/route/dispatch are recorded as its phases
+        async with tracing.span("hub.process_query", request_id=request_id, service="hub") as sp:
+            try:
+                result = await self._process_query(turn, shutdown_event, request_id, trigger_briefing_callback)
+            finally:
+                # [FEAT-477] A turn cancelled by the router's wait_for budget or failing mid-way must not
+                # leave its prefetch behind: the next identical turn would be served that stale result
+                self._discard_rag_prefetch(turn, "turn exited")
+            sp.set(vibe=getattr(self, "current_vibe", ""))
+            return result
+
+    async def _process_query(self, turn, shutdown_event, request_id, trigger_briefing_callback):
+        self.turn_thought_trace = {}
         
         # [NEW] Unified Early Priming
         logging.info(f"[PRIME] Spawning priming task for: {turn[:20]}")
@@ -742,6 +846,7 @@ class CognitiveHub:
         t_parsed = None
         
         # [BKM-015] Role Token Routing: Bypass LLM triage if query contains a role token
+        self._reload_role_tokens()
         if self.role_tokens:
             for token in self.role_tokens:
                 if token in turn:
@@ -776,6 +881,26 @@ class CognitiveHub:
                 "hyde_vector_text": ""
             }
 
+        # [FEAT-476] Semantic Triage Cache: a repeat intent skips straight to routing
+        tracing.lap("triage")
+        if t_parsed is None:
+            cached, similarity = self.triage_cache.lookup(turn, TRIAGE_FINGERPRINT)
+            if cached is not None:
+                # Routing comes from the cache; the query-specific fields are left for this turn
+                # (resolve_hyde_vector falls through to Deep Thought synthesis)
+                t_parsed = {**cached, "inferred_intent": "", "situation": "", "hints": "", "hyde_vector_text": ""}
+                logging.info(f"[HUB] Triage cache hit (similarity={similarity}). Vibe: {t_parsed.get('vibe')}")
+                await self.broadcast({
+                    "type": "crosstalk",
+                    "brain": f"[HUB] Triage cache hit ({similarity:.2f}). Vibe: {t_parsed.get('vibe')}",
+                    "brain_source": "System",
+                    "version": LAB_VERSION
+                })
+
+        # [FEAT-477] Speculative RAG: overlap raw-query retrieval with the triage round trip
+        if t_parsed is None:
+            self._start_rag_prefetch(turn)
+
         # [FEAT-350] Engine Stabilization: Retry loop for small models
         for triage_attempt in range(3):
             if t_parsed is not None:
@@ -787,49 +912,6 @@ class CognitiveHub:
                     "brain_source": "System"
                 })
                 
-                # [FEAT-436] Unified Intent-HyDE Guided Decoding Schema & Context
-                triage_schema = {
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "prereflection_triage_result",
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "inferred_intent": {"type": "string"},
-                                "addressed_to": {"type": "string", "enum": ["NONE", "BRAIN", "PINKY", "MICE"]},
-                                "vibe": {"type": "string", "enum": ["TECHNICAL", "CASUAL", "HISTORICAL", "ANALYTICAL", "OPERATIONAL", "FORENSIC", "META", "WYWO", "DEEP_RESEARCH"]},
-                                "domain": {"type": "string", "enum": ["exp_tlm", "exp_bkm", "exp_for", "standard", "lab_history"]},
-                                "casual": {"type": "number"},
-                                "intrigue": {"type": "number"},
-                                "importance": {"type": "number"},
-                                "situation": {"type": "string"},
-                                "hints": {"type": "string"},
-                                "hyde_vector_text": {
-                                    "type": "string",
-                                    "description": "3-part multi-voice Composite HyDE Vector Query. For technical, historical, or validation queries, synthesize EXACTLY this format: [VALIDATION]: <silicon_term_or_pcie_ras> | [STRATEGY]: <focal_goal_or_leadership_impact> | [SRE]: <bkm_scar_or_shell_command>. For casual quips or greetings, emit an empty string."
-                                }
-                            },
-                            "required": ["inferred_intent", "addressed_to", "vibe", "domain", "casual", "intrigue", "importance", "hyde_vector_text"]
-                        }
-                    }
-                }
-
-                # [FEAT-451/452] Brain Persona grounding + 4-Domain HyDE Domain Map Contract
-                triage_mode_context = (
-                    '[MODE]: UNIFIED PRE-REFLECTION & TRIAGE\n'
-                    + BRAIN_PERSONA_SPEC + '\n'
-                    "Translate user intent (I think the user is trying to say...).\n"
-                    'HyDE synthesis is gated by the 4-Domain HyDE Map Contract:\n'
-                    '  1. exp_tlm (Silicon Telemetry): PCIe error bursts, RAPL power/thermal caps, NVIDIA GPU metrics, MSR registers, Redfish sensors.\n'
-                    '  2. exp_bkm (SRE playbooks): Point-of-failure playbooks, diagnostic shell BKMs, test runner steps, systemd service topologies.\n'
-                    '  3. exp_for (Forensic Logs): Kernel panic tracebacks, OOM crash logs, backpressure ledgers, memory pressure root cause analysis.\n'
-                    '  4. lab_history (18-Year Archive): historical project notes (2005-2025), career milestones, past sprint retrospectives.\n'
-                    'If the intent maps to a domain, synthesize in hyde_vector_text a 3-part Composite HyDE Vector Query:\n'
-                    '[VALIDATION]: <silicon_term_or_pcie_ras> | [STRATEGY]: <focal_goal_or_leadership_impact> | [SRE]: <bkm_scar_or_shell_command>\n'
-                    'If the intent does NOT map to the 4 domains (casual greetings, status checks, pleasantries, meta-talk), set hyde_vector_text: "" and vibe: CASUAL. No hardcoded string arrays (BKM-015).\n'
-                    'For casual quips or greetings, set addressed_to: PINKY, vibe: CASUAL, importance: 0.1, hyde_vector_text: empty string.'
-                )
-
                 # [Task 12.2] Brain Early-Reply: Route to Deep Thought for immediate HyDE synthesis
                 # [FEAT-028] Deep Thought gating: HIBERNATING -> zero remote traffic.
                 # Reachability is decided by the ping->API probe, NOT local vocal state.
@@ -862,7 +944,7 @@ class CognitiveHub:
                             try:
                                 # Pass triage context to Deep Thought so it produces real HyDE vector
                                 async for token in self._process_node_stream(
-                                    "thought", turn, triage_mode_context, "Deep Thought", tools=[], temperature=0.2, request_id=request_id
+                                    "thought", turn, TRIAGE_MODE_CONTEXT, "Deep Thought", tools=[], temperature=0.2, request_id=request_id
                                 ):
                                     t_text += token
                             except Exception as e:
@@ -879,7 +961,7 @@ class CognitiveHub:
                     if hibernating:
                         logging.info("[HUB] Lab HIBERNATING. Skipping Deep Thought HyDE (zero remote traffic).")
                     async for token in self._process_node_stream(
-                        "lab", turn, triage_mode_context, "Lab (Triage)", tools=[], temperature=0.0, response_format=triage_schema, request_id=request_id
+                        "lab", turn, TRIAGE_MODE_CONTEXT, "Lab (Triage)", tools=[], temperature=0.0, response_format=TRIAGE_SCHEMA, request_id=request_id
                     ):
                         t_text += token
 
@@ -913,6 +995,11 @@ class CognitiveHub:
                 self.consecutive_parse_failures = 0 # Reset on success
                 self.triage_failures = 0 # [FIX] Reset on successful parse
                 t_parsed = t_clean
+                # [FEAT-476] Only cache real JSON triage, never prose-synthesized fallbacks, and never
+                # a briefing trigger (that lives in hints/situation, which the cache does not keep)
+                briefing = "morning_briefing" in f"{t_parsed.get('hints', '')} {t_parsed.get('situation', '')}".lower()
+                if "{" in t_text and not briefing:
+                    self.triage_cache.store(turn, t_parsed, TRIAGE_FINGERPRINT)
                 await self.broadcast({
                     "type": "crosstalk",
                     "brain": f"[HUB] Triage successful. Vibe: {t_parsed.get('vibe')}",
@@ -934,6 +1021,7 @@ class CognitiveHub:
         situation = str(t_parsed.get("situation", "")).lower()
         if "morning_briefing" in hints or "morning_briefing" in situation or "trigger_morning_briefing" in hints:
             logging.info("[HUB] Triage Intent Gate: Morning briefing triggered via triage.")
+            self._discard_rag_prefetch(turn, "morning briefing")
             if trigger_briefing_callback:
                 await trigger_briefing_callback()
             else:
@@ -951,7 +1039,11 @@ class CognitiveHub:
         
         vibe = t_parsed.get("vibe", "").upper()
         self.current_vibe = vibe
+        tracing.lap("dispatch", vibe=vibe)
         self._wrap_residents_for_sandbox()
+        if vibe in ("CASUAL", "WYWO"):
+            # [FEAT-477] No archive retrieval on these paths; drop the speculative one
+            self._discard_rag_prefetch(turn, vibe)
         
         target = t_parsed.get("addressed_to", "PINKY").lower()
         
@@ -1056,54 +1148,59 @@ class CognitiveHub:
         else: # "PINKY" or "NONE"
             lead_node = "pinky"
 
+        # [FEAT-482] Legs run concurrently under per-leg deadlines, so the turn waits on the
+        # slowest necessary leg rather than the sum. Lead-speaker order survives as start
+        # constraints: the foil still follows the Brain baseline, and Pinky-node legs never
+        # overlap (their tokens share one session buffer per request).
+        legs = LegScheduler(request_id, shutdown_event, stats=self.leg_stats)
+        strategic = None
         if lead_node == "brain":
-            # Brain leads Turn 1
-            await self._run_brain_leg(turn, t_parsed, shutdown_event=shutdown_event, request_id=request_id)
-            # Turn 2: Pinky interjects if interest is high
-            if self.current_interest > 0.5:
-                async for token in self._process_node_stream(
-                    "pinky", turn, context, "Pinky (Foil Interjection)", 
-                    tools=[], temperature=0.7, request_id=request_id,
-                    behavioral_guidance="[MODE]: FOIL_INTERJECTION (Brief, witty, intuitive quip following Brain's response.)"
-                ):
-                    if shutdown_event and shutdown_event.is_set():
-                        break
-        elif lead_node == "both":
-            # Both speak on Turn 1 ("Hey mice!")
-            full_pinky_text = ""
-            async for token in self._process_node_stream(
-                "pinky", turn, context, "Pinky (Response)", 
-                tools=[], temperature=0.7, request_id=request_id,
-                behavioral_guidance=behavioral_guidance
-            ):
-                full_pinky_text += token
-                if shutdown_event and shutdown_event.is_set():
-                    break
-            await self._run_brain_leg(turn, t_parsed, shutdown_event=shutdown_event, request_id=request_id)
+            # Brain leads Turn 1; Turn 2: Pinky interjects if interest is high
+            strategic = self._spawn_brain_leg(turn, t_parsed, legs, shutdown_event=shutdown_event, request_id=request_id)
+            legs.start("pinky", self._foil_leg(turn, context, shutdown_event=shutdown_event, request_id=request_id), after=("brain",))
         else:
-            # Pinky leads Turn 1 (Default for PINKY or NONE)
-            full_pinky_text = ""
-            async for token in self._process_node_stream(
-                "pinky", turn, context, "Pinky (Response)", 
-                tools=[], temperature=0.7, request_id=request_id,
-                behavioral_guidance=behavioral_guidance
-            ):
-                full_pinky_text += token
-                if shutdown_event and shutdown_event.is_set():
-                    break
-            
+            legs.start("pinky", self._node_leg(
+                "pinky", turn, context, "Pinky (Response)", shutdown_event=shutdown_event,
+                tools=[], temperature=0.7, request_id=request_id, behavioral_guidance=behavioral_guidance
+            ))
+            # Both speak on Turn 1 ("Hey mice!"); Pinky-led turns pull the Brain in when interest is high
+            if lead_node == "both" or self.current_interest > 0.5:
+                strategic = self._spawn_brain_leg(turn, t_parsed, legs, shutdown_event=shutdown_event, request_id=request_id)
+
+        pinky_leg = await legs.settled("pinky")
+        full_pinky_text = pinky_leg.text if pinky_leg else ""
+        if pinky_leg is not None and pinky_leg.useful:
+            pinky_leg.used = True
+
+        if lead_node == "pinky":
             # Intercept morning briefing tool call from Pinky's response
             if "trigger_morning_briefing" in full_pinky_text:
                 logging.info("[HUB] Intercepted trigger_morning_briefing tool call from Pinky's response.")
+                legs.cancel_all("morning briefing intercepted")
+                if legs.brief is not None:
+                    legs.brief.cancel()
+                if strategic is not None:
+                    strategic.cancel()
+                    await asyncio.gather(strategic, return_exceptions=True)
+                await legs.join()
                 if trigger_briefing_callback:
                     await trigger_briefing_callback()
                 else:
                     await self.trigger_morning_briefing(request_id=request_id)
                 return
-            
-            # Turn 2: Brain interjects if interest is high
-            if self.current_interest > 0.5:
-                await self._run_brain_leg(turn, t_parsed, shutdown_event=shutdown_event, request_id=request_id)
+
+            # A peer-vote boost during Pinky's reply [FEAT-238] can still pull the Brain in late
+            if strategic is None and self.current_interest > 0.5:
+                strategic = self._spawn_brain_leg(turn, t_parsed, legs, shutdown_event=shutdown_event, request_id=request_id)
+
+        if strategic is not None:
+            try:
+                await strategic
+            except Exception as e:
+                logging.error(f"[HUB] Brain leg failed: {e}")
+        await legs.join()
+
+        self._discard_rag_prefetch(turn, "turn complete")
 
         # [FEAT-356] Unified Session Ledger: Record turn summary
         turn_ledger = f"User: {turn}"
@@ -1446,38 +1543,96 @@ class CognitiveHub:
         logging.info("[FEAT-437][TIER3] Non-matching domain / casual turn; returning empty HyDE vector (BKM-015)")
         return "", DIRECT_RAW_QUERY
 
+    def _start_rag_prefetch(self, turn, n_results=3):
+        """[FEAT-477] Kick off a raw-query get_context the moment a turn arrives."""
+        if not SPECULATIVE_RAG or "archive" not in self.residents or turn in self._rag_prefetch:
+            return
+        self._rag_prefetch[turn] = asyncio.create_task(self._archive_get_context(turn, None, n_results))
+        self.rag_prefetch_stats["started"] += 1
+
+    def _discard_rag_prefetch(self, turn, reason=""):
+        task = self._rag_prefetch.pop(turn, None)
+        if task is not None and not task.done():
+            task.cancel()
+            self.rag_prefetch_stats["cancelled"] += 1
+            logging.info(f"[RAG] Speculative prefetch cancelled ({reason}).")
+
+    async def _archive_get_context(self, turn, hyde, n_results=3):
+        """One archive get_context call, capped for prompt use. Returns "" on failure."""
+        args = {"query": turn, "n_results": n_results}
+        if hyde:
+            args["hyde_vector_text"] = hyde
+        # [FEAT-481] The archive records its own phases under the same request_id
+        request_id = tracing.current_request_id()
+        if request_id:
+            args["request_id"] = request_id
+        async with tracing.span("rag.get_context", speculative=not hyde) as sp:
+            try:
+                res = await self.residents["archive"].call_tool("get_context", args)
+                if hasattr(res, 'content') and len(res.content) > 0:
+                    result_text = res.content[0].text
+                    if result_text:
+                        sp.set(chars=len(result_text))
+                        # [FEAT-444] Cap RAG context before it enters any prompt
+                        return self._truncate_to_tokens(result_text, doc_id=self._extract_doc_id(result_text))
+            except asyncio.CancelledError:
+                sp.set(cancelled=True)
+                raise
+            except Exception as e:
+                logging.error(f"[HUB] RAG context fetch failed: {e}")
+            return ""
+
+    async def _settle_rag(self, refined, prefetch, cache_key, generation=None):
+        """
+        [FEAT-477] Refine-or-serve: the HyDE retrieval wins if it lands within
+        SPECULATIVE_REFINE_BUDGET. Otherwise whichever finishes first is served;
+        a late HyDE result still lands in the cache for the Brain leg.
+        """
+        refined.add_done_callback(
+            lambda t: self._rag_cache.put(cache_key, t.result(), generation)
+            if not t.cancelled() and t.exception() is None else None
+        )
+        if prefetch is None:
+            return await refined
+        done, _ = await asyncio.wait({refined}, timeout=SPECULATIVE_REFINE_BUDGET)
+        if refined not in done:
+            done, _ = await asyncio.wait({refined, prefetch}, return_when=asyncio.FIRST_COMPLETED)
+            if refined not in done and not prefetch.cancelled() and prefetch.exception() is None and prefetch.result():
+                self.rag_prefetch_stats["served"] += 1
+                logging.info("[RAG] HyDE retrieval still running; serving speculative raw-query context.")
+                return prefetch.result()
+        if not prefetch.done():
+            prefetch.cancel()
+        self.rag_prefetch_stats["refined"] += 1
+        return await refined
+
     async def _fetch_rag_context(self, turn, t_parsed, n_results=3):
         """[FEAT-437/442/454] Post-triage RAG retrieval: pass the AI-produced HyDE vector text
         from the unified pre-reflection pass into the archive context engine, so retrieval
         searches the refined domain indexing terms instead of the raw noisy turn."""
         if "archive" not in self.residents:
             return ""
-        hyde, hyde_tier = await self.resolve_hyde_vector(turn, t_parsed)
+        async with tracing.span("hyde") as sp:
+            hyde, hyde_tier = await self.resolve_hyde_vector(turn, t_parsed)
+            sp.set(tier=str(hyde_tier), empty=not hyde)
+        prefetch = self._rag_prefetch.pop(turn, None)
         # BKM-015: If judge-driven HyDE evaluated to empty string (casual / non-match), bypass ChromaDB
         if not hyde:
+            if prefetch is not None and not prefetch.done():
+                prefetch.cancel()
+                self.rag_prefetch_stats["cancelled"] += 1
             return ""
         # [FEAT-441-Cache] Key on the exact inputs that shape retrieval output
         cache_key = hashlib.sha256((turn + hyde + str(n_results)).encode("utf-8")).hexdigest()
-        result_text = ""
-        if cache_key in self._rag_cache:
-            result_text = self._rag_cache[cache_key]
+        result_text = self._rag_cache.get(cache_key)
+        if result_text is not None:
+            if prefetch is not None and not prefetch.done():
+                prefetch.cancel()
         else:
-            try:
-                res = await self.residents["archive"].call_tool(
-                    "get_context", {"query": turn, "hyde_vector_text": hyde, "n_results": n_results}
-                )
-                if hasattr(res, 'content') and len(res.content) > 0:
-                    result_text = res.content[0].text
-                    if result_text:
-                        # [FEAT-444] Cap RAG context before it enters any prompt
-                        result_text = self._truncate_to_tokens(
-                            result_text, doc_id=self._extract_doc_id(result_text)
-                        )
-                        self._rag_cache[cache_key] = result_text
-                        if len(self._rag_cache) > 128:
-                            self._rag_cache.pop(next(iter(self._rag_cache)))
-            except Exception as e:
-                logging.error(f"[HUB] RAG context fetch failed: {e}")
+            # [FEAT-478] Tag with the generation seen before retrieval; a concurrent re-index lands it stale
+            generation = self._rag_cache.generation()
+            refined = asyncio.create_task(self._archive_get_context(turn, hyde, n_results))
+            result_text = await self._settle_rag(refined, prefetch, cache_key, generation)
 
         # [FEAT-454] Broadcast RAG Eval payload to Web Intercom for + click expanders
         if result_text:
@@ -1498,9 +1653,37 @@ class CognitiveHub:
 
         return result_text
 
-    async def _run_brain_leg(self, query, triage, shutdown_event=None, request_id="default"):
-        """Handles Brain (4090) leg of the waterfall."""
-        # [Task 2.2] Context Precision
+    def _node_leg(self, node_id, query, context, source_name, shutdown_event=None, **kwargs):
+        """[FEAT-482] Wrap a node stream as a leg body that streams into leg.text."""
+        async def run(leg):
+            async for token in self._process_node_stream(node_id, query, context, source_name, **kwargs):
+                leg.feed(token)
+                if shutdown_event and shutdown_event.is_set():
+                    break
+            return leg.text
+        return run
+
+    def _foil_leg(self, turn, context, shutdown_event=None, request_id="default"):
+        """[FEAT-418] Pinky's foil interjection; decided once the Brain baseline has landed."""
+        stream = self._node_leg(
+            "pinky", turn, context, "Pinky (Foil Interjection)", shutdown_event=shutdown_event,
+            tools=[], temperature=0.7, request_id=request_id,
+            behavioral_guidance="[MODE]: FOIL_INTERJECTION (Brief, witty, intuitive quip following Brain's response.)"
+        )
+
+        async def run(leg):
+            if self.current_interest <= 0.5:
+                return None
+            return await stream(leg)
+        return run
+
+    def _spawn_brain_leg(self, query, triage, legs, shutdown_event=None, request_id="default"):
+        """[FEAT-482] Register the Brain/Deep Thought legs now and run the rest of the Brain leg as a task."""
+        self._start_strategic_legs(query, triage, legs, shutdown_event=shutdown_event, request_id=request_id)
+        return asyncio.create_task(self._run_brain_leg(query, triage, shutdown_event=shutdown_event, request_id=request_id, legs=legs))
+
+    async def _strategic_brief(self, query, triage, request_id="default"):
+        """[Task 2.2] Context Precision: raw grounding context and its distilled brief for the Brain leg."""
         vibe = triage.get("vibe", "").upper()
         if vibe == "WYWO":
             # Construct WYWO context
@@ -1535,55 +1718,95 @@ class CognitiveHub:
                 raw_context += f"\n\n[RAG_CONTEXT]:\n{rag_context}"
         
         distilled_context = await self._distill_strategic_brief(raw_context, request_id=request_id)
+        return raw_context, distilled_context
 
-        # [FEAT-470] Step 3: Local Brain-LoRA Waterfall Handoff (shadow_brain_v2 on vLLM port 8088).
-        # Stream The Brain's local technical baseline BEFORE remote escalation to Deep Thought.
-        brain_response = ""
-        if "brain" in self.residents:
+    def _start_strategic_legs(self, query, triage, legs, shutdown_event=None, request_id="default"):
+        """
+        [FEAT-482] Schedule the local Brain baseline and Deep Thought concurrently.
+        Both share one brief. Deep Thought holds for the baseline up to
+        BASELINE_GRACE_S to use it as grounding, then goes without it; a useful
+        Deep Thought answer supersedes a Brain baseline that is still streaming.
+        """
+        if legs.get("brain") is not None:
+            return legs.brief
+        legs.brief = asyncio.create_task(self._strategic_brief(query, triage, request_id=request_id))
+
+        async def brain_run(leg):
+            # [FEAT-470] Step 3: Local Brain-LoRA Waterfall Handoff (shadow_brain_v2 on vLLM port 8088).
+            if "brain" not in self.residents:
+                return None
+            _, distilled_context = await asyncio.shield(legs.brief)
             brain_tools = await self._get_node_tools("brain")
-            async for token in self._process_node_stream(
-                "brain", query, distilled_context, "Brain (Local Baseline)",
+            return await self._node_leg(
+                "brain", query, distilled_context, "Brain (Local Baseline)", shutdown_event=shutdown_event,
                 tools=brain_tools, temperature=0.2, request_id=request_id
-            ):
-                brain_response += token
-                if shutdown_event and shutdown_event.is_set():
-                    break
+            )(leg)
 
-        # Step 4: Remote escalation to Deep Thought (Kender), passing the query, distilled
-        # strategic brief, AND the local Brain synthesis as grounding context upstream.
-        dt_response = ""
-        thought_reachable = "thought" in self.residents
-        if thought_reachable and self.is_deep_thought_reachable:
-            try:
-                thought_reachable = await self.is_deep_thought_reachable()
-            except Exception as e:
-                logging.warning(f"[HUB] Deep Thought reachability probe failed: {e}")
-                thought_reachable = False
-        if thought_reachable:
-            thought_context = distilled_context
+        async def thought_run(leg):
+            # Step 4: Remote escalation to Deep Thought (Kender), passing the query, distilled
+            # strategic brief, AND the local Brain synthesis (when ready in time) as grounding.
+            thought_reachable = "thought" in self.residents
+            if thought_reachable and self.is_deep_thought_reachable:
+                try:
+                    thought_reachable = await self.is_deep_thought_reachable()
+                except Exception as e:
+                    logging.warning(f"[HUB] Deep Thought reachability probe failed: {e}")
+                    thought_reachable = False
+            if not thought_reachable:
+                return None
+            _, thought_context = await asyncio.shield(legs.brief)
+            brain_response = await legs.result("brain", timeout=BASELINE_GRACE_S)
             if brain_response:
+                legs.get("brain").used = True
                 thought_context += f"\n\n[LOCAL_BRAIN_BASELINE]:\n{brain_response}"
             active_tools = await self._get_node_tools("thought")
-            async for token in self._process_node_stream(
-                "thought", query, thought_context, "Deep Thought", tools=active_tools, temperature=0.2, request_id=request_id
-            ):
-                dt_response += token
-                if shutdown_event and shutdown_event.is_set():
-                    break
+            return await self._node_leg(
+                "thought", query, thought_context, "Deep Thought", shutdown_event=shutdown_event,
+                tools=active_tools, temperature=0.2, request_id=request_id
+            )(leg)
+
+        legs.start("brain", brain_run)
+        legs.start("thought", thought_run, supersedes=("brain",))
+        return legs.brief
+
+    async def _run_brain_leg(self, query, triage, shutdown_event=None, request_id="default", legs=None):
+        """Handles Brain (4090) leg of the waterfall: Brain baseline and Deep Thought concurrently, then the Grounding Gate."""
+        own_legs = legs is None
+        if own_legs:
+            legs = LegScheduler(request_id, shutdown_event, stats=self.leg_stats)
+        self._start_strategic_legs(query, triage, legs, shutdown_event=shutdown_event, request_id=request_id)
+        try:
+            brain_leg = await legs.settled("brain")
+            thought_leg = await legs.settled("thought")
+            raw_context, _ = await legs.brief
+
+            # [SPR-41_2] Skip cascade if context starvation was detected
+            if "thought" in self.context_starved_nodes:
+                self.context_starved_nodes.discard("thought")
+                logging.info("[HUB] Brain leg cascade bypassed due to CONTEXT_STARVED.")
+                return
 
-        # [SPR-41_2] Skip cascade if context starvation was detected
-        if "thought" in self.context_starved_nodes:
-            self.context_starved_nodes.discard("thought")
-            logging.info("[HUB] Brain leg cascade bypassed due to CONTEXT_STARVED.")
-            return
-        
-        # [FEAT-227] The Grounding Gate: Let Pinky critique and summarize the final strategic output.
-        # [FEAT-470] Evaluate whichever strategic response the waterfall produced (Deep Thought if
-        # reachable, otherwise the local Brain baseline) against the raw grounding context.
-        strategic_response = dt_response or brain_response
-        strategic_source = "Deep Thought" if dt_response else "Brain (Local Baseline)"
-        rag_payload = raw_context if 'raw_context' in locals() else ""
-        await self.evaluate_grounding(strategic_source, strategic_response, interest=self.current_interest, shutdown_event=shutdown_event, request_id=request_id, rag_context=rag_payload)
+            # [FEAT-227] The Grounding Gate: Let Pinky critique and summarize the final strategic output.
+            # [FEAT-470] Evaluate whichever strategic response the waterfall produced (Deep Thought if
+            # it answered, otherwise the local Brain baseline) against the raw grounding context.
+            strategic_leg = thought_leg if thought_leg is not None and thought_leg.useful else brain_leg
+            if strategic_leg is None or not strategic_leg.useful:
+                return
+            strategic_leg.used = True
+            strategic_source = "Deep Thought" if strategic_leg.name == "thought" else "Brain (Local Baseline)"
+
+            async def grounding_run(leg):
+                self.turn_thought_trace.pop("critique", None)
+                await self.evaluate_grounding(strategic_source, strategic_leg.text, interest=self.current_interest, shutdown_event=shutdown_event, request_id=request_id, rag_context=raw_context)
+                return self.turn_thought_trace.get("critique")
+
+            # Pinky-node legs are serialized: the critique waits for Pinky's reply/foil
+            grounding = legs.start("grounding", grounding_run, after=("pinky",))
+            await legs.settled("grounding")
+            grounding.used = grounding.useful
+        finally:
+            if own_legs:
+                await legs.join()
 
     async def _run_triggered_task(self, task_name):
         """[Task 9.7] Handles one-off system triggers (Recruiter, Librarian, etc)."""
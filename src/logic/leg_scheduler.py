@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from infra import tracing
+
+# [FEAT-482] Concurrent Leg Scheduler
+# Objective: Run the independent legs of a turn (Pinky reply, Brain baseline,
+# Deep Thought synthesis, Pinky grounding critique) side by side, each under
+# its own deadline, so turn latency tracks the slowest *necessary* leg instead
+# of the sum of every leg's budget.
+#
+# A leg is an async callable `run(leg)` that streams into `leg.text` and
+# returns its final text. The scheduler owns the task, enforces the deadline
+# (partial text is kept), cancels superseded legs once a better answer lands,
+# and scores each leg's utility for the Hub's running stats.
+
+# Per-leg deadlines (seconds), mirroring the Foyer's STAGE_TIMEOUTS stages 2-5.
+LEG_DEADLINES = {
+    "pinky": 30.0,
+    "brain": 30.0,
+    "thought": 60.0,
+    "grounding": 20.0,
+}
+DEFAULT_LEG_DEADLINE = 30.0
+# How long Deep Thought holds its request for the local Brain baseline to use as grounding.
+BASELINE_GRACE_S = 3.0
+
+# Utility scoring: a leg that finished and whose answer fed the turn scores 1.0;
+# one that finished but was not consumed (e.g. superseded) 0.5; a leg cut off by
+# its deadline/cancellation after streaming something 0.25; nothing useful 0.
+UTILITY = {"used": 1.0, "ok": 0.5, "partial": 0.25, "none": 0.0}
+
+_STARVED = "[ERROR: CONTEXT_STARVED]"
+
+
+class Leg:
+    """State of one leg. `status` is one of pending/running/ok/skipped/empty/starved/timeout/cancelled/error."""
+
+    __slots__ = ("name", "deadline", "supersedes", "after", "text", "status", "used",
+                 "started", "ended", "ttft", "reason", "task")
+
+    def __init__(self, name, deadline, supersedes=(), after=()):
+        self.name = name
+        self.deadline = deadline
+        self.supersedes = tuple(supersedes)
+        self.after = tuple(after)
+        self.text = ""
+        self.status = "pending"
+        self.used = False
+        self.started = None
+        self.ended = None
+        self.ttft = None
+        self.reason = ""
+        self.task = None
+
+    def feed(self, token):
+        """Append streamed text (the leg body calls this per token)."""
+        if token and self.ttft is None and self.started is not None:
+            self.ttft = time.monotonic() - self.started
+        self.text += token
+
+    @property
+    def done(self):
+        return self.status not in ("pending", "running")
+
+    @property
+    def useful(self):
+        return self.status == "ok"
+
+    @property
+    def latency(self):
+        if self.started is None or self.ended is None:
+            return None
+        return self.ended - self.started
+
+    @property
+    def utility(self):
+        if self.status == "ok":
+            return UTILITY["used"] if self.used else UTILITY["ok"]
+        if self.status in ("timeout", "cancelled") and self.text.strip():
+            return UTILITY["partial"]
+        return UTILITY["none"]
+
+    def to_dict(self):
+        return {
+            "leg": self.name,
+            "status": self.status,
+            "latency_ms": round(self.latency * 1000.0, 1) if self.latency is not None else None,
+            "ttft_ms": round(self.ttft * 1000.0, 1) if self.ttft is not None else None,
+            "chars": len(self.text),
+            "used": self.used,
+            "utility": self.utility,
+            "reason": self.reason,
+        }
+
+
+class LegScheduler:
+    """[FEAT-482] Runs one turn's legs concurrently with deadlines and supersession."""
+
+    def __init__(self, request_id="default", shutdown_event=None, stats=None):
+        self.request_id = request_id
+        self.shutdown_event = shutdown_event
+        self.stats = stats
+        self.legs = {}
+        self.brief = None  # upstream work shared by several legs (the Hub's strategic brief task)
+        self._t0 = time.monotonic()
+
+    def start(self, name, run, deadline=None, supersedes=(), after=()):
+        """
+        Schedule `run(leg)` as leg `name`. The deadline starts once the leg
+        actually starts, i.e. after every leg in `after` has settled. When this
+        leg finishes with a useful answer, still-running legs named in
+        `supersedes` are cancelled.
+        """
+        if name in self.legs and not self.legs[name].done:
+            return self.legs[name]
+        leg = Leg(name, deadline or LEG_DEADLINES.get(name, DEFAULT_LEG_DEADLINE), supersedes, after)
+        self.legs[name] = leg
+        leg.task = asyncio.create_task(self._drive(leg, run))
+        leg.task.add_done_callback(lambda _task, leg=leg: self._finalize(leg))
+        return leg
+
+    def get(self, name):
+        return self.legs.get(name)
+
+    async def _drive(self, leg, run):
+        try:
+            for dep in leg.after:
+                await self.settled(dep)
+            if self.shutdown_event is not None and self.shutdown_event.is_set():
+                leg.status, leg.reason = "cancelled", "shutdown"
+            else:
+                leg.status, leg.started = "running", time.monotonic()
+                result = await asyncio.wait_for(run(leg), timeout=leg.deadline)
+                if result and len(result) >= len(leg.text):
+                    leg.text = result
+                if result is None and not leg.text:
+                    leg.status = "skipped"  # the leg decided it had nothing to do (gate, absent resident)
+                elif _STARVED in leg.text:
+                    leg.status = "starved"
+                else:
+                    leg.status = "ok" if leg.text.strip() else "empty"
+        except asyncio.TimeoutError:
+            leg.status, leg.reason = "timeout", f"deadline {leg.deadline:.0f}s"
+            logging.warning(f"[HUB] [FEAT-482] Leg '{leg.name}' hit its {leg.deadline:.0f}s deadline ({len(leg.text)} chars kept).")
+        except asyncio.CancelledError:
+            leg.status = "cancelled"
+            leg.reason = leg.reason or "cancelled"
+        except Exception as e:
+            leg.status, leg.reason = "error", str(e)[:120]
+            logging.error(f"[HUB] [FEAT-482] Leg '{leg.name}' failed: {e}")
+        self._finish(leg)
+        if leg.useful:
+            for other in leg.supersedes:
+                self.cancel(other, f"superseded by {leg.name}")
+        return leg
+
+    def _finalize(self, leg):
+        # A task cancelled before its first step never enters _drive's handlers.
+        if not leg.done:
+            leg.status = "cancelled"
+            leg.reason = leg.reason or "cancelled"
+            self._finish(leg)
+
+    def _finish(self, leg):
+        leg.ended = time.monotonic()
+        if leg.started is None:
+            leg.started = leg.ended
+
+    async def settled(self, name, timeout=None):
+        """Wait for leg `name` to finish (any status). Returns the Leg, or None if never scheduled / still running at timeout."""
+        leg = self.legs.get(name)
+        if leg is None:
+            return None
+        if leg.done:
+            return leg
+        try:
+            await asyncio.wait_for(asyncio.shield(leg.task), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.CancelledError:
+            if not leg.task.done():
+                raise
+        return leg if leg.done else None
+
+    async def result(self, name, timeout=None):
+        """Text of leg `name` if it finished usefully within `timeout`, else ""."""
+        leg = await self.settled(name, timeout=timeout)
+        return leg.text if leg is not None and leg.useful else ""
+
+    def cancel(self, name, reason="cancelled"):
+        leg = self.legs.get(name)
+        if leg is None or leg.done or leg.task is None:
+            return False
+        leg.reason = reason
+        leg.task.cancel()
+        logging.info(f"[HUB] [FEAT-482] Leg '{name}' cancelled: {reason}.")
+        return True
+
+    def cancel_all(self, reason="cancelled"):
+        for name in list(self.legs):
+            self.cancel(name, reason)
+
+    async def join(self):
+        """Wait for every scheduled leg (including legs started while waiting), then record stats."""
+        while True:
+            pending = [leg.task for leg in self.legs.values() if leg.task is not None and not leg.task.done()]
+            if not pending:
+                break
+            await asyncio.gather(*pending, return_exceptions=True)
+        self.record()
+        return self.legs
+
+    def record(self):
+        for leg in self.legs.values():
+            if self.stats is not None:
+                self.stats.record(leg)
+            if leg.started is not None:
+                tracing.record_span(
+                    f"leg.{leg.name}", self.request_id, time.time() - (time.monotonic() - leg.started),
+                    time.time() - (time.monotonic() - leg.ended), service="hub",
+                    status=leg.status, utility=leg.utility, chars=len(leg.text),
+                )
+        summary = ", ".join(f"{leg.name}={leg.status}/{leg.utility}" for leg in self.legs.values())
+        if summary:
+            logging.info(f"[HUB] [FEAT-482] Turn {self.request_id} legs settled in {time.monotonic() - self._t0:.2f}s: {summary}")
+
+    def report(self):
+        return [leg.to_dict() for leg in self.legs.values()]
+
+
+class LegStats:
+    """[FEAT-482] Rolling per-leg outcome counters, latency percentiles and mean utility."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._legs = {}
+
+    def record(self, leg):
+        s = self._legs.setdefault(leg.name, {"runs": 0, "statuses": {}, "latency": deque(maxlen=self.window),
+                                             "utility": deque(maxlen=self.window)})
+        s["runs"] += 1
+        s["statuses"][leg.status] = s["statuses"].get(leg.status, 0) + 1
+        if leg.latency is not None and leg.status != "cancelled":
+            s["latency"].append(leg.latency)
+        s["utility"].append(leg.utility)
+
+    @staticmethod
+    def _pct(values, q):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000.0, 1)
+
+    def report(self):
+        out = {}
+        for name, s in self._legs.items():
+            out[name] = {
+                "runs": s["runs"],
+                "statuses": dict(s["statuses"]),
+                "p50_ms": self._pct(s["latency"], 0.50),
+                "p95_ms": self._pct(s["latency"], 0.95),
+                "mean_utility": round(sum(s["utility"]) / len(s["utility"]), 3) if s["utility"] else None,
+            }
+        return out
@@ -0,0 +1,103 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+from infra.rag_generation import read_rag_generation
+
+# [FEAT-478] RAG Context Cache
+# Replaces the insertion-ordered FEAT-441 dict. Entries are evicted LRU-first
+# once either the entry count or the byte budget is exceeded, expire after a
+# TTL, and are tagged with the archive generation they were retrieved under:
+# when an indexer bumps the generation, older entries are treated as misses.
+
+RAG_CACHE_TTL = float(os.environ.get("LAB_RAG_CACHE_TTL", "1800"))
+RAG_CACHE_ENTRIES = 128
+RAG_CACHE_BYTES = 2 * 1024 * 1024
+
+
+class RagCache:
+    """[FEAT-478] LRU + byte budget + TTL cache of archive get_context results."""
+
+    def __init__(self, max_entries=RAG_CACHE_ENTRIES, max_bytes=RAG_CACHE_BYTES, ttl=RAG_CACHE_TTL,
+                 generation=read_rag_generation):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._generation = generation
+        self._entries = OrderedDict()  # key -> (value, size, ts, generation)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "invalidated": 0}
+
+    def generation(self):
+        try:
+            return self._generation()
+        except Exception:
+            return 0
+
+    def _drop(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        current = self.generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            value, _, ts, gen = entry
+            if gen != current:
+                self._drop(key)
+                self.stats["invalidated"] += 1
+                self.stats["misses"] += 1
+                return None
+            if time.time() - ts > self.ttl:
+                self._drop(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        """Store `value`; pass the generation read before retrieval started so late results land stale."""
+        if not value:
+            return False
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        gen = self.generation() if generation is None else generation
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.time(), gen)
+            self._bytes += size
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def report(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(
+            self.stats,
+            entries=len(self._entries),
+            bytes=self._bytes,
+            generation=self.generation(),
+            hit_rate=round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        )
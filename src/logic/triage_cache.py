@@ -0,0 +1,220 @@
+import copy
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# [FEAT-476] Semantic Triage Cache
+# Objective: Repeat intents ("what's the GPU temp" / "check gpu temperature")
+# skip the unified pre-reflection round trip and go straight to routing.
+#
+# Lookup is two-tier: an exact hit on the normalized text, then a cosine scan
+# over a lightweight lexical embedding (stem + char-trigram features) gated by
+# `threshold`. Stems only fold inflections, and whole-word features dominate
+# the trigrams, so "restart vllm" vs "restore vllm" scores ~0.58 and misses,
+# while "restarting vllm" hits. Identifiers (years, GEM/FEAT ids) must match.
+# FastEmbed lives in the Archive process; paying an MCP round trip per turn to
+# embed a 10-word query would eat most of the win, so the embedder is local and
+# pluggable. Entries expire after a TTL and the whole cache is dropped when the
+# triage prompt/schema fingerprint or config/role_tokens.json changes.
+#
+# Only the routing decision is cached. inferred_intent, situation, hints and
+# hyde_vector_text describe the exact wording of one query, so a paraphrase
+# hit must not inherit them; the caller recomputes those per turn.
+
+TRIAGE_CACHE_TTL = float(os.environ.get("LAB_TRIAGE_CACHE_TTL", "900"))
+TRIAGE_CACHE_SIZE = 256
+SIMILARITY_THRESHOLD = 0.88
+ROUTING_FIELDS = ("addressed_to", "vibe", "domain", "importance", "casual", "intrigue")
+
+# Words that carry no routing signal ("check gpu temperature" == "gpu temp").
+# Question words other than "what" stay in the key: "why did vllm crash" and
+# "when did vllm crash" are different questions.
+_STOPWORDS = frozenset("""
+a an the is are was were be am do does did of for to in on at by with and or
+me my our us you your i we it its this that these those there here
+what whats what's
+can could would will should please pls thanks thank
+check show tell give get find list see look fetch display report
+current currently now right today quick quickly just again about regarding
+""".split())
+
+# Domain abbreviations folded onto one spelling. Deliberately explicit: prefix
+# truncation made "restart"/"restore" and "deploy"/"deplete" the same key.
+_ALIASES = {
+    "temperature": "temp", "temperatures": "temp", "temps": "temp",
+    "utilization": "util", "utilisation": "util", "usage": "util",
+    "memory": "mem", "configuration": "config", "statistics": "stats",
+    "information": "info", "documentation": "docs", "processes": "procs", "process": "procs",
+}
+
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ied", "es", "ed", "s")
+
+_TOKEN_RE = re.compile(r"[a-z0-9_\-\.]+")
+
+
+def normalize_query(text, refine=None):
+    """Lowercase, de-noise (optional QPR refiner) and keep routing-relevant words (aliases folded)."""
+    if not text:
+        return ""
+    if refine is not None:
+        try:
+            text = refine(text) or text
+        except Exception:
+            pass
+    tokens = [t.strip(".-") for t in _TOKEN_RE.findall(text.lower())]
+    words = [_ALIASES.get(t, t) for t in tokens if t and t not in _STOPWORDS and (len(t) > 1 or t.isdigit())]
+    return " ".join(words)
+
+
+def _stem(word):
+    """Inflection-only suffix strip ("restarting" -> "restart"); never merges different verbs."""
+    if not word.isalpha() or word.endswith(("ss", "us", "is")):
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + ("y" if suffix in ("ies", "ied") else "")
+    return word
+
+
+def _identifiers(normalized):
+    """Tokens carrying digits (years, GEM/FEAT ids) must match exactly for a semantic hit."""
+    return frozenset(t for t in normalized.split() if any(c.isdigit() for c in t))
+
+
+def lexical_embedding(normalized):
+    """Sparse {feature: weight} vector over inflection stems, L2-normalized. Stems weigh double their trigrams."""
+    vec = {}
+    for stem in map(_stem, normalized.split()):
+        vec["w:" + stem] = vec.get("w:" + stem, 0.0) + 1.0
+        padded = f"#{stem}#"
+        for i in range(len(padded) - 2):
+            key = "c:" + padded[i:i + 3]
+            vec[key] = vec.get(key, 0.0) + 0.5
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    return {k: v / norm for k, v in vec.items()} if norm else {}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    except OSError:
+        return "absent"
+
+
+class TriageCache:
+    """
+    [FEAT-476] TTL + LRU cache of parsed triage results.
+    `fingerprint` identifies the triage prompt/schema revision; `watch_files`
+    are stat'ed on every lookup and any change clears the cache. Only `fields`
+    of a stored result are kept (the routing decision by default).
+    """
+
+    def __init__(self, fingerprint="", watch_files=(), ttl=TRIAGE_CACHE_TTL, max_entries=TRIAGE_CACHE_SIZE,
+                 threshold=SIMILARITY_THRESHOLD, embed=lexical_embedding, refine=None, fields=ROUTING_FIELDS):
+        self.fields = tuple(fields) if fields else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.embed = embed
+        self.refine = refine
+        self.watch_files = tuple(watch_files)
+        self._fingerprint = fingerprint
+        self._file_sigs = {p: file_signature(p) for p in self.watch_files}
+        self._entries = OrderedDict()  # normalized -> {"vec", "result", "ts", "hits"}
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    def _check_version(self, fingerprint=None):
+        changed = []
+        if fingerprint is not None and fingerprint != self._fingerprint:
+            changed.append("triage prompt")
+            self._fingerprint = fingerprint
+        for path in self.watch_files:
+            sig = file_signature(path)
+            if sig != self._file_sigs.get(path):
+                changed.append(os.path.basename(path))
+                self._file_sigs[path] = sig
+        if changed and self._entries:
+            logging.info(f"[TRIAGE_CACHE] Invalidated {len(self._entries)} entries ({', '.join(changed)} changed).")
+            self._entries.clear()
+            self.stats["invalidations"] += 1
+        return bool(changed)
+
+    def lookup(self, query, fingerprint=None):
+        """Returns (result_copy, similarity) on a hit, else (None, best_similarity)."""
+        norm = normalize_query(query, self.refine)
+        if not norm:
+            return None, 0.0
+        now = time.time()
+        with self._lock:
+            self._check_version(fingerprint)
+            for key in [k for k, e in self._entries.items() if now - e["ts"] > self.ttl]:
+                del self._entries[key]
+
+            entry = self._entries.get(norm)
+            exact = entry is not None
+            score = 1.0 if exact else 0.0
+            if entry is None:
+                vec = self.embed(norm)
+                ids = _identifiers(norm)
+                for key, candidate in self._entries.items():
+                    if _identifiers(key) != ids:
+                        continue
+                    s = cosine(vec, candidate["vec"])
+                    if s > score:
+                        score, best = s, key
+                if score >= self.threshold:
+                    entry = self._entries[best]
+                    norm = best
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, round(score, 3)
+            self._entries.move_to_end(norm)
+            entry["hits"] += 1
+            self.stats["exact_hits" if exact else "semantic_hits"] += 1
+            return copy.deepcopy(entry["result"]), round(score, 3)
+
+    def store(self, query, result, fingerprint=None):
+        norm = normalize_query(query, self.refine)
+        if not norm or not isinstance(result, dict):
+            return False
+        if self.fields is not None:
+            result = {k: result[k] for k in self.fields if k in result}
+        with self._lock:
+            self._check_version(fingerprint)
+            self._entries[norm] = {"vec": self.embed(norm), "result": copy.deepcopy(result), "ts": time.time(), "hits": 0}
+            self._entries.move_to_end(norm)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["stores"] += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def report(self):
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        lookups = hits + self.stats["misses"]
+        return dict(self.stats, entries=len(self._entries), hit_rate=round(hits / lookups, 3) if lookups else 0.0)
+
+
+def prompt_fingerprint(*parts):
+    """Short stable hash of the triage prompt + schema revision."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+    return h.hexdigest()[:12]
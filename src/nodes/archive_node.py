@@ -6,10 +6,12 @@ import time
 import glob
 import subprocess
 import asyncio
-import chromadb
 import aiohttp
+from collections import OrderedDict
 
 from infra.montana import reclaim_logger
+from infra.style_key import get_style_key as _shared_style_key
+from infra import tracing
 
 # [FEAT-304] Protocol Hardening: Ensure logs do not corrupt the MCP JSON-RPC pipe
 reclaim_logger(role="ARCHIVE")
@@ -17,8 +19,10 @@ logger = logging.getLogger(__name__)
 
 try:
     from nodes.loader import BicameralNode
+    from nodes.capabilities import LazyProxy
 except ImportError:
     from loader import BicameralNode
+    from capabilities import LazyProxy
 
 # --- Configuration ---
 WORKSPACE_DIR = os.path.expanduser("~/Dev_Lab/Portfolio_Dev")
@@ -37,12 +41,8 @@ SESSION_CLIPBOARD = []
 CLIPBOARD_CHAR_LIMIT = 8000 # [Task 2.3] Memory-OS: Context ceiling
 
 def get_style_key():
-    """[FEAT-267] Dynamic Key Discovery for Lab REST calls."""
-    import hashlib
-    if not os.path.exists(STYLE_CSS):
-        return "missing"
-    with open(STYLE_CSS, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()[:8]
+    """[FEAT-267] Dynamic Key Discovery for Lab REST calls (mtime-memoized, FEAT-475)."""
+    return _shared_style_key(STYLE_CSS, fallback="missing")
 DB_PATH = os.path.expanduser("~/AcmeLab/chroma_db")
 COLLECTION_STREAM = "short_term_stream"
 COLLECTION_WISDOM = "long_term_wisdom"
@@ -51,8 +51,8 @@ COLLECTION_DNA = "behavioral_dna"
 # Chroma Setup (FastEmbed CPU-only ONNX embeddings: 0 MB GPU VRAM, ~20ms latency)
 _fastembed_model = None
 
-def embed_texts(texts: list[str]) -> list[list[float]]:
-    """[FEAT-ONNX] Compute embeddings strictly on CPU via FastEmbed (0 MB GPU VRAM)."""
+def _load_embedder():
+    """[FEAT-472] Deferred FastEmbed model load (resolved via the 'embeddings' capability)."""
     global _fastembed_model
     if _fastembed_model is None:
         try:
@@ -61,13 +61,43 @@ def embed_texts(texts: list[str]) -> list[list[float]]:
         except Exception as e:
             logger.error(f"[ARCHIVE] FastEmbed initialization error: {e}")
             raise
-    return [vec.tolist() for vec in _fastembed_model.embed(texts)]
+    return _fastembed_model
+
+
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """[FEAT-ONNX] Compute embeddings strictly on CPU via FastEmbed (0 MB GPU VRAM)."""
+    return [vec.tolist() for vec in node.require("embeddings").embed(texts)]
+
+
+# [FEAT-477] Query-embedding memo: the Hub's speculative raw-query prefetch and the
+# follow-up HyDE retrieval embed the same turn text; only the first pays for it.
+_QUERY_VEC_CACHE = OrderedDict()
+_QUERY_VEC_CACHE_SIZE = 128
 
-try:
-    chroma_client = chromadb.HttpClient(host="127.0.0.1", port=8001)
-    chroma_client.heartbeat()
-except Exception:
-    chroma_client = chromadb.PersistentClient(path=DB_PATH)
+
+def embed_query(text: str) -> list[list[float]]:
+    vec = _QUERY_VEC_CACHE.get(text)
+    if vec is None:
+        vec = embed_texts([text])
+        _QUERY_VEC_CACHE[text] = vec
+        if len(_QUERY_VEC_CACHE) > _QUERY_VEC_CACHE_SIZE:
+            _QUERY_VEC_CACHE.popitem(last=False)
+    else:
+        _QUERY_VEC_CACHE.move_to_end(text)
+    return vec
+
+def _connect_chroma():
+    """[FEAT-472] Deferred Chroma connection: resolved on first collection access."""
+    import chromadb
+    try:
+        client = chromadb.HttpClient(host="127.0.0.1", port=8001)
+        client.heartbeat()
+    except Exception:
+        client = chromadb.PersistentClient(path=DB_PATH)
+    return client
+
+
+chroma_client = LazyProxy(lambda: node.require("chroma"))
 
 
 def get_safe_collection(name):
@@ -77,9 +107,9 @@ def get_safe_collection(name):
         return chroma_client.get_collection(name=name)
 
 
-stream = get_safe_collection(COLLECTION_STREAM)
-wisdom = get_safe_collection(COLLECTION_WISDOM)
-dna = get_safe_collection(COLLECTION_DNA)
+stream = LazyProxy(lambda: get_safe_collection(COLLECTION_STREAM))
+wisdom = LazyProxy(lambda: get_safe_collection(COLLECTION_WISDOM))
+dna = LazyProxy(lambda: get_safe_collection(COLLECTION_DNA))
 
 # Ensure paths exist
 os.makedirs(DRAFTS_DIR, exist_ok=True)
@@ -95,6 +125,9 @@ ARCHIVE_SYSTEM_PROMPT = (
 )
 
 node = BicameralNode("ArchiveNode", ARCHIVE_SYSTEM_PROMPT)
+tracing.set_service("archive")  # [FEAT-481]
+node.capabilities.register("chroma", _connect_chroma)
+node.capabilities.register("embeddings", _load_embedder)
 mcp = node.mcp
 
 
@@ -727,7 +760,16 @@ def execute_grep_search_pivot(query: str, max_matches: int = 5) -> str:
 
 
 @mcp.tool()
-async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_vector_text: str = None) -> str:
+async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_vector_text: str = None, request_id: str = "") -> str:
+    """
+    [FEAT-116/117/437/442/447] Context Retrieval Engine (see _get_context).
+    [FEAT-481] `request_id` keys this call's phase spans into the Hub's trace.
+    """
+    async with tracing.span("archive.get_context", request_id=request_id or None, hyde=bool(hyde_vector_text)):
+        return await _get_context(query, n_results=n_results, domain=domain, hyde_vector_text=hyde_vector_text)
+
+
+async def _get_context(query: str, n_results: int = 3, domain: str = None, hyde_vector_text: str = None) -> str:
     """
     [FEAT-116/117/437/442/447] Context Retrieval Engine: Searches wisdom, stream, and keyword stores.
     Supports HyDE (Hypothetical Document Embeddings) vector text overrides for vector queries.
@@ -832,6 +874,7 @@ async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_v
             return _collect_multi_results(raw)
 
         # [FEAT-442/447] First pass: search with HyDE-refined query
+        tracing.lap("multi_collection")
         multi_candidates = []
         try:
             async with aiohttp.ClientSession() as session:
@@ -865,10 +908,12 @@ async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_v
             logging.info(f"[HYDE] HyDE vector query produced {len(multi_candidates)} candidates.")
 
         # [FEAT-450 / Story 58.1] Maximal Marginal Relevance (MMR) Diversity Re-Ranking
+        tracing.lap("mmr", candidates=len(multi_candidates))
         multi_candidates = compute_mmr_ranking(multi_candidates, n_results=n_results)
 
         # [FEAT-451 / Story 58.2] Autonomous Grep Search Pivot Loop (Agentic-R)
         if not multi_candidates or (multi_candidates and multi_candidates[0]["distance"] > 0.50):
+            tracing.lap("grep_pivot")
             pivot_evidence = execute_grep_search_pivot(query)
             if pivot_evidence:
                 combined_context.append(pivot_evidence)
@@ -946,6 +991,7 @@ async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_v
         target_year = str(target_date.year) if target_date else None
 
         # [Task 2.1] Memo Integration: Check for high-level observations first
+        tracing.lap("memo")
         memo = await get_observational_memo(topic=query if not target_year else None, year=target_year)
         if "[MEMO:" in memo:
             combined_context.append(memo)
@@ -959,8 +1005,9 @@ async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_v
             logging.info(f"[ARCHIVE] Applying Fuzzy Year Post-Filter: {target_year} (Target: {target_date})")
 
         # Stage 1: Hybrid Discovery (RRF)
+        tracing.lap("vector_rrf")
         vector_results = []
-        q_vecs = embed_texts([query])
+        q_vecs = embed_query(query)
         res_w = wisdom.query(query_embeddings=q_vecs, n_results=fetch_limit)
         for i, doc in enumerate(res_w.get("documents", [[]])[0]):
             meta = res_w.get("metadatas", [[]])[0][i]
@@ -993,6 +1040,7 @@ async def get_context(query: str, n_results: int = 3, domain: str = None, hyde_v
              return json.dumps({"text": "\n\n".join(combined_context), "sources": []})
 
         # Stage 2: Raw Acquisition (Multi-Stage Discovery)
+        tracing.lap("acquisition")
         full_truths = []
         source_files = []
         
@@ -1411,7 +1459,7 @@ async def query_vibe(query_text: str) -> str:
     Returns the target adapter and behavioral guidance.
     """
     try:
-        q_vec = embed_texts([query_text])
+        q_vec = embed_query(query_text)
         results = dna.query(query_embeddings=q_vec, n_results=1)
         if not results["ids"][0]:
             return json.dumps({"adapter": "standard", "guidance": "Follow standard operating protocols."})
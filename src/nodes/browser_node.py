@@ -1,9 +1,5 @@
-import os
-import asyncio
 import json
 import logging
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
 from infra.montana import reclaim_logger
 
 # [FEAT-304] Protocol Hardening: Ensure logs do not corrupt the MCP JSON-RPC pipe
@@ -11,8 +7,10 @@ reclaim_logger(role="BROWSER")
 
 try:
     from nodes.loader import BicameralNode
+    from nodes.browser_pool import load_fetcher
 except ImportError:
     from loader import BicameralNode
+    from browser_pool import load_fetcher
 
 BROWSER_SYSTEM_PROMPT = (
     "You are the Browser Node, 'The Scout'. IDENTITY: Web Acquisition Operative. "
@@ -25,45 +23,28 @@ BROWSER_SYSTEM_PROMPT = (
 node = BicameralNode("Browser", BROWSER_SYSTEM_PROMPT)
 mcp = node.mcp
 
+# [FEAT-483] Long-lived Chromium page pool + revalidating disk cache, resolved on first use
+node.capabilities.register("browser", load_fetcher)
+
+
 @mcp.tool()
-async def browse_url(url: str) -> str:
-    """Extracts clean text/markdown from a job board page or any URL."""
+async def browse_url(url: str, verify: bool = False) -> str:
+    """Extracts clean text/markdown from a job board page or any URL. verify=True skips unconfirmed cache hits."""
     logging.info(f"[BROWSER] Navigating to: {url}")
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=True)
-            # Use a real-looking UA to avoid simple bot detection
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            
-            # Set a reasonable timeout
-            await page.goto(url, wait_until="networkidle", timeout=45000)
-            
-            # Wait a bit for any dynamic content
-            await asyncio.sleep(2)
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove scripts, styles, and other noise
-            for s in soup(['script', 'style', 'nav', 'footer', 'header', 'iframe', 'noscript']):
-                s.decompose()
-            
-            # Get text and clean it
-            text = soup.get_text(separator='\n')
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            clean_text = '\n'.join(lines)
-            
-            await browser.close()
-            
-            # Return a reasonable chunk
-            return clean_text[:10000] # Cap at 10k chars for sanity
-            
-        except Exception as e:
-            logging.error(f"[BROWSER] Error browsing {url}: {e}")
-            return f"Error: Failed to fetch {url}. Exception: {str(e)}"
+    try:
+        return await node.capabilities.get("browser").fetch(url, verify=verify)
+    except Exception as e:
+        logging.error(f"[BROWSER] Error browsing {url}: {e}")
+        return f"Error: Failed to fetch {url}. Exception: {str(e)}"
+
+
+@mcp.tool()
+async def browse_urls(urls: list, verify: bool = False) -> str:
+    """[FEAT-483] Fetch several URLs concurrently through the page pool. Returns JSON {url: text}."""
+    logging.info(f"[BROWSER] Batch navigation: {len(urls)} URLs")
+    fetcher = node.capabilities.get("browser")
+    return json.dumps(await fetcher.fetch_many(urls, verify=verify))
+
 
 @mcp.tool()
 async def ping_engine(force: bool = False) -> str:
@@ -0,0 +1,397 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from html.parser import HTMLParser
+
+from infra.atomic_io import atomic_write_json
+
+# [FEAT-483] Persistent Browser Pool
+# Objective: browse_url used to launch a fresh Chromium per URL, wait for
+# networkidle plus a fixed 2 s sleep, and parse with BeautifulSoup's pure-Python
+# html.parser. The Recruiter verifies dozens of JDs a night, so:
+#   - one long-lived browser, with a pool of reusable context+page slots (the
+#     pool size is the concurrency cap),
+#   - images/fonts/media are aborted at the route level,
+#   - navigation waits for DOMContentLoaded plus a short, bounded settle,
+#   - extracted text is cached on disk and revalidated with a conditional GET
+#     (ETag / Last-Modified) before paying for a render again; pages without
+#     validators are only trusted for a few minutes,
+#   - fetch(verify=True) never answers from cache without asking the server:
+#     a copy is returned only after a 304, otherwise the page is re-rendered,
+#   - text extraction uses lxml (stdlib streaming parser if lxml is absent).
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BROWSER_CACHE_DIR = os.environ.get("LAB_BROWSER_CACHE_DIR", os.path.join(LAB_DIR, ".cache", "browser"))
+BROWSER_POOL_SIZE = int(os.environ.get("LAB_BROWSER_POOL", "4"))
+BLOCKED_RESOURCES = frozenset({"image", "font", "media"})
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+NAV_TIMEOUT_MS = 45000
+SETTLE_MS = 1500          # bounded networkidle wait after DOMContentLoaded (was a fixed 2 s sleep)
+RECYCLE_AFTER = 50        # fresh context after this many navigations (cookies, memory)
+REVALIDATE_TIMEOUT_S = 10.0
+NO_VALIDATOR_TTL_S = int(os.environ.get("LAB_BROWSER_NO_VALIDATOR_TTL", "600"))  # pages without ETag/Last-Modified
+CACHE_RETENTION_DAYS = 14
+TEXT_CAP = 10000          # chars returned to callers
+
+NOISE_TAGS = ("script", "style", "nav", "footer", "header", "iframe", "noscript")
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _clean_lines(chunks):
+    lines = (line.strip() for chunk in chunks for line in chunk.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class _TextExtractor(HTMLParser):
+    """Streaming fallback: collects text outside NOISE_TAGS without building a tree."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NOISE_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in NOISE_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chunks.append(data)
+
+
+def extract_text(html):
+    """Visible text of an HTML document, one non-empty line per text block."""
+    if not html:
+        return ""
+    try:
+        import lxml.html
+        from lxml import etree
+    except ImportError:
+        parser = _TextExtractor()
+        parser.feed(html)
+        parser.close()
+        return _clean_lines(parser.chunks)
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    etree.strip_elements(doc, etree.Comment, *NOISE_TAGS, with_tail=False)
+    return _clean_lines(doc.itertext())
+
+
+def cache_policy(headers):
+    """(cacheable, fresh_for_s, validators) from the document's response headers."""
+    cc = (headers.get("cache-control") or "").lower()
+    if "no-store" in cc:
+        return False, 0, {}
+    validators = {k: headers[k] for k in ("etag", "last-modified") if headers.get(k)}
+    match = _MAX_AGE_RE.search(cc)
+    if match and "no-cache" not in cc:
+        return True, int(match.group(1)), validators
+    return True, (0 if validators else NO_VALIDATOR_TTL_S), validators
+
+
+class PageCache:
+    """[FEAT-483] One JSON file per URL: extracted text plus its HTTP validators."""
+
+    def __init__(self, directory=BROWSER_CACHE_DIR, retention_days=CACHE_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._pruned = False
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url), "r") as f:
+                entry = json.load(f)
+            return entry if entry.get("url") == url else None
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, text, fresh_for, validators):
+        entry = {"url": url, "text": text, "fetched_at": time.time(), "fresh_for": fresh_for, **validators}
+        try:
+            atomic_write_json(self._path(url), entry, indent=None)
+        except Exception as e:
+            logging.warning(f"[BROWSER] Cache write failed for {url}: {e}")
+        self.prune()
+        return entry
+
+    def touch(self, url, entry, headers=None):
+        """Revalidated (304): restart the freshness window, adopting any refreshed validators."""
+        if headers:
+            _, fresh_for, validators = cache_policy(headers)
+            entry.update(validators)
+            entry["fresh_for"] = fresh_for
+        entry["fetched_at"] = time.time()
+        try:
+            atomic_write_json(self._path(url), entry, indent=None)
+        except Exception:
+            pass
+
+    def prune(self):
+        if self._pruned:
+            return
+        self._pruned = True
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+        except OSError:
+            pass
+
+
+def _conditional_get(url, entry, timeout=REVALIDATE_TIMEOUT_S):
+    """Blocking conditional GET. Returns (status, headers) -- 304 means the cached text is current."""
+    headers = {"User-Agent": USER_AGENT}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last-modified"):
+        headers["If-Modified-Since"] = entry["last-modified"]
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, {k.lower(): v for k, v in resp.headers.items()}
+    except urllib.error.HTTPError as e:
+        return e.code, {k.lower(): v for k, v in (e.headers or {}).items()}
+
+
+async def revalidate(url, entry):
+    return await asyncio.to_thread(_conditional_get, url, entry)
+
+
+def _plain_get(url, timeout=NAV_TIMEOUT_MS / 1000.0):
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            charset = resp.headers.get_content_charset() or "utf-8"
+            return resp.status, {k.lower(): v for k, v in resp.headers.items()}, resp.read().decode(charset, errors="replace")
+    except urllib.error.HTTPError as e:
+        return e.code, {k.lower(): v for k, v in (e.headers or {}).items()}, ""
+
+
+async def http_render(url):
+    """Renderer without a browser (no JavaScript). Used when Playwright is not installed."""
+    return await asyncio.to_thread(_plain_get, url)
+
+
+class _Slot:
+    __slots__ = ("context", "page", "uses", "generation", "broken")
+
+    def __init__(self, context, page, generation):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.generation = generation
+        self.broken = False
+
+
+class BrowserPool:
+    """
+    [FEAT-483] One headless Chromium shared by every browse_url call.
+    `size` context+page slots are reused across calls; a call waits for a free
+    slot, so `size` is also the navigation concurrency cap. A crashed browser
+    is relaunched on the next render.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, blocked=BLOCKED_RESOURCES, user_agent=USER_AGENT,
+                 nav_timeout_ms=NAV_TIMEOUT_MS, settle_ms=SETTLE_MS, recycle_after=RECYCLE_AFTER):
+        self.size = max(1, size)
+        self.blocked = frozenset(blocked)
+        self.user_agent = user_agent
+        self.nav_timeout_ms = nav_timeout_ms
+        self.settle_ms = settle_ms
+        self.recycle_after = recycle_after
+        self.stats = {"launches": 0, "renders": 0, "blocked": 0, "recycled": 0}
+        self._pw = None
+        self._browser = None
+        self._slots = None
+        self._generation = 0
+        self._lock = None
+
+    @property
+    def running(self):
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.running:
+                return
+            from playwright.async_api import async_playwright
+            if self._pw is None:
+                self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=True, args=["--disable-dev-shm-usage"])
+            self._generation += 1
+            self.stats["launches"] += 1
+            # Reuse the queue so callers already waiting on it get the new browser's pages
+            if self._slots is None:
+                self._slots = asyncio.Queue()
+            while not self._slots.empty():
+                self._slots.get_nowait()
+            for _ in range(self.size):
+                self._slots.put_nowait(await self._new_slot())
+            logging.info(f"[BROWSER] Chromium up with {self.size} pooled pages (launch #{self.stats['launches']}).")
+
+    async def _new_slot(self):
+        context = await self._browser.new_context(user_agent=self.user_agent, service_workers="block")
+        await context.route("**/*", self._route)
+        return _Slot(context, await context.new_page(), self._generation)
+
+    async def _route(self, route):
+        if route.request.resource_type in self.blocked:
+            self.stats["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _release(self, slot):
+        if slot.generation != self._generation:
+            return  # belongs to a browser that has since been relaunched
+        if slot.broken or slot.uses >= self.recycle_after:
+            self.stats["recycled"] += 1
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+            try:
+                slot = await self._new_slot()
+            except Exception as e:
+                logging.warning(f"[BROWSER] Pooled page replacement failed ({e}); relaunching Chromium.")
+                await self._relaunch()
+                return
+        self._slots.put_nowait(slot)
+
+    async def _relaunch(self):
+        browser, self._browser = self._browser, None
+        try:
+            if browser is not None:
+                await browser.close()
+        except Exception:
+            pass
+        try:
+            await self.start()
+        except Exception as e:
+            logging.error(f"[BROWSER] Chromium relaunch failed: {e}")
+
+    async def render(self, url):
+        """Navigate a pooled page to `url`. Returns (status, headers, html)."""
+        if not self.running:
+            await self.start()
+        slot = await self._slots.get()
+        try:
+            resp = await slot.page.goto(url, wait_until="domcontentloaded", timeout=self.nav_timeout_ms)
+            try:
+                await slot.page.wait_for_load_state("networkidle", timeout=self.settle_ms)
+            except Exception:
+                pass  # pages with long-polling never go idle; the DOM is already there
+            html = await slot.page.content()
+            slot.uses += 1
+            self.stats["renders"] += 1
+            if resp is None:
+                return 200, {}, html
+            return resp.status, await resp.all_headers(), html
+        except Exception:
+            slot.broken = True
+            raise
+        finally:
+            await self._release(slot)
+
+    async def close(self):
+        browser, pw = self._browser, self._pw
+        self._browser = self._pw = None
+        try:
+            if browser is not None:
+                await browser.close()
+            if pw is not None:
+                await pw.stop()
+        except Exception as e:
+            logging.debug(f"[BROWSER] Shutdown: {e}")
+
+
+class PageFetcher:
+    """
+    [FEAT-483] browse_url front end: disk cache -> conditional revalidation -> render.
+    `renderer(url)` returns (status, headers, html); `concurrency` caps renders
+    for renderers that have no pool of their own.
+    """
+
+    def __init__(self, renderer, cache=None, concurrency=BROWSER_POOL_SIZE, revalidator=revalidate, text_cap=TEXT_CAP):
+        self.renderer = renderer
+        self.cache = cache if cache is not None else PageCache()
+        self.concurrency = concurrency
+        self.revalidator = revalidator
+        self.text_cap = text_cap
+        self.stats = {"fresh": 0, "revalidated": 0, "rendered": 0, "errors": 0}
+        self._sem = None
+
+    async def fetch(self, url, verify=False):
+        """verify=True: the server must confirm a cached copy (304) or the page is rendered again."""
+        entry = self.cache.get(url)
+        if entry is not None:
+            if not verify and time.time() - entry.get("fetched_at", 0) < entry.get("fresh_for", 0):
+                self.stats["fresh"] += 1
+                return entry["text"][:self.text_cap]
+            if entry.get("etag") or entry.get("last-modified"):
+                try:
+                    status, headers = await self.revalidator(url, entry)
+                    if status == 304:
+                        self.stats["revalidated"] += 1
+                        self.cache.touch(url, entry, headers)
+                        return entry["text"][:self.text_cap]
+                except Exception as e:
+                    logging.debug(f"[BROWSER] Revalidation failed for {url}: {e}")
+
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        async with self._sem:
+            try:
+                status, headers, html = await self.renderer(url)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+        self.stats["rendered"] += 1
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if status >= 400:
+            return f"Error: HTTP {status} fetching {url}"
+        text = extract_text(html)
+        cacheable, fresh_for, validators = cache_policy(headers)
+        if cacheable and status == 200 and text:
+            self.cache.put(url, text[:self.text_cap], fresh_for, validators)
+        return text[:self.text_cap]
+
+    async def fetch_many(self, urls, verify=False):
+        """Fetch `urls` concurrently; per-URL failures come back as 'Error: ...' strings."""
+        async def _one(u):
+            try:
+                return await self.fetch(u, verify=verify)
+            except Exception as e:
+                return f"Error: Failed to fetch {u}. Exception: {str(e)}"
+        results = await asyncio.gather(*(_one(u) for u in urls))
+        return dict(zip(urls, results))
+
+
+def load_fetcher():
+    """Capability loader: pooled Chromium when Playwright is installed, plain HTTP otherwise."""
+    try:
+        import playwright.async_api  # noqa: F401
+        pool = BrowserPool()
+        return PageFetcher(pool.render, concurrency=pool.size)
+    except ImportError:
+        logging.warning("[BROWSER] Playwright not installed; falling back to plain HTTP fetches (no JavaScript).")
+        return PageFetcher(http_render)
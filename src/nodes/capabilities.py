@@ -0,0 +1,247 @@
+import builtins
+import importlib
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# [FEAT-472] Role-Aware Capabilities: Heavy imports and client connections are
+# declared per role in config/node_capabilities.json and resolved on first use.
+# A node that never touches ChromaDB never pays for it.
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CAPABILITY_MANIFEST = os.path.join(LAB_DIR, "config", "node_capabilities.json")
+PROFILE_DIR = os.path.join(LAB_DIR, "logs")
+
+
+def _load_liger():
+    from liger_kernel.transformers import apply_liger_kernel_to_qwen2, apply_liger_kernel_to_llama
+    apply_liger_kernel_to_qwen2()
+    apply_liger_kernel_to_llama()
+    return True
+
+
+# Built-in loaders; nodes register role-specific ones (e.g. the Archive's Chroma client).
+DEFAULT_LOADERS = {
+    "local_kernels": _load_liger,
+    "nvml": lambda: importlib.import_module("pynvml"),
+}
+
+
+def canonical_role(name):
+    """'ArchiveNode' / 'ARCHIVE' / 'archive' -> 'archive'."""
+    role = str(name).lower()
+    return role[:-4] if role.endswith("node") and len(role) > 4 else role
+
+
+def load_manifest(role, path=CAPABILITY_MANIFEST):
+    """Returns {'capabilities': [...], 'warm': [...]} for a role."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        entry = data.get("roles", {}).get(canonical_role(role)) or data.get("default", {})
+        return {"capabilities": list(entry.get("capabilities", [])), "warm": list(entry.get("warm", []))}
+    except Exception:
+        return {"capabilities": [], "warm": []}
+
+
+class StartupProfiler:
+    """
+    [FEAT-472] Import-time tree per node.
+    Wraps builtins.__import__ while active and records nested wall time for every
+    import statement that actually loaded new modules. Enabled with LAB_STARTUP_PROFILE=1.
+    """
+
+    def __init__(self, min_ms=1.0):
+        self.min_ms = min_ms
+        self.root = {"name": "<startup>", "ms": 0.0, "children": []}
+        self.phases = {}
+        self._stack = [self.root]
+        self._orig_import = None
+        self._t0 = time.perf_counter()
+        self._lock = threading.RLock()
+
+    @property
+    def active(self):
+        return self._orig_import is not None
+
+    def install(self):
+        if self.active:
+            return
+        self._orig_import = builtins.__import__
+        profiler = self
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if threading.current_thread() is not threading.main_thread():
+                return profiler._orig_import(name, globals, locals, fromlist, level)
+            label = name
+            if level and globals:
+                label = f"{globals.get('__package__') or ''}{'.' * level}{name}"
+            if fromlist and fromlist != ("*",):
+                label = f"{label} ({', '.join(map(str, fromlist))})"
+            node = {"name": label, "ms": 0.0, "children": []}
+            before = len(sys.modules)
+            profiler._stack.append(node)
+            t0 = time.perf_counter()
+            try:
+                return profiler._orig_import(name, globals, locals, fromlist, level)
+            finally:
+                node["ms"] = (time.perf_counter() - t0) * 1000.0
+                profiler._stack.pop()
+                if len(sys.modules) > before and node["ms"] >= profiler.min_ms:
+                    profiler._stack[-1]["children"].append(node)
+
+        builtins.__import__ = _timed_import
+
+    def uninstall(self):
+        if self.active:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a named startup phase (e.g. a client connection)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = round((time.perf_counter() - t0) * 1000.0, 2)
+
+    def tree(self):
+        def _finish(node):
+            kids = [_finish(c) for c in node["children"]]
+            child_ms = sum(c["ms"] for c in kids)
+            out = {"name": node["name"], "ms": round(node["ms"], 2), "self_ms": round(max(0.0, node["ms"] - child_ms), 2)}
+            if kids:
+                out["children"] = sorted(kids, key=lambda c: c["ms"], reverse=True)
+            return out
+
+        self.root["ms"] = sum(c["ms"] for c in self.root["children"])
+        return _finish(self.root)
+
+    def report(self, role):
+        tree = self.tree()
+        return {
+            "role": canonical_role(role),
+            "pid": os.getpid(),
+            "uptime_ms": round((time.perf_counter() - self._t0) * 1000.0, 2),
+            "import_ms": tree["ms"],
+            "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+            "phases": dict(self.phases),
+            "imports": tree,
+        }
+
+    def dump(self, role, directory=PROFILE_DIR):
+        """Write logs/startup_profile_<role>.json, log the slowest top-level imports and stop profiling."""
+        if not self.active:
+            return None
+        report = self.report(role)
+        # Startup is over: later (lazy) imports must not keep growing the tree through _timed_import
+        self.uninstall()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"startup_profile_{report['role']}.json")
+            with open(path, "w") as f:
+                json.dump(report, f)
+            top = ", ".join(f"{c['name']}={c['ms']:.0f}ms" for c in report["imports"].get("children", [])[:5])
+            logging.info(f"[PROFILE] {report['role']} imports {report['import_ms']:.0f}ms, RSS {report['max_rss_mib']}MiB. Top: {top}")
+            return path
+        except Exception as e:
+            logging.warning(f"[PROFILE] Startup profile dump failed: {e}")
+            return None
+
+
+profiler = StartupProfiler()
+if os.environ.get("LAB_STARTUP_PROFILE") == "1":
+    profiler.install()
+
+
+class CapabilitySet:
+    """
+    [FEAT-472] Lazily resolved, role-declared heavy dependencies.
+    get() resolves a capability once (thread-safe) and caches the result.
+    Undeclared capabilities still load, but log manifest drift.
+    """
+
+    def __init__(self, role, manifest=None):
+        self.role = canonical_role(role)
+        manifest = manifest if manifest is not None else load_manifest(self.role)
+        self.declared = set(manifest.get("capabilities", []))
+        self.warm_list = [c for c in manifest.get("warm", []) if c in self.declared]
+        self._loaders = dict(DEFAULT_LOADERS)
+        self._resolved = {}
+        self._lock = threading.RLock()
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+
+    def is_declared(self, name):
+        return name in self.declared
+
+    def loaded(self, name):
+        return name in self._resolved
+
+    def get(self, name):
+        if name in self._resolved:
+            return self._resolved[name]
+        with self._lock:
+            if name in self._resolved:
+                return self._resolved[name]
+            if name not in self._loaders:
+                raise KeyError(f"Unknown capability: {name}")
+            if name not in self.declared:
+                logging.warning(f"[{self.role}] Capability '{name}' used but not declared in node_capabilities.json")
+            with profiler.phase(f"capability:{name}"):
+                value = self._loaders[name]()
+            self._resolved[name] = value
+            logging.debug(f"[{self.role}] Capability '{name}' resolved ({profiler.phases.get(f'capability:{name}')}ms)")
+            return value
+
+    def warm(self):
+        """Resolve the manifest's warm list in the background (after the MCP pipe is up)."""
+        if not self.warm_list:
+            return None
+
+        def _worker():
+            for name in self.warm_list:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    logging.warning(f"[{self.role}] Background warm of '{name}' failed: {e}")
+
+        t = threading.Thread(target=_worker, daemon=True, name=f"warm-{self.role}")
+        t.start()
+        return t
+
+
+class LazyProxy:
+    """Module-level stand-in that resolves its target on first attribute access."""
+
+    __slots__ = ("_resolver", "_target", "_lock")
+
+    def __init__(self, resolver):
+        object.__setattr__(self, "_resolver", resolver)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self):
+        target = object.__getattribute__(self, "_target")
+        if target is None:
+            with object.__getattribute__(self, "_lock"):
+                target = object.__getattribute__(self, "_target")
+                if target is None:
+                    target = object.__getattribute__(self, "_resolver")()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        target = object.__getattribute__(self, "_target")
+        return f"<LazyProxy {'unresolved' if target is None else repr(target)}>"
@@ -1,3 +1,5 @@
+# [FEAT-472] Installed first so LAB_STARTUP_PROFILE=1 sees the node's full import tree
+from nodes.capabilities import CapabilitySet, profiler
 import aiohttp
 import asyncio
 import json
@@ -10,6 +12,11 @@ import queue
 import requests
 from mcp.server.fastmcp import FastMCP
 from infra.pager_relay import trigger_pager
+from nodes.prompt_layout import PromptLayout
+from infra.token_budget import ContextWindowExceeded, TokenCounter, fit_prompt, load_tokenizer
+from infra import tracing
+from infra.stream_decoder import NDJSON, SSE, StreamDecoder, iter_batches
+from infra.trace_sink import NODE_TRACE_ENABLED, get_sink
 
 # Paths
 LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -81,12 +88,13 @@ class BicameralNode:
 
         self.name = name.lower()
 
-        # [FEAT-210] Optimized kernels (Lazy Load)
-        if os.environ.get("DISABLE_EAR") != "1":
+        # [FEAT-472] Role-aware capabilities: heavy deps resolve on first use, per manifest
+        self.capabilities = CapabilitySet(self.name)
+
+        # [FEAT-210] Optimized kernels: only for roles that run an in-process transformer
+        if self.capabilities.is_declared("local_kernels") and os.environ.get("DISABLE_EAR") != "1":
             try:
-                from liger_kernel.transformers import apply_liger_kernel_to_qwen2, apply_liger_kernel_to_llama
-                apply_liger_kernel_to_qwen2()
-                apply_liger_kernel_to_llama()
+                self.capabilities.get("local_kernels")
                 logging.debug(f"[{self.name}] Liger kernels applied (Qwen + Llama).")
             except Exception as e:
                 logging.warning(f"[{self.name}] Liger application failed: {e}")
@@ -120,8 +128,16 @@ class BicameralNode:
             "you are FORBIDDEN from generating placeholder facts. "
             "You must output the exact token: [ERROR: CONTEXT_STARVED]."
         )
-        self.system_prompt = self.IDENTITY_BEDROCK + "\n\n" + system_prompt
+        # [FEAT-479] Canonical, byte-stable system prefix for vLLM prefix caching
+        self.layout = PromptLayout(self.IDENTITY_BEDROCK, system_prompt)
+        self.system_prompt = self.layout.prefix
+        # [FEAT-480] CPU tokenizer of the served base model, loaded on the first vLLM turn
+        self.capabilities.register("tokenizer", lambda: TokenCounter(load_tokenizer(get_unified_base_model())))
+        tracing.set_service(name)  # [FEAT-481]
         self.mcp = FastMCP(name)
+        # [FEAT-078][FEAT-495] Neural trace goes through a background sink, off the generation path
+        self.trace_path = os.path.join(LAB_DIR, "logs", f"trace_{self.name}.json")
+        self.trace_sink = get_sink(self.trace_path)
         self._last_brain_prime = 0
         self.brain_online = True
         self._engine_cache = None
@@ -152,11 +168,11 @@ class BicameralNode:
             [FEAT-240.2] The Relay Pattern: Standard-compliant 'Thinking' turn.
             Supports real-time token yielding to the Hub for internal waterfall streaming.
             """
-            system_override = self.system_prompt
-            if tools:
-                system_override += "\n\n" + self.CONTEXT_VALIDITY
-            if behavioral_guidance:
-                system_override += f"\n\n[BEHAVIORAL_GUIDANCE]:\n{behavioral_guidance}"
+            # [FEAT-479] Per-turn sections ride in the tail; the system prefix stays fixed
+            sections = {
+                "CONTEXT_VALIDITY": self.CONTEXT_VALIDITY if tools else "",
+                "GUIDANCE_FRAME": behavioral_guidance,
+            }
 
             # [SPR-41_5] Log tool call to tool_log.md archive
             params_preview = f"query=\"{query[:80]}\""
@@ -178,7 +194,7 @@ class BicameralNode:
             with redirect_stdout(sys.stderr):
                 # Pass sampling parameters for small model stability
                 # [FEAT-339] Use LoRA by default, but allow override for stability
-                async for token in self.generate_response(query, context, system_override=system_override, source_name=stream_source, temperature=temperature, repetition_penalty=repetition_penalty, use_lora=use_lora, tools=tools, response_format=response_format, request_id=request_id):
+                async for token in self.generate_response(query, context, sections=sections, source_name=stream_source, temperature=temperature, repetition_penalty=repetition_penalty, use_lora=use_lora, tools=tools, response_format=response_format, request_id=request_id):
                     if "The local engine is warming its anchors" not in token:
                         full_response += token
                     
@@ -196,15 +212,22 @@ class BicameralNode:
         [FEAT-240.2] Native Sampling Bridge (Streaming).
         Returns an async generator of tokens.
         """
-        system_override = self.system_prompt
+        sections = {"GUIDANCE_FRAME": behavioral_guidance}
         if tools:
-            system_override += "\n\n" + self.CONTEXT_VALIDITY
             tool_desc = "\n".join([f"- {t}" for t in tools])
-            system_override += f"\n\n[HUB_TOOLS]: You have access to these steering tools via the Hub:\n{tool_desc}"
-        if behavioral_guidance:
-            system_override += f"\n\n[BEHAVIORAL_GUIDANCE]:\n{behavioral_guidance}"
-        
-        return self.generate_response(query, context, system_override=system_override, source_name=self.name, response_format=response_format)
+            sections["CONTEXT_VALIDITY"] = self.CONTEXT_VALIDITY
+            sections["HUB_TOOLS"] = f"You have access to these steering tools via the Hub:\n{tool_desc}"
+
+        return self.generate_response(query, context, sections=sections, source_name=self.name, response_format=response_format)
+
+    @property
+    def tokens(self):
+        """[FEAT-480] Shared token counter (exact when the model's tokenizer is on disk)."""
+        return self.require("tokenizer")
+
+    def require(self, capability):
+        """[FEAT-472] Resolve a declared heavy dependency (module or client) on first use."""
+        return self.capabilities.get(capability)
 
     def _load_json(self, path):
         if os.path.exists(path):
@@ -414,8 +437,12 @@ class BicameralNode:
                 self._session = None
             return False, f"Connection failed: {e}"
 
-    async def generate_response(self, query, context="", metadata=None, system_override=None, max_tokens=1000, disable_tools=False, source_name=None, temperature=0.2, repetition_penalty=1.1, use_lora=True, tools=None, response_format=None, request_id="default"):
-        """Standard interface for LLM calls across the bicameral mind (Async Generator)."""
+    async def generate_response(self, query, context="", metadata=None, system_override=None, max_tokens=1000, disable_tools=False, source_name=None, temperature=0.2, repetition_penalty=1.1, use_lora=True, tools=None, response_format=None, request_id="default", sections=None):
+        """
+        Standard interface for LLM calls across the bicameral mind (Async Generator).
+        `sections` are per-turn prompt blocks (see nodes/prompt_layout.py); they are
+        appended after the query so the system prefix stays cacheable.
+        """
         # [FEAT-462] Warming Anchor Hold-The-Line Loop
         if not self._engine_cache or (time.time() - self._last_probe > self._probe_ttl_success):
             ok, msg = await self.ping_engine()
@@ -458,11 +485,10 @@ class BicameralNode:
                     logging.debug(f"[{self.name}] Role token '{token}' -> LoRA: '{label}'")
                     break
 
-        system_prompt = system_override or self.system_prompt
-        
+        sections = dict(sections or {})
+
         # [FEAT-254.2] Metadata Displacement: Context shifts from system to user
         # This prevents 3B models from confusing system data with their core identity.
-        user_context = ""
         if context:
             # [MASKING] Convert technical metrics into qualitative design stances
             # This prevents the model from citing "Fuel: 0.80" in its response.
@@ -483,42 +509,32 @@ class BicameralNode:
                     masked = masked.replace(fuel_match.group(0), f"Resonance: {stance}")
             except Exception:
                 pass
-            
-            masked = masked.replace("ROUTE:", "Flow:").replace("ROLE:", "Identity:")
-            user_context += f"[SYSTEM_DESIGN_STANCE]:\n{masked}\n\n"
-            
-        # Detect guidance jammed into system_override by wrappers
-        if system_override and "[BEHAVIORAL_GUIDANCE]:" in system_override:
-            parts = system_override.split("[BEHAVIORAL_GUIDANCE]:")
-            system_prompt = parts[0].strip()
-            user_context += f"[GUIDANCE_FRAME]:\n{parts[1].strip()}\n\n"
 
-        if user_context:
-            # [Task 20.5] Append context to end to preserve prefix hash
-            query = f"{query}\n\n---\n[DYNAMIC_CONTEXT]:\n{user_context}"
+            masked = masked.replace("ROUTE:", "Flow:").replace("ROLE:", "Identity:")
+            sections["SYSTEM_DESIGN_STANCE"] = masked
 
         if engine["type"] == "VLLM":
-            # [SAFETY] Dynamic context ceiling auto-discovered from active vLLM model metadata
+            # [SAFETY][FEAT-480] Pack the turn into the auto-discovered vLLM window using
+            # exact token counts; the system prefix is never cut ([FEAT-479] layout).
             MAX_CONTEXT = engine.get("max_model_len", 16384)
-            SAFE_CEILING = max(1000, MAX_CONTEXT - 384)
-            SAFE_PROMPT_HEADROOM = max(800, MAX_CONTEXT - 884)
-            est_prompt_tokens = int((len(system_prompt) + len(query)) / 3.8)
-            
-            # If prompt alone exceeds prompt headroom, dynamically truncate excess context
-            if est_prompt_tokens > SAFE_PROMPT_HEADROOM:
-                allowed_chars = int((SAFE_PROMPT_HEADROOM - len(system_prompt) / 3.8) * 3.8)
-                if allowed_chars > 200:
-                    query = query[-allowed_chars:]
-                    est_prompt_tokens = int((len(system_prompt) + len(query)) / 3.8)
-                    logging.warning(f"[{self.name}] [FEAT-431] Dynamically truncated excess context to {est_prompt_tokens} tokens for {MAX_CONTEXT} vLLM window.")
-
-            if est_prompt_tokens + max_tokens > SAFE_CEILING:
-                clamped_max = max(150, SAFE_CEILING - est_prompt_tokens)
-                if clamped_max < max_tokens:
-                    warn_msg = f"Context Ceiling Clamp: Clamped max_tokens from {max_tokens} to {clamped_max} (Prompt: ~{est_prompt_tokens} tokens) for {MAX_CONTEXT} context limit."
-                    logging.warning(f"[{self.name}] {warn_msg}")
-                    trigger_pager(warn_msg, source="VLLM", severity="WARNING")
-                    max_tokens = clamped_max
+            requested_max = max_tokens
+            try:
+                system_prompt, query, max_tokens, budget = fit_prompt(
+                    self.tokens, self.layout, query, sections, system_override, MAX_CONTEXT, max_tokens
+                )
+            except ContextWindowExceeded as e:
+                # Nothing sensible fits; a one-token query with max_tokens=1 would just burn a request
+                logging.error(f"[{self.name}] [FEAT-480] {e}")
+                trigger_pager(str(e), source="VLLM", severity="ERROR")
+                yield f"Error: {e}"
+                return
+            trimmed = [k for k, (kept, full) in budget["sections"].items() if kept < full]
+            if trimmed:
+                logging.warning(f"[{self.name}] [FEAT-480] Trimmed {', '.join(trimmed)} to fit {MAX_CONTEXT}-token window ({budget['prompt_tokens']} prompt tokens).")
+            if max_tokens < requested_max:
+                warn_msg = f"Context Ceiling Clamp: Clamped max_tokens from {requested_max} to {max_tokens} (Prompt: {budget['prompt_tokens']} tokens) for {MAX_CONTEXT} context limit."
+                logging.warning(f"[{self.name}] {warn_msg}")
+                trigger_pager(warn_msg, source="VLLM", severity="WARNING")
 
             payload = {
                 "model": engine["model"],
@@ -559,6 +575,8 @@ class BicameralNode:
                     }
                 }
         else:
+            # [Task 20.5][FEAT-479] Canonical layout: fixed system prefix, variable sections after the query
+            system_prompt, query = self.layout.assemble(query, sections, system_override=system_override)
             payload = {
                 "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": query}],
                 "stream": True,
@@ -569,30 +587,36 @@ class BicameralNode:
             if engine.get("model"):
                 payload["model"] = engine["model"]
 
-        self._mirror_trace("send", payload, url=engine["url"], metadata=metadata)
+        trace_turn = NODE_TRACE_ENABLED and self.trace_sink.sampled(request_id)  # [FEAT-495]
+        if trace_turn:
+            self._mirror_trace("send", payload, url=engine["url"], metadata=metadata, request_id=request_id)
 
         # [FEAT-T20.1] Token timing instrumentation
-        full_response = ""
+        parts = []
         token_count = 0
         ttft_ms = 0.0
         t0 = time.time()
         first_token = True
+        # [FEAT-481] Generation span; ended in finally because the caller may close this generator early
+        gen_span = tracing.span("llm.generate", request_id=request_id, engine=engine.get("type", ""), model=payload.get("model", ""))
         try:
             stream_iter = (
                 self._stream_vllm(engine["url"], payload)
                 if engine["type"] == "VLLM"
                 else self._stream_ollama(engine["url"], payload)
             )
-            async for token in stream_iter:
-                if first_token and token:
+            # [FEAT-494] Streams yield (text, tokens) batches; count tokens, not batches
+            async for text, n in stream_iter:
+                if first_token and text:
                     ttft_ms = (time.time() - t0) * 1000.0
                     first_token = False
-                full_response += token
-                token_count += 1
-                yield token
+                parts.append(text)
+                token_count += n
+                yield text
 
             duration_s = time.time() - t0
-            self._mirror_trace("recv", full_response)
+            if trace_turn:
+                self._mirror_trace("recv", "".join(parts), request_id=request_id)
 
             # [FEAT-T20.1] Emit telemetry event for hub collection
             self._emit_telemetry(
@@ -606,11 +630,14 @@ class BicameralNode:
         except Exception as e:
             logging.error(f"[{self.name}] Generation failed: {e}")
             err_str = str(e)
+            gen_span.set(error=err_str[:120])
             if "Connect call failed" in err_str or "vLLM connection" in err_str or "ClientConnectorError" in err_str or "Connection failure" in err_str:
                 prefix = "Narf! " if self.name == "Pinky" else ""
                 yield f"{prefix}The local engine is warming its anchors right now. Re-connecting momentarily!"
             else:
                 yield f"Egad! Logic failure: {e}"
+        finally:
+            gen_span.end(ttft_ms=round(ttft_ms, 1), decode_ms=round((time.time() - t0) * 1000.0 - ttft_ms, 1), tokens=token_count)
 
     def _start_telemetry_relay(self):
         """[FEAT-233.2] Dedicated thread for non-blocking token delivery."""
@@ -641,7 +668,7 @@ class BicameralNode:
         self.telemetry_queue.put(payload)
 
     def append_to_tool_log(self, tool_name, params_preview="", output_link=""):
-        """[FEAT-411] Structured Append-Only Tool Log Archive with atomic writes."""
+        """[FEAT-411] Structured Append-Only Tool Log Archive; one O_APPEND write per entry [FEAT-495]."""
         try:
             os.makedirs(os.path.dirname(TOOL_LOG_PATH), exist_ok=True)
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -650,21 +677,22 @@ class BicameralNode:
                 parts.append(f"with params {params_preview}")
             if output_link:
                 parts.append(f"-> Output at [{output_link}](file://{output_link})")
-            
-            # Atomic write: .tmp + os.replace
-            tmp_path = f"{TOOL_LOG_PATH}.tmp"
-            with open(tmp_path, "a") as f:
-                f.write(" ".join(parts) + "\n")
-            os.replace(tmp_path, TOOL_LOG_PATH)
+
+            # [FEAT-495] The old .tmp + os.replace swapped a one-line file over the whole archive.
+            # A single O_APPEND write keeps history and never interleaves with other appenders.
+            fd = os.open(TOOL_LOG_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, (" ".join(parts) + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
         except Exception as e:
             logging.error(f"[TOOL_LOG] Failed to append to tool log: {e}")
 
     def _emit_telemetry(self, request_id, ttft_ms, total_tokens, duration_s, engine_type, model):
         """[FEAT-T20.1] Fire telemetry callback if wired by hub."""
         # [SPR-41_5] Log generation completion to tool_log.md with trace link
-        trace_path = os.path.join(LAB_DIR, "logs", f"trace_{self.name}.json")
         params_preview = f"request_id={request_id}, tokens={total_tokens}, duration={duration_s}s"
-        self.append_to_tool_log("think", params_preview, output_link=trace_path)
+        self.append_to_tool_log("think", params_preview, output_link=self.trace_path)
 
         if callable(self._on_telemetry):
             try:
@@ -701,15 +729,30 @@ class BicameralNode:
         import threading
         threading.Thread(target=_send_http, daemon=True).start()
 
+    async def _decode_stream(self, response, protocol):
+        """[FEAT-494] Raw body chunks -> (text, token_count) batches via StreamDecoder."""
+        decoder = StreamDecoder(protocol)
+        async for chunk in response.content.iter_any():
+            tokens = decoder.feed(chunk)
+            if tokens:
+                for batch in iter_batches(tokens):
+                    yield batch
+            if decoder.done:
+                return
+        for batch in iter_batches(decoder.close()):
+            yield batch
+
     async def _stream_vllm(self, url, payload):
-        """[FEAT-233] vLLM token generator."""
+        """[FEAT-233] vLLM token generator; yields (text, token_count) batches [FEAT-494]."""
         async with aiohttp.ClientSession() as session:
             try:
                 async with session.post(url, json=payload, timeout=120) as r:
                     if r.status != 200:
                         err = await r.text()
                         # [FEAT-431] Reactive 400 Context Overflow Fallback Retry
-                        if r.status == 400 and ("context length" in err.lower() or "input_tokens" in err.lower()):
+                        # [FEAT-480] With an exact tokenizer the prompt was packed to the window
+                        # up front; the blind 25% chop only remains for heuristic counts.
+                        if r.status == 400 and not self.tokens.exact and ("context length" in err.lower() or "input_tokens" in err.lower()):
                             logging.warning(f"[{self.name}] [FEAT-431] vLLM 400 Context Overflow caught! Truncating context by 25% and retrying once...")
                             try:
                                 messages = payload.get("messages", [])
@@ -721,103 +764,68 @@ class BicameralNode:
                                     payload["max_tokens"] = max(150, payload.get("max_tokens", 500) - 100)
                                     async with session.post(url, json=payload, timeout=120) as r_retry:
                                         if r_retry.status == 200:
-                                            async for line in r_retry.content:
-                                                if line:
-                                                    decoded = line.decode('utf-8').strip()
-                                                    if decoded.startswith("data: "):
-                                                        if "[DONE]" in decoded:
-                                                            break
-                                                        try:
-                                                            data = json.loads(decoded[6:])
-                                                            token = data["choices"][0]["delta"].get("content", "")
-                                                            if token:
-                                                                yield token
-                                                        except Exception:
-                                                            continue
+                                            async for batch in self._decode_stream(r_retry, SSE):
+                                                yield batch
                                             return
                             except Exception as retry_ex:
                                 logging.error(f"[{self.name}] [FEAT-431] Reactive 400 retry failed: {retry_ex}")
 
                         logging.error(f"[{self.name}] vLLM Error {r.status}: {err}")
                         trigger_pager(f"vLLM Stream Error ({r.status}): {err}", source="VLLM", severity="ERROR")
-                        yield f"Error: vLLM returned {r.status}: {err}"
+                        yield f"Error: vLLM returned {r.status}: {err}", 0
                         return
 
-                    async for line in r.content:
-                        if line:
-                            decoded = line.decode('utf-8').strip()
-                            if decoded.startswith("data: "):
-                                if "[DONE]" in decoded:
-                                    break
-                                try:
-                                    data = json.loads(decoded[6:])
-                                    token = data["choices"][0]["delta"].get("content", "")
-                                    if token:
-                                        yield token
-                                except Exception:
-                                    continue
+                    async for batch in self._decode_stream(r, SSE):
+                        yield batch
             except aiohttp.ClientPayloadError as pe:
                 logging.error(f"[{self.name}] Payload Error (vLLM Crash?): {pe}")
-                yield f"Error: Engine communication broken ({pe})"
+                yield f"Error: Engine communication broken ({pe})", 0
             except Exception as e:
                 logging.error(f"[{self.name}] vLLM Connection failed: {e}")
                 err_str = str(e)
                 if any(k in err_str for k in ["Connect call failed", "vLLM connection", "ClientConnectorError", "Connection failure", "Cannot connect to host"]):
                     prefix = "Narf! " if self.name == "Pinky" else ""
-                    yield f"{prefix}The local engine is warming its anchors right now. Re-connecting momentarily!"
+                    yield f"{prefix}The local engine is warming its anchors right now. Re-connecting momentarily!", 0
                 else:
-                    yield f"Error: vLLM connection failed: {e}"
+                    yield f"Error: vLLM connection failed: {e}", 0
 
     async def _stream_ollama(self, url, payload):
-        """[FEAT-233] Ollama token generator."""
+        """[FEAT-233] Ollama token generator; yields (text, token_count) batches [FEAT-494]."""
         async with aiohttp.ClientSession() as session:
             try:
                 async with session.post(url, json=payload, timeout=120) as r:
                     if r.status != 200:
                         err = await r.text()
                         logging.error(f"[{self.name}] Ollama Error {r.status}: {err}")
-                        yield f"Error: Ollama returned {r.status}"
+                        yield f"Error: Ollama returned {r.status}", 0
                         return
-                    async for line in r.content:
-                        if line:
-                            try:
-                                data = json.loads(line.decode('utf-8'))
-                                token = data.get("message", {}).get("content", "")
-                                if token:
-                                    yield token
-                                if data.get("done"):
-                                    break
-                            except Exception:
-                                continue
+                    async for batch in self._decode_stream(r, NDJSON):
+                        yield batch
             except aiohttp.ClientPayloadError as pe:
                 self._engine_cache = None
                 logging.error(f"[{self.name}] Payload Error (Ollama Crash?): {pe}")
-                yield f"Error: Engine communication broken ({pe})"
+                yield f"Error: Engine communication broken ({pe})", 0
             except Exception as e:
                 self._engine_cache = None  # [FEAT-084] Clear cache on error
                 logging.error(f"[{self.name}] Stream failed: {e}")
                 err_str = str(e)
                 if any(k in err_str for k in ["Connect call failed", "ClientConnectorError", "Connection failure", "Cannot connect to host"]):
                     prefix = "Narf! " if self.name == "Pinky" else ""
-                    yield f"{prefix}The local engine is warming its anchors right now. Re-connecting momentarily!"
+                    yield f"{prefix}The local engine is warming its anchors right now. Re-connecting momentarily!", 0
                 else:
-                    yield f"Error: Stream failed: {e}"
+                    yield f"Error: Stream failed: {e}", 0
 
-    def _mirror_trace(self, phase, data, url=None, metadata=None):
-        """[FEAT-078] Neural Trace: Persists black-box payloads for auditability."""
-        try:
-            lab_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            log_dir = os.path.join(lab_root, "logs")
-            os.makedirs(log_dir, exist_ok=True)
-            log_path = os.path.join(log_dir, f"trace_{self.name}.json")
-            mode = "a"
-            entry = {"phase": phase, "timestamp": time.time(), "data": data, "metadata": metadata}
-            if url:
-                entry["url"] = url
-            with open(log_path, mode) as f:
-                f.write(json.dumps(entry, indent=2) + "\n")
-        except Exception:
-            pass
+    def _mirror_trace(self, phase, data, url=None, metadata=None, request_id=None):
+        """[FEAT-078] Neural Trace: Persists black-box payloads for auditability.
+        [FEAT-495] Queued to the node's TraceSink as one compact NDJSON line; never blocks."""
+        if not NODE_TRACE_ENABLED:
+            return
+        entry = {"phase": phase, "timestamp": time.time(), "data": data, "metadata": metadata}
+        if url:
+            entry["url"] = url
+        if request_id:
+            entry["request_id"] = request_id
+        self.trace_sink.submit(entry)
 
     async def call_remote_tool(self, target_node: str, tool_name: str, parameters: dict) -> str:
         logging.info(f"[{self.name}] Requesting remote tool: {target_node}.{tool_name}")
@@ -827,4 +835,10 @@ class BicameralNode:
         })
 
     def run(self):
-        self.mcp.run()
+        # [FEAT-472] Imports are done by now: record the startup tree, then warm declared clients
+        profiler.dump(self.name)
+        self.capabilities.warm()
+        try:
+            self.mcp.run()
+        finally:
+            self.trace_sink.close()  # [FEAT-495] Flush queued traces on shutdown
@@ -1,6 +1,5 @@
 import json
 import os
-import pynvml
 # [FEAT-031] Logger Isolation (The Montana Fix)
 from infra.montana import reclaim_logger
 
@@ -33,6 +32,7 @@ async def ask_brain(task: str) -> str:
 async def vram_vibe_check() -> str:
     """High-fidelity VRAM telemetry via direct NVML bindings."""
     try:
+        pynvml = node.require("nvml")  # [FEAT-472] Lazy capability
         pynvml.nvmlInit()
         handle = pynvml.nvmlDeviceGetHandleByIndex(0)
         info = pynvml.nvmlDeviceGetMemoryInfo(handle)
@@ -49,6 +49,7 @@ async def vram_vibe_check() -> str:
 async def get_lab_health() -> str:
     """Reports system thermals and power draw."""
     try:
+        pynvml = node.require("nvml")  # [FEAT-472] Lazy capability
         pynvml.nvmlInit()
         handle = pynvml.nvmlDeviceGetHandleByIndex(0)
         temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
@@ -0,0 +1,114 @@
+import hashlib
+import re
+
+# [FEAT-479] Prefix-Stable Prompt Layout
+# vLLM's automatic prefix caching reuses KV blocks only while the token stream
+# is byte-identical from the start. The system message is therefore built once
+# per node (identity bedrock + role prompt, canonicalized) and never varies per
+# turn; everything turn-specific -- tool contract, stance, guidance, masked
+# context, the round-table debate -- goes into the user message after the
+# query, in one fixed order.
+
+# Tail sections in emission order. Unknown labels sort after these, alphabetically.
+TAIL_ORDER = (
+    "CONTEXT_VALIDITY",
+    "HUB_TOOLS",
+    "SYSTEM_DESIGN_STANCE",
+    "GUIDANCE_FRAME",
+    "PREVIOUS_DEBATE",
+)
+
+# Markers wrappers have historically concatenated onto system_override / query.
+_GUIDANCE_MARKERS = ("[BEHAVIORAL_GUIDANCE]:", "[VIBE_GUIDANCE]:")
+_DEBATE_MARKER = "[PREVIOUS_DEBATE]:"
+_TRAILING_WS = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def canonicalize(text):
+    """Normalize newlines and trailing whitespace so equal prompts are equal bytes."""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _TRAILING_WS.sub("", text).strip()
+
+
+def prefix_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def split_guidance(system_text):
+    """
+    Pull guidance a wrapper appended to a system prompt back out:
+    'BASE\\n\\n[BEHAVIORAL_GUIDANCE]:\\nbe brief' -> ('BASE', 'be brief').
+    """
+    if not system_text:
+        return "", ""
+    cut = min((system_text.find(m) for m in _GUIDANCE_MARKERS if m in system_text), default=-1)
+    if cut < 0:
+        return system_text, ""
+    base, guidance = system_text[:cut], system_text[cut:]
+    for marker in _GUIDANCE_MARKERS:
+        guidance = guidance.replace(marker, "")
+    return base, canonicalize(guidance)
+
+
+def split_debate(query):
+    """Detach a '[PREVIOUS_DEBATE]:' block the Hub appended to the query."""
+    if not query or _DEBATE_MARKER not in query:
+        return query, ""
+    head, _, debate = query.partition(_DEBATE_MARKER)
+    return head.rstrip(), canonicalize(debate)
+
+
+class PromptLayout:
+    """
+    [FEAT-479] Per-node prompt assembler.
+    `system()` is the byte-stable prefix; `assemble()` returns (system, user)
+    with all variable sections appended after the query.
+    """
+
+    def __init__(self, identity, role_prompt):
+        self.prefix = canonicalize(f"{canonicalize(identity)}\n\n{canonicalize(role_prompt)}")
+        self.prefix_id = prefix_hash(self.prefix)
+        self._overrides = {}
+
+    def system(self, override=None):
+        """The node prefix, or a canonicalized fixed override (e.g. the fast-reflex prompts)."""
+        if not override:
+            return self.prefix
+        cached = self._overrides.get(override)
+        if cached is None:
+            cached = canonicalize(override)
+            if len(self._overrides) < 64:
+                self._overrides[override] = cached
+        return cached
+
+    @staticmethod
+    def tail(sections):
+        present = {k: canonicalize(v) for k, v in (sections or {}).items() if v and canonicalize(v)}
+        order = [k for k in TAIL_ORDER if k in present] + sorted(k for k in present if k not in TAIL_ORDER)
+        return "\n\n".join(f"[{k}]:\n{present[k]}" for k in order)
+
+    def split(self, query, sections=None, system_override=None):
+        """
+        Returns (system_prompt, query, sections). Guidance embedded in
+        `system_override` and a debate block embedded in `query` are moved
+        into the sections so they cannot perturb the prefix.
+        """
+        sections = dict(sections or {})
+        base, guidance = split_guidance(system_override or "")
+        if guidance:
+            prior = sections.get("GUIDANCE_FRAME", "")
+            sections["GUIDANCE_FRAME"] = f"{prior}\n{guidance}" if prior else guidance
+        query, debate = split_debate(query)
+        if debate and not sections.get("PREVIOUS_DEBATE"):
+            sections["PREVIOUS_DEBATE"] = debate
+        return self.system(base if base.strip() else None), query, sections
+
+    def render(self, system, query, sections):
+        tail = self.tail(sections)
+        return system, (f"{query}\n\n---\n[DYNAMIC_CONTEXT]:\n{tail}" if tail else query)
+
+    def assemble(self, query, sections=None, system_override=None):
+        """Returns (system_prompt, user_message) with every variable section after the query."""
+        return self.render(*self.split(query, sections, system_override))
@@ -0,0 +1,245 @@
+import datetime
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from infra.atomic_io import atomic_write_json
+
+# [FEAT-485] Incremental Semantic Map Builder
+# Objective: build_semantic_map used to re-read every timeline JSON in
+# field_notes/data on every call and dedupe each pillar with a list scan per
+# item (quadratic in the archive). Now each file's contribution (event count,
+# strategic anchors, per-pillar entries) is computed once and cached keyed by
+# mtime/size, with a content hash to absorb touch-only changes (a file whose
+# bytes hash to the cached sha1 is never re-parsed). Only changed files are
+# re-parsed (in a spawn-context process pool when there are enough of them:
+# build() runs in a worker thread of the lab node, where fork is unsafe); the
+# merge is a single linear pass with per-pillar seen-sets, and nothing is
+# rewritten when no input changed.
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SEMANTIC_CACHE_FILE = os.environ.get("LAB_SEMANTIC_MAP_CACHE", os.path.join(LAB_DIR, ".cache", "semantic_map.json"))
+CACHE_VERSION = 1
+POOL_THRESHOLD = 4  # below this many changed files a process pool costs more than it saves
+SUMMARY_CAP = 150
+
+# Metadata/non-timeline JSON files that live alongside the year files
+EXCLUDED_FILES = frozenset({
+    "semantic_map.json", "status.json", "themes.json", "vram_characterization.json", "file_manifest.json",
+    "learning_ledger.json", "recruiter_report.json", "processed_jobs.json", "queue.json", "chunk_state.json",
+    "compressed_history.json", "memo_cache.json", "nightly_dialogue.json", "null.json", "privacy_audit.json",
+    "scan_state.json",
+})
+
+# Pillars keywords definition
+PILLARS_KW = {
+    "validation": ["validation", "validate", "test", "verification", "verify", "fuzz", "regression", "checking", "check", "assert", "dttc", "qa"],
+    "automation": ["automation", "automate", "script", "tool", "pipeline", "jenkins", "build", "ci/cd", "cron", "workflow", "subprocess", "pexpect"],
+# [FEAT-457] FeatureTracker Alignment & Submodule Synchronization
+    "architecture": ["architecture", "design", "structure", "microservice", "infrastructure", "topology", "uml", "spec", "platform", "submodule", "agentic"],
+    "telemetry": ["telemetry", "monitor", "prometheus", "grafana", "rapl", "msr", "power", "thermal", "load", "sensory", "logging", "metric", "dcgm"]
+}
+
+
+def _matches(keywords, tags_low, summary_low, evidence_low):
+    # Check tags first, then summary/evidence
+    if any(k in t for t in tags_low for k in keywords):
+        return True
+    return any(k in summary_low or k in evidence_low for k in keywords)
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_contribution(path):
+    """
+    Parse one timeline file into its share of the hierarchy. Module-level so
+    the process pool can pickle it. Returns (sha1, contribution); the
+    contribution is None for non-timeline content.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    data = json.loads(raw)
+    if not isinstance(data, list):
+        return digest, None
+
+    year = os.path.basename(path).replace(".json", "")
+    strategic = []
+    analytical = {pillar: [] for pillar in PILLARS_KW}
+    seen = {pillar: set() for pillar in PILLARS_KW}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        rank = item.get("rank", 2)
+        anchor_text = str(item.get("summary", ""))
+        technical_gem = item.get("technical_gem", "") or ""
+
+        # 1. Strategic Layer (Rank >= 4 or STRATEGIC_ANCHOR flag)
+        if rank >= 4 or "[STRATEGIC_ANCHOR]" in anchor_text:
+            strategic.append({"year": year, "anchor": anchor_text[:SUMMARY_CAP], "gem": technical_gem})
+
+        # 2. Analytical Layer (Themes/Pillars)
+        summary_low = anchor_text.lower()
+        evidence_low = str(item.get("evidence", "")).lower()
+        tags_low = [str(t).lower() for t in item.get("tags", [])]
+        summary = anchor_text[:SUMMARY_CAP]
+        for pillar, keywords in PILLARS_KW.items():
+            if summary in seen[pillar] or not _matches(keywords, tags_low, summary_low, evidence_low):
+                continue
+            seen[pillar].add(summary)
+            analytical[pillar].append({"year": year, "gem": technical_gem, "summary": summary})
+
+    return digest, {"year": year, "events": len(data), "strategic": strategic, "analytical": analytical}
+
+
+def merge_contributions(contributions):
+    """Fold per-file contributions (in file order) into the 3-layer hierarchy."""
+    hierarchy = {
+        "strategic_layer": [],  # Rank >= 4 anchors
+        "analytical_layer": {pillar: [] for pillar in PILLARS_KW},  # Grouped by specific technical pillars
+        "tactical_layer": {     # Chronological distribution of events
+            "total_events": 0,
+            "year_distribution": {},
+            "description": "Raw chronological technical evidence."
+        },
+        "meta_layer": {
+            "resonance_score": 0.0,
+            "active_themes": [],
+            "last_refactor": datetime.datetime.now().isoformat()
+        }
+    }
+    seen = {pillar: set() for pillar in PILLARS_KW}
+    tactical = hierarchy["tactical_layer"]
+    for contrib in contributions:
+        year = contrib["year"]
+        tactical["total_events"] += contrib["events"]
+        tactical["year_distribution"][year] = tactical["year_distribution"].get(year, 0) + contrib["events"]
+        hierarchy["strategic_layer"].extend(contrib["strategic"])
+        for pillar, entries in contrib["analytical"].items():
+            bucket, pillar_seen = hierarchy["analytical_layer"].setdefault(pillar, []), seen.setdefault(pillar, set())
+            for entry in entries:
+                # Avoid duplicates by summary
+                if entry["summary"] not in pillar_seen:
+                    pillar_seen.add(entry["summary"])
+                    bucket.append(entry)
+    return hierarchy
+
+
+class SemanticMapBuilder:
+    """[FEAT-485] Rebuilds semantic_map.json from only the timeline files that changed since the last run."""
+
+    def __init__(self, data_dir, map_file=None, cache_file=None, workers=None):
+        self.data_dir = data_dir
+        self.map_file = map_file or os.path.join(data_dir, "semantic_map.json")
+        self.cache_file = cache_file or SEMANTIC_CACHE_FILE
+        self.workers = workers
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, "r") as f:
+                cache = json.load(f)
+            if cache.get("version") == CACHE_VERSION and cache.get("data_dir") == self.data_dir:
+                return cache.get("files", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _artifacts(self):
+        try:
+            names = sorted(n for n in os.listdir(self.data_dir) if n.endswith(".json") and n not in EXCLUDED_FILES)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.data_dir, n) for n in names]
+
+    def _parse(self, paths):
+        """Returns {path: (digest, contribution) | Exception} for the changed files."""
+        if len(paths) >= POOL_THRESHOLD:
+            try:
+                # Never fork: build() is called from asyncio.to_thread inside the node's event loop
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    futures = {path: pool.submit(file_contribution, path) for path in paths}
+                    out = {path: self._outcome(fut) for path, fut in futures.items()}
+                if not any(isinstance(result, BrokenProcessPool) for result in out.values()):
+                    return out
+                logging.warning("[BUILD_SEMANTIC_MAP] Process pool workers died; parsing inline.")
+            except (OSError, RuntimeError) as e:
+                logging.warning(f"[BUILD_SEMANTIC_MAP] Process pool unavailable ({e}); parsing inline.")
+        out = {}
+        for path in paths:
+            try:
+                out[path] = file_contribution(path)
+            except Exception as e:
+                out[path] = e
+        return out
+
+    @staticmethod
+    def _outcome(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def build(self):
+        """Returns stats: files, parsed (changed content), touched (mtime-only), removed, written."""
+        cached = self._load_cache()
+        files, changed = {}, []
+        for path in self._artifacts():
+            name = os.path.basename(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = cached.get(name)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                files[name] = entry
+            else:
+                changed.append(path)
+                files[name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+        stats = {"files": len(files), "parsed": 0, "touched": 0,
+                 "removed": len(set(cached) - set(files)), "written": False}
+        # Hash before parsing: a touch-only change keeps its cached contribution
+        to_parse = []
+        for path in changed:
+            name = os.path.basename(path)
+            previous = cached.get(name)
+            try:
+                same = bool(previous and previous.get("sha1")) and file_digest(path) == previous["sha1"]
+            except OSError:
+                same = False
+            if same:
+                files[name].update({"sha1": previous["sha1"], "contribution": previous.get("contribution")})
+                stats["touched"] += 1
+            else:
+                to_parse.append(path)
+
+        for path, result in self._parse(to_parse).items():
+            name = os.path.basename(path)
+            stats["parsed"] += 1  # new content, or a failure: whatever it contributed before is gone
+            if isinstance(result, Exception):
+                logging.error(f"[BUILD_SEMANTIC_MAP] Failed to parse {path}: {result}")
+                files[name].update({"sha1": None, "contribution": None})
+                continue
+            digest, contribution = result
+            files[name].update({"sha1": digest, "contribution": contribution})
+
+        dirty = stats["parsed"] or stats["removed"] or not os.path.exists(self.map_file)
+        if dirty:
+            hierarchy = merge_contributions(files[n]["contribution"] for n in sorted(files) if files[n].get("contribution"))
+            atomic_write_json(self.map_file, hierarchy, indent=None)
+            stats["written"] = True
+        if changed or stats["removed"]:
+            atomic_write_json(self.cache_file, {"version": CACHE_VERSION, "data_dir": self.data_dir, "files": files}, indent=None)
+        logging.info(f"[BUILD_SEMANTIC_MAP] [FEAT-485] {stats['files']} files: {stats['parsed']} re-parsed, "
+                     f"{stats['touched']} touched, {stats['removed']} removed; map {'rewritten' if stats['written'] else 'unchanged'}.")
+        return stats
@@ -35,14 +35,14 @@ mcp = node.mcp
 @mcp.tool()
 async def deep_think(task: str, context: str = "", metadata: dict = None) -> str:
     """The Reasoning Engine: Execute complex architectural or coding tasks."""
-    system_override = None
+    sections = None
     if metadata and metadata.get("behavioral_guidance"):
-        # [FEAT-190] Vibe-Aware Prompting
-        system_override = f"{DEEP_THOUGHT_SYSTEM_PROMPT}\n\n[VIBE_GUIDANCE]: {metadata['behavioral_guidance']}"
+        # [FEAT-190] Vibe-Aware Prompting ([FEAT-479] tail section; system prefix stays cacheable)
+        sections = {"GUIDANCE_FRAME": metadata["behavioral_guidance"]}
     
     # Return full string block
     full_response = ""
-    async for token in node.generate_response(task, context, metadata=metadata, system_override=system_override):
+    async for token in node.generate_response(task, context, metadata=metadata, sections=sections):
         full_response += token
     return full_response
 
@@ -17,6 +17,12 @@ CONFIG_FILE = os.path.join(BASE_DIR, "../config/recruiter_config.json")
 SIGNATURES_FILE = os.path.join(BASE_DIR, "../config/team_signatures.json")
 PAGER_FILE = os.path.expanduser("~/Dev_Lab/Portfolio_Dev/field_notes/data/pager_activity.json")
 
+# [FEAT-484] Verification pipeline stage widths: JD fetches ride the Browser
+# node's page pool; scoring is a deep_think on the Brain, so it stays narrower.
+FETCH_CONCURRENCY = int(os.environ.get("LAB_RECRUITER_FETCH_CONCURRENCY", "4"))
+SCORE_CONCURRENCY = int(os.environ.get("LAB_RECRUITER_SCORE_CONCURRENCY", "2"))
+LEDGER_CAP = 1000
+
 def load_config():
     default = {
         "target_roles": ["Senior Platform Telemetry Engineer"],
@@ -73,6 +79,11 @@ class NightlyRecruiter:
         self.config = config
         self.signatures = signatures
         self.ledger_path = os.path.expanduser("~/Dev_Lab/Portfolio_Dev/field_notes/data/processed_jobs.json")
+        # [FEAT-484] Ledger loaded once per run into hashed seen-sets; written back once by flush_ledger()
+        self._ledger = None
+        self._seen_urls = set()
+        self._seen_identities = set()
+        self._ledger_dirty = False
 
     async def calculate_semantic_match(self, jd_text: str) -> Dict:
         """
@@ -110,48 +121,61 @@ class NightlyRecruiter:
             
         return {"score": 0.5, "bucket": "General", "evidence": "Failed to perform semantic audit."}
 
+    @staticmethod
+    def _identity(job: Dict) -> str:
+        return (job.get("title", "") + job.get("company", "")).lower().replace(" ", "").strip()
+
+    def _load_ledger(self):
+        """[FEAT-484] Read processed_jobs.json once; URL and fuzzy-identity lookups become set hits."""
+        if self._ledger is not None:
+            return
+        ledger = []
+        if os.path.exists(self.ledger_path):
+            try:
+                with open(self.ledger_path, "r") as f:
+                    ledger = json.load(f)
+            except Exception as e:
+                logging.error(f"[RECRUITER] Ledger Load Failed: {e}")
+                ledger = []
+        self._ledger = [item for item in ledger if isinstance(item, str)]
+        for item in self._ledger:
+            if item.startswith("http"):
+                self._seen_urls.add(item)
+            else:
+                self._seen_identities.add(item.lower().replace(" ", "").strip())
+
     def is_duplicate(self, job: Dict) -> bool:
         """Checks the persistent ledger to prevent redundant alerts."""
-        if not os.path.exists(self.ledger_path):
-            return False
-        try:
-            with open(self.ledger_path, "r") as f:
-                ledger = json.load(f)
-            
-            # Case 1: Direct URL match
-            if job.get("url") and job.get("url") in ledger:
-                return True
-                
-            # Case 2: Fuzzy Identity match (Title + Company)
-            identity = (job.get("title", "") + job.get("company", "")).lower().replace(" ", "").strip()
-            if not identity: return False
-            
-            for item in ledger:
-                if not item.startswith("http") and identity == item.lower().replace(" ", "").strip():
-                    return True
-            
-            return False
-        except Exception:
-            return False
+        self._load_ledger()
+        # Case 1: Direct URL match
+        if job.get("url") and job.get("url") in self._seen_urls:
+            return True
+        # Case 2: Fuzzy Identity match (Title + Company)
+        identity = self._identity(job)
+        return bool(identity) and identity in self._seen_identities
 
     def mark_as_processed(self, job: Dict):
-        """Logs the job into the ledger."""
+        """Logs the job into the in-memory ledger (persisted by flush_ledger)."""
+        self._load_ledger()
+        url = job.get("url")
+        identity = (job.get("title", "") + job.get("company", ""))
+        if url and url not in self._seen_urls:
+            self._seen_urls.add(url)
+            self._ledger.append(url)
+            self._ledger_dirty = True
+        key = self._identity(job)
+        if key and key not in self._seen_identities:
+            self._seen_identities.add(key)
+            self._ledger.append(identity)
+            self._ledger_dirty = True
+
+    def flush_ledger(self):
+        """[FEAT-484] Single atomic write of everything marked this run."""
+        if not self._ledger_dirty:
+            return
         try:
-            if not os.path.exists(self.ledger_path):
-                ledger = []
-            else:
-                with open(self.ledger_path, "r") as f:
-                    ledger = json.load(f)
-            
-            url = job.get("url")
-            identity = (job.get("title", "") + job.get("company", ""))
-            
-            if url and url not in ledger:
-                ledger.append(url)
-            if identity and identity not in ledger:
-                ledger.append(identity)
-                
-            atomic_write_json(self.ledger_path, ledger[-1000:])
+            atomic_write_json(self.ledger_path, self._ledger[-LEDGER_CAP:])
+            self._ledger_dirty = False
         except Exception as e:
             logging.error(f"[RECRUITER] Ledger Update Failed: {e}")
 
@@ -192,36 +216,67 @@ class NightlyRecruiter:
         except Exception:
             return []
 
+    async def _fetch_jd(self, job: Dict) -> str:
+        """Fetch stage: JD text via the Browser node, or "" if the listing cannot be verified."""
+        logging.info(f"[RECRUITER] Verifying: {job['url']}")
+        try:
+            # A cached JD only counts as verified once the server has confirmed it
+            res = await self.browser.call_tool("browse_url", arguments={"url": job['url'], "verify": True})
+            jd_text = res.content[0].text
+        except Exception as e:
+            logging.error(f"[RECRUITER] Browser tool failed: {e}")
+            return ""
+        if "Error:" in jd_text:
+            logging.warning(f"[RECRUITER] Verification failed for {job['url']}")
+            return ""
+        return jd_text
+
     async def verify_and_score_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """[RE-FEAT-168.2] JD Verification via Browser Node and Semantic Scoring."""
-        scored_jobs = []
+        """
+        [RE-FEAT-168.2] JD Verification via Browser Node and Semantic Scoring.
+        [FEAT-484] Two bounded stages per job (fetch, then score) run concurrently
+        across jobs; the ledger is read once and written once.
+        """
+        # Without browser, we can't verify, so we skip to maintain high-fidelity
+        if not self.browser:
+            return []
+
+        pending, batch_keys = [], set()
         for job in jobs:
             if self.is_duplicate(job):
                 continue
-                
-            logging.info(f"[RECRUITER] Verifying: {job['url']}")
-            jd_text = ""
-            if self.browser:
-                try:
-                    res = await self.browser.call_tool("browse_url", arguments={"url": job['url']})
-                    jd_text = res.content[0].text
-                    if "Error:" in jd_text:
-                        logging.warning(f"[RECRUITER] Verification failed for {job['url']}")
-                        continue
-                except Exception as e:
-                    logging.error(f"[RECRUITER] Browser tool failed: {e}")
-                    continue
-            else:
-                # Without browser, we can't verify, so we skip to maintain high-fidelity
+            # The same listing twice in one batch is verified once
+            keys = {job.get("url") or None, self._identity(job) or None} - {None}
+            if keys & batch_keys:
                 continue
+            batch_keys |= keys
+            pending.append(job)
+        if not pending:
+            return []
 
+        fetch_sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+        score_sem = asyncio.Semaphore(SCORE_CONCURRENCY)
+
+        async def _verify(job):
+            async with fetch_sem:
+                jd_text = await self._fetch_jd(job)
+            if not jd_text:
+                return None
             # Semantic Scoring
-            audit = await self.calculate_semantic_match(jd_text)
+            async with score_sem:
+                audit = await self.calculate_semantic_match(jd_text)
             job.update(audit)
             job["jd_summary"] = jd_text[:500] + "..."
-            scored_jobs.append(job)
             self.mark_as_processed(job)
-            
+            return job
+
+        t0 = time.time()
+        try:
+            results = await asyncio.gather(*(_verify(job) for job in pending))
+        finally:
+            self.flush_ledger()
+        scored_jobs = [job for job in results if job is not None]
+        logging.info(f"[RECRUITER] Verified {len(scored_jobs)}/{len(pending)} listings in {time.time() - t0:.1f}s.")
         return scored_jobs
 
     async def generate_brief(self, jobs: List[Dict], context: str) -> (str, int):
@@ -8,6 +8,8 @@ Usage:
     python run_evals.py --model ollama     # target Ollama instead of vLLM
     python run_evals.py --dry-run          # show prompts, don't execute
     python run_evals.py --list-tags        # show available tags
+    python run_evals.py --engine mock      # [FEAT-492] CI-free run against the in-process mock engine
+    python run_evals.py --concurrency 4 --warmup 2   # [FEAT-492] scheduler knobs
 
 Output:
     HomeLabAI/logs/benchmarks.jsonl        # append-only benchmark ledger
@@ -16,6 +18,8 @@ Output:
 
 import argparse
 import asyncio
+import bisect
+import contextlib
 import json
 import logging
 import os
@@ -48,6 +52,21 @@ OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2:3b")
 WATCHDOG_SCORE_THRESHOLD = float(os.environ.get("BENCH_SCORE_THRESHOLD", "3.0"))
 WATCHDOG_WINDOW = int(os.environ.get("BENCH_WATCHDOG_WINDOW", "5"))  # last N runs
 
+# [FEAT-492] Scheduler defaults (CLI flags override)
+# Concurrency is opt-in: contended cases report worse TTFT/tok/s/J-per-token than the
+# historical solo runs in benchmarks.jsonl, so the default stays one case at a time.
+# Rows carry `concurrency`; compare like with like when reading the ledger.
+EVAL_CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", "1"))
+EVAL_WARMUP = int(os.environ.get("BENCH_WARMUP", "1"))
+EVAL_JUDGE_CONCURRENCY = int(os.environ.get("BENCH_JUDGE_CONCURRENCY", "1"))
+EVAL_COOLDOWN_S = float(os.environ.get("BENCH_COOLDOWN_S", "0"))
+# The judge runs on the local Ollama; scoring while a case is timed skews its latency
+# and power, so judging waits for inference unless pipelining is asked for.
+EVAL_PIPELINE_JUDGE = os.environ.get("BENCH_PIPELINE_JUDGE", "0") == "1"
+DCGM_POLL_S = float(os.environ.get("BENCH_DCGM_POLL_S", "1.0"))
+
+from infra.eval_scheduler import EvalScheduler, MockEngine  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [EVAL] %(message)s")
 log = logging.getLogger("eval")
 
@@ -142,6 +161,7 @@ class BenchmarkRun:
     tokens_per_sec: float = 0.0
     total_tokens: int = 0
     duration_s: float = 0.0
+    concurrency: int = 1     # [FEAT-492] cases in flight when this one started
     # Silicon
     gpu_power_w: float = 0.0
     gpu_temp_c: float = 0.0
@@ -183,6 +203,47 @@ async def _gpu_snapshot(session: aiohttp.ClientSession) -> dict:
     return {"gpu_power_w": 0.0, "gpu_temp_c": 0.0, "vram_used_mb": 0.0}
 
 
+class _GpuSampler:
+    """
+    [FEAT-492] Polls DCGM in the background for the whole run. With several
+    cases in flight a before/after snapshot pair per case no longer means
+    anything, so each case reads the samples inside its own time window.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, interval_s: float = DCGM_POLL_S):
+        self.session = session
+        self.interval_s = interval_s
+        self._times, self._snaps = [], []
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            snap = await _gpu_snapshot(self.session)
+            self._times.append(time.monotonic())
+            self._snaps.append(snap)
+            await asyncio.sleep(self.interval_s)
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    def window(self, t0: float, t1: float) -> dict:
+        lo, hi = bisect.bisect_left(self._times, t0), bisect.bisect_right(self._times, t1)
+        snaps = self._snaps[lo:hi] or self._snaps[max(0, hi - 1):hi]  # short case: nearest earlier sample
+        if not snaps:
+            return {"gpu_power_w": 0.0, "gpu_temp_c": 0.0, "vram_used_mb": 0.0}
+        return {
+            "gpu_power_w": sum(s["gpu_power_w"] for s in snaps) / len(snaps),
+            "gpu_temp_c": snaps[-1]["gpu_temp_c"],
+            "vram_used_mb": snaps[-1]["vram_used_mb"],
+        }
+
+
 # ---------------------------------------------------------------------------
 # Inference Runners
 # ---------------------------------------------------------------------------
@@ -447,87 +508,121 @@ async def _resolve_vllm_model_name(session: aiohttp.ClientSession) -> tuple[str,
 
 # ---------------------------------------------------------------------------
 # Main Eval Loop
+# [FEAT-492] Cases run through EvalScheduler: warmup requests first (reported
+# as cold-start, kept out of the ledger and the stats), then `concurrency`
+# cases at a time, then the judge (overlapped with inference only when
+# pipeline_judge is set).
 # ---------------------------------------------------------------------------
-async def run_eval(prompts: list, engine: str = "vllm", dry_run: bool = False) -> list[BenchmarkRun]:
-    runs = []
+def _to_run(result, engine: str, model_name: str, quantization: str, gpu: dict) -> BenchmarkRun:
+    p = result.case
+    # Concurrent cases share the board's draw; charge each its share
+    power = gpu["gpu_power_w"] / max(1, result.inflight)
+    j_per_tok, tco = _compute_economics(power, result.duration_s, result.tokens)
+    tps = result.tokens / result.duration_s if result.duration_s > 0 else 0.0
+    return BenchmarkRun(
+        prompt_id=p["id"],
+        tags=p["tags"],
+        prompt=p["prompt"],
+        response=result.response[:2000],  # cap stored response
+        engine=engine.upper(),
+        model=model_name,
+        quantization=quantization,
+        ttft_ms=round(result.ttft_ms, 2),
+        tokens_per_sec=round(tps, 2),
+        total_tokens=result.tokens,
+        duration_s=round(result.duration_s, 3),
+        concurrency=result.inflight,
+        gpu_power_w=round(power, 2),
+        gpu_temp_c=round(gpu.get("gpu_temp_c", 0.0), 1),
+        vram_used_mb=round(gpu.get("vram_used_mb", 0.0), 0),
+        joules_per_token=j_per_tok,
+        tco_usd=tco,
+        judge_score=result.score,
+        judge_reasoning=result.reasoning or ("Inference failed" if result.error else ""),
+        judge_model=result.judge_model,
+        rubric=p.get("rubric", ""),
+    )
 
-    # Resolve the actual model identity at runtime
-    async with aiohttp.ClientSession() as probe:
-        if engine == "vllm":
-            model_name, quantization = await _resolve_vllm_model_name(probe)
-        else:
-            model_name = OLLAMA_MODEL
-            quantization = "Q4_0"  # Ollama default quantization
 
-    async with aiohttp.ClientSession() as session:
+async def run_eval_report(
+    prompts: list,
+    engine: str = "vllm",
+    dry_run: bool = False,
+    concurrency: int = EVAL_CONCURRENCY,
+    warmup: int = EVAL_WARMUP,
+    judge_concurrency: int = EVAL_JUDGE_CONCURRENCY,
+    cooldown_s: float = EVAL_COOLDOWN_S,
+    pipeline_judge: bool = EVAL_PIPELINE_JUDGE,
+    mock: Optional[MockEngine] = None,
+) -> tuple[list[BenchmarkRun], dict]:
+    """Returns (runs in prompt order, scheduler report)."""
+    if dry_run:
         for i, p in enumerate(prompts):
             log.info(f"[{i+1}/{len(prompts)}] Running: {p['id']} | {p['tags']}")
-
-            if dry_run:
-                log.info(f"  PROMPT: {p['prompt'][:80]}...")
-                continue
-
-            # 1. Snap GPU before
-            gpu_before = await _gpu_snapshot(session)
-
-            # 2. Run inference
+            log.info(f"  PROMPT: {p['prompt'][:80]}...")
+        return [], {}
+
+    runs = {}
+    async with contextlib.AsyncExitStack() as stack:
+        sampler = None
+        if engine == "mock":
+            mock = mock or MockEngine()
+            infer, judge = mock.infer, mock.judge
+            model_name, quantization = "mock-engine", "NONE"
+        else:
+            session = await stack.enter_async_context(aiohttp.ClientSession())
+            # Resolve the actual model identity at runtime
             if engine == "vllm":
-                response, ttft_ms, tokens, duration_s = await _run_vllm(session, p["prompt"])
+                model_name, quantization = await _resolve_vllm_model_name(session)
             else:
-                response, ttft_ms, tokens, duration_s = await _run_ollama(session, p["prompt"])
-
-            # 3. Snap GPU after (use avg of before/after)
-            gpu_after = await _gpu_snapshot(session)
-            avg_power = (gpu_before["gpu_power_w"] + gpu_after["gpu_power_w"]) / 2.0
+                model_name = OLLAMA_MODEL
+                quantization = "Q4_0"  # Ollama default quantization
+            runner = _run_vllm if engine == "vllm" else _run_ollama
 
-            # 4. Economics
-            j_per_tok, tco = _compute_economics(avg_power, duration_s, tokens)
-            tps = tokens / duration_s if duration_s > 0 else 0.0
+            async def infer(case):
+                return await runner(session, case["prompt"])
 
-            # 5. Judge
-            score, reasoning, judge_model = await _judge_response(
-                session, p["prompt"], response, p.get("rubric", ""), engine
-            )
+            async def judge(case, response):
+                return await _judge_response(session, case["prompt"], response, case.get("rubric", ""), engine)
 
-            # 6. Assemble
-            run = BenchmarkRun(
-                prompt_id=p["id"],
-                tags=p["tags"],
-                prompt=p["prompt"],
-                response=response[:2000],  # cap stored response
-                engine=engine.upper(),
-                model=model_name,
-                quantization=quantization,
-                ttft_ms=round(ttft_ms, 2),
-                tokens_per_sec=round(tps, 2),
-                total_tokens=tokens,
-                duration_s=round(duration_s, 3),
-                gpu_power_w=round(avg_power, 2),
-                gpu_temp_c=round(gpu_after.get("gpu_temp_c", 0.0), 1),
-                vram_used_mb=round(gpu_after.get("vram_used_mb", 0.0), 0),
-                joules_per_token=j_per_tok,
-                tco_usd=tco,
-                judge_score=score,
-                judge_reasoning=reasoning,
-                judge_model=judge_model,
-                rubric=p.get("rubric", ""),
-            )
+            sampler = _GpuSampler(session)
+            sampler.start()
+            stack.push_async_callback(sampler.stop)
 
+        def on_result(result):
+            gpu = sampler.window(result.started, result.finished) if sampler else {
+                "gpu_power_w": 0.0, "gpu_temp_c": 0.0, "vram_used_mb": 0.0}
+            run = _to_run(result, engine, model_name, quantization, gpu)
             _append_ledger(run)
-            _watchdog_check(score, p["id"])
-            runs.append(run)
-
+            _watchdog_check(run.judge_score, run.prompt_id)
+            runs[result.index] = run
             log.info(
-                f"  Score={score}/5 | TTFT={ttft_ms:.0f}ms | "
-                f"{tps:.1f}tok/s | {avg_power:.0f}W | J/tok={j_per_tok:.4f}"
+                f"[{len(runs)}/{len(prompts)}] {run.prompt_id} | Score={run.judge_score}/5 | "
+                f"TTFT={run.ttft_ms:.0f}ms | {run.tokens_per_sec:.1f}tok/s | x{run.concurrency} | "
+                f"{run.gpu_power_w:.0f}W | J/tok={run.joules_per_token:.4f}"
             )
 
-            # Cooldown between prompts to avoid thermal saturation
-            await asyncio.sleep(2.0)
+        scheduler = EvalScheduler(
+            infer, judge, concurrency=concurrency, warmup=warmup,
+            judge_concurrency=judge_concurrency, cooldown_s=cooldown_s, on_result=on_result,
+            pipeline_judge=pipeline_judge,
+        )
+        results = await scheduler.run(prompts)
+        report = scheduler.report(results)
+    return [runs[i] for i in sorted(runs)], report
+
 
+async def run_eval(prompts: list, engine: str = "vllm", dry_run: bool = False, **scheduler_kwargs) -> list[BenchmarkRun]:
+    runs, _ = await run_eval_report(prompts, engine=engine, dry_run=dry_run, **scheduler_kwargs)
     return runs
 
 
+def _format_summary(summary: dict) -> str:
+    parts = [f"p{q}={summary[f'p{q}']['value']:.0f} [{summary[f'p{q}']['ci'][0]:.0f}, {summary[f'p{q}']['ci'][1]:.0f}]"
+             for q in (50, 95, 99)]
+    return f"n={summary['n']} " + " ".join(parts)
+
+
 # ---------------------------------------------------------------------------
 # CLI Entry Point
 # ---------------------------------------------------------------------------
@@ -536,8 +631,14 @@ def main():
     parser.add_argument("--tag", type=str, default=None, help="Filter prompts by tag")
     parser.add_argument("--id", type=str, default=None, help="Run a single prompt by ID")
     parser.add_argument(
-        "--engine", type=str, default="vllm", choices=["vllm", "ollama"], help="Inference engine target"
+        "--engine", type=str, default="vllm", choices=["vllm", "ollama", "mock"], help="Inference engine target"
     )
+    parser.add_argument("--concurrency", type=int, default=EVAL_CONCURRENCY, help="Cases in flight (opt-in; default 1 keeps ledger rows solo)")
+    parser.add_argument("--warmup", type=int, default=EVAL_WARMUP, help="Warmup requests excluded from stats")
+    parser.add_argument("--judge-concurrency", type=int, default=EVAL_JUDGE_CONCURRENCY, help="Judge calls in flight")
+    parser.add_argument("--cooldown", type=float, default=EVAL_COOLDOWN_S, help="Per-worker pause between cases (s)")
+    parser.add_argument("--pipeline-judge", action="store_true", default=EVAL_PIPELINE_JUDGE,
+                        help="Judge finished cases while others are still timed (opt-in; skews latency/power with a local judge)")
     parser.add_argument("--dry-run", action="store_true", help="Show prompts without executing")
     parser.add_argument("--list-tags", action="store_true", help="Print available tags and exit")
     args = parser.parse_args()
@@ -559,8 +660,15 @@ def main():
         log.error("No prompts matched. Use --list-tags to see available tags.")
         sys.exit(1)
 
-    log.info(f"Starting benchmark: {len(prompts)} prompts | engine={args.engine} | dry_run={args.dry_run}")
-    runs = asyncio.run(run_eval(prompts, engine=args.engine, dry_run=args.dry_run))
+    log.info(
+        f"Starting benchmark: {len(prompts)} prompts | engine={args.engine} | concurrency={args.concurrency} | "
+        f"warmup={args.warmup} | dry_run={args.dry_run}"
+    )
+    runs, report = asyncio.run(run_eval_report(
+        prompts, engine=args.engine, dry_run=args.dry_run, concurrency=args.concurrency,
+        warmup=args.warmup, judge_concurrency=args.judge_concurrency, cooldown_s=args.cooldown,
+        pipeline_judge=args.pipeline_judge,
+    ))
 
     if not args.dry_run:
         scored = [r for r in runs if r.judge_score > 0]
@@ -572,6 +680,12 @@ def main():
             f"  Prompts run:   {len(runs)}\n"
             f"  Avg judge:     {avg_score:.2f}/5\n"
             f"  Avg tok/s:     {avg_tps:.1f}\n"
+            f"  Errors:        {report['errors']}\n"
+            f"  Wall time:     {report['wall_s']:.1f}s ({report['throughput_cps']:.2f} cases/s)\n"
+            f"  Cold start:    {', '.join(f'{v:.0f}' for v in report['cold_start']['latency_ms']) or 'n/a'} ms\n"
+            f"  Latency (ms):  {_format_summary(report['steady_state']['latency_ms'])}\n"
+            f"  TTFT (ms):     {_format_summary(report['steady_state']['ttft_ms'])}\n"
+            f"  Judge overlap: {report['judge']['pipelined']}/{report['cases']} scored during inference\n"
             f"  Ledger:        {BENCHMARKS_LEDGER}\n"
             f"{'='*60}"
         )
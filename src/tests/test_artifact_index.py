@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forge.artifact_index import ArtifactIndex, normalize  # noqa: E402
+
+ARTIFACTS = [
+    {"filename": "rapl_power_sweep.py", "keywords": ["rapl", "power"], "synopsis": "RAPL sweep"},
+    {"filename": "PCIe_AER_Triage.md", "keywords": ["aer", "power"], "synopsis": "AER storms"},
+    {"filename": "dcgm-exporter-notes.txt", "keywords": ["dcgm"], "synopsis": "DCGM exporter"},
+]
+
+
+def _linear(slug):
+    for entry in ARTIFACTS:
+        if slug in (entry.get("filename", ""), *entry.get("keywords", [])):
+            return entry
+    return None
+
+
+def test_exact_tier_matches_linear_scan():
+    """[FEAT-487] Exact lookups return what the old first-match scan returned."""
+    index = ArtifactIndex(ARTIFACTS)
+    for slug in ["rapl_power_sweep.py", "power", "aer", "dcgm", "PCIe_AER_Triage.md"]:
+        found, tier = index.resolve(slug)
+        assert tier == "exact" and found is _linear(slug)
+
+
+def test_normalized_and_fuzzy_fallback():
+    index = ArtifactIndex(ARTIFACTS)
+    assert normalize("PCIe_AER_Triage.md") == "pcie aer triage"
+    assert index.resolve("pcie-aer-triage")[0]["synopsis"] == "AER storms"
+    found, tier = index.resolve("dcgm_exporter_note")
+    assert tier == "fuzzy" and found["synopsis"] == "DCGM exporter"
+    assert index.resolve("thermal-throttle-log") == (None, "miss")
+    assert index.stats == {"exact": 0, "normalized": 1, "fuzzy": 1, "miss": 1}
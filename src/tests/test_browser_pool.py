@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from nodes.browser_pool import NO_VALIDATOR_TTL_S, BrowserPool, PageCache, PageFetcher, extract_text, http_render  # noqa: E402
+
+JD_PAGE = """<html><head><title>JD</title><style>.x{color:red}</style><script>var tracking = 1;</script></head>
+<body><nav>Home | Jobs</nav><h1>Silicon Validation Engineer</h1>
+<p>Own PCIe AER telemetry &amp; MSR triage.</p><img src="/logo.png"><!-- internal note -->
+<footer>Careers footer</footer></body></html>"""
+
+
+class _Site:
+    """Local fixture: /jd/<n> pages with ETags and 304 support, an optional per-request delay."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.delay = 0.0
+        self.hits = []
+
+    def handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                site.hits.append((self.path, self.headers.get("If-None-Match")))
+                if self.path == "/logo.png":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.end_headers()
+                    return
+                if self.path == "/gone":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                time.sleep(site.delay)
+                etag = f'"{site.version}"'
+                if self.path.startswith("/plain"):
+                    etag = None  # no validators at all
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = JD_PAGE.replace("Engineer", f"Engineer {site.version}").encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+@pytest.fixture
+def site():
+    fixture = _Site()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fixture.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fixture.base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield fixture
+    server.shutdown()
+    server.server_close()
+
+
+def test_extract_text_drops_noise():
+    text = extract_text(JD_PAGE)
+    assert text.splitlines() == ["JD", "Silicon Validation Engineer", "Own PCIe AER telemetry & MSR triage."]
+
+
+def test_cache_revalidates_with_etag(site, tmp_path):
+    """[FEAT-483] Second fetch is a 304 revalidation; a changed page is re-rendered."""
+    fetcher = PageFetcher(http_render, cache=PageCache(str(tmp_path)))
+    url = f"{site.base}/jd/1"
+
+    async def run():
+        first = await fetcher.fetch(url)
+        second = await fetcher.fetch(url)
+        site.version = "v2"
+        third = await fetcher.fetch(url)
+        gone = await fetcher.fetch(f"{site.base}/gone")
+        return first, second, third, gone
+
+    first, second, third, gone = asyncio.run(run())
+    assert "Silicon Validation Engineer v1" in first and second == first
+    assert "Engineer v2" in third
+    assert gone.startswith("Error: HTTP 404")
+    assert fetcher.stats == {"fresh": 0, "revalidated": 1, "rendered": 3, "errors": 0}
+    assert [h for h in site.hits if h[0] == "/jd/1"] == [("/jd/1", None), ("/jd/1", '"v1"'), ("/jd/1", '"v1"'), ("/jd/1", None)]
+
+
+def test_validatorless_pages_expire_fast_and_never_verify_from_cache(site, tmp_path):
+    assert NO_VALIDATOR_TTL_S <= 15 * 60
+    cache = PageCache(str(tmp_path))
+    fetcher = PageFetcher(http_render, cache=cache)
+    plain, tagged = f"{site.base}/plain/1", f"{site.base}/jd/1"
+
+    async def run():
+        await fetcher.fetch(plain)
+        assert "v1" in await fetcher.fetch(plain)  # inside the short window: served from cache
+        site.version = "v2"
+        verified = await fetcher.fetch(plain, verify=True)  # no way to confirm it: rendered again
+        await fetcher.fetch(tagged)
+        confirmed = await fetcher.fetch(tagged, verify=True)  # 304, so the copy counts
+        return verified, confirmed
+
+    verified, confirmed = asyncio.run(run())
+    assert "Engineer v2" in verified and "Engineer v2" in confirmed
+    assert fetcher.stats == {"fresh": 1, "revalidated": 1, "rendered": 3, "errors": 0}
+    assert cache.get(plain)["fresh_for"] == NO_VALIDATOR_TTL_S
+
+
+def test_fetch_many_is_concurrent_and_capped(site, tmp_path):
+    site.delay = 0.2
+    fetcher = PageFetcher(http_render, cache=PageCache(str(tmp_path)), concurrency=4)
+    urls = [f"{site.base}/jd/{i}" for i in range(8)]
+    t0 = time.monotonic()
+    results = asyncio.run(fetcher.fetch_many(urls))
+    elapsed = time.monotonic() - t0
+    assert 0.35 < elapsed < 1.2  # two waves of four, not eight serial fetches
+    assert all("Silicon Validation" in results[u] for u in urls)
+
+
+def test_browser_pool_blocks_images(site, tmp_path):
+    pytest.importorskip("playwright.async_api")
+
+    async def run():
+        pool = BrowserPool(size=2, settle_ms=200)
+        try:
+            await pool.start()
+        except Exception as e:
+            pytest.skip(f"Chromium unavailable: {e}")
+        fetcher = PageFetcher(pool.render, cache=PageCache(str(tmp_path)), concurrency=pool.size)
+        try:
+            results = await fetcher.fetch_many([f"{site.base}/jd/{i}" for i in range(4)])
+        finally:
+            await pool.close()
+        return pool, results
+
+    pool, results = asyncio.run(run())
+    assert all("Silicon Validation Engineer" in text for text in results.values())
+    assert pool.stats["launches"] == 1 and pool.stats["renders"] == 4
+    assert not any(path == "/logo.png" for path, _ in site.hits)
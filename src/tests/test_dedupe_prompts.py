@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forge.dedupe_prompts import SIMILARITY_THRESHOLD, dedupe_near, jaccard, shingles  # noqa: E402
+
+
+def _brute_force(prompts, threshold=SIMILARITY_THRESHOLD):
+    kept, kept_shingles = [], []
+    for prompt in prompts:
+        sh = shingles(prompt)
+        if any(jaccard(sh, other) >= threshold for other in kept_shingles):
+            continue
+        kept.append(prompt)
+        kept_shingles.append(sh)
+    return kept
+
+
+def _corpus(seed=7, bases=300):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2000)]
+    corpus = []
+    for _ in range(bases):
+        words = rng.sample(vocab, rng.randint(12, 24))
+        corpus.append(" ".join(words))
+        for _ in range(rng.randint(0, 3)):
+            variant = list(words)
+            for _ in range(rng.randint(1, 3)):  # 1 edit is a near-duplicate, 3 usually is not
+                variant[rng.randrange(len(variant))] = rng.choice(vocab)
+            corpus.append(" ".join(variant).upper() if rng.random() < 0.3 else " ".join(variant))
+    rng.shuffle(corpus)  # near-duplicates end up far apart
+    return corpus
+
+
+def test_lsh_matches_brute_force_on_synthetic_corpus():
+    """[FEAT-488] Global MinHash/LSH dedupe keeps exactly what an all-pairs scan keeps."""
+    corpus = _corpus()
+    kept, stats = dedupe_near(corpus)
+    expected = _brute_force(corpus)
+    assert kept == expected
+    assert 300 <= len(kept) < len(corpus)
+    assert stats["verified_duplicates"] == len(corpus) - len(kept)
+    # Candidates stay close to the true duplicates instead of growing with N^2
+    assert stats["candidates"] < 3 * len(corpus)
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Check the PCIe AER log!") == shingles("check the pcie, aer log")
+    assert jaccard(shingles("rapl"), shingles("RAPL")) == 1.0
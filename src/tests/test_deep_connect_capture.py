@@ -0,0 +1,153 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+@pytest.fixture
+def epoch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the module opens deep_connect_capture.log in the cwd
+    from forge import deep_connect_epoch_v2
+    return deep_connect_epoch_v2
+
+
+class FakeFoyer:
+    """Greets with LabStatus, enforces the lab_key handshake, answers each text_input after `delay`."""
+
+    def __init__(self, delay=0.2, vram_used=4000):
+        self.delay = delay
+        self.vram_used = vram_used
+        self.connections = 0
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def handler(self, ws, *args):
+        self.connections += 1
+        await ws.send(json.dumps({"state": "OPERATIONAL", "vram_used": self.vram_used, "vram_total": 11264}))
+        hello = json.loads(await ws.recv())
+        if hello.get("type") != "handshake" or hello.get("lab_key") != "tok":
+            await ws.close(code=1008)
+            return
+        await ws.send(json.dumps({"type": "status", "state": "connected", "socket_id": "fake01"}))
+        async for raw in ws:
+            asyncio.create_task(self._answer(ws, json.loads(raw)))
+
+    async def _answer(self, ws, msg):
+        self.prompts.append(msg["content"])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await ws.send(json.dumps({"type": "chat", "brain": "thinking", "brain_source": "Pinky", "request_id": msg["request_id"]}))
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        await ws.send(json.dumps({"type": "chat", "brain": f"RAW {msg['content'][-20:]}",
+                                  "brain_source": "Lab (Result)", "request_id": msg["request_id"]}))
+
+
+def _gems(epoch, tmp_path, n):
+    notes = tmp_path / "notes"
+    notes.mkdir(exist_ok=True)
+    (notes / "2019.json").write_text(json.dumps(
+        [{"summary": f"AER storm triage {i}", "rank": 4} for i in range(n)] + [{"summary": "minor", "rank": 2}]))
+    return list(epoch.iter_gems(notes))
+
+
+def _run(epoch, foyer, out, gems, **kwargs):
+    async def go():
+        async with websockets.serve(foyer.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            session = epoch.FoyerSession(f"ws://127.0.0.1:{port}", lab_key="tok")
+            runner = epoch.CaptureRunner(session, out_file=out, **kwargs)
+            t0 = time.monotonic()
+            stats = await runner.run(gems)
+            return stats, session, time.monotonic() - t0
+    return asyncio.run(go())
+
+
+def test_one_session_pipelines_captures(epoch, tmp_path):
+    """[FEAT-489] Captures share one websocket and overlap instead of sleeping 30 s apiece."""
+    foyer, out = FakeFoyer(delay=0.2), tmp_path / "raw_stage_1.jsonl"
+    gems = _gems(epoch, tmp_path, 6)
+    stats, session, elapsed = _run(epoch, foyer, out, gems)
+    assert stats["captured"] == 6 and foyer.connections == 1 and session.connects == 1
+    assert 1 < foyer.peak <= epoch.MAX_INFLIGHT
+    assert elapsed < 6 * 0.2
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(entry["gem_hash"] for entry in lines) == sorted(g["gem_hash"] for g in gems)
+
+
+def test_interrupted_run_resumes_from_checkpoint(epoch, tmp_path):
+    foyer, out = FakeFoyer(delay=0.05), tmp_path / "raw_stage_1.jsonl"
+    gems = _gems(epoch, tmp_path, 5)
+    first, _, _ = _run(epoch, foyer, out, gems, limit=2)
+    assert first["captured"] == 2
+    with open(out, "a") as f:
+        f.write('{"summary": "torn')  # crash mid-append
+
+    resumed, _, _ = _run(epoch, foyer, out, gems)
+    assert resumed["skipped"] == 2 and resumed["captured"] == 3
+    assert len(epoch.load_checkpoint(out)) == 5
+
+
+def test_high_vram_pauses_dispatch(epoch, tmp_path, monkeypatch):
+    foyer, out = FakeFoyer(delay=0.05, vram_used=10800), tmp_path / "raw_stage_1.jsonl"
+    gems = _gems(epoch, tmp_path, 2)
+    polls = []
+
+    async def status_fn():
+        polls.append(time.monotonic())
+        return {"vram_used": 4000, "vram_total": 11264}
+
+    backpressure = epoch.Backpressure()
+    backpressure.paused = True  # as after a high greeting on a previous session
+    monkeypatch.setattr(epoch, "STATUS_POLL_S", 0.1)
+    stats, _, _ = _run(epoch, foyer, out, gems, backpressure=backpressure, status_fn=status_fn)
+    assert stats["captured"] == 2 and polls and backpressure.pauses >= 1
+
+
+def _flaky_sends(epoch, monkeypatch, failures):
+    """Every socket's send raises ConnectionClosed for the next `failures` capture requests."""
+    from websockets.exceptions import ConnectionClosed
+    real_connect, left = epoch.websockets.connect, [failures]
+
+    async def connect(*args, **kwargs):
+        ws = await real_connect(*args, **kwargs)
+        real_send = ws.send
+
+        async def send(message):
+            if '"text_input"' in message and left[0] > 0:
+                left[0] -= 1
+                raise ConnectionClosed(None, None)
+            await real_send(message)
+
+        ws.send = send
+        return ws
+
+    monkeypatch.setattr(epoch.websockets, "connect", connect)
+
+
+def test_connection_closed_reconnects_once(epoch, tmp_path, monkeypatch):
+    foyer, out = FakeFoyer(delay=0.05), tmp_path / "raw_stage_1.jsonl"
+    _flaky_sends(epoch, monkeypatch, failures=1)
+    stats, session, _ = _run(epoch, foyer, out, _gems(epoch, tmp_path, 3))
+    assert stats["captured"] == 3 and stats["failed"] == 0
+    assert session.connects == 2 and foyer.connections == 2
+
+
+def test_connection_closed_twice_fails_only_that_capture(epoch, tmp_path, monkeypatch):
+    """A capture whose reconnect also dies is counted as failed; the rest of the run carries on."""
+    foyer, out = FakeFoyer(delay=0.05), tmp_path / "raw_stage_1.jsonl"
+    _flaky_sends(epoch, monkeypatch, failures=2)
+    backpressure = epoch.Backpressure()
+    stats, session, _ = _run(epoch, foyer, out, _gems(epoch, tmp_path, 4), backpressure=backpressure)
+    assert stats["failed"] == 1 and stats["captured"] == 3
+    assert session.connects == 3 and backpressure.inflight == 0
+    assert len(epoch.load_checkpoint(out)) == 3
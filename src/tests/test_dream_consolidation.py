@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra import dream_node  # noqa: E402
+
+
+class FakeJournal:
+    """Thread-safe lab_journal stand-in; optionally fails one upsert to simulate a crash mid-dream."""
+
+    def __init__(self, fail_on_call=None, delay=0.0):
+        self.docs = {}
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+        self.delay = delay
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def upsert(self, ids, documents, metadatas):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            if self.calls == self.fail_on_call:
+                raise ConnectionError("chroma went away")
+            for i, d, m in zip(ids, documents, metadatas):
+                self.docs[i] = (d, m)
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(dream_node, "JOURNAL_LEDGER", str(tmp_path / "journal_ledger.jsonl"))
+    monkeypatch.setattr(dream_node, "DREAMING_LEDGER", str(tmp_path / "journal_ledger.dreaming.jsonl"))
+    monkeypatch.setattr(dream_node, "DREAM_CHECKPOINT", str(tmp_path / "journal_ledger.dreaming.ckpt.json"))
+    monkeypatch.setattr(dream_node, "bump_rag_generation", lambda *a, **k: None)
+    now = int(time.time())
+    rows = [{"ts": now - 100 - i, "dialogue": f"User: sweep {i}\nPinky: vram ok {i}"} for i in range(10)]
+    rows.append({"ts": now - 3 * 86400, "dialogue": "stale"})
+    with open(dream_node.JOURNAL_LEDGER, "w") as f:
+        f.write("\n".join(json.dumps(r) for r in rows) + "\n")
+    return tmp_path
+
+
+def test_crash_mid_dream_resumes_without_loss_or_duplicates(ledger, monkeypatch):
+    """[FEAT-491] A failed chunk keeps the checkpoint; the next run finishes from that offset."""
+    journal = FakeJournal(fail_on_call=2)
+    monkeypatch.setattr(dream_node, "lab_journal", journal)
+
+    first = asyncio.run(dream_node.consolidate_memories(allow_hub=False, note_id="journal_kb_t", chunk_size=4))
+    assert first is None and len(journal.docs) == 4
+    with open(dream_node.DREAM_CHECKPOINT) as f:
+        ckpt = json.load(f)
+    assert ckpt["entry_count"] == 4 and ckpt["offset"] > 0
+
+    # The hub keeps journaling while the dream is interrupted; that turn belongs to the next night
+    with open(dream_node.JOURNAL_LEDGER, "w") as f:
+        f.write(json.dumps({"ts": int(time.time()), "dialogue": "late turn"}) + "\n")
+
+    summary, note_id, count = asyncio.run(dream_node.consolidate_memories(allow_hub=False, chunk_size=4))
+    assert note_id == "journal_kb_t" and count == 10
+    entries = [m for _, m in journal.docs.values() if m["type"] == "journal_entry"]
+    assert len(entries) == 10 and journal.docs[note_id][1]["entry_count"] == 10
+    assert "sweep 9" in summary and "stale" not in summary and "late turn" not in summary
+    assert not os.path.exists(dream_node.DREAMING_LEDGER) and not os.path.exists(dream_node.DREAM_CHECKPOINT)
+    with open(dream_node.JOURNAL_LEDGER) as f:
+        assert "late turn" in f.read()
+
+
+def test_upserts_run_off_the_event_loop(ledger, monkeypatch):
+    journal = FakeJournal(delay=0.1)
+    monkeypatch.setattr(dream_node, "lab_journal", journal)
+    ticks = []
+
+    async def run():
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+        t = asyncio.create_task(ticker())
+        result = await dream_node.consolidate_memories(allow_hub=False, chunk_size=5)
+        t.cancel()
+        return result
+
+    result = asyncio.run(run())
+    assert result[2] == 10 and journal.calls == 3  # two entry batches + the journal_kb
+    assert threading.get_ident() not in journal.threads
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.08  # loop kept ticking through 0.1 s upserts
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.eval_scheduler import EvalScheduler, MockEngine, percentile, summarize  # noqa: E402
+
+
+def _cases(n):
+    return [{"id": f"case-{i:02d}", "tags": ["mock"], "prompt": f"Question {i}?", "rubric": "Any."} for i in range(n)]
+
+
+def test_percentile_matches_linear_interpolation():
+    values = list(range(1, 101))
+    random.Random(1).shuffle(values)
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 95) == pytest.approx(95.05)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([7.0], 99) == 7.0 and percentile([], 50) == 0.0
+
+
+def test_bootstrap_ci_brackets_estimate_and_is_seeded():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(3, 0.5) for _ in range(200)]
+    summary = summarize(values)
+    assert summary["n"] == 200
+    for q in ("p50", "p95", "p99"):
+        lo, hi = summary[q]["ci"]
+        assert lo <= summary[q]["value"] <= hi
+    assert summary["p50"]["ci"][1] - summary["p50"]["ci"][0] < summary["p99"]["ci"][1] - summary["p99"]["ci"][0]
+    assert summarize(values) == summary
+    assert summarize([5.0])["p95"] == {"value": 5.0, "ci": [5.0, 5.0]}
+
+
+def test_scheduler_concurrency_warmup_and_pipelined_judge():
+    """[FEAT-492] Cold request stays out of steady-state stats; judging overlaps inference."""
+    engine = MockEngine(ttft_ms=20, token_ms=1, tokens=20, cold_start_ms=300, jitter=0.1, judge_ms=5)
+    reported = []
+    scheduler = EvalScheduler(engine.infer, engine.judge, concurrency=4, warmup=1, on_result=reported.append,
+                              pipeline_judge=True)
+    cases = _cases(12)
+    results = asyncio.run(scheduler.run(cases))
+    report = scheduler.report(results)
+
+    assert [r.case["id"] for r in results] == [c["id"] for c in cases]
+    assert engine.calls == 13 and engine.judged == 12 and engine.peak_inflight == 4
+    assert sorted(r.index for r in reported) == list(range(12))
+    assert all(1 <= r.score <= 5 for r in results)
+
+    assert report["warmup"] == 1 and report["cold_start"]["latency_ms"][0] > 300
+    steady = report["steady_state"]["latency_ms"]
+    assert steady["n"] == 12 and steady["p99"]["value"] < 150
+    assert report["steady_state"]["ttft_ms"]["p50"]["value"] < steady["p50"]["value"]
+    assert report["judge"]["pipelined"] > 0
+    # Three waves of four, not twelve serial cases
+    assert report["wall_s"] < 12 * 0.04
+
+
+def test_judge_never_overlaps_a_timed_case_by_default():
+    """With the judge on the same GPU, no judge call may run while a case is being timed."""
+    engine = MockEngine(ttft_ms=5, token_ms=0.5, tokens=10, cold_start_ms=0, judge_ms=5)
+    overlaps, judging = [], [0]
+
+    async def infer(case):
+        overlaps.append(judging[0])
+        out = await engine.infer(case)
+        overlaps.append(judging[0])
+        return out
+
+    async def judge(case, response):
+        judging[0] += 1
+        overlaps.append(engine.inflight)
+        try:
+            return await engine.judge(case, response)
+        finally:
+            overlaps.append(engine.inflight)
+            judging[0] -= 1
+
+    scheduler = EvalScheduler(infer, judge, concurrency=1, warmup=1)
+    results = asyncio.run(scheduler.run(_cases(6)))
+    assert engine.judged == 6 and all(r.score for r in results)
+    assert not any(overlaps) and scheduler.report(results)["judge"]["pipelined"] == 0
+    assert min(r.judged_at for r in results) >= max(r.finished for r in results)
+
+
+def test_failed_cases_are_reported_but_not_judged_or_measured():
+    engine = MockEngine(ttft_ms=5, token_ms=0.5, tokens=10, cold_start_ms=0, fail_ids={"case-01", "case-03"})
+    scheduler = EvalScheduler(engine.infer, engine.judge, concurrency=2)
+    results = asyncio.run(scheduler.run(_cases(6)))
+    report = scheduler.report(results)
+    assert report["errors"] == 2 and report["steady_state"]["latency_ms"]["n"] == 4
+    assert report["cold_start"]["latency_ms"] == []
+    assert [r.error.startswith("[ERROR]") for r in results] == [False, True, False, True, False, False]
+    assert engine.judged == 4 and results[1].score == 0
+
+
+def test_run_eval_against_mock_engine(tmp_path, monkeypatch):
+    pytest.importorskip("aiohttp")
+    import run_evals
+
+    ledger = tmp_path / "benchmarks.jsonl"
+    monkeypatch.setattr(run_evals, "BENCHMARKS_LEDGER", str(ledger))
+    engine = MockEngine(ttft_ms=5, token_ms=0.5, tokens=16, cold_start_ms=50)
+    prompts = run_evals.EVAL_PROMPTS[:5]
+    runs, report = asyncio.run(run_evals.run_eval_report(prompts, engine="mock", concurrency=3, warmup=2, mock=engine))
+
+    assert [r.prompt_id for r in runs] == [p["id"] for p in prompts]
+    assert all(r.engine == "MOCK" and r.total_tokens == 16 and r.judge_model == "mock-judge" for r in runs)
+    assert max(r.concurrency for r in runs) == 3
+    # Warmup requests never reach the ledger
+    rows = [json.loads(line) for line in ledger.read_text().splitlines()]
+    assert sorted(row["prompt_id"] for row in rows) == sorted(p["id"] for p in prompts)
+    assert len(report["cold_start"]["latency_ms"]) == 2 and report["steady_state"]["latency_ms"]["n"] == 5
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forge import extract_gemini_prompts as egp  # noqa: E402
+
+
+def _history(n):
+    first = {"session": "a", "messages": [{"type": "user", "content": f"prompt {i}\nsecond line"} for i in range(n)]}
+    second = {"note": "has \"messages\": [1] inside a string",
+              "messages": [{"type": "gemini", "content": "reply"}, {"type": "user", "content": ["list", "prompt"]}]}
+    return json.dumps(first, indent=1) + "\n" + json.dumps(second)
+
+
+def test_stdlib_scanner_across_chunk_boundaries(monkeypatch):
+    """[FEAT-490] Elements straddling read chunks decode the same as a full parse."""
+    monkeypatch.setattr(egp, "READ_CHUNK", 7)
+    items = list(egp._iter_array_items(io.StringIO(_history(50))))
+    assert len(items) == 52
+    assert items[0] == {"type": "user", "content": "prompt 0\nsecond line"}
+    assert items[-1]["content"] == ["list", "prompt"]
+
+
+def test_incremental_extract_only_parses_new_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(egp, "ijson", None)
+    history = tmp_path / "history.json"
+    history.write_text(_history(3))
+    chats = []
+    for i in range(4):
+        chat = tmp_path / f"chat{i}.json"
+        chat.write_text(json.dumps({"messages": [{"type": "user", "content": f"chat {i}"},
+                                                 {"type": "user", "content": "prompt 0\nsecond line"}]}))
+        chats.append(str(chat))
+    (tmp_path / "broken.json").write_text("{not json")
+    transcript = tmp_path / "transcript.jsonl"
+    transcript.write_text('{"type": "USER_INPUT", "content": "agy 1"}\n\n{"type": "MODEL"}\n')
+    out = tmp_path / "manifest.jsonl"
+
+    run = dict(history=history, transcript_files=[str(transcript)], output=out, workers=2)
+    stats = egp.extract(chat_files=chats + [str(tmp_path / "broken.json")], **run)
+    prompts = [json.loads(line)["prompt"] for line in out.read_text().splitlines()]
+    assert prompts == ["prompt 0\nsecond line", "prompt 1\nsecond line", "prompt 2\nsecond line", "list prompt",
+                       "chat 0", "chat 1", "chat 2", "chat 3", "agy 1"]
+    assert stats["parsed"] == 7 and stats["duplicates"] == 4
+
+    new_chat = tmp_path / "chat9.json"
+    new_chat.write_text(json.dumps({"messages": [{"type": "user", "content": "chat 9"}, {"type": "user", "content": "chat 1"}]}))
+    stats = egp.extract(chat_files=chats + [str(new_chat)], **run)
+    assert stats["parsed"] == 1 and stats["unchanged"] == 6 and stats["written"] == 1
+    assert out.read_text().splitlines()[-1] == '{"prompt": "chat 9"}'
+
+
+def test_interrupted_run_only_saves_completed_sources(tmp_path, monkeypatch):
+    """A crash mid-pool must not mark queued sessions as processed."""
+    monkeypatch.setattr(egp, "ijson", None)
+    chats = []
+    for i in range(3):
+        chat = tmp_path / f"chat{i}.json"
+        chat.write_text(json.dumps({"messages": [{"type": "user", "content": f"chat {i}"}]}))
+        chats.append(str(chat))
+    out = tmp_path / "manifest.jsonl"
+
+    class _Interrupt(Exception):
+        pass
+
+    real_add = egp.PromptManifest.add
+
+    def add(self, prompt):
+        if prompt == "chat 1":
+            raise _Interrupt()
+        real_add(self, prompt)
+
+    monkeypatch.setattr(egp.PromptManifest, "add", add)
+    run = dict(history=None, transcript_files=[], output=out, workers=1)
+    try:
+        egp.extract(chat_files=chats, **run)
+    except _Interrupt:
+        pass
+    state = json.loads((tmp_path / "manifest.state.json").read_text())
+    assert list(state["sources"]) == [chats[0]]
+
+    monkeypatch.setattr(egp.PromptManifest, "add", real_add)
+    stats = egp.extract(chat_files=chats, **run)
+    assert stats["parsed"] == 2 and stats["unchanged"] == 1
+    assert [json.loads(line)["prompt"] for line in out.read_text().splitlines()] == ["chat 0", "chat 1", "chat 2"]
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+import asyncio
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from v5.ignition.induction import InductionPipeline, Stage, default_stages, load_checkpoint  # noqa: E402
+
+
+def _touch_stage(name, marker_dir, sleep=0.0, code=0, deps=()):
+    script = (
+        f"import time, pathlib; time.sleep({sleep}); "
+        f"pathlib.Path(r'{marker_dir}', '{name}').write_text(str(time.time())); "
+        f"raise SystemExit({code})"
+    )
+    return Stage(name, [sys.executable, "-c", script], tuple(deps))
+
+
+def test_default_dag_orders_prep_before_forge():
+    stages = {s.name: s for s in default_stages(python="python3", lab_dir="/lab")}
+    assert stages["refine_prompts"].deps == ("extract_prompts",)
+    assert set(stages["forge"].deps) == {"build_datasets", "hierarchy"}
+    assert stages["recruiter"].deps == ()  # runs alongside dataset prep
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    """[FEAT-473] Two 0.6s stages without a dependency finish in ~one stage's time."""
+    ckpt = str(tmp_path / "ckpt.json")
+    stages = [
+        _touch_stage("a", tmp_path, sleep=0.6),
+        _touch_stage("b", tmp_path, sleep=0.6),
+        _touch_stage("c", tmp_path, deps=("a", "b")),
+    ]
+    summary = asyncio.run(InductionPipeline(stages, "2026-01-01", checkpoint_path=ckpt).run())
+    assert not summary["cancelled"]
+    assert all(r["status"] == "done" for r in summary["stages"].values())
+    assert summary["wall_s"] < 1.15
+    assert float((tmp_path / "c").read_text()) >= float((tmp_path / "a").read_text())
+    assert load_checkpoint(ckpt, "2026-01-01")["c"]["duration_s"] >= 0
+
+
+def test_failed_stage_is_recorded_without_blocking_dependents(tmp_path):
+    stages = [_touch_stage("a", tmp_path, code=2), _touch_stage("b", tmp_path, deps=("a",))]
+    summary = asyncio.run(InductionPipeline(stages, "c1", checkpoint_path=str(tmp_path / "k.json")).run())
+    assert summary["stages"]["a"]["status"] == "failed"
+    assert summary["stages"]["a"]["returncode"] == 2
+    assert summary["stages"]["b"]["status"] == "done"
+
+
+def test_cancel_terminates_and_resume_skips_finished(tmp_path):
+    """[FEAT-473] A user intent kills running stages; the next run resumes from the checkpoint."""
+    ckpt = str(tmp_path / "ckpt.json")
+    stages = [_touch_stage("quick", tmp_path), _touch_stage("slow", tmp_path, sleep=30, deps=("quick",))]
+
+    async def _run_and_preempt():
+        pipe = InductionPipeline(stages, "night", checkpoint_path=ckpt)
+        task = asyncio.create_task(pipe.run())
+        while pipe.records.get("slow", {}).get("status") != "running":
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)
+        pipe.cancel("INTENT_abc")
+        return await task
+
+    t0 = time.time()
+    summary = asyncio.run(_run_and_preempt())
+    assert time.time() - t0 < 10
+    assert summary["cancelled"] and summary["cancel_reason"] == "INTENT_abc"
+    assert summary["stages"]["slow"]["status"] == "cancelled"
+    assert not (tmp_path / "slow").exists()
+
+    (tmp_path / "quick").unlink()
+    resumed = [_touch_stage("quick", tmp_path), _touch_stage("slow", tmp_path, deps=("quick",))]
+    summary = asyncio.run(InductionPipeline(resumed, "night", checkpoint_path=ckpt).run())
+    assert summary["stages"]["quick"]["resumed"]
+    assert not (tmp_path / "quick").exists()  # not re-run
+    assert summary["stages"]["slow"]["status"] == "done"
+    assert json.load(open(ckpt))["cycle"] == "night"
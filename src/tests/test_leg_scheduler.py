@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from logic import cognitive_hub  # noqa: E402
+from logic.cognitive_hub import CognitiveHub  # noqa: E402
+from logic.leg_scheduler import LegScheduler, LegStats  # noqa: E402
+
+
+def _sleeper(delay, text, chunks=1):
+    async def run(leg):
+        for i in range(chunks):
+            await asyncio.sleep(delay / chunks)
+            leg.feed(f"{text}{i} ")
+        return leg.text
+    return run
+
+
+def test_legs_overlap_and_deadlines_keep_partial_text():
+    """[FEAT-482] Wall time tracks the slowest leg; a late leg keeps what it streamed."""
+    async def run():
+        stats = LegStats()
+        legs = LegScheduler("req-1", stats=stats)
+        t0 = time.monotonic()
+        legs.start("pinky", _sleeper(0.2, "narf"))
+        legs.start("brain", _sleeper(0.3, "aer"))
+        legs.start("thought", _sleeper(1.0, "synth", chunks=10), deadline=0.35)
+        legs.start("grounding", _sleeper(0.05, "critique"), after=("pinky",))
+        await legs.join()
+        return legs, stats, time.monotonic() - t0
+
+    legs, stats, elapsed = asyncio.run(run())
+    assert elapsed < 0.5  # serial would be 0.2 + 0.3 + 0.35 + 0.05
+    assert legs.get("pinky").status == legs.get("brain").status == "ok"
+    thought = legs.get("thought")
+    assert thought.status == "timeout" and thought.text.startswith("synth0") and thought.utility == 0.25
+    assert legs.get("grounding").started >= legs.get("pinky").ended  # ordering constraint held
+    assert stats.report()["thought"]["statuses"] == {"timeout": 1}
+
+
+def test_useful_answer_cancels_superseded_leg():
+    async def run():
+        legs = LegScheduler("req-2", stats=LegStats())
+        legs.start("brain", _sleeper(1.0, "slow", chunks=10))
+        legs.start("thought", _sleeper(0.1, "fast"), supersedes=("brain",))
+        legs.start("foil", lambda leg: asyncio.sleep(0))  # returns None -> skipped
+        t0 = time.monotonic()
+        await legs.join()
+        return legs, time.monotonic() - t0
+
+    legs, elapsed = asyncio.run(run())
+    assert elapsed < 0.5
+    brain = legs.get("brain")
+    assert brain.status == "cancelled" and brain.reason == "superseded by thought"
+    assert legs.get("thought").useful and legs.get("foil").status == "skipped"
+
+
+class FakeNode:
+    """think() answers after `delay`; the Brain's distillation call answers immediately."""
+
+    def __init__(self, delay, text):
+        self.delay = delay
+        self.text = text
+        self.contexts = []
+        self.cancelled = False
+
+    async def call_tool(self, name, arguments=None):
+        args = arguments or {}
+        if args.get("behavioral_guidance") == "Distill for Strategic Thought.":
+            return SimpleNamespace(content=[SimpleNamespace(text="brief")])
+        self.contexts.append(args.get("context", ""))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+async def _noop_broadcast(_msg):
+    return None
+
+
+def test_brain_leg_runs_baseline_and_deep_thought_concurrently():
+    async def run():
+        brain, thought = FakeNode(0.6, "Brain baseline"), FakeNode(0.2, "Deep Thought synthesis")
+        hub = CognitiveHub(
+            residents={"brain": brain, "thought": thought},
+            broadcast_callback=_noop_broadcast, sensory_manager=None,
+            get_vram_status=None, trigger_morning_briefing=None,
+        )
+        t0 = time.monotonic()
+        with patch.object(cognitive_hub, "BASELINE_GRACE_S", 0.05):
+            await hub._run_brain_leg("pcie aer storms?", {"vibe": "TECHNICAL"}, request_id="req-3")
+        return hub, brain, thought, time.monotonic() - t0
+
+    hub, brain, thought, elapsed = asyncio.run(run())
+    assert elapsed < 0.5  # Deep Thought did not wait out the Brain baseline
+    assert "[LOCAL_BRAIN_BASELINE]" not in thought.contexts[0]
+    assert brain.cancelled  # superseded once Deep Thought answered
+    legs = hub.get_status()["legs"]
+    assert legs["thought"]["statuses"] == {"ok": 1} and legs["thought"]["mean_utility"] == 1.0
+    assert legs["brain"]["statuses"] == {"cancelled": 1}
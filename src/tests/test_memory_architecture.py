@@ -52,13 +52,11 @@ def test_processed_ids_deque_eviction():
 def test_rag_cache_hashing_and_lru():
     """Verify RAG cache stores and evicts at max 128 entries."""
     hub = _make_hub()
-    assert hub._rag_cache == {}
+    assert len(hub._rag_cache) == 0
 
     for i in range(135):
         key = hashlib.sha256(f"turn_{i}".encode()).hexdigest()
-        hub._rag_cache[key] = f"payload_{i}"
-        if len(hub._rag_cache) > 128:
-            hub._rag_cache.pop(next(iter(hub._rag_cache)))
+        hub._rag_cache.put(key, f"payload_{i}")
 
     assert len(hub._rag_cache) == 128
     first_key = hashlib.sha256("turn_0".encode()).hexdigest()
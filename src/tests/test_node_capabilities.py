@@ -0,0 +1,96 @@
+import os
+import sys
+import builtins
+import json
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from nodes.capabilities import (  # noqa: E402
+    CapabilitySet, LazyProxy, StartupProfiler, canonical_role, load_manifest,
+)
+
+
+def test_canonical_role_strips_node_suffix():
+    assert canonical_role("ArchiveNode") == "archive"
+    assert canonical_role("PINKY") == "pinky"
+
+
+def test_manifest_keeps_chroma_out_of_lab_role():
+    """[FEAT-472] Only the Archive declares the Chroma client; Lab never pays for it."""
+    assert "chroma" in load_manifest("ARCHIVE")["capabilities"]
+    assert "chroma" not in load_manifest("Lab")["capabilities"]
+    assert "local_kernels" not in load_manifest("Lab")["capabilities"]
+
+
+def test_capability_resolves_once_and_lazily():
+    calls = []
+    caps = CapabilitySet("archive", manifest={"capabilities": ["chroma"], "warm": []})
+    caps.register("chroma", lambda: calls.append(1) or "client")
+    assert not caps.loaded("chroma")
+    assert calls == []
+    assert caps.get("chroma") == "client"
+    assert caps.get("chroma") == "client"
+    assert calls == [1]
+
+
+def test_undeclared_capability_still_loads_with_warning(caplog):
+    caps = CapabilitySet("lab", manifest={"capabilities": [], "warm": []})
+    caps.register("chroma", lambda: "client")
+    assert caps.get("chroma") == "client"
+    assert "not declared" in caplog.text
+    with pytest.raises(KeyError):
+        caps.get("nonexistent")
+
+
+def test_background_warm_only_touches_declared_entries():
+    caps = CapabilitySet("archive", manifest={"capabilities": ["chroma"], "warm": ["chroma", "embeddings"]})
+    caps.register("chroma", lambda: "client")
+    caps.register("embeddings", lambda: pytest.fail("undeclared warm must be skipped"))
+    caps.warm().join(timeout=5)
+    assert caps.loaded("chroma")
+    assert not caps.loaded("embeddings")
+
+
+def test_lazy_proxy_defers_resolution():
+    resolved = []
+
+    class _Collection:
+        def count(self):
+            return 7
+
+    proxy = LazyProxy(lambda: resolved.append(1) or _Collection())
+    assert resolved == []
+    assert proxy.count() == 7
+    assert proxy.count() == 7
+    assert resolved == [1]
+
+
+def test_startup_profiler_builds_nested_import_tree(tmp_path):
+    pkg = tmp_path / "fakeheavy"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("import time\ntime.sleep(0.02)\nfrom fakeheavy import inner\n")
+    (pkg / "inner.py").write_text("import time\ntime.sleep(0.01)\n")
+    sys.path.insert(0, str(tmp_path))
+    prof = StartupProfiler(min_ms=0.0)
+    prof.install()
+    try:
+        import fakeheavy  # noqa: F401
+    finally:
+        prof.uninstall()
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("fakeheavy", None)
+        sys.modules.pop("fakeheavy.inner", None)
+
+    tree = prof.tree()
+    top = next(c for c in tree["children"] if c["name"] == "fakeheavy")
+    assert top["ms"] >= 25
+    assert any("inner" in c["name"] for c in top.get("children", []))
+
+    original = builtins.__import__
+    prof.install()
+    path = prof.dump("Lab", directory=str(tmp_path))
+    assert not prof.active and builtins.__import__ is original  # dump() ends the profiling window
+    assert prof.dump("Lab", directory=str(tmp_path)) is None
+    report = json.loads(open(path).read())
+    assert report["role"] == "lab" and report["import_ms"] >= 25
@@ -0,0 +1,61 @@
+import os
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.vllm_metrics import PrefixCacheMeter  # noqa: E402
+from nodes.prompt_layout import PromptLayout  # noqa: E402
+
+IDENTITY = "[FOCUS]: You are assisting an engineer.  \r\n[OPERATIONAL_CONTEXT]: Runtime: Z87-Linux."
+ROLE = "You are Pinky. Narf!"
+
+
+def test_system_prefix_is_byte_stable_across_turns():
+    """[FEAT-479] Tools, stance, guidance and debate never touch the system prefix."""
+    layout = PromptLayout(IDENTITY, ROLE)
+    turns = [
+        layout.assemble("gpu temp?", {}),
+        layout.assemble("pcie errors?", {"CONTEXT_VALIDITY": "[CONTEXT_VALIDITY]: no placeholders",
+                                         "GUIDANCE_FRAME": "\n[STANCE]: ACADEMIC"}),
+        layout.assemble("and 2019?\n\n[PREVIOUS_DEBATE]:\nBrain: AER storms", {"SYSTEM_DESIGN_STANCE": "Flow: x"}),
+        layout.assemble("recap", {}, system_override=layout.prefix + "\n\n[BEHAVIORAL_GUIDANCE]:\nbe brief"),
+    ]
+    assert {system for system, _ in turns} == {layout.prefix}
+    assert "\r" not in layout.prefix and "  \n" not in layout.prefix
+
+
+def test_variable_sections_follow_the_query_in_canonical_order():
+    layout = PromptLayout(IDENTITY, ROLE)
+    _, user = layout.assemble(
+        "and 2019?\n\n[PREVIOUS_DEBATE]:\nBrain: AER storms",
+        {"GUIDANCE_FRAME": "be brief", "SYSTEM_DESIGN_STANCE": "Resonance: Deep", "CONTEXT_VALIDITY": "cv"},
+    )
+    assert user.startswith("and 2019?\n\n---\n[DYNAMIC_CONTEXT]:\n")
+    order = [user.index(f"[{k}]:") for k in ("CONTEXT_VALIDITY", "SYSTEM_DESIGN_STANCE", "GUIDANCE_FRAME", "PREVIOUS_DEBATE")]
+    assert order == sorted(order)
+    assert user.count("[PREVIOUS_DEBATE]") == 1
+
+    # Guidance jammed into a fast-reflex override is moved out; the override itself stays fixed
+    system, user = layout.assemble("hi", None, system_override="You are The Brain. Fast mode.\n\n[VIBE_GUIDANCE]: terse")
+    assert system == "You are The Brain. Fast mode."
+    assert user.endswith("[GUIDANCE_FRAME]:\nterse")
+    assert layout.assemble("hi")[1] == "hi"
+
+
+def test_prefix_cache_meter_windowed_hit_rate():
+    pages = iter([
+        '# HELP vllm:prefix_cache_queries_total x\n'
+        'vllm:prefix_cache_queries_total{model_name="a"} 1000.0\n'
+        'vllm:prefix_cache_hits_total{model_name="a"} 250.0\n',
+        'vllm:prefix_cache_queries_total{model_name="a"} 2000.0\n'
+        'vllm:prefix_cache_hits_total{model_name="a"} 1150.0\n',
+    ])
+    meter = PrefixCacheMeter(fetch=lambda url: next(pages))
+    first = meter.sample()
+    assert first["hit_rate"] == 0.25 and first["window_hit_rate"] is None
+    second = meter.sample()
+    assert second["window_hit_rate"] == 0.9 and second["hit_tokens"] == 1150
+
+    legacy = PrefixCacheMeter(fetch=lambda url: 'vllm:gpu_prefix_cache_hit_rate{model_name="a"} 0.42\n')
+    assert legacy.sample()["hit_rate"] == 0.42
+    assert PrefixCacheMeter(fetch=lambda url: "vllm:num_requests_running 0.0\n").sample() is None
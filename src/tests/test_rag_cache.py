@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import time
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.rag_generation import bump_rag_generation, read_rag_generation  # noqa: E402
+from logic.rag_cache import RagCache  # noqa: E402
+
+
+def test_lru_order_and_byte_budget():
+    """[FEAT-478] Reads refresh recency; the byte budget evicts before the entry cap."""
+    cache = RagCache(max_entries=10, max_bytes=30, generation=lambda: 0)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    assert cache.get("a") == "x" * 10
+    cache.put("c", "z" * 15)  # 35 bytes > 30: evicts "b", the least recently used
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.report()["bytes"] == 25
+    assert cache.put("huge", "q" * 31) is False
+    assert cache.report()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = RagCache(ttl=0.05, generation=lambda: 0)
+    cache.put("k", "context")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.report()["expired"] == 1 and len(cache) == 0
+
+
+def test_indexer_bump_invalidates(tmp_path):
+    gen_file = str(tmp_path / "rag_generation.json")
+    cache = RagCache(generation=lambda: read_rag_generation(gen_file))
+    cache.put("k", "old context")
+    assert cache.get("k") == "old context"
+
+    assert bump_rag_generation("bridge_burn_to_rag", 3, path=gen_file) == 1
+    assert cache.get("k") is None
+    with open(gen_file) as f:
+        assert json.load(f)["source"] == "bridge_burn_to_rag"
+
+    # A retrieval that started before the bump must not be cached as current
+    stale_gen = read_rag_generation(gen_file)
+    bump_rag_generation("dream_node", 1, path=gen_file)
+    cache.put("k", "late result", generation=stale_gen)
+    assert cache.get("k") is None
+    report = cache.report()
+    assert report["invalidated"] == 2 and report["generation"] == 2 and report["hits"] == 1
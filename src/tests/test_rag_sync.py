@@ -0,0 +1,104 @@
+import os
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.rag_sync import RagSync  # noqa: E402
+
+
+class FakeCollection:
+    """In-memory stand-in for a Chroma collection; counts round trips and embedded documents."""
+
+    def __init__(self):
+        self.docs = {}
+        self.metadatas = {}
+        self.calls = {"get": 0, "upsert": 0}
+        self.embedded = 0
+
+    def count(self):
+        return len(self.docs)
+
+    def get(self, ids, include=None):
+        self.calls["get"] += 1
+        hits = [i for i in ids if i in self.docs]
+        out = {"ids": hits, "documents": [self.docs[i] for i in hits]}
+        if include and "metadatas" in include:
+            out["metadatas"] = [self.metadatas.get(i) for i in hits]
+        return out
+
+    def upsert(self, ids, documents, metadatas):
+        self.calls["upsert"] += 1
+        self.embedded += len(documents)
+        self.docs.update(zip(ids, documents))
+        self.metadatas.update(zip(ids, metadatas))
+
+
+def _run(collection, manifest_dir, docs, metadata=None):
+    sync = RagSync(collection, "wisdom", manifest_dir=str(manifest_dir), batch_size=256)
+    for doc_id, text in docs.items():
+        sync.add(doc_id, text, (metadata or {}).get(doc_id, {"type": "artifact"}))
+    return sync.sync()
+
+
+def test_sync_batches_and_skips_unchanged(tmp_path):
+    """[FEAT-486] Thousands of events cost a few batched calls; an unchanged re-run embeds nothing."""
+    wisdom = FakeCollection()
+    docs = {f"artifact_{i}": f"[2019] [exp_tlm] RAPL sweep {i}" for i in range(600)}
+
+    stats = _run(wisdom, tmp_path, docs)
+    assert stats["upserted"] == 600 and stats["batches"] == 3
+    assert wisdom.calls == {"get": 3, "upsert": 3}
+
+    wisdom.calls = {"get": 0, "upsert": 0}
+    stats = _run(wisdom, tmp_path, {k: v.replace(" ", "  ") for k, v in docs.items()})  # whitespace-only edits
+    assert stats["unchanged"] == 600 and stats["upserted"] == 0
+    assert wisdom.calls == {"get": 0, "upsert": 0} and wisdom.embedded == 600
+
+    docs["theme_2019"] = "[2019 STRATEGIC THEME]: telemetry"
+    docs["artifact_7"] = "[2019] [exp_tlm] RAPL sweep 7, corrected"
+    stats = _run(wisdom, tmp_path, docs)
+    assert stats["upserted"] == 2 and wisdom.docs["artifact_7"].endswith("corrected")
+
+
+def test_manifest_recovers_from_loss_and_wiped_collection(tmp_path):
+    wisdom = FakeCollection()
+    docs = {f"asset_{i}": f"[ASSET: f{i}.py] synopsis {i}" for i in range(300)}
+    _run(wisdom, tmp_path / "a", docs)
+
+    # Manifest lost: existing documents are recognised by a batched get, not re-embedded
+    stats = _run(wisdom, tmp_path / "b", docs)
+    assert stats["recovered"] == 300 and stats["upserted"] == 0 and wisdom.embedded == 300
+
+    # Collection wiped under an intact manifest: everything is pushed again
+    wisdom.docs.clear()
+    stats = _run(wisdom, tmp_path / "b", docs)
+    assert stats["upserted"] == 300 and wisdom.count() == 300
+
+
+def test_duplicate_content_under_two_ids_is_tracked_per_id(tmp_path):
+    wisdom = FakeCollection()
+    docs = {"theme_2019": "[2019 STRATEGIC THEME]: telemetry", "theme_2019_copy": "[2019 STRATEGIC THEME]: telemetry"}
+    assert _run(wisdom, tmp_path, docs)["upserted"] == 2
+
+    stats = _run(wisdom, tmp_path, docs)
+    assert stats["unchanged"] == 2 and stats["upserted"] == 0 and wisdom.calls["get"] == 1
+
+    docs["theme_2019_copy"] = "[2019 STRATEGIC THEME]: telemetry, revised"
+    stats = _run(wisdom, tmp_path, docs)
+    assert stats["upserted"] == 1 and wisdom.docs["theme_2019"] == "[2019 STRATEGIC THEME]: telemetry"
+
+
+def test_metadata_only_change_is_upserted(tmp_path):
+    wisdom = FakeCollection()
+    docs = {f"artifact_{i}": f"[2019] [exp_tlm] RAPL sweep {i}" for i in range(5)}
+    _run(wisdom, tmp_path, docs)
+
+    stats = _run(wisdom, tmp_path, docs, metadata={"artifact_3": {"type": "artifact", "rank": 4}})
+    assert stats["upserted"] == 1 and wisdom.metadatas["artifact_3"]["rank"] == 4
+    # Key order in the metadata is canonicalized away
+    stats = _run(wisdom, tmp_path, docs, metadata={"artifact_3": {"rank": 4, "type": "artifact"}})
+    assert stats["unchanged"] == 5 and stats["upserted"] == 0
+
+    # A lost manifest recovers by comparing metadata too
+    stats = _run(wisdom, tmp_path / "cold", docs)
+    assert stats["recovered"] == 4 and stats["upserted"] == 1 and "rank" not in wisdom.metadatas["artifact_3"]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import recruiter  # noqa: E402
+from recruiter import NightlyRecruiter  # noqa: E402
+
+
+def _text(text):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class FakeBrowser:
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.urls = []
+
+    async def call_tool(self, name, arguments=None):
+        url = arguments["url"]
+        self.urls.append(url)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if url.endswith("/dead"):
+            return _text(f"Error: HTTP 404 fetching {url}")
+        return _text(f"JD for {url}: PCIe telemetry, MSR triage.")
+
+
+class FakeBrain:
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return _text('{"bucket": "Telemetry", "score": 0.8, "evidence": "PCIe overlap"}')
+
+
+def _job(i, url=None):
+    return {"title": f"Validation Engineer {i}", "company": "NVIDIA", "url": url or f"https://jobs.example/{i}"}
+
+
+def test_pipeline_is_concurrent_ordered_and_flushes_once(tmp_path):
+    """[FEAT-484] Fetch and score overlap across jobs; the ledger is read once and written once."""
+    ledger = tmp_path / "processed_jobs.json"
+    ledger.write_text(json.dumps(["https://jobs.example/seen", "Old RoleACME"]))
+    browser, brain = FakeBrowser(0.1), FakeBrain(0.1)
+    bot = NightlyRecruiter(None, brain, browser)
+    bot.ledger_path = str(ledger)
+
+    jobs = [_job(i) for i in range(8)]
+    jobs += [
+        _job(9, "https://jobs.example/seen"),                       # already in the ledger
+        {"title": "old role", "company": "acme", "url": "https://jobs.example/x"},  # fuzzy identity hit
+        _job(3),                                                    # duplicate within the batch
+        _job(10, "https://jobs.example/dead"),                      # unverifiable listing
+    ]
+
+    writes = []
+    real_write = recruiter.atomic_write_json
+    with patch.object(recruiter, "atomic_write_json", side_effect=lambda *a, **k: (writes.append(a[0]), real_write(*a, **k))):
+        t0 = time.monotonic()
+        scored = asyncio.run(bot.verify_and_score_jobs(jobs))
+        elapsed = time.monotonic() - t0
+
+    assert elapsed < 0.8  # serial would be 9 fetches + 8 scores at 0.1s each
+    assert browser.peak == recruiter.FETCH_CONCURRENCY and brain.peak == recruiter.SCORE_CONCURRENCY
+    assert [j["url"] for j in scored] == [f"https://jobs.example/{i}" for i in range(8)]
+    assert all(j["score"] == 0.8 and j["jd_summary"].startswith("JD for") for j in scored)
+    assert len(browser.urls) == 9
+
+    assert writes == [str(ledger)]
+    persisted = json.loads(ledger.read_text())
+    assert "https://jobs.example/3" in persisted and "https://jobs.example/dead" not in persisted
+
+    # A fresh run sees everything as processed without touching the browser
+    again = NightlyRecruiter(None, brain, FakeBrowser(0))
+    again.ledger_path = str(ledger)
+    assert asyncio.run(again.verify_and_score_jobs([_job(i) for i in range(8)])) == []
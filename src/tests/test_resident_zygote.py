@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+import signal
+import subprocess
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SRC_DIR)
+from v5.common import zygote  # noqa: E402
+
+ECHO_NODE = """
+import os, sys, json
+line = sys.stdin.readline()
+sys.stdout.write(json.dumps({"argv": sys.argv[1:], "token": os.environ.get("LAB_IMMUNITY_TOKEN"), "echo": line.strip(), "pid": os.getpid()}) + "\\n")
+sys.stdout.flush()
+"""
+
+
+@pytest.fixture
+def warm_pool(tmp_path):
+    sock = str(tmp_path / "zygote.sock")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "v5.common.zygote", "serve", "--socket", sock, "--no-preload"],
+        cwd=SRC_DIR, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 10
+    while zygote.ping(sock) is None:
+        assert time.time() < deadline, "zygote never came up"
+        time.sleep(0.05)
+    yield sock, proc
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(timeout=5)
+
+
+def _spawn(sock, script, *args, env=None):
+    return subprocess.Popen(
+        [sys.executable, "-m", "v5.common.zygote", "spawn", "--socket", sock, "--", str(script), *args],
+        cwd=SRC_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        env={**os.environ, **(env or {})},
+    )
+
+
+def test_forked_node_speaks_on_shim_stdio(warm_pool, tmp_path):
+    """[FEAT-471] The forked child must own the shim's stdin/stdout (MCP stdio contract)."""
+    sock, proc = warm_pool
+    script = tmp_path / "echo_node.py"
+    script.write_text(ECHO_NODE)
+
+    shim = _spawn(sock, script, "--role", "PINKY", env={"LAB_IMMUNITY_TOKEN": "abc123"})
+    out, _ = shim.communicate("hello\n", timeout=10)
+    data = json.loads(out)
+    assert data["argv"] == ["--role", "PINKY"]
+    assert data["token"] == "abc123"
+    assert data["echo"] == "hello"
+    assert data["pid"] != shim.pid  # ran inside a zygote fork, not the shim
+    assert shim.returncode == 0
+
+
+def test_exit_code_propagates(warm_pool, tmp_path):
+    sock, _ = warm_pool
+    script = tmp_path / "fail_node.py"
+    script.write_text("import sys\nsys.exit(3)\n")
+    shim = _spawn(sock, script)
+    shim.communicate(timeout=10)
+    assert shim.returncode == 3
+
+
+def test_cold_fallback_when_zygote_absent(tmp_path):
+    """[FEAT-471] No zygote listening: the shim execs the node directly."""
+    script = tmp_path / "echo_node.py"
+    script.write_text(ECHO_NODE)
+    shim = _spawn(str(tmp_path / "missing.sock"), script, "--role", "LAB")
+    out, _ = shim.communicate("cold\n", timeout=10)
+    data = json.loads(out)
+    assert data["argv"] == ["--role", "LAB"]
+    assert data["pid"] == shim.pid
+
+
+def test_shim_strips_only_the_separator(tmp_path):
+    script = tmp_path / "echo_node.py"
+    script.write_text(ECHO_NODE)
+    shim = _spawn(str(tmp_path / "missing.sock"), script, "--role", "LAB", "--", "--raw")
+    out, _ = shim.communicate("cold\n", timeout=10)
+    assert json.loads(out)["argv"] == ["--role", "LAB", "--", "--raw"]
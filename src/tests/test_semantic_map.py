@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import nodes.semantic_map as semantic_map  # noqa: E402
+from nodes.semantic_map import SemanticMapBuilder  # noqa: E402
+
+
+def _write_year(data_dir, year, items):
+    (data_dir / f"{year}.json").write_text(json.dumps(items))
+
+
+def _items(year, n):
+    return [{"summary": f"{year} MSR telemetry sweep {i}", "rank": 4 if i == 0 else 2,
+             "tags": ["validation"], "technical_gem": f"GEM-{year}-{i}"} for i in range(n)]
+
+
+def _load(path):
+    with open(path) as f:
+        m = json.load(f)
+    m["meta_layer"].pop("last_refactor")
+    return m
+
+
+def test_incremental_rebuild_matches_full_rebuild(tmp_path):
+    """[FEAT-485] Only changed files are re-parsed, and the merged map equals a cold rebuild."""
+    data = tmp_path / "data"
+    data.mkdir()
+    for year in range(2018, 2024):
+        _write_year(data, year, _items(year, 3))
+    (data / "status.json").write_text("{}")  # metadata, never parsed
+    builder = SemanticMapBuilder(str(data), cache_file=str(tmp_path / "cache.json"))
+
+    first = builder.build()
+    assert first == {"files": 6, "parsed": 6, "touched": 0, "removed": 0, "written": True}
+    m = _load(builder.map_file)
+    assert m["tactical_layer"]["total_events"] == 18 and len(m["strategic_layer"]) == 6
+    assert len(m["analytical_layer"]["validation"]) == 18 and len(m["analytical_layer"]["telemetry"]) == 18
+
+    assert builder.build()["written"] is False  # nothing changed, nothing re-read
+
+    os.utime(data / "2018.json", ns=(1, 1))  # touch only: content hash unchanged
+    assert builder.build() == {"files": 6, "parsed": 0, "touched": 1, "removed": 0, "written": False}
+
+    # Same summary repeated inside and across files is deduped per pillar
+    _write_year(data, 2021, _items(2021, 3) + [{"summary": "2018 MSR telemetry sweep 1", "tags": ["qa"]}] * 2 + ["junk"])
+    os.remove(data / "2019.json")
+    stats = builder.build()
+    assert stats == {"files": 5, "parsed": 1, "touched": 0, "removed": 1, "written": True}
+
+    cold = SemanticMapBuilder(str(data), map_file=str(tmp_path / "cold.json"), cache_file=str(tmp_path / "cold_cache.json"))
+    cold.build()
+    incremental, full = _load(builder.map_file), _load(cold.map_file)
+    assert incremental == full
+    assert full["tactical_layer"]["year_distribution"]["2021"] == 6
+    assert [e["summary"] for e in full["analytical_layer"]["validation"]].count("2018 MSR telemetry sweep 1") == 1
+
+
+def test_touch_only_change_is_hashed_not_parsed(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    for year in (2020, 2021):
+        _write_year(data, year, _items(year, 2))
+    builder = SemanticMapBuilder(str(data), cache_file=str(tmp_path / "cache.json"))
+    builder.build()
+
+    parsed = []
+    original = semantic_map.file_contribution
+    monkeypatch.setattr(semantic_map, "file_contribution", lambda path: parsed.append(path) or original(path))
+    for year in (2020, 2021):
+        os.utime(data / f"{year}.json", ns=(5, 5))
+    assert builder.build() == {"files": 2, "parsed": 0, "touched": 2, "removed": 0, "written": False}
+    assert parsed == []
+
+    _write_year(data, 2021, _items(2021, 3))
+    assert builder.build()["parsed"] == 1 and parsed == [str(data / "2021.json")]
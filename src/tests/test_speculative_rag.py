@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from logic import cognitive_hub  # noqa: E402
+from logic.cognitive_hub import CognitiveHub  # noqa: E402
+
+HYDE = "[VALIDATION]: PCIe AER | [SRE]: lspci -vvv"
+
+
+class FakeArchive:
+    """get_context with separate latencies for raw-query and HyDE retrievals."""
+
+    def __init__(self, raw_delay, hyde_delay):
+        self.raw_delay = raw_delay
+        self.hyde_delay = hyde_delay
+        self.calls = []
+        self.cancelled = []
+
+    async def call_tool(self, name, args):
+        kind = "hyde" if args.get("hyde_vector_text") else "raw"
+        self.calls.append(kind)
+        try:
+            await asyncio.sleep(self.hyde_delay if kind == "hyde" else self.raw_delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(kind)
+            raise
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{kind} context for {args['query']}")])
+
+
+async def _noop_broadcast(_msg):
+    return None
+
+
+def _make_hub(archive):
+    return CognitiveHub(
+        residents={"archive": archive},
+        broadcast_callback=_noop_broadcast,
+        sensory_manager=None,
+        get_vram_status=None,
+        trigger_morning_briefing=None,
+    )
+
+
+def test_casual_triage_cancels_prefetch():
+    """[FEAT-477] A greeting never pays for the speculative retrieval."""
+    async def run():
+        archive = FakeArchive(raw_delay=1.0, hyde_delay=0.0)
+        hub = _make_hub(archive)
+        hub._start_rag_prefetch("hey pinky")
+        await asyncio.sleep(0)
+        hub._discard_rag_prefetch("hey pinky", "CASUAL")
+        await asyncio.sleep(0)
+        return hub, archive
+
+    hub, archive = asyncio.run(run())
+    assert archive.cancelled == ["raw"]
+    assert hub._rag_prefetch == {}
+    assert hub.rag_prefetch_stats["cancelled"] == 1
+
+
+def test_slow_hyde_serves_prefetch_then_fills_cache():
+    async def run():
+        archive = FakeArchive(raw_delay=0.01, hyde_delay=0.3)
+        hub = _make_hub(archive)
+        hub._start_rag_prefetch("pcie errors on node 3")
+        with patch.object(cognitive_hub, "SPECULATIVE_REFINE_BUDGET", 0.05):
+            first = await hub._fetch_rag_context("pcie errors on node 3", {"hyde_vector_text": HYDE})
+        await asyncio.sleep(0.4)  # the HyDE retrieval keeps running for the Brain leg
+        second = await hub._fetch_rag_context("pcie errors on node 3", {"hyde_vector_text": HYDE})
+        return hub, archive, first, second
+
+    hub, archive, first, second = asyncio.run(run())
+    assert first.startswith("raw context")
+    assert second.startswith("hyde context")
+    assert archive.calls == ["raw", "hyde"]  # second lookup came from the cache
+    assert hub.rag_prefetch_stats["served"] == 1
+
+
+def test_fast_hyde_refines_and_cancels_prefetch():
+    async def run():
+        archive = FakeArchive(raw_delay=1.0, hyde_delay=0.01)
+        hub = _make_hub(archive)
+        hub._start_rag_prefetch("gpu temp")
+        await asyncio.sleep(0)
+        result = await hub._fetch_rag_context("gpu temp", {"hyde_vector_text": HYDE})
+        await asyncio.sleep(0)
+        return hub, archive, result
+
+    hub, archive, result = asyncio.run(run())
+    assert result.startswith("hyde context")
+    assert archive.cancelled == ["raw"]
+    assert hub.rag_prefetch_stats["refined"] == 1
+
+
+def test_cancelled_turn_drops_its_prefetch():
+    """A turn cut off by the router's total budget must not leave a prefetch for the next identical turn."""
+    async def run():
+        archive = FakeArchive(raw_delay=1.0, hyde_delay=0.0)
+        hub = _make_hub(archive)
+
+        async def stalled_turn(turn, *_args):
+            hub._start_rag_prefetch(turn)
+            await asyncio.sleep(10)
+
+        hub._process_query = stalled_turn
+        try:
+            await asyncio.wait_for(hub.process_query("gpu temp", request_id="r1"), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.sleep(0)
+        return hub, archive
+
+    hub, archive = asyncio.run(run())
+    assert hub._rag_prefetch == {}
+    assert archive.cancelled == ["raw"]
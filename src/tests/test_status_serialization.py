@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import hashlib
+from unittest.mock import patch
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra import style_key  # noqa: E402
+from v5.common.types import LabStatus  # noqa: E402
+
+
+def test_style_key_hashes_once_per_mtime(tmp_path):
+    """[FEAT-475] Repeated lookups reuse the hash until the stylesheet changes."""
+    css = tmp_path / "style.css"
+    css.write_text("body { color: red; }")
+    style_key.clear_style_key_cache()
+    expected = hashlib.md5(css.read_bytes()).hexdigest()[:8]
+
+    css_v2 = b"body { color: blue; }"
+    expected_v2 = hashlib.md5(css_v2).hexdigest()[:8]
+
+    with patch.object(style_key.hashlib, "md5", wraps=hashlib.md5) as md5:
+        assert [style_key.get_style_key(str(css)) for _ in range(50)] == [expected] * 50
+        assert md5.call_count == 1
+
+        css.write_bytes(css_v2)
+        os.utime(css, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        assert style_key.get_style_key(str(css)) == expected_v2
+        assert md5.call_count == 2
+
+    assert style_key.get_style_key(str(tmp_path / "missing.css"), fallback="missing") == "missing"
+
+
+def test_lab_status_rebuilds_only_on_change():
+    status = LabStatus(state="HIBERNATING")
+    with patch.object(LabStatus, "_build_dict", wraps=status._build_dict) as build:
+        first = status.to_dict()
+        second = status.to_dict()
+        assert build.call_count == 1
+        assert first == second and first is not second
+
+        status.vram_used = 4096
+        status.vram_total = 8192
+        third = status.to_dict()
+        assert build.call_count == 2
+        assert third["vitals"]["vram"] == "50.0%"
+
+
+def test_lab_status_payload_is_safe_to_extend():
+    status = LabStatus(state="OPERATIONAL")
+    payload = status.to_dict()
+    payload["live_telemetry"] = {"x": 1}
+    payload["vitals"]["style_key"] = "tampered"
+    fresh = status.to_dict()
+    assert "live_telemetry" not in fresh
+    assert fresh["vitals"]["style_key"] != "tampered"
+    assert fresh["status"] == "ONLINE"
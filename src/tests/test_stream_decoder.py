@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.stream_decoder import NDJSON, SSE, StreamDecoder, iter_batches  # noqa: E402
+
+TOKENS = ["Hello", ",", " wörld", " 🚀", ' say "hi"', " back\\slash", "\n", "\ttab", " \\\"", " end"]
+
+
+def _sse_body(tokens, spaced=False):
+    sep = (", ", ": ") if spaced else (",", ":")
+    events = [{"id": "c1", "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}}]}]
+    events += [{"id": "c1", "choices": [{"index": 0, "delta": {"content": t}, "logprobs": None}]} for t in tokens]
+    events.append({"id": "c1", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    body = b"".join(b"data: " + json.dumps(e, ensure_ascii=False, separators=sep).encode() + b"\n\n" for e in events)
+    return body + b"data: [DONE]\n\n"
+
+
+def _ndjson_body(tokens):
+    rows = [{"model": "m", "message": {"role": "assistant", "content": t}, "done": False} for t in tokens]
+    rows.append({"model": "m", "message": {"role": "assistant", "content": ""}, "done": True, "eval_count": len(tokens)})
+    return b"".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode() + b"\n" for r in rows)
+
+
+def _decode(protocol, body, cuts):
+    dec, out, prev = StreamDecoder(protocol), [], 0
+    for cut in sorted(cuts) + [len(body)]:
+        out += dec.feed(body[prev:cut])
+        prev = cut
+    return dec, out + dec.close()
+
+
+@pytest.mark.parametrize("protocol,make", [(SSE, _sse_body), (NDJSON, _ndjson_body)])
+def test_random_chunk_splits_match_full_parse(protocol, make):
+    """[FEAT-494] Any split of the byte stream, including inside a UTF-8 sequence, yields the same tokens."""
+    body = make(TOKENS)
+    rng = random.Random(7)
+    for _ in range(200):
+        cuts = rng.sample(range(1, len(body)), rng.randint(0, 40))
+        dec, out = _decode(protocol, body, cuts)
+        assert out == TOKENS
+        assert dec.done and dec.tokens == len(TOKENS) and dec.slow_path == 0
+    # One byte at a time is the worst case for the tail carry-over
+    assert _decode(protocol, body, range(1, len(body)))[1] == TOKENS
+
+
+def test_sse_layouts_that_need_the_full_parse():
+    tool_first = {"choices": [{"delta": {"tool_calls": [{"function": {"arguments": "{}"}}], "content": "x"}}]}
+    null_content = {"choices": [{"delta": {"content": None}}]}
+    body = b"".join([
+        b": keep-alive comment\n\n",
+        b"data:" + json.dumps({"choices": [{"delta": {"content": "a"}}]}).encode() + b"\n\n",  # no space after data:
+        b"data: " + json.dumps(tool_first).encode() + b"\n\n",
+        b"data: " + json.dumps(null_content).encode() + b"\n\n",
+        b"data: {not json}\n\n",
+        _sse_body(["b"], spaced=True),
+        b"data: " + json.dumps({"choices": [{"delta": {"content": "after done"}}]}).encode() + b"\n\n",
+    ])
+    dec, out = _decode(SSE, body, [])
+    assert out == ["a", "x", "b"]
+    assert dec.done and dec.slow_path == 2  # tool_calls line + the malformed line
+
+
+def test_ndjson_done_and_unterminated_last_line():
+    body = _ndjson_body(["one", " two"])
+    dec, out = _decode(NDJSON, body, [])
+    assert out == ["one", " two"] and dec.done
+    # Trailing data after done is ignored
+    assert dec.feed(b'{"message":{"content":"late"},"done":false}\n') == []
+
+    unterminated = b'{"message":{"content":"a"},"done":false}\n{"message":{"content":"b"},"done":true}'
+    dec = StreamDecoder(NDJSON)
+    assert dec.feed(unterminated) == ["a"] and not dec.done
+    assert dec.close() == ["b"] and dec.done
+
+
+def test_unknown_protocol_and_batches():
+    with pytest.raises(ValueError):
+        StreamDecoder("grpc")
+    tokens = [str(i) for i in range(35)]
+    batches = list(iter_batches(tokens, 16))
+    assert [n for _, n in batches] == [16, 16, 3]
+    assert "".join(text for text, _ in batches) == "".join(tokens)
+    assert list(iter_batches([], 16)) == []
+
+
+def test_loader_streams_batches_from_stub():
+    """The loader's vLLM/Ollama paths yield (text, n) batches that add up to the stub's tokens."""
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("mcp")
+    from infra.stream_bench import loader_targets, ollama_payload, vllm_payload
+    from infra.stub_engine import StubConfig, StubEngine, stub_tokens
+
+    targets = loader_targets()
+    if not targets:
+        pytest.skip("nodes.loader unavailable")
+
+    async def run():
+        engine = StubEngine(StubConfig(ttft_ms=0, token_rate=0))
+        base = await engine.start()
+        try:
+            vllm = [item async for item in targets["loader.vllm"](base, vllm_payload(40))]
+            ollama = [item async for item in targets["loader.ollama"](base, ollama_payload(40))]
+            return vllm, ollama
+        finally:
+            await engine.stop()
+
+    expected = "".join(stub_tokens(0, vllm_payload(40)["messages"], 40))
+    for batches in asyncio.run(run()):
+        assert sum(n for _, n in batches) == 40
+        assert all(1 <= n <= 16 for _, n in batches)
+        assert "".join(text for text, _ in batches) == expected
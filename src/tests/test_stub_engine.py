@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.stream_bench import StubProcess, bench_retry, loader_targets, run_bench, vllm_payload  # noqa: E402
+from infra.stub_engine import StubConfig, StubEngine  # noqa: E402
+from infra.vllm_metrics import parse_prom_metrics  # noqa: E402
+
+
+def _with_stub(config, body):
+    async def run():
+        engine = StubEngine(config)
+        base = await engine.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                return await body(engine, base, session)
+        finally:
+            await engine.stop()
+    return asyncio.run(run())
+
+
+async def _sse(session, url, payload):
+    events = []
+    async with session.post(url, json=payload) as r:
+        assert r.status == 200 and r.headers["Content-Type"].startswith("text/event-stream")
+        async for line in r.content:
+            if line.startswith(b"data: "):
+                events.append(line[6:].strip())
+    return events
+
+
+def test_vllm_sse_is_paced_and_deterministic():
+    """[FEAT-493] Same request -> same tokens; TTFT then token_rate on an absolute schedule."""
+    async def body(engine, base, session):
+        url = f"{base}/v1/chat/completions"
+        t0 = time.monotonic()
+        first = await _sse(session, url, vllm_payload(20))
+        elapsed = time.monotonic() - t0
+        second = await _sse(session, url, vllm_payload(20))
+        other = await _sse(session, url, vllm_payload(20, "A different question"))
+        return first, second, other, elapsed
+
+    first, second, other, elapsed = _with_stub(StubConfig(tokens=20, ttft_ms=50, token_rate=400), body)
+
+    def tokens(events):
+        assert events[-1] == b"[DONE]"
+        chunks = [json.loads(e) for e in events[:-1]]
+        assert chunks[0]["choices"][0]["delta"] == {"role": "assistant", "content": ""}
+        assert chunks[-1]["choices"][0]["finish_reason"] == "length"
+        return [c["choices"][0]["delta"]["content"] for c in chunks[1:-1]]
+
+    assert len(tokens(first)) == 20
+    assert tokens(first) == tokens(second) and tokens(first) != tokens(other)
+    assert 0.09 < elapsed < 0.5  # 50 ms TTFT + 19 tokens at 400/s
+
+
+def test_models_errors_and_overflow():
+    async def body(engine, base, session):
+        out = {}
+        async with session.get(f"{base}/v1/models") as r:
+            out["models"] = await r.json()
+        async with session.post(f"{base}/v1/chat/completions", json={**vllm_payload(8), "model": "nope"}) as r:
+            out["unknown"] = r.status
+        lora = await _sse(session, f"{base}/v1/chat/completions", {**vllm_payload(8), "model": "lab_history_v1"})
+        out["lora"] = json.loads(lora[1])["model"]
+        long = vllm_payload(100, " ".join(["word"] * 200))
+        async with session.post(f"{base}/v1/chat/completions", json=long) as r:
+            out["overflow"] = (r.status, (await r.json())["message"])
+        engine.config.update({"fail_first": engine.stats["completions"] + 1})
+        async with session.post(f"{base}/v1/chat/completions", json=vllm_payload(8)) as r:
+            out["warming"] = r.status
+        engine.config.update({"abort_after": 3})
+        try:
+            out["aborted"] = await _sse(session, f"{base}/v1/chat/completions", vllm_payload(8))
+        except aiohttp.ClientPayloadError:
+            out["aborted"] = "payload-error"
+        out["stats"] = engine.stats
+        return out
+
+    out = _with_stub(StubConfig(max_model_len=256, ttft_ms=0, token_rate=0, loras=("lab_history_v1",)), body)
+    data = out["models"]["data"]
+    assert [m["id"] for m in data] == ["unified-base", "lab_history_v1"]
+    assert data[0]["parent"] is None and data[1]["parent"] == "unified-base" and data[0]["max_model_len"] == 256
+    assert out["unknown"] == 404 and out["lora"] == "lab_history_v1"
+    assert out["overflow"][0] == 400 and "maximum context length is 256 tokens" in out["overflow"][1]
+    assert out["warming"] == 503
+    assert out["aborted"] == "payload-error" or b"[DONE]" not in out["aborted"]
+    assert out["stats"]["aborted"] == 1
+
+
+def test_ollama_ndjson_and_metrics():
+    async def body(engine, base, session):
+        lines = []
+        payload = {"model": "llama3.2:3b", "stream": True, "options": {"num_predict": 12},
+                   "messages": [{"role": "system", "content": "sys prompt"}, {"role": "user", "content": "hi"}]}
+        for _ in range(2):
+            async with session.post(f"{base}/api/chat", json=payload) as r:
+                lines = [json.loads(line) async for line in r.content if line.strip()]
+        async with session.get(f"{base}/api/tags") as r:
+            tags = await r.json()
+        async with session.get(f"{base}/metrics") as r:
+            metrics = await r.text()
+        return lines, tags, metrics
+
+    lines, tags, metrics = _with_stub(StubConfig(ttft_ms=0, token_rate=0), body)
+    assert len(lines) == 13 and not any(line["done"] for line in lines[:-1])
+    assert lines[-1]["done"] and lines[-1]["eval_count"] == 12 and lines[-1]["done_reason"] == "length"
+    assert tags["models"][0]["name"] == "llama3.2:3b"
+    totals = parse_prom_metrics(metrics, ["vllm:generation_tokens_total", "vllm:prefix_cache_queries_total",
+                                          "vllm:prefix_cache_hits_total", "stub_connections_total"])
+    assert totals["vllm:generation_tokens_total"] == 24
+    assert totals["vllm:prefix_cache_queries_total"] == 6 and totals["vllm:prefix_cache_hits_total"] == 2
+
+
+def test_bench_harness_against_stub_process():
+    with StubProcess(StubConfig()) as stub:
+        report = asyncio.run(run_bench(stub, targets={}, requests=3, tokens=32))
+    overhead = report["overhead"]
+    assert set(overhead) == {"raw.vllm", "raw.ollama", "legacy.vllm", "legacy.ollama"}
+    assert overhead["legacy.vllm"]["items"] == overhead["legacy.ollama"]["items"] == 3 * 32
+    assert overhead["raw.vllm"]["items"] >= 3 and overhead["raw.ollama"]["items"] >= 3
+    conns = report["connections"]
+    assert conns["fresh"]["connections"] == 3 and conns["shared"]["connections"] == 1
+    assert "retry" not in report
+
+
+def test_loader_retry_paths():
+    pytest.importorskip("mcp")
+    targets = loader_targets()
+    if not targets:
+        pytest.skip("nodes.loader unavailable")
+    with StubProcess(StubConfig()) as stub:
+        report = asyncio.run(bench_retry(stub, targets["loader.vllm"]))
+    overflow = report["overflow"]
+    assert overflow["outcome"] == "ok" and overflow["tokens"] == 64
+    assert overflow["requests"] == {"/v1/chat/completions 400": 1, "/v1/chat/completions 200": 1}
+    assert report["unavailable"]["outcome"].startswith("Error: vLLM returned 503") and report["unavailable"]["pages"] == 1
+    assert report["abort"]["tokens"] == 8 and report["abort"]["outcome"] != "ok"
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.token_budget import (  # noqa: E402
+    SAFETY_MARGIN_TOKENS, ContextWindowExceeded, TokenCounter, fit_prompt, pack_sections,
+)
+from nodes.prompt_layout import PromptLayout  # noqa: E402
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word (transformers-style encode/decode)."""
+
+    def __init__(self):
+        self.vocab, self.words = {}, []
+
+    def encode(self, text, add_special_tokens=False):
+        ids = []
+        for w in text.split():
+            if w not in self.vocab:
+                self.vocab[w] = len(self.words)
+                self.words.append(w)
+            ids.append(self.vocab[w])
+        return ids
+
+    def decode(self, ids):
+        return " ".join(self.words[i] for i in ids)
+
+
+def _words(prefix, n):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def test_pack_sections_by_priority():
+    """[FEAT-480] Guidance survives whole; RAG keeps its head; debate keeps its most recent tail."""
+    counter = TokenCounter(WordTokenizer())
+    sections = {
+        "PREVIOUS_DEBATE": _words("turn", 200),
+        "SYSTEM_DESIGN_STANCE": _words("rag", 100),
+        "GUIDANCE_FRAME": _words("guide", 10),
+    }
+    packed, report = pack_sections(counter, sections, 150)
+    assert packed["GUIDANCE_FRAME"] == sections["GUIDANCE_FRAME"]
+    assert packed["SYSTEM_DESIGN_STANCE"] == sections["SYSTEM_DESIGN_STANCE"]
+    assert packed["PREVIOUS_DEBATE"].endswith("turn199") and "turn0 " not in packed["PREVIOUS_DEBATE"]
+    assert sum(kept for kept, _ in report.values()) <= 150
+
+    packed, _ = pack_sections(counter, sections, 60)
+    assert "PREVIOUS_DEBATE" not in packed
+    assert packed["SYSTEM_DESIGN_STANCE"].startswith("rag0 rag1")
+
+
+def test_fit_prompt_fills_window_exactly_without_touching_prefix():
+    counter = TokenCounter(WordTokenizer())
+    layout = PromptLayout("[FOCUS]: engineer", _words("role", 50))
+    system, user, max_tokens, report = fit_prompt(
+        counter, layout, "what changed in 2019?",
+        {"SYSTEM_DESIGN_STANCE": _words("rag", 5000), "GUIDANCE_FRAME": "be brief"},
+        None, max_model_len=2048, max_tokens=1000,
+    )
+    assert system == layout.prefix
+    assert user.startswith("what changed in 2019?")
+    assert report["exact"] and report["prompt_tokens"] + max_tokens <= 2048 - SAFETY_MARGIN_TOKENS
+    assert max_tokens >= 150
+    assert report["sections"]["SYSTEM_DESIGN_STANCE"][0] < report["sections"]["SYSTEM_DESIGN_STANCE"][1]
+
+    # Small prompts keep the full reply budget
+    _, _, max_tokens, report = fit_prompt(counter, layout, "hi", {}, None, 2048, 1000)
+    assert max_tokens == 1000 and report["sections"] == {}
+
+
+def test_oversized_system_prefix_raises_instead_of_clamping():
+    counter = TokenCounter(WordTokenizer())
+    layout = PromptLayout("[FOCUS]: engineer", _words("role", 2000))
+    with pytest.raises(ContextWindowExceeded, match="System prefix exceeds context window"):
+        fit_prompt(counter, layout, "what changed in 2019?", {}, None, max_model_len=2048, max_tokens=1000)
+
+
+def test_heuristic_counter_without_tokenizer():
+    counter = TokenCounter()
+    assert not counter.exact
+    assert counter.count("x" * 35) == 10
+    assert counter.truncate("abcdefghij" * 10, 2, keep="tail") == "abcdefghij"[-7:]
@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra.trace_sink import TraceSink, get_sink  # noqa: E402
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_compact_ndjson_and_snapshot(tmp_path):
+    """[FEAT-495] One compact line per entry; edits after submit() never reach the file."""
+    path = str(tmp_path / "logs" / "trace_brain.json")
+    sink = TraceSink(path)
+    payload = {"messages": [{"role": "user", "content": "original"}], "max_tokens": 500}
+    assert sink.submit({"phase": "send", "data": payload})
+    payload["messages"][-1]["content"] = "truncated"  # what the FEAT-431 retry does in place
+    payload["max_tokens"] = 400
+    sink.submit({"phase": "recv", "data": "héllo", "metadata": None})
+    assert sink.flush()
+
+    with open(path) as f:
+        raw = f.read()
+    assert raw.count("\n") == 2 and ": " not in raw and "\n  " not in raw
+    send, recv = _lines(path)
+    assert send["data"] == {"messages": [{"role": "user", "content": "original"}], "max_tokens": 500}
+    assert recv["data"] == "héllo"
+    sink.close()
+    assert sink.stats["written"] == 2 and sink.stats["dropped"] == 0
+
+
+def test_size_rotation_keeps_bounded_backups(tmp_path):
+    path = str(tmp_path / "trace.json")
+    sink = TraceSink(path, max_bytes=400, backups=2)
+    for i in range(60):
+        sink.submit({"i": i, "pad": "x" * 40})
+        sink.flush()
+    sink.close()
+
+    assert os.path.exists(f"{path}.1") and os.path.exists(f"{path}.2") and not os.path.exists(f"{path}.3")
+    assert all(os.path.getsize(p) <= 400 for p in (path, f"{path}.1", f"{path}.2"))
+    kept = [e["i"] for p in (f"{path}.2", f"{path}.1", path) for e in _lines(p)]
+    assert kept == list(range(kept[0], 60))  # newest entries, in order, nothing lost inside the window
+    assert sink.stats["rotations"] >= 2
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    sink = TraceSink(str(tmp_path / "trace.json"), queue_size=4)
+    entered, gate = threading.Event(), threading.Event()
+    original = sink._write
+    sink._write = lambda batch: (entered.set(), gate.wait(5), original(batch))
+
+    # Park the worker inside _write with a one-entry batch, then flood the queue
+    assert sink.submit({"i": -1}) and entered.wait(5)
+    t0 = time.perf_counter()
+    accepted = sum(sink.submit({"i": i}) for i in range(100))
+    elapsed = time.perf_counter() - t0
+    gate.set()
+    sink.close()
+
+    assert elapsed < 0.5
+    assert accepted == 4 and sink.stats["dropped"] == 96
+    assert sink.stats["written"] == 5
+
+
+def test_sampling_is_stable_per_request():
+    sink = TraceSink("/nonexistent/trace.json", sample=0.25)
+    ids = [f"req-{i}" for i in range(2000)]
+    first = [sink.sampled(r) for r in ids]
+    assert first == [sink.sampled(r) for r in ids]
+    assert 0.2 < sum(first) / len(ids) < 0.3
+    assert TraceSink("/x", sample=1.0).sampled("req-1") and not TraceSink("/x", sample=0.0).sampled("req-1")
+
+
+def test_close_flushes_and_registry_shares_sinks(tmp_path):
+    path = str(tmp_path / "trace.json")
+    sink = get_sink(path)
+    assert get_sink(path) is sink
+    for i in range(10):
+        sink.submit({"i": i})
+    sink.close()
+    assert [e["i"] for e in _lines(path)] == list(range(10))
+    assert not sink.submit({"i": 99}) and sink.stats["dropped"] == 1
+    assert get_sink(path) is not sink  # a closed sink is replaced on the next lookup
+
+
+def test_loader_trace_and_tool_log_keep_history(tmp_path, monkeypatch):
+    pytest.importorskip("mcp")
+    pytest.importorskip("aiohttp")
+    import nodes.loader as loader
+
+    log_path = tmp_path / "tool_log.md"
+    monkeypatch.setattr(loader, "TOOL_LOG_PATH", str(log_path))
+    node = loader.BicameralNode("TraceNode", "test prompt")
+    node.trace_sink = TraceSink(str(tmp_path / "trace_tracenode.json"))
+
+    node.append_to_tool_log("think", 'query="one"')
+    node.append_to_tool_log("think", 'query="two"')
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 2 and 'query="one"' in lines[0] and 'query="two"' in lines[1]
+    assert not os.path.exists(f"{log_path}.tmp")
+
+    node._mirror_trace("send", {"messages": []}, url="http://x", request_id="r1")
+    node._mirror_trace("recv", "answer", request_id="r1")
+    node.trace_sink.close()
+    send, recv = _lines(node.trace_sink.path)
+    assert (send["phase"], send["url"], recv["data"], recv["request_id"]) == ("send", "http://x", "answer", "r1")
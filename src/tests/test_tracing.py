@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from infra import tracing  # noqa: E402
+
+
+def test_nested_spans_and_laps_build_a_waterfall(tmp_path):
+    """[FEAT-481] Spans, laps and recorded intervals for one request_id render as one tree."""
+    store = tracing.TraceStore(str(tmp_path))
+    tracing.set_store(store)
+    try:
+        t_enqueue = time.time() - 0.05
+        tracing.record_span("queue_wait", "req-1", t_enqueue, service="foyer")
+        with tracing.span("division_of_labor", request_id="req-1", service="foyer"):
+            tracing.lap("stage1.kender_ping")
+            with tracing.span("hub.process_query", service="hub") as hub:
+                tracing.lap("triage")
+                tracing.lap("dispatch", vibe="TECHNICAL")
+                assert tracing.current_request_id() == "req-1"
+            assert hub.d_us is not None
+        with tracing.span("division_of_labor", request_id="req-2"):
+            pass
+    finally:
+        tracing.set_store(None)
+
+    spans = store.load("req-1")
+    assert {s["n"] for s in spans} == {"queue_wait", "division_of_labor", "stage1.kender_ping",
+                                       "hub.process_query", "triage", "dispatch"}
+    view = tracing.waterfall(spans)
+    rows = {r["name"]: r for r in view["rows"]}
+    assert view["rows"][0]["name"] == "queue_wait" and rows["queue_wait"]["dur_ms"] >= 40
+    assert rows["division_of_labor"]["depth"] == 0
+    assert rows["hub.process_query"]["depth"] == 1 and rows["hub.process_query"]["service"] == "hub"
+    assert rows["dispatch"]["depth"] == 2 and rows["dispatch"]["attrs"] == {"vibe": "TECHNICAL"}
+    assert set(view["by_service"]) == {"foyer"}  # nested phases are not double counted
+
+    recent = store.recent()
+    assert [r["request_id"] for r in recent] == ["req-2", "req-1"] and recent[1]["spans"] == 6
+    page = tracing.render_waterfall_html("req-1", view)
+    assert "hub · hub.process_query" in page and "<script" not in page
+
+
+def test_request_id_propagates_into_spawned_tasks(tmp_path):
+    store = tracing.TraceStore(str(tmp_path))
+    tracing.set_store(store)
+
+    async def _leg(name):
+        await asyncio.sleep(0.01)
+        with tracing.span(name):
+            pass
+
+    async def _turn():
+        async with tracing.span("hub.process_query", request_id="req-3"):
+            await asyncio.gather(asyncio.create_task(_leg("node.pinky")), asyncio.create_task(_leg("node.brain")))
+        # Outside the span nothing is ambient any more
+        assert tracing.current_request_id() is None
+        tracing.lap("ignored")
+
+    try:
+        asyncio.run(_turn())
+    finally:
+        tracing.set_store(None)
+
+    spans = store.load("req-3")
+    root = next(s for s in spans if s["n"] == "hub.process_query")
+    legs = [s for s in spans if s["n"].startswith("node.")]
+    assert len(legs) == 2 and all(s["p"] == root["s"] for s in legs)
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("spans_")
+    with open(tmp_path / files[0]) as f:
+        assert all(json.loads(line)["r"] == "req-3" for line in f)
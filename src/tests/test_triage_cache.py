@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from logic.triage_cache import ROUTING_FIELDS, TriageCache, normalize_query  # noqa: E402
+
+GPU_TRIAGE = {"vibe": "OPERATIONAL", "addressed_to": "PINKY", "domain": "exp_tlm", "importance": 0.6}
+
+
+def test_paraphrased_intent_hits_cache():
+    """[FEAT-476] 'what's the GPU temp' and 'check gpu temperature' share one triage."""
+    assert normalize_query("what's the GPU temp") == normalize_query("check gpu temperature")
+    cache = TriageCache()
+    cache.store("what's the GPU temp", GPU_TRIAGE)
+    hit, sim = cache.lookup("Check GPU temperature please")
+    assert hit == GPU_TRIAGE and sim >= 0.88
+    hit["vibe"] = "MUTATED"
+    assert cache.lookup("gpu temp")[0]["vibe"] == "OPERATIONAL"  # callers get copies
+
+
+def test_distinct_intents_and_identifiers_miss():
+    cache = TriageCache()
+    cache.store("gpu temp", GPU_TRIAGE)
+    cache.store("lab history 2010", {"vibe": "HISTORICAL"})
+    assert cache.lookup("cpu temp")[0] is None
+    assert cache.lookup("lab history 2011")[0] is None  # years must match exactly
+    report = cache.report()
+    assert report["misses"] == 2 and report["hit_rate"] == 0.0
+
+
+def test_ttl_expiry():
+    cache = TriageCache(ttl=0.05)
+    cache.store("gpu temp", GPU_TRIAGE)
+    time.sleep(0.1)
+    assert cache.lookup("gpu temp")[0] is None
+    assert cache.report()["entries"] == 0
+
+
+def test_invalidation_on_prompt_or_role_tokens_change(tmp_path):
+    tokens = tmp_path / "role_tokens.json"
+    tokens.write_text('{"<|PINKY|>": "cli_voice_v1"}')
+    cache = TriageCache(fingerprint="v1", watch_files=(str(tokens),))
+    cache.store("gpu temp", GPU_TRIAGE, "v1")
+    assert cache.lookup("gpu temp", "v1")[0] is not None
+
+    assert cache.lookup("gpu temp", "v2")[0] is None  # prompt revision changed
+    cache.store("gpu temp", GPU_TRIAGE, "v2")
+    tokens.write_text('{"<|PINKY|>": "cli_voice_v2", "<|LAB|>": null}')
+    assert cache.lookup("gpu temp", "v2")[0] is None  # role_tokens.json changed
+    assert cache.report()["invalidations"] == 2
+
+
+def test_lru_bound():
+    cache = TriageCache(max_entries=2)
+    for q in ("gpu temp", "pcie errors", "kernel panic"):
+        cache.store(q, GPU_TRIAGE)
+    assert cache.lookup("gpu temp")[0] is None
+    assert cache.lookup("kernel panic")[0] is not None
+
+
+def test_distinct_commands_sharing_a_prefix_do_not_collide():
+    """Regression: prefix truncation served 'restart vllm' triage to 'restore vllm'."""
+    pairs = [("restart vllm", "restore vllm"), ("deploy lora", "deplete lora"), ("gpu status", "gpu statistics")]
+    for first, second in pairs:
+        assert normalize_query(first) != normalize_query(second)
+        cache = TriageCache()
+        cache.store(first, GPU_TRIAGE)
+        assert cache.lookup(second)[0] is None
+        assert cache.lookup(first)[1] == 1.0
+
+
+def test_inflections_still_hit_semantically():
+    cache = TriageCache()
+    cache.store("restart vllm", GPU_TRIAGE)
+    hit, sim = cache.lookup("restarting vllm")
+    assert hit == GPU_TRIAGE and sim >= 0.88
+    assert cache.report()["semantic_hits"] == 1
+
+
+def test_threshold_decides_near_paraphrase_hits():
+    """A different word set (extra 'server') scores ~0.81: a hit at 0.8, a miss at the 0.88 default."""
+    for threshold, expect_hit in ((0.8, True), (0.88, False)):
+        cache = TriageCache(threshold=threshold)
+        cache.store("restart vllm", GPU_TRIAGE)
+        hit, sim = cache.lookup("restart vllm server")
+        assert (hit is not None) == expect_hit and 0.8 <= sim < 0.88
+
+
+def test_pluggable_embedder_drives_semantic_tier():
+    calls = []
+
+    def embed(normalized):
+        calls.append(normalized)
+        return {"all": 1.0}  # everything looks identical to this embedder
+
+    cache = TriageCache(embed=embed)
+    cache.store("gpu temp", GPU_TRIAGE)
+    cache.store("lab history 2010", {"vibe": "HISTORICAL"})
+    assert cache.lookup("kernel panic")[0] == GPU_TRIAGE
+    assert cache.lookup("lab notes 2011")[0] is None  # identifier guard still applies
+    assert "kernel panic" in calls
+
+
+def test_question_words_stay_in_the_key():
+    assert normalize_query("why did vllm crash") != normalize_query("when did vllm crash")
+    cache = TriageCache()
+    cache.store("why did vllm crash", GPU_TRIAGE)
+    assert cache.lookup("when did vllm crash")[0] is None
+    assert cache.lookup("why did vllm crash")[0] == GPU_TRIAGE
+
+
+def test_only_routing_fields_are_cached():
+    """The query-specific half of a triage (intent, situation, hints, HyDE text) is never replayed."""
+    full = dict(GPU_TRIAGE, casual=0.1, intrigue=0.4, inferred_intent="read the gpu temperature",
+                situation="User checks thermals", hints="nvidia-smi", hyde_vector_text="GPU temp was 71C")
+    cache = TriageCache()
+    cache.store("what's the GPU temp", full)
+    hit, _ = cache.lookup("check gpu temperature")
+    assert hit == dict(GPU_TRIAGE, casual=0.1, intrigue=0.4)
+    assert set(hit) <= set(ROUTING_FIELDS)
+    keep_all = TriageCache(fields=None)
+    keep_all.store("gpu temp", full)
+    assert keep_all.lookup("gpu temp")[0] == full
@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure HomeLabAI/src is on sys.path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from v5.ignition.vitals import NvmlHandle, StatusPublisher, VitalsSampler, diff_status  # noqa: E402
+
+
+class _FakeNvml:
+    def __init__(self):
+        self.inits = 0
+        self.fail_next = False
+
+    def nvmlInit(self):
+        self.inits += 1
+
+    def nvmlDeviceGetHandleByIndex(self, idx):
+        return f"gpu{idx}"
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("NVML_ERROR_GPU_IS_LOST")
+        return SimpleNamespace(used=2048 * 1024**2, total=12288 * 1024**2)
+
+
+def test_nvml_handle_initializes_once_and_recovers():
+    """[FEAT-474] nvmlInit runs once across ticks; an NVML error forces a single re-init."""
+    fake = _FakeNvml()
+    nvml = NvmlHandle(nvml=fake)
+    assert [nvml.memory() for _ in range(5)][-1] == (2048, 12288)
+    assert fake.inits == 1
+    fake.fail_next = True
+    assert nvml.memory() is None
+    assert nvml.memory() == (2048, 12288)
+    assert fake.inits == 2
+
+
+def test_probes_run_concurrently_and_slow_probe_keeps_last_value():
+    def slow(): time.sleep(0.4); return "slow"  # noqa: E702
+
+    async def slow_async():
+        await asyncio.sleep(5)
+
+    sampler = VitalsSampler(probes={"a": slow, "b": slow, "host": lambda: (41.5, 20.0)}, timeout=1.0)
+    status = SimpleNamespace(ram_pct=0.0, available_ram=0.0)
+    t0 = time.perf_counter()
+    readings = asyncio.run(sampler.sample(status))
+    assert time.perf_counter() - t0 < 0.75
+    assert readings["a"] == readings["b"] == "slow"
+    assert (status.ram_pct, status.available_ram) == (41.5, 20.0)
+
+    sampler.probes["a"] = slow_async
+    sampler.timeout = 0.2
+    readings = asyncio.run(sampler.sample(status))
+    assert readings["a"] == "slow"  # timed out -> last known value
+
+
+def test_diff_ignores_volatile_keys():
+    prev = {"state": "HIBERNATING", "vram_used": 10, "timestamp": "01:00:00"}
+    cur = {"state": "HIBERNATING", "vram_used": 12, "timestamp": "01:00:10"}
+    assert diff_status(prev, cur) == {"vram_used": 12}
+
+
+def test_publisher_sends_full_then_deltas_and_resyncs_after_failure():
+    sent = []
+    fail = {"next": False}
+
+    def post(url, body):
+        if fail["next"]:
+            fail["next"] = False
+            raise OSError("connection refused")
+        sent.append(dict(body))
+
+    pub = StatusPublisher(post=post)
+    base = {"state": "HIBERNATING", "vram_used": 10, "nodes": {}, "timestamp": "t0"}
+
+    async def _drive():
+        await pub.push(base)
+        await pub.push(dict(base, timestamp="t1"))
+        await pub.push(dict(base, vram_used=11, timestamp="t2"))
+        fail["next"] = True
+        await pub.push(dict(base, vram_used=12))
+        await pub.push(dict(base, vram_used=12))
+
+    asyncio.run(_drive())
+    assert sent[0] == base  # first push is a full sync
+    assert sent[1] == {"state": "HIBERNATING"}  # heartbeat only
+    assert sent[2] == {"state": "HIBERNATING", "vram_used": 11}
+    assert sent[3]["nodes"] == {}  # failure forced a full resync
+    assert pub.stats == {"full": 2, "delta": 2, "failed": 1}
+
+
+def test_status_refresh_tasks_are_held_and_failures_logged(caplog):
+    pytest.importorskip("psutil")
+    from v5.ignition.manager import IgnitionManager
+
+    manager = IgnitionManager.__new__(IgnitionManager)
+    manager._status_tasks = set()
+    calls = []
+
+    async def refresh_status():
+        calls.append(1)
+        await asyncio.sleep(0)
+        if len(calls) == 2:
+            raise RuntimeError("nvml gone")
+
+    manager.refresh_status = refresh_status
+
+    async def run():
+        manager.update_status_file()
+        manager.update_status_file()
+        assert len(manager._status_tasks) == 2
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert calls == [1, 1] and manager._status_tasks == set()
+    assert "Status refresh failed: nvml gone" in caplog.text
@@ -15,6 +15,8 @@ class _MockContent:
         return self
     async def __anext__(self):
         raise StopAsyncIteration
+    def iter_any(self):
+        return self
 
 
 @pytest.mark.asyncio
@@ -1,11 +1,14 @@
 import asyncio
 import os
 import logging
+import subprocess
 import sys
+import time
 from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from typing import Dict, Optional
+from v5.common import zygote
 
 # [Task 4.1] V5 Resident Manager: Modular Node Spawner
 # Objective: Decouple node lifecycle from the foyer server.
@@ -22,6 +25,50 @@ class ResidentManager:
         self.booted = False
         self.booting = False
         self._boot_lock = asyncio.Lock()
+        # [FEAT-471] Warm Pool: fork nodes from a pre-imported zygote (LAB_WARM_POOL=0 to disable)
+        self.warm_pool = os.environ.get("LAB_WARM_POOL", "1") == "1"
+        self._zygote_proc = None
+        self.boot_timings: Dict[str, dict] = {}
+
+    async def prewarm_pool(self, timeout: float = 120.0) -> bool:
+        """[FEAT-471] Ensure the zygote is up so the next wake forks instead of cold-importing."""
+        if not self.warm_pool:
+            return False
+        # ping() is a blocking socket round trip (up to 1 s); keep it off the event loop
+        if await asyncio.to_thread(zygote.ping) is not None:
+            return True
+        if self._zygote_proc is None or self._zygote_proc.poll() is not None:
+            logging.info("[RESIDENTS] Spawning warm-pool zygote...")
+            env = os.environ.copy()
+            env["PYTHONPATH"] = f"{env.get('PYTHONPATH', '')}:{SRC_DIR}"
+            os.makedirs(os.path.dirname(zygote.ZYGOTE_LOG), exist_ok=True)
+            with open(zygote.ZYGOTE_LOG, "a") as log_f:
+                self._zygote_proc = subprocess.Popen(
+                    [PYTHON_PATH, "-m", "v5.common.zygote", "serve"],
+                    cwd=SRC_DIR, env=env,
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log_f,
+                    start_new_session=True,
+                )
+        t0 = time.time()
+        while time.time() - t0 < timeout:
+            if await asyncio.to_thread(zygote.ping) is not None:
+                logging.info(f"[RESIDENTS] Warm pool ready in {time.time() - t0:.1f}s.")
+                return True
+            if self._zygote_proc.poll() is not None:
+                break
+            await asyncio.sleep(0.25)
+        logging.warning("[RESIDENTS] Warm pool unavailable. Falling back to cold boots.")
+        return False
+
+    def release_pool(self):
+        """[FEAT-471] Terminate the zygote (Foyer exit only — hibernation keeps it warm)."""
+        if self._zygote_proc is not None and self._zygote_proc.poll() is None:
+            self._zygote_proc.terminate()
+            try:
+                self._zygote_proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._zygote_proc.kill()
+        self._zygote_proc = None
 
     async def boot_all(self):
         """Idempotent boot of all logical nodes with timed liveness check."""
@@ -51,6 +98,7 @@ class ResidentManager:
             self.booting = True
             try:
                 logging.info("[RESIDENTS] Booting node stack...")
+                warm = await self.prewarm_pool()
                 n_dir = os.path.join(SRC_DIR, "nodes")
                 nodes = [
                     ("pinky", os.path.join(n_dir, "pinky_node.py")),
@@ -63,40 +111,61 @@ class ResidentManager:
                 # Launch all node boots concurrently
                 boot_tasks = []
                 for name, path in nodes:
-                    boot_tasks.append(self._boot_node(name, path))
+                    boot_tasks.append(self._boot_node(name, path, warm=warm))
                 
+                t0 = time.perf_counter()
                 await asyncio.gather(*boot_tasks)
                 self.booted = True
-                logging.info("[RESIDENTS] All nodes fully synchronized.")
+                self.boot_timings["_stack"] = {
+                    "mode": "warm" if warm else "cold",
+                    "total_s": round(time.perf_counter() - t0, 3),
+                    "at": time.time(),
+                }
+                logging.info(f"[RESIDENTS] All nodes fully synchronized. Boot breakdown: {self.boot_timings}")
             finally:
                 self.booting = False
 
-    async def _boot_node(self, name, path):
+    async def _boot_node(self, name, path, warm=False):
+        timings = {"mode": "warm" if warm else "cold"}
+        t_start = time.perf_counter()
         try:
             logging.info(f"[RESIDENTS] Syncing {name.upper()}...")
-            # Settle window (legacy requirement)
-            await asyncio.sleep(1.0)
+            if not warm:
+                # Settle window (legacy requirement)
+                await asyncio.sleep(1.0)
+            timings["settle_s"] = round(time.perf_counter() - t_start, 3)
             
             env = os.environ.copy()
             env["PYTHONPATH"] = f"{env.get('PYTHONPATH', '')}:{SRC_DIR}"
             env["LAB_IMMUNITY_TOKEN"] = self.session_token
             node_args = [path, "--role", name.upper(), "--session", self.session_token]
+            if warm:
+                # [FEAT-471] Shim forks the node inside the zygote on this transport's stdio
+                node_args = ["-m", "v5.common.zygote", "spawn", "--"] + node_args
             
-            params = StdioServerParameters(command=PYTHON_PATH, args=node_args, env=env)
+            params = StdioServerParameters(command=PYTHON_PATH, args=node_args, env=env, cwd=SRC_DIR)
             
             # [Task 4.1] Manual context management to avoid anyio task mismatch
+            t0 = time.perf_counter()
             transport_cm = stdio_client(params)
             read_stream, write_stream = await transport_cm.__aenter__()
             self.transports.append(transport_cm)
+            timings["spawn_s"] = round(time.perf_counter() - t0, 3)
             
+            t0 = time.perf_counter()
             session = ClientSession(read_stream, write_stream)
             await session.__aenter__()
             await session.initialize()
+            timings["initialize_s"] = round(time.perf_counter() - t0, 3)
             
             self.residents[name] = session
             logging.info(f"[RESIDENTS] {name.upper()} Node active.")
         except Exception as e:
+            timings["error"] = str(e)
             logging.error(f"[RESIDENTS] Failed to sync {name.upper()}: {e}")
+        finally:
+            timings["total_s"] = round(time.perf_counter() - t_start, 3)
+            self.boot_timings[name] = timings
 
     async def shutdown(self):
         """Graceful release of all node contexts with manual cleanup."""
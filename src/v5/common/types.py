@@ -1,10 +1,12 @@
 import os
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, astuple, fields
 from enum import Enum
 from typing import Dict, Optional
 import time
 
+from infra.style_key import get_style_key
+
 class SensoryMode(Enum):
     ACTIVE = "ACTIVE"
     PAUSED = "PAUSED"
@@ -64,29 +66,38 @@ class LabStatus:
             super().__setattr__("state_changed_at", time.time())
         super().__setattr__(name, value)
 
+    def _snapshot_key(self):
+        """Every serialized field, including nested NodeStatus values (cheap tuple compare)."""
+        key = tuple(getattr(self, f.name) for f in fields(self) if f.name != "nodes")
+        return key + tuple((k, astuple(v)) for k, v in self.nodes.items())
+
     def to_dict(self):
+        """
+        [FEAT-475] Cached serializer: the payload is rebuilt only when a field
+        changed; the clock-derived duration and the (mtime-memoized) style key
+        are refreshed per call. Returns a fresh dict callers may extend.
+        """
+        key = self._snapshot_key()
+        cached = self.__dict__.get("_dict_cache")
+        if cached is None or cached[0] != key:
+            cached = (key, self._build_dict())
+            object.__setattr__(self, "_dict_cache", cached)
+        payload = dict(cached[1])
+        payload["nodes"] = dict(payload["nodes"])
+        payload["vitals"] = dict(payload["vitals"], style_key=get_style_key(fallback="38637b40"))
+        state_changed_at = getattr(self, "state_changed_at", 0)
+        payload["state_duration_s"] = round(max(0.0, time.time() - state_changed_at), 1) if state_changed_at > 0 else 0.0
+        return payload
+
+    def _build_dict(self):
         # [Task 9.7] UI Compatibility Layer (V3 -> V5 Bridge)
         vram_pct = (self.vram_used / self.vram_total * 100) if self.vram_total > 0 else 0
-        now = time.time()
-        state_duration = max(0.0, now - self.state_changed_at) if getattr(self, "state_changed_at", 0) > 0 else 0.0
-        
-        # Discover style key
-        style_key = "38637b40" # Fallback
-        try:
-            workspace = os.path.expanduser("~/Dev_Lab/Portfolio_Dev")
-            style_path = os.path.join(workspace, "field_notes/style.css")
-            if os.path.exists(style_path):
-                import hashlib
-                with open(style_path, "rb") as f:
-                    style_key = hashlib.md5(f.read()).hexdigest()[:8]
-        except Exception:
-            pass
 
         return {
             "state": self.state,
             "state_changed_at": getattr(self, "state_changed_at", self.timestamp),
             "state_changed_iso": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(getattr(self, "state_changed_at", self.timestamp))),
-            "state_duration_s": round(state_duration, 1),
+            "state_duration_s": 0.0,  # refreshed per call in to_dict()
             "status": "ONLINE" if self.state == "OPERATIONAL" else (
                 "HIBERNATING (VRAM Free)" if self.state == "HIBERNATING" else self.state
             ),
@@ -112,7 +123,7 @@ class LabStatus:
                 "intercom": "ONLINE" if self.vocal else "OFFLINE",
                 "brain": "ONLINE" if self.engine_up else "OFFLINE",
                 "session": self.active_intent_id or "standby",
-                "style_key": style_key,
+                "style_key": None,  # refreshed per call in to_dict()
                 "recovery_level": self.recovery_level,
                 "recovery_in_progress": self.recovery_in_progress
             }
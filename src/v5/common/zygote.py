@@ -0,0 +1,316 @@
+import argparse
+import importlib
+import json
+import logging
+import os
+import runpy
+import selectors
+import signal
+import socket
+import sys
+import time
+
+# [FEAT-471] V5 Warm Pool: Resident Node Zygote
+# Objective: Pay the heavy import cost (MCP, ChromaDB, FastEmbed, Liger) once per
+# lab session instead of once per node per wake. The zygote pre-imports the shared
+# dependency set and forks node roles on demand. A featherweight shim process keeps
+# the MCP stdio contract intact: it hands its stdin/stdout/stderr to the zygote via
+# SCM_RIGHTS, and the forked child runs the node script on those exact pipes.
+#
+# NOTE: This module must only import the stdlib at top level — the shim runs on
+# every node boot and must stay cheap.
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAB_DIR = os.path.dirname(SRC_DIR)
+ZYGOTE_SOCKET = os.environ.get("LAB_ZYGOTE_SOCKET", os.path.join(LAB_DIR, "run", "zygote.sock"))
+ZYGOTE_LOG = os.path.join(LAB_DIR, "logs", "zygote.log")
+
+# Shared dependency set: imported once in the zygote, inherited by every fork.
+# Nothing here may initialize CUDA, start threads or open network clients.
+PRELOAD_MODULES = (
+    "asyncio",
+    "json",
+    "aiohttp",
+    "requests",
+    "numpy",
+    "mcp.server.fastmcp",
+    "chromadb",
+    "fastembed",
+    "pynvml",
+    "liger_kernel.transformers",
+)
+
+
+def preload(modules=PRELOAD_MODULES):
+    """[FEAT-471] Import the shared dependency set. Returns {module: seconds} (None if missing)."""
+    timings = {}
+    for mod in modules:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(mod)
+            timings[mod] = round(time.perf_counter() - t0, 4)
+        except Exception as e:
+            timings[mod] = None
+            logging.warning(f"[ZYGOTE] Preload skipped {mod}: {e}")
+    return timings
+
+
+def _send_line(conn, payload):
+    try:
+        conn.sendall((json.dumps(payload) + "\n").encode())
+    except OSError:
+        pass
+
+
+def _recv_request(conn):
+    """Read one newline-terminated JSON request plus any passed descriptors."""
+    msg, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+    while msg and not msg.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        msg += chunk
+    return json.loads(msg.decode()), fds
+
+
+def _run_child(request, fds, inherited):
+    """Forked child: adopt the shim's stdio and become the requested node."""
+    try:
+        # Drop the zygote's sockets so shims only ever see their own child's lifetime.
+        for sock in inherited:
+            sock.close()
+        for target, fd in enumerate(fds[:3]):
+            os.dup2(fd, target)
+            if fd > 2:
+                os.close(fd)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.environ.update(request.get("env", {}))
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        if SRC_DIR not in sys.path:
+            sys.path.insert(0, SRC_DIR)
+        # Re-open the std streams on the inherited descriptors
+        sys.stdin = os.fdopen(0, "r", closefd=False)
+        sys.stdout = os.fdopen(1, "w", closefd=False)
+        sys.stderr = os.fdopen(2, "w", closefd=False)
+        logging.getLogger().handlers.clear()
+        argv = request["argv"]
+        sys.argv = list(argv)
+        runpy.run_path(argv[0], run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException as e:
+        try:
+            sys.stderr.write(f"[ZYGOTE] Node crashed: {e}\n")
+            sys.stderr.flush()
+        except Exception:
+            pass
+        code = 1
+    try:
+        sys.stdout.flush()
+    except Exception:
+        pass
+    os._exit(code)
+
+
+class Zygote:
+    """
+    [FEAT-471] Pre-forked interpreter server.
+    One connection per spawn request; the zygote reports the child pid back on
+    the connection and later its exit code. If the shim disappears, the child
+    is terminated so no orphaned node outlives its MCP transport.
+    """
+
+    def __init__(self, socket_path=ZYGOTE_SOCKET):
+        self.socket_path = socket_path
+        self.children = {}  # pid -> conn
+        self.preload_timings = {}
+        self._running = True
+
+    def serve(self, modules=PRELOAD_MODULES):
+        t0 = time.perf_counter()
+        self.preload_timings = preload(modules)
+        logging.info(f"[ZYGOTE] Preloaded {len(modules)} modules in {time.perf_counter() - t0:.2f}s")
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(16)
+
+        sel = selectors.DefaultSelector()
+        sel.register(listener, selectors.EVENT_READ, "accept")
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        try:
+            while self._running:
+                for key, _ in sel.select(timeout=0.5):
+                    if key.data == "accept":
+                        self._accept(listener, sel)
+                    else:
+                        self._on_shim_event(key.fileobj, key.data, sel)
+                self._reap(sel)
+        finally:
+            for pid in list(self.children):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            logging.info("[ZYGOTE] Shut down.")
+
+    def _stop(self, *_):
+        self._running = False
+
+    def _accept(self, listener, sel):
+        conn, _ = listener.accept()
+        try:
+            request, fds = _recv_request(conn)
+        except Exception as e:
+            logging.error(f"[ZYGOTE] Malformed spawn request: {e}")
+            conn.close()
+            return
+
+        if request.get("op") == "ping":
+            _send_line(conn, {"pong": True, "pid": os.getpid(), "preload": self.preload_timings})
+            conn.close()
+            return
+
+        if len(fds) != 3:
+            _send_line(conn, {"error": "expected 3 stdio descriptors"})
+            conn.close()
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            inherited = [listener, conn] + [c for c in self.children.values() if c is not None]
+            _run_child(request, fds, inherited)
+        for fd in fds:
+            os.close(fd)
+        self.children[pid] = conn
+        sel.register(conn, selectors.EVENT_READ, pid)
+        _send_line(conn, {"pid": pid})
+        logging.info(f"[ZYGOTE] Forked {request['argv'][0]} as PID {pid}")
+
+    def _on_shim_event(self, conn, pid, sel):
+        # The shim never writes after the request; readable means it went away.
+        try:
+            data = conn.recv(1)
+        except OSError:
+            data = b""
+        if not data:
+            sel.unregister(conn)
+            conn.close()
+            if pid in self.children:
+                self.children[pid] = None
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+
+    def _reap(self, sel):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = self.children.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            logging.info(f"[ZYGOTE] PID {pid} exited ({code})")
+            if conn is not None:
+                _send_line(conn, {"exit": code})
+                try:
+                    sel.unregister(conn)
+                except (KeyError, ValueError):
+                    pass
+                conn.close()
+
+
+def ping(socket_path=ZYGOTE_SOCKET, timeout=1.0):
+    """Return the zygote's ping payload, or None if it is not accepting spawns."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(socket_path)
+            s.sendall((json.dumps({"op": "ping"}) + "\n").encode())
+            return json.loads(s.makefile().readline())
+    except Exception:
+        return None
+
+
+def spawn(argv, socket_path=ZYGOTE_SOCKET):
+    """
+    [FEAT-471] Shim entrypoint: ask the zygote to fork `argv` on our stdio and
+    mirror the child's lifetime. Falls back to a cold exec if the zygote is down.
+    """
+    try:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.connect(socket_path)
+        request = {"argv": argv, "env": dict(os.environ), "cwd": os.getcwd()}
+        socket.send_fds(s, [(json.dumps(request) + "\n").encode()], [0, 1, 2])
+        reader = s.makefile()
+        reply = json.loads(reader.readline())
+        child_pid = reply["pid"]
+    except Exception:
+        os.execv(sys.executable, [sys.executable] + list(argv))
+
+    def _forward(signum, _frame):
+        try:
+            os.kill(child_pid, signum)
+        except OSError:
+            pass
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+
+    line = reader.readline()
+    if not line:
+        # Zygote died underneath us; take the child with it.
+        _forward(signal.SIGTERM, None)
+        return 1
+    return json.loads(line).get("exit", 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="[FEAT-471] Resident node zygote")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="Pre-import shared deps and fork nodes on demand")
+    p_serve.add_argument("--socket", default=ZYGOTE_SOCKET)
+    p_serve.add_argument("--no-preload", action="store_true", help="Skip heavy imports (testing)")
+    p_spawn = sub.add_parser("spawn", help="Run a node script inside the warm pool")
+    p_spawn.add_argument("--socket", default=ZYGOTE_SOCKET)
+    p_spawn.add_argument("argv", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - [ZYGOTE] %(levelname)s - %(message)s",
+            stream=sys.stderr,
+        )
+        try:
+            import setproctitle
+            setproctitle.setproctitle("acme_zygote_v5")
+        except ImportError:
+            pass
+        Zygote(args.socket).serve(() if args.no_preload else PRELOAD_MODULES)
+        return 0
+
+    # Only the separator goes; a "--" meant for the node itself is passed through
+    argv = list(args.argv)
+    if "--" in argv:
+        del argv[argv.index("--")]
+    return spawn(argv, args.socket)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
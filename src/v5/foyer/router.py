@@ -30,6 +30,8 @@ from logic.cognitive_hub import CognitiveHub  # noqa: E402
 from equipment.sensory_manager import SensoryManager  # noqa: E402
 from infra.pager_relay import trigger_pager  # noqa: E402
 from infra.atomic_io import atomic_write_json  # noqa: E402
+from infra.style_key import get_style_key as _shared_style_key  # noqa: E402
+from infra import tracing  # noqa: E402
 import ctypes
 
 # [LAB-010] Lazy import — M5 Air may not be available at startup.
@@ -86,13 +88,8 @@ except ImportError:
     setproctitle = None
 
 def get_style_key():
-    """[FEAT-267] Dynamic Key Discovery for Lab REST calls."""
-    style_path = os.path.join(WORKSPACE_DIR, "field_notes/style.css")
-    if os.path.exists(style_path):
-        import hashlib
-        with open(style_path, "rb") as f:
-            return hashlib.md5(f.read()).hexdigest()[:8]
-    return "default_key"
+    """[FEAT-267] Dynamic Key Discovery for Lab REST calls (mtime-memoized, FEAT-475)."""
+    return _shared_style_key(os.path.join(WORKSPACE_DIR, "field_notes/style.css"), fallback="default_key")
 
 def resolve_thought_url():
     """[FEAT-028] Resolves Deep Thought heartbeat URL from infrastructure config."""
@@ -134,6 +131,7 @@ class FoyerRouter:
         # ... existing ...
         if setproctitle:
             setproctitle.setproctitle("acme_foyer_v5")
+        tracing.set_service("foyer")  # [FEAT-481]
             
         self.connected_clients = set()
         self.mode = mode
@@ -349,11 +347,17 @@ class FoyerRouter:
             import uuid
             request_id = uuid.uuid4().hex[:8]
 
+        # [FEAT-481] Root span for the request inside the Foyer; the Hub's spans nest under it.
+        async with tracing.span("division_of_labor", request_id=request_id, source=source):
+            await self._run_division_of_labor(query, source, request_id)
+
+    async def _run_division_of_labor(self, query, source, request_id):
         # Stage 1: Preamble & Triage (Kender · t=0, local fallback)
         if self.stage_memory.get(request_id, {}).get("stage1_kender_triage") is None:
             await self._emit_stage_progress("stage1_kender_triage", request_id, "STARTED")
 
         kender_online = False
+        tracing.lap("stage1.kender_ping")
         try:
             thought = self.residents.get_node("thought")
             if thought is not None:
@@ -367,6 +371,8 @@ class FoyerRouter:
             detail="kender_online" if kender_online else "local_fallback",
         )
 
+        tracing.lap("stages2_4", kender_online=kender_online)
+
         # Stages 2-4 run inside the hub; guarded by a total-budget timeout.
         shutdown_ev = asyncio.Event()
         try:
@@ -400,6 +406,7 @@ class FoyerRouter:
         try:
             # [FIX] Safeguard against anyio cancel scope drift
             await self.residents.shutdown()
+            self.residents.release_pool()
         except Exception as e:
             logger.error(f"Error during logical node shutdown: {e}")
         
@@ -629,6 +636,8 @@ class FoyerRouter:
             web.get('/sys_metrics', self.handle_sys_metrics),    # [FEAT-T20.5] Live graph feed
             web.get('/telemetry_kpi', self.handle_telemetry_kpi),  # [FEAT-T20.3]
             web.get('/benchmarks_kpi', self.handle_benchmarks_kpi),  # [FEAT-T21.2]
+            web.get('/trace', self.handle_trace),    # [FEAT-481] Per-request waterfall
+            web.get('/traces', self.handle_traces),  # [FEAT-481] Recent request_ids
             # [FEAT-143] Remote Control endpoints (Standard & Cloudflare /attendant/ Path Prefix)
             web.post('/wake', self.handle_remote_action),
             web.post('/sleep', self.handle_remote_action),
@@ -862,6 +871,8 @@ class FoyerRouter:
                 if lab_node:
                     asyncio.create_task(lab_node.call_tool("build_semantic_map"))
         
+        # [FEAT-471] Warm the resident zygote now so the first wake forks instead of cold-importing
+        asyncio.create_task(self.residents.prewarm_pool())
         asyncio.create_task(self.reflex_loop())
         asyncio.create_task(self.ear_poller_loop())
         asyncio.create_task(self.scheduled_tasks_loop())
@@ -887,8 +898,35 @@ class FoyerRouter:
         # [FEAT-426] Expose the session token so the browser client can present it
         # as the WS handshake `lab_key` (browsers cannot set custom WS headers).
         status_dict["session_token"] = self.session_token
+        # [FEAT-471] Per-node boot breakdown (settle/spawn/initialize, warm vs cold)
+        status_dict["resident_boot"] = self.residents.boot_timings
+        # [FEAT-476] Triage cache hit rate
+        status_dict["triage_cache"] = self.cognitive.triage_cache.report()
+        # [FEAT-478] RAG cache hit/miss/eviction counters and archive generation
+        status_dict["rag_cache"] = self.cognitive._rag_cache.report()
+        # [FEAT-482] Per-leg status counts, p50/p95 latency and mean utility
+        status_dict["legs"] = self.cognitive.leg_stats.report()
         return web.json_response(status_dict)
 
+    async def handle_trace(self, request):
+        """[FEAT-481] Waterfall for one request_id (?format=html for a rendered view)."""
+        request_id = request.query.get("request_id", "").strip()
+        if not request_id:
+            return web.json_response({"error": "request_id required"}, status=400)
+        view = tracing.waterfall(tracing.get_store().load(request_id))
+        if request.query.get("format") == "html":
+            return web.Response(text=tracing.render_waterfall_html(request_id, view), content_type="text/html")
+        view["request_id"] = request_id
+        return web.json_response(view)
+
+    async def handle_traces(self, request):
+        """[FEAT-481] Most recent traced requests, newest first."""
+        try:
+            limit = int(request.query.get("limit", 20))
+        except ValueError:
+            limit = 20
+        return web.json_response({"traces": tracing.get_store().recent(limit=limit)})
+
     async def handle_logs(self, request):
         """
         [FEAT-309.3] Serve specific log trace files or the main log.
@@ -1335,6 +1373,7 @@ class FoyerRouter:
         # [Task 14.2] Isolated buffers by (request_id, source)
         pending_chunks = defaultdict(str)
         chunk_timestamps = {}
+        first_chunk_at = {}  # [FEAT-481] buf_key -> arrival of the first chunk
         _judge_semaphore = asyncio.Semaphore(2)
 
         while True:
@@ -1348,6 +1387,7 @@ class FoyerRouter:
                 
                 buf_key = (request_id, source)
                 chunk_timestamps[buf_key] = time.time()
+                first_chunk_at.setdefault(buf_key, chunk_timestamps[buf_key])
 
                 if token:
                     # [Story 54.7] Standalone t=0 Warming Pop:
@@ -1375,6 +1415,7 @@ class FoyerRouter:
                         if "brain" in s_lower or "thought" in s_lower:
                             channel = "insight"
                             
+                        t_bcast = time.time()
                         await self.broadcast({
                             "type": "chat",
                             "brain": content,
@@ -1383,6 +1424,11 @@ class FoyerRouter:
                             "channel": channel,
                             "request_id": request_id
                         })
+                        # [FEAT-481] Drain window (first chunk -> final flag) and the broadcast itself
+                        tracing.record_span("waterfall.drain", request_id, first_chunk_at.get(buf_key, t_bcast), t_bcast,
+                                            source=source, chars=len(content))
+                        tracing.record_span("waterfall.broadcast", request_id, t_bcast, source=source,
+                                            clients=len(self.connected_clients))
 
                         # [SPR-52.0 / Task 52.3] Stage 5: contract completion (idempotent)
                         if self.stage_memory.get(request_id, {}).get("stage5_pinky_review") is None:
@@ -1433,6 +1479,7 @@ class FoyerRouter:
                         del pending_chunks[buf_key]
                         if buf_key in chunk_timestamps:
                             del chunk_timestamps[buf_key]
+                        first_chunk_at.pop(buf_key, None)
 
                 # [LAB-095] TTL Sweeper: Clean orphaned pending_chunks keys inactive > 30 seconds
                 now_ts = time.time()
@@ -1441,6 +1488,7 @@ class FoyerRouter:
                     logger.warning(f"[LAB-095] TTL Purge orphaned waterfall buffer key: {k}")
                     del pending_chunks[k]
                     del chunk_timestamps[k]
+                    first_chunk_at.pop(k, None)
 
                 self.waterfall_queue.task_done()
 
@@ -1582,15 +1630,18 @@ class FoyerRouter:
                                         })
                                         
                                         # [FEAT-283] Neural Buffer Replay: Wait for node boot if cold, then dispatch
-                                        async def _dispatch_buffered_intent(evt_query, evt_src, evt_id):
+                                        async def _dispatch_buffered_intent(evt_query, evt_src, evt_id, evt_ts):
+                                            held = not self.residents.booted
                                             if not self.residents.booted:
                                                 logger.info(f"[FEAT-283] Neural Buffer holding prompt '{evt_query[:20]}...' until node ignition finishes...")
                                                 while not self.residents.booted:
                                                     await asyncio.sleep(0.5)
                                                 logger.info(f"[FEAT-283] Silicon booted! Replaying buffered prompt '{evt_query[:20]}...' to Division of Labor.")
+                                            # [FEAT-481] Enqueue -> dispatch, including any cold-boot hold
+                                            tracing.record_span("queue_wait", evt_id, evt_ts, source=evt_src, boot_hold=held)
                                             await self.run_division_of_labor(evt_query, source=evt_src, request_id=evt_id)
 
-                                        asyncio.create_task(_dispatch_buffered_intent(event.query, event.source, event.id))
+                                        asyncio.create_task(_dispatch_buffered_intent(event.query, event.source, event.id, event.timestamp))
                                 except Exception as e:
                                     logger.error(f"Intent parse error: {e}")
                             last_pos = os.path.getsize(QUEUE_FILE) # [FIX] Accurate tailing
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# [FEAT-473] Non-Blocking Induction Pipeline
+# Objective: The nightly induction cycle used to be seven blocking subprocess.run
+# calls inside the Ignition event loop, which froze queue_watcher and the status
+# heartbeat for hours. Stages are now a small DAG executed with
+# asyncio.create_subprocess_exec: independent stages run side by side, every
+# transition is checkpointed, and a user intent preempts the whole cycle.
+#
+# NOTE: Dependencies are ordering constraints only. A failed stage is recorded
+# but does not block its dependents (the legacy sequence never checked exit codes).
+
+V5_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.dirname(V5_DIR)
+LAB_DIR = os.path.dirname(SRC_DIR)
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from infra.atomic_io import atomic_write_json  # noqa: E402
+
+WORKSPACE_DIR = os.path.expanduser("~/Dev_Lab/Portfolio_Dev")
+CHECKPOINT_FILE = os.path.join(WORKSPACE_DIR, "field_notes/data/induction_checkpoint.json")
+
+STAGE_TIMEOUT = 4 * 3600  # Hard ceiling per stage; the forge is the long pole
+TERMINATE_GRACE = 10.0
+
+# Stage states that count as "finished" for ordering and resume purposes.
+FINISHED = ("done", "failed", "timeout")
+
+
+@dataclass
+class Stage:
+    name: str
+    argv: List[str]
+    deps: Tuple[str, ...] = ()
+    label: str = ""
+    timeout: float = STAGE_TIMEOUT
+
+
+def default_stages(python=sys.executable, lab_dir=LAB_DIR) -> List[Stage]:
+    """
+    [FEAT-473] The nightly induction DAG.
+    Dataset prep is a strict chain (each script consumes the previous one's
+    manifest). The recruiter and hierarchy refactor share the Foyer, so they
+    run in series with each other but alongside prep. The forge waits for both.
+    """
+    forge = lambda script: [python, os.path.join(lab_dir, "src/forge", script)]  # noqa: E731
+    task = lambda name: [python, os.path.join(lab_dir, "src/acme_lab.py"), "--trigger-task", name]  # noqa: E731
+    return [
+        Stage("extract_prompts", forge("extract_gemini_prompts.py"), label="Step 0a: Extract Gemini Prompts"),
+        Stage("refine_prompts", forge("refine_prompts.py"), ("extract_prompts",), "Step 0b: Refine Prompts"),
+        Stage("dream_voice", forge("dream_voice.py"), ("refine_prompts",), "Step 0c: Dream Voice"),
+        Stage("build_datasets", forge("build_lora_datasets.py"), ("dream_voice",), "Step 0d: Build LoRA Datasets"),
+        Stage("recruiter", task("recruiter"), label="Step 1: Nightly Recruiter"),
+        Stage("hierarchy", task("lab"), ("recruiter",), "Step 2: Hierarchy Refactor"),
+        Stage("forge", task("forge"), ("build_datasets", "hierarchy"), "Step 3: Sequenced Batch Forge"),
+    ]
+
+
+def load_checkpoint(path, cycle_id) -> Dict[str, dict]:
+    """Return per-stage records for `cycle_id`, or {} if the checkpoint is stale or missing."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("cycle") == cycle_id:
+            return data.get("stages", {})
+    except Exception:
+        pass
+    return {}
+
+
+class InductionPipeline:
+    """
+    [FEAT-473] Async DAG runner for the induction cycle.
+    run() resumes from the checkpoint for `cycle_id`: finished stages are kept,
+    cancelled or never-started stages run again. cancel() terminates every
+    running stage's process group and leaves the checkpoint resumable.
+    """
+
+    def __init__(self, stages, cycle_id, checkpoint_path=CHECKPOINT_FILE, env=None,
+                 on_event: Optional[Callable[[str, str], None]] = None):
+        names = {s.name for s in stages}
+        for s in stages:
+            missing = [d for d in s.deps if d not in names]
+            if missing:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stage(s): {missing}")
+        self.stages = {s.name: s for s in stages}
+        self.cycle_id = cycle_id
+        self.checkpoint_path = checkpoint_path
+        self.env = env
+        self.on_event = on_event
+        self.records: Dict[str, dict] = {}
+        self.cancel_reason = None
+        self._cancel = asyncio.Event()
+        self._procs: Dict[str, asyncio.subprocess.Process] = {}
+        self._started_at = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self, reason="USER_INTENT"):
+        if not self._cancel.is_set():
+            self.cancel_reason = reason
+            self._cancel.set()
+
+    def _emit(self, message, severity="INFO"):
+        if self.on_event:
+            try:
+                self.on_event(message, severity)
+            except Exception:
+                pass
+
+    def _save(self):
+        payload = {
+            "cycle": self.cycle_id,
+            "updated": time.time(),
+            "started": self._started_at,
+            "cancel_reason": self.cancel_reason,
+            "stages": self.records,
+        }
+        try:
+            atomic_write_json(self.checkpoint_path, payload)
+        except Exception as e:
+            logging.warning(f"[INDUCTION] Checkpoint write failed: {e}")
+
+    async def _terminate(self, proc):
+        """SIGTERM the stage's process group, escalating to SIGKILL after the grace period."""
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=TERMINATE_GRACE)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    async def _run_stage(self, stage: Stage):
+        rec = self.records.setdefault(stage.name, {})
+        rec.update({"status": "running", "started": time.time(), "argv": stage.argv})
+        rec.pop("error", None)
+        self._save()
+        label = stage.label or stage.name
+        logging.info(f"[INDUCTION] {label} [START]")
+        self._emit(f"{label} [START]")
+
+        t0 = time.perf_counter()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *stage.argv, env=self.env, cwd=LAB_DIR, start_new_session=True
+            )
+        except Exception as e:
+            rec.update({"status": "failed", "returncode": None, "error": str(e),
+                        "duration_s": 0.0, "finished": time.time()})
+            self._save()
+            logging.error(f"[INDUCTION] {label} failed to launch: {e}")
+            self._emit(f"{label} [LAUNCH FAILED]", severity="WARNING")
+            return
+
+        self._procs[stage.name] = proc
+        waiter = asyncio.ensure_future(proc.wait())
+        canceller = asyncio.ensure_future(self._cancel.wait())
+        try:
+            done, _ = await asyncio.wait({waiter, canceller}, timeout=stage.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if waiter in done:
+                status = "done" if proc.returncode == 0 else "failed"
+            else:
+                status = "cancelled" if canceller in done else "timeout"
+                await self._terminate(proc)
+        finally:
+            canceller.cancel()
+            self._procs.pop(stage.name, None)
+
+        rec.update({
+            "status": status,
+            "returncode": proc.returncode,
+            "duration_s": round(time.perf_counter() - t0, 2),
+            "finished": time.time(),
+        })
+        self._save()
+        logging.info(f"[INDUCTION] {label} [{status.upper()}] ({rec['duration_s']}s, rc={proc.returncode})")
+        if status != "done":
+            self._emit(f"{label} [{status.upper()}]", severity="WARNING")
+
+    async def run(self) -> dict:
+        """Execute the DAG. Returns a summary with per-stage records."""
+        self._started_at = time.time()
+        previous = load_checkpoint(self.checkpoint_path, self.cycle_id)
+        for name in self.stages:
+            rec = previous.get(name)
+            if rec and rec.get("status") in FINISHED:
+                self.records[name] = dict(rec, resumed=True)
+            else:
+                self.records[name] = {"status": "pending"}
+        resumed = [n for n, r in self.records.items() if r.get("resumed")]
+        if resumed:
+            logging.info(f"[INDUCTION] Resuming cycle {self.cycle_id}; skipping finished stages: {resumed}")
+        self._save()
+
+        running: Dict[asyncio.Task, str] = {}
+        t0 = time.perf_counter()
+        while not self.cancelled:
+            for name, stage in self.stages.items():
+                if self.records[name]["status"] != "pending" or name in running.values():
+                    continue
+                if all(self.records[d]["status"] in FINISHED for d in stage.deps):
+                    running[asyncio.ensure_future(self._run_stage(stage))] = name
+            if not running:
+                break
+            canceller = asyncio.ensure_future(self._cancel.wait())
+            done, _ = await asyncio.wait(set(running) | {canceller}, return_when=asyncio.FIRST_COMPLETED)
+            canceller.cancel()
+            for task in done:
+                if task is not canceller:
+                    running.pop(task)
+                    task.result()
+
+        if running:
+            # Cancellation: let each stage reap its own process group.
+            await asyncio.gather(*running, return_exceptions=True)
+        for rec in self.records.values():
+            if rec["status"] in ("pending", "running"):
+                rec["status"] = "cancelled"
+        self._save()
+
+        summary = {
+            "cycle": self.cycle_id,
+            "cancelled": self.cancelled,
+            "cancel_reason": self.cancel_reason,
+            "wall_s": round(time.perf_counter() - t0, 2),
+            "stages": self.records,
+        }
+        timings = ", ".join(f"{n}={r.get('duration_s', '-')}s/{r['status']}" for n, r in self.records.items())
+        logging.info(f"[INDUCTION] Cycle {self.cycle_id} {'CANCELLED' if self.cancelled else 'COMPLETE'} in {summary['wall_s']}s: {timings}")
+        return summary
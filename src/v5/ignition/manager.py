@@ -16,6 +16,9 @@ if SRC_DIR not in sys.path:
     sys.path.append(SRC_DIR)
 
 from v5.common.types import LabStatus, IntentEvent
+from v5.ignition.induction import InductionPipeline, default_stages
+from v5.ignition.vitals import VitalsSampler, StatusPublisher
+from infra.atomic_io import atomic_write_json
 from infra.pager_relay import trigger_pager
 
 # [Task 4.4] V5 Ignition: The physical Hardware Guardian
@@ -31,6 +34,9 @@ GEM_REFINER = os.path.join(WORKSPACE_DIR, "field_notes/refine_gem.py")
 
 INFRA_CONFIG = os.path.expanduser("~/Dev_Lab/HomeLabAI/config/infrastructure.json")
 
+# [FEAT-474] Vitals cadence (was a fixed 30s when every tick re-initialized NVML)
+VITALS_INTERVAL = float(os.environ.get("LAB_VITALS_INTERVAL", "10"))
+
 def get_unified_base_model():
     """[FEAT-030 / LAB-003] Read config/infrastructure.json and resolve the model_manifest.unified-base pointer."""
     try:
@@ -62,12 +68,23 @@ class IgnitionManager:
         self.processed_ids = deque(maxlen=1000) # [Task 6.3] Hygiene: Prevent memory leaks
         self.last_induction = None
         self.last_induction_date = None # [FEAT-289] Atomic Induction
+        # [FEAT-473] Non-blocking induction: the running pipeline and its task
+        self.induction = None
+        self._induction_task = None
+        self.induction_preempted = False
+        # [FEAT-474] In-flight status refreshes: held so they are not GC'd mid-run and their errors surface
+        self._status_tasks = set()
         self.last_activity_time = time.time() # [Task 4.1] Idle tracking
         # [FEAT-302] & [FEAT-323] Recovery backoff attributes
         self.recovery_attempts = 0
         self.cooldown_until = 0.0
         self.operational_start_time = 0.0
         self.recovery_in_progress = False
+        # [FEAT-474] Persistent NVML handle + concurrent probes + delta push
+        self.vitals = VitalsSampler()
+        self.publisher = StatusPublisher()
+        self._status_lock = asyncio.Lock()
+
     def record_pager(self, message, severity="INFO", source="LabAttendant"):
         """[Task 9.9] Centralized Pager Logging."""
         trigger_pager(message, severity=severity, source=source)
@@ -119,6 +136,39 @@ class IgnitionManager:
             logging.warning("[IGNITION] VRAM Mutex busy (locked by another process).")
             return False
 
+    def preempt_induction(self, reason):
+        """[FEAT-473] A user intent outranks the nightly cycle. Returns True if one was running."""
+        if self._induction_task is None or self._induction_task.done():
+            return False
+        if not self.induction.cancelled:
+            logging.info(f"[IGNITION] Preempting induction cycle for {reason}.")
+            self.record_pager(f"Induction Cycle [PREEMPTED] ({reason})", severity="WARNING", source="Induction")
+            self.induction.cancel(reason)
+        return True
+
+    async def _run_induction(self, cycle_id):
+        """[FEAT-473] Runs the induction DAG off the main loop; the caller holds the VRAM mutex."""
+        self.induction = InductionPipeline(
+            default_stages(),
+            cycle_id=cycle_id,
+            env=os.environ.copy(),
+            on_event=lambda msg, severity: self.record_pager(msg, severity=severity, source="Induction"),
+        )
+        try:
+            summary = await self.induction.run()
+            if summary["cancelled"]:
+                # Re-open today's window; the checkpoint lets the next attempt skip finished stages.
+                self.induction_preempted = True
+                self.last_induction_date = None
+            else:
+                self.induction_preempted = False
+                self.record_pager(f"Full Induction Cycle [COMPLETE] ({summary['wall_s']:.0f}s)", source="Induction")
+        except Exception as e:
+            logging.error(f"[ALARM] Induction pipeline failure: {e}")
+        finally:
+            self._release_vram_lock()
+            self.status.timestamp = time.time()
+
     def _release_vram_lock(self):
         if self._vram_lock_fd is not None:
             try:
@@ -131,6 +181,13 @@ class IgnitionManager:
         if self.status.state in ["WAKING", "OPERATIONAL"]:
             return True
 
+        # [FEAT-473] Wait for a preempted induction to reap its stages and drop the mutex
+        if self.preempt_induction(reason):
+            try:
+                await self._induction_task
+            except Exception:
+                pass
+
         # [FEAT-302] Adaptive Cooldown Tracking
         now = time.time()
         if now < self.cooldown_until:
@@ -250,50 +307,44 @@ class IgnitionManager:
 
     def update_status_file(self):
         """[FEAT-265] Multi-host status synchronization."""
-        self.status.timestamp = time.time()
-        
-        # [Task 9.7] Live Telemetry Polling
+        # [FEAT-474] Sampling, the atomic write and the push run on the loop; callers never block.
         try:
-            vm = psutil.virtual_memory()
-            self.status.ram_pct = vm.percent
-            self.status.available_ram = round(vm.available / (1024**3), 2)
-            import pynvml
-            try:
-                pynvml.nvmlInit()
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                self.status.vram_used = int(info.used // 1024**2)
-                self.status.vram_total = int(info.total // 1024**2)
-            except Exception: pass
-        except Exception: pass
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.refresh_status())
+            return
+        task = loop.create_task(self.refresh_status())
+        self._status_tasks.add(task)
+        task.add_done_callback(self._status_task_done)
+
+    def _status_task_done(self, task):
+        self._status_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(f"[IGNITION] Status refresh failed: {task.exception()}")
+
+    async def refresh_status(self):
+        """[FEAT-474] One vitals tick: concurrent probes -> compact atomic status.json -> delta push."""
+        async with self._status_lock:
+            self.status.timestamp = time.time()
+            readings = await self.vitals.sample(self.status)
+
+            # [FEAT-323] Expose recovery info to status
+            self.status.recovery_level = self.recovery_attempts
+            self.status.recovery_in_progress = self.recovery_in_progress
 
-        # [FEAT-323] Expose recovery info to status
-        self.status.recovery_level = self.recovery_attempts
-        self.status.recovery_in_progress = self.recovery_in_progress
-
-        try:
-            payload = self.status.to_dict()
             try:
-                from infra.live_telemetry import merge_live_benchmarks
-                merge_live_benchmarks(payload)
-            except Exception:
-                pass
-            with open(STATUS_JSON, "w") as f:
-                json.dump(payload, f, indent=2)
-            
-            # [Task 6.2] Latency: Async status push
-            def _push_update():
-                try:
-                    import requests
-                    requests.post("http://localhost:8765/status_update", json=self.status.to_dict(), timeout=0.5)
-                except Exception: pass
-            
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.run_in_executor(None, _push_update)
-            else:
-                _push_update()
-        except Exception: pass
+                payload = self.status.to_dict()
+                if "live_telemetry" in readings:
+                    payload["live_telemetry"] = readings["live_telemetry"]
+                payload["vitals_sample_ms"] = self.vitals.last_ms
+                if "prefix_cache" in readings:
+                    payload["prefix_cache"] = readings["prefix_cache"]
+                await asyncio.to_thread(atomic_write_json, STATUS_JSON, payload, None)
+
+                # [Task 6.2] Latency: Async status push (delta-only since FEAT-474)
+                await self.publisher.push({k: v for k, v in payload.items() if k != "live_telemetry"})
+            except Exception as e:
+                logging.debug(f"[IGNITION] Status refresh failed: {e}")
 
     async def stop_lab(self, reason="AFK", target_state="HIBERNATING"):
         """[Task 4.1] Stable Hibernation: Strict subprocess termination."""
@@ -357,6 +408,9 @@ class IgnitionManager:
                                         logging.info(f"[IGNITION] New Intent Detected: {event.id} (State: {self.status.state})")
                                         self.processed_ids.append(event.id)
                                         self.last_activity_time = time.time() # Reset idle timer
+                                        # [FEAT-473] Any user intent preempts a running induction cycle
+                                        if not event.query.startswith("[OPERATIONAL] LOCK"):
+                                            self.preempt_induction(f"INTENT_{event.id}")
                                         
                                         # Handle remote control operational intents
                                         if event.query.startswith("[OPERATIONAL]"):
@@ -518,58 +572,36 @@ class IgnitionManager:
                 # 2. Daily Induction Window (02:00 - 04:00)
                 disable_lock_path = "/home/jallred/Dev_Lab/Portfolio_Dev/field_notes/data/disable_induction.lock"
                 is_window = (2 <= now.hour < 4) and not os.path.exists(disable_lock_path)
-                if is_window and self.last_induction_date != today:
+                induction_busy = self._induction_task is not None and not self._induction_task.done()
+                # [FEAT-473] A preempted cycle only resumes once the lab has gone back to sleep
+                resume_ok = not self.induction_preempted or self.status.state == "HIBERNATING"
+                if is_window and self.last_induction_date != today and not induction_busy and resume_ok:
                     # [FEAT-289] Atomic Induction: Mark today as started
                     self.last_induction_date = today
-                    logging.info("[ALARM] Entering Daily Induction Window...")
+                    logging.info("[ALARM] Entering Daily Induction Window..." if not self.induction_preempted else "[ALARM] Resuming preempted induction cycle...")
                     self.record_pager("Daily Induction Window [OPEN]", source="Induction")
                     
                     # Try to acquire silicon mutex
                     if self._acquire_vram_lock():
-                        try:
-                            # [Task 1.2] Pre-Forge Dataset Refresh
-                            logging.info("[ALARM] Step 0: Pre-Forge Dataset Refresh...")
-                            self.record_pager("Step 0: Pre-Forge Dataset Refresh [START]", source="Induction")
-                            
-                            # Sequential dataset prep runs
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/forge/extract_gemini_prompts.py")], env=os.environ.copy())
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/forge/refine_prompts.py")], env=os.environ.copy())
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/forge/dream_voice.py")], env=os.environ.copy())
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/forge/build_lora_datasets.py")], env=os.environ.copy())
-                            
-                            # Step 1: Nightly Recruiter
-                            logging.info("[ALARM] Step 1: Nightly Recruiter...")
-                            self.record_pager("Step 1: Nightly Recruiter [START]", source="Induction")
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/acme_lab.py"), "--trigger-task", "recruiter"], env=os.environ.copy())
-                            
-                            # Step 2: Hierarchy Refactor
-                            logging.info("[ALARM] Step 2: Hierarchy Refactor...")
-                            self.record_pager("Step 2: Hierarchy Refactor [START]", source="Induction")
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/acme_lab.py"), "--trigger-task", "lab"], env=os.environ.copy())
-                            
-                            # Step 3: Sequenced Batch Forge
-                            logging.info("[ALARM] Step 3: Sequenced Batch Forge...")
-                            self.record_pager("Step 3: Sequenced Batch Forge [START]", source="Induction")
-                            subprocess.run([sys.executable, os.path.join(LAB_DIR, "src/acme_lab.py"), "--trigger-task", "forge"], env=os.environ.copy())
-                            
-                            self.record_pager("Full Induction Cycle [COMPLETE]", source="Induction")
-                        finally:
-                            self._release_vram_lock()
-                            self.status.timestamp = time.time()
+                        # [FEAT-473] The DAG runs as a task so queue_watcher and the heartbeat stay live
+                        self._induction_task = asyncio.create_task(self._run_induction(today.isoformat()))
                     else:
                         logging.warning("[ALARM] Silicon busy (Mutex Locked). Deferring induction.")
                         self.last_induction_date = None
 
                 # 3. Slow Burn: Idle GEM Refinement
                 idle_time = time.time() - self.status.timestamp
-                if idle_time > 3600 and self.status.state == "HIBERNATING":
+                induction_busy = self._induction_task is not None and not self._induction_task.done()
+                if idle_time > 3600 and self.status.state == "HIBERNATING" and not induction_busy:
                     logging.info("[IGNITION] System Idle > 1hr. Triggering Quiet Refinement...")
                     if self._acquire_vram_lock():
                         try:
                             refiner = GEM_REFINER
                             if os.path.exists(refiner):
                                 logging.info(f"[IGNITION] Running {refiner}...")
-                                subprocess.run([sys.executable, refiner, "--one-turn"], env=os.environ.copy())
+                                # [FEAT-473] Non-blocking: keep queue_watcher responsive during refinement
+                                proc = await asyncio.create_subprocess_exec(sys.executable, refiner, "--one-turn", env=os.environ.copy())
+                                await proc.wait()
                             else:
                                 logging.warning(f"[IGNITION] Refiner script not found at {refiner}")
                         finally:
@@ -593,8 +625,8 @@ class IgnitionManager:
                 if stable_dur > 300 and self.recovery_attempts > 0:
                     logging.info(f"[IGNITION] Silicon Stability Verified ({int(stable_dur)}s). Resetting recovery backoff.")
                     self.recovery_attempts = 0
-            self.update_status_file()
-            await asyncio.sleep(30)
+            await self.refresh_status()
+            await asyncio.sleep(VITALS_INTERVAL)
 
 if __name__ == "__main__":
     manager = IgnitionManager()
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Optional
+
+from infra.vllm_metrics import PrefixCacheMeter
+
+# [FEAT-474] Vitals Sampler
+# Objective: Keep the Ignition heartbeat cheap enough to run at a higher cadence.
+#   - NVML is initialized once and the device handle is cached (re-init only on error).
+#   - Host, GPU and live-benchmark probes run concurrently with a per-probe deadline,
+#     so one dead endpoint cannot stall the tick.
+#   - The Foyer receives only the keys that changed since the last acknowledged push,
+#     with a periodic full resync in case it restarted underneath us.
+
+PROBE_TIMEOUT = 2.5
+FULL_SYNC_INTERVAL = 300.0
+FOYER_STATUS_UPDATE_URL = "http://localhost:8765/status_update"
+
+# Presentation-only keys that change every tick; they never justify a push on their own.
+VOLATILE_KEYS = ("timestamp", "state_duration_s")
+# Always sent: the Foyer re-evaluates resident boot/hibernate on every state it receives.
+HEARTBEAT_KEYS = ("state",)
+
+
+class NvmlHandle:
+    """
+    [FEAT-474] Persistent NVML session.
+    nvmlInit() and the device-handle lookup cost more than the memory query
+    itself; do them once. Any NVML error drops the cached handle so the next
+    read re-initializes (driver reload, GPU reset).
+    """
+
+    def __init__(self, index=0, nvml=None):
+        self.index = index
+        self._nvml = nvml
+        self._handle = None
+        self.init_count = 0
+
+    def _module(self):
+        if self._nvml is None:
+            import pynvml
+            self._nvml = pynvml
+        return self._nvml
+
+    def memory(self):
+        """Returns (used_mib, total_mib) or None if the GPU is unreadable."""
+        try:
+            nvml = self._module()
+            if self._handle is None:
+                nvml.nvmlInit()
+                self.init_count += 1
+                self._handle = nvml.nvmlDeviceGetHandleByIndex(self.index)
+            info = nvml.nvmlDeviceGetMemoryInfo(self._handle)
+            return int(info.used // 1024**2), int(info.total // 1024**2)
+        except Exception as e:
+            if self._handle is not None:
+                logging.debug(f"[VITALS] NVML read failed, dropping cached handle: {e}")
+            self._handle = None
+            return None
+
+    def shutdown(self):
+        if self._handle is not None:
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+            self._handle = None
+
+
+def _host_memory():
+    import psutil
+    vm = psutil.virtual_memory()
+    return vm.percent, round(vm.available / (1024**3), 2)
+
+
+async def _live_benchmarks():
+    from infra.live_telemetry import get_collector
+    return (await get_collector().snapshot_async()).to_dict()
+
+
+class VitalsSampler:
+    """[FEAT-474] Concurrent host/GPU/benchmark probes feeding LabStatus."""
+
+    def __init__(self, nvml: Optional[NvmlHandle] = None, probes: Optional[Dict[str, Callable]] = None,
+                 timeout=PROBE_TIMEOUT):
+        self.nvml = nvml or NvmlHandle()
+        self.timeout = timeout
+        self.probes = probes if probes is not None else {
+            "host": _host_memory,
+            "gpu": self.nvml.memory,
+            "live_telemetry": _live_benchmarks,
+            # [FEAT-479] vLLM prefix-cache reuse (lifetime + since last tick)
+            "prefix_cache": PrefixCacheMeter().sample,
+        }
+        self.last = {}
+        self.last_ms = 0.0
+
+    async def _probe(self, name, fn):
+        try:
+            call = fn() if asyncio.iscoroutinefunction(fn) else asyncio.to_thread(fn)
+            return await asyncio.wait_for(call, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logging.debug(f"[VITALS] Probe '{name}' exceeded {self.timeout}s; keeping last value.")
+        except Exception as e:
+            logging.debug(f"[VITALS] Probe '{name}' failed: {e}")
+        return self.last.get(name)
+
+    async def sample(self, status=None) -> Dict[str, Any]:
+        """Run every probe concurrently; apply host/GPU readings to `status` when given."""
+        t0 = time.perf_counter()
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._probe(n, self.probes[n]) for n in names))
+        readings = {n: r for n, r in zip(names, results) if r is not None}
+        self.last.update(readings)
+        self.last_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+
+        if status is not None:
+            if "host" in readings:
+                status.ram_pct, status.available_ram = readings["host"]
+            if "gpu" in readings:
+                status.vram_used, status.vram_total = readings["gpu"]
+        return readings
+
+    def close(self):
+        self.nvml.shutdown()
+
+
+def diff_status(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level keys whose value changed (nested dicts compare as a whole)."""
+    return {
+        k: v for k, v in current.items()
+        if k not in VOLATILE_KEYS and (k not in previous or previous[k] != v)
+    }
+
+
+def _post_json(url, payload, timeout=0.5):
+    req = urllib.request.Request(
+        url, data=json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.status
+
+
+class StatusPublisher:
+    """
+    [FEAT-474] Delta-only status push to the Foyer.
+    The Foyer's /status_update merges whatever keys it receives, so unchanged
+    fields can be omitted; `state` rides along every time as the heartbeat.
+    A failed push forces the next one to be a full resync, as does
+    FULL_SYNC_INTERVAL elapsing.
+    """
+
+    def __init__(self, url=FOYER_STATUS_UPDATE_URL, post: Callable = _post_json,
+                 full_sync_interval=FULL_SYNC_INTERVAL):
+        self.url = url
+        self._post = post
+        self.full_sync_interval = full_sync_interval
+        self._acked: Dict[str, Any] = {}
+        self._last_full = 0.0
+        self.stats = {"full": 0, "delta": 0, "failed": 0}
+
+    async def push(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send what changed. Returns the body that was sent, or None on failure."""
+        full = not self._acked or (time.time() - self._last_full) > self.full_sync_interval
+        body = dict(payload) if full else diff_status(self._acked, payload)
+        for key in HEARTBEAT_KEYS:
+            if key in payload:
+                body[key] = payload[key]
+        try:
+            await asyncio.to_thread(self._post, self.url, body)
+        except Exception as e:
+            logging.debug(f"[VITALS] Status push failed ({e}); next push will be a full resync.")
+            self.stats["failed"] += 1
+            self._acked = {}
+            return None
+        if full:
+            self._acked = dict(payload)
+            self._last_full = time.time()
+        else:
+            self._acked.update(body)
+        self.stats["full" if full else "delta"] += 1
+        return body